@@ -25,6 +25,20 @@ class CorClust:
         self.c_rs += c_rt ** 2
         self.C += np.outer(c_rt, c_rt)
 
+    # X: a numpy array of shape (B, n), the same as calling update on each row of X, in order.
+    # The residuals of all rows are computed at once (from the running sums of the rows), and their
+    # cross-products are accumulated with a single matrix multiply.
+    def update_batch(self, X):
+        # running linear sums, accumulated in the same order as update
+        c = np.cumsum(np.vstack((self.c, X)), axis=0)[1:]
+        N = self.N + np.arange(1, X.shape[0] + 1)
+        c_rt = X - c / N[:, np.newaxis]
+        self.N += X.shape[0]
+        self.c = c[-1]
+        self.c_r += c_rt.sum(axis=0)
+        self.c_rs += (c_rt ** 2).sum(axis=0)
+        self.C += np.dot(c_rt.T, c_rt)
+
     # creates the current correlation distance matrix between the features
     def corr_dist(self):
         c_rs_sqrt = np.sqrt(self.c_rs)
@@ -0,0 +1,48 @@
+import numpy as np
+from scipy.special import expit
+
+
+# A compiled (inference only) form of the KitNET ensemble layer, built from the trained autoencoders.
+# All autoencoders are executed at once: a single gather of the features of every autoencoder (in
+# the order of the feature map), a block-diagonal weight matrix for the encode and the decode steps,
+# and a per-autoencoder RMSE reduction (np.add.reduceat over each autoencoder's visible units).
+# v: the feature map; ensemble_layer: the trained DA objects (one per entry of v).
+class FusedEnsemble:
+    def __init__(self, v, ensemble_layer):
+        self.n_ae = len(v)
+
+        # concatenated gather index, and the first visible/hidden unit of each autoencoder
+        self.index = np.concatenate([np.asarray(ad_map, dtype=np.intp) for ad_map in v])
+        n_visible = np.array([len(ad_map) for ad_map in v])
+        n_hidden = np.array([da.params.n_hidden for da in ensemble_layer])
+        self.v_start = np.concatenate(([0], np.cumsum(n_visible)[:-1]))
+        h_start = np.concatenate(([0], np.cumsum(n_hidden)[:-1]))
+        self.n_visible = n_visible
+        self.h_start = h_start
+        self.n_hidden = n_hidden
+
+        self.W = np.zeros((n_visible.sum(), n_hidden.sum()))
+        for a, da in enumerate(ensemble_layer):
+            self.W[self.v_start[a]:self.v_start[a] + n_visible[a],
+                   h_start[a]:h_start[a] + n_hidden[a]] = da.W
+        self.W_prime = self.W.T
+        self.hbias = np.concatenate([da.hbias for da in ensemble_layer])
+        self.vbias = np.concatenate([da.vbias for da in ensemble_layer])
+
+        # for 0-1 normalization
+        self.norm_min = np.concatenate([da.norm_min for da in ensemble_layer])
+        self.norm_scale = np.concatenate([da.norm_max - da.norm_min for da in ensemble_layer]) \
+            + 0.0000000000000001
+
+        # autoencoders still in their grace period score 0
+        self.in_grace = np.array([da.in_grace() for da in ensemble_layer])
+
+    # returns the RMSE of each autoencoder for each row of X (a (B, n) array), as a (B, n_ae) array
+    def execute_batch(self, X):
+        # 0-1 normalize
+        X = (X[:, self.index] - self.norm_min) / self.norm_scale
+        Y = expit(np.dot(X, self.W) + self.hbias)
+        Z = expit(np.dot(Y, self.W_prime) + self.vbias)
+        S = np.sqrt(np.add.reduceat((X - Z) ** 2, self.v_start, axis=1) / self.n_visible)
+        S[:, self.in_grace] = 0.0
+        return S
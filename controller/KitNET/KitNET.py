@@ -4,6 +4,10 @@ import pickle
 from pathlib import Path
 from .dA import DA, DAParams
 from .CorClust import CorClust
+from .FusedEnsemble import FusedEnsemble
+from .EnsembleWorkers import EnsembleWorkers, MIN_BATCH
+from .Quantized import QuantizedEnsemble, INFERENCE_MODES
+from .ModelBundle import save_model, load_model
 
 
 # This class represents a KitNET machine learner. KitNET is a lightweight online anomaly detection algorithm based on
@@ -19,9 +23,13 @@ class KitNET:
     # 0.75 will cause roughly a 25% compression in the hidden layer. feature_map: One may optionally provide a
     # feature map instead of learning one. The map must be a list, where the i-th entry contains a list of the
     # feature indices to be assigned to the i-th autoencoder in the ensemble. For example, [[2,5,3],[4,0,1],[6,7]]
+    # model: a trained model bundle (see ModelBundle), instead of the (legacy) pickled feature map, ensemble layer
+    # and output layer.
+    # model_dir: directory where the model bundle is saved once trained (default: models, next to this file).
     def __init__(self, n, max_autoencoder_size=10, fm_grace_period=None, ad_grace_period=10000,
                  learning_rate=0.1, hidden_ratio=0.75, feature_map=None, ensemble_layer=None,
-                 output_layer=None, attack='', train_exact_ratio=0):
+                 output_layer=None, attack='', train_exact_ratio=0, model=None,
+                 model_dir=None):
         # Parameters:
         self.AD_grace_period = ad_grace_period
         if fm_grace_period is None:
@@ -41,13 +49,24 @@ class KitNET:
         self.n_executed = 0  # the number of executed instances so far
         self.ensembleLayer = []
         self.outputLayer = None
+        self.fused = None  # compiled ensemble layer, built when the training finishes
+        self.workers = None  # thread pool evaluating the ensemble layer (see set_workers)
+        self.inference_mode = 'float64'  # see set_inference_mode
+        self.quantized = None  # quantized ensemble and output layers, for the inference mode
         self.attack = attack
         self.train_exact_ratio = train_exact_ratio
+        self.model_dir = model_dir
 
-        # Check if the feature map, ensemble layer and output layer are provided as input.
+        # Check if the model, or the feature map, ensemble layer and output layer are provided as input.
         # If so, skip the training phase.
 
-        if feature_map is not None:
+        if model is not None:
+            bundle = load_model(model)
+            self.v = bundle['v']
+            self.ensembleLayer = bundle['ensemble_layer']
+            self.outputLayer = bundle['output_layer']
+            print("Feature-Mapper: execute-mode, Anomaly-Detector: execute-mode")
+        elif feature_map is not None:
             with open(feature_map, 'rb') as f_fm:
                 self.v = pickle.load(f_fm)
             self.__createAD__()
@@ -62,19 +81,29 @@ class KitNET:
                 self.ensembleLayer = pickle.load(f_el)
             with open(output_layer, 'rb') as f_ol:
                 self.outputLayer = pickle.load(f_ol)
-            self.n_trained = self.FM_grace_period + self.AD_grace_period + 1
             print("Feature-Mapper: execute-mode, Anomaly-Detector: execute-mode")
+        if self.outputLayer is not None:
+            self.n_trained = self.FM_grace_period + self.AD_grace_period + 1
+            self.__fused__()
 
     # If FM_grace_period+AM_grace_period has passed, then this function executes KitNET on x.
     # Otherwise, this function learns from x. x: a numpy array of length n.
     # Note: KitNET automatically performs 0-1 normalization on all attributes.
     def process(self, x):
         # If both the FM and AD are in execute-mode
-        if self.n_trained >= self.FM_grace_period + self.AD_grace_period:
+        if self.is_executing():
             return self.execute(x)
         else:
             return self.train(x)
 
+    # True if the FM is in train-mode (learning the feature mapping).
+    def is_mapping(self):
+        return self.v is None and self.n_trained < self.FM_grace_period
+
+    # True if both the FM and AD are in execute-mode.
+    def is_executing(self):
+        return self.n_trained >= self.FM_grace_period + self.AD_grace_period
+
     # force train KitNET on x
     # returns the anomaly score of x during training (do not use for alerting)
     def train(self, x):
@@ -83,14 +112,11 @@ class KitNET:
             # update the incremental correlation matrix
             self.FM.update(x)
             if self.n_trained == self.FM_grace_period - 1:  # If the feature mapping should be instantiated
-                self.v = self.FM.cluster(self.m)
-                self.__createAD__()
-                print("The Feature-Mapper found a mapping: " + str(self.n) + " features to " + str(
-                    len(self.v)) + " autoencoders.")
-                print("Feature-Mapper: execute-mode, Anomaly-Detector: train-mode")
+                self.__map_features__()
             self.n_trained += 1
             return 0.0
         else:  # train
+            self.fused = None
             # Ensemble Layer
             S_l1 = np.zeros(len(self.ensembleLayer))
             for a in range(len(self.ensembleLayer)):
@@ -100,24 +126,86 @@ class KitNET:
             # OutputLayer
             output = self.outputLayer.train(S_l1)
             if self.n_trained == self.AD_grace_period + self.FM_grace_period - 1:
-                print("Feature-Mapper: execute-mode, Anomaly-Detector: execute-mode")
-
-                outdir = str(Path(__file__).parents[0]) + '/models'
-                if not os.path.exists(str(Path(__file__).parents[0]) + '/models'):
-                    os.mkdir(outdir)
-
-                with open(outdir + '/' + self.attack + '-m-' + str(self.m)
-                          + '-r-' + str(self.train_exact_ratio) + '-fm' + '.txt', 'wb') as f_fm:
-                    pickle.dump(self.v, f_fm)
-                with open(outdir + '/' + self.attack + '-m-' + str(self.m)
-                          + '-r-' + str(self.train_exact_ratio) + '-el' + '.txt', 'wb') as f_el:
-                    pickle.dump(self.ensembleLayer, f_el)
-                with open(outdir + '/' + self.attack + '-m-' + str(self.m)
-                          + '-r-' + str(self.train_exact_ratio) + '-ol' + '.txt', 'wb') as f_ol:
-                    pickle.dump(self.outputLayer, f_ol)
+                self.__finish_training__()
             self.n_trained += 1
             return output
 
+    # force train KitNET on a batch of instances X: a numpy array of shape (B, n).
+    # The instances of the FM grace period update the FM with a single call (see CorClust.update_batch),
+    # the others are trained on with a single mini-batch step per autoencoder (see DA.train_batch).
+    # returns the anomaly scores of X during training (do not use for alerting)
+    def train_batch(self, X):
+        X = np.atleast_2d(X)
+        output = np.zeros(X.shape[0])
+        i = 0
+        if self.is_mapping():
+            # If the FM is in train-mode, update the incremental correlation matrix
+            i = min(self.FM_grace_period - self.n_trained, X.shape[0])
+            self.FM.update_batch(X[:i])
+            self.n_trained += i
+            # If the feature mapping should be instantiated
+            if self.n_trained == self.FM_grace_period:
+                self.__map_features__()
+        if i == X.shape[0]:
+            return output
+
+        X = X[i:]
+        self.fused = None
+        # Ensemble Layer
+        if self.workers is not None and X.shape[0] >= MIN_BATCH:
+            S_l1 = self.workers.train_batch(self.v, self.ensembleLayer, X)
+        else:
+            S_l1 = np.empty((X.shape[0], len(self.ensembleLayer)))
+            for a in range(len(self.ensembleLayer)):
+                # make sub instances
+                S_l1[:, a] = self.ensembleLayer[a].train_batch(X[:, self.v[a]])
+        # OutputLayer
+        output[i:] = self.outputLayer.train_batch(S_l1)
+        end = self.AD_grace_period + self.FM_grace_period
+        if self.n_trained < end <= self.n_trained + X.shape[0]:
+            self.__finish_training__()
+        self.n_trained += X.shape[0]
+        return output
+
+    # process a batch of instances X (a numpy array of shape (B, n)), in order: the instances
+    # within the grace periods are trained on (see train_batch), the next ones are executed.
+    def process_batch(self, X):
+        X = np.atleast_2d(X)
+        n_train = min(max(self.FM_grace_period + self.AD_grace_period - self.n_trained, 0),
+                      X.shape[0])
+        output = np.zeros(X.shape[0])
+        if n_train > 0:
+            output[:n_train] = self.train_batch(X[:n_train])
+        if n_train < X.shape[0]:
+            output[n_train:] = self.execute_batch(X[n_train:])
+        return output
+
+    # The FM is trained: find the feature mapping and build the AD.
+    def __map_features__(self):
+        self.v = self.FM.cluster(self.m)
+        self.__createAD__()
+        print("The Feature-Mapper found a mapping: " + str(self.n) + " features to " + str(
+            len(self.v)) + " autoencoders.")
+        print("Feature-Mapper: execute-mode, Anomaly-Detector: train-mode")
+
+    # The AD is trained: compile the ensemble layer and save the models.
+    def __finish_training__(self):
+        self.__fused__()
+        print("Feature-Mapper: execute-mode, Anomaly-Detector: execute-mode")
+
+        outdir = self.model_dir
+        if outdir is None:
+            outdir = str(Path(__file__).parents[0]) + '/models'
+        if not os.path.exists(outdir):
+            os.mkdir(outdir)
+
+        save_model(outdir + '/' + self.attack + '-m-' + str(self.m)
+                   + '-r-' + str(self.train_exact_ratio) + '-model.npz',
+                   self.v, self.ensembleLayer, self.outputLayer,
+                   {'n': self.n, 'm': self.m, 'fm_grace_period': self.FM_grace_period,
+                    'ad_grace_period': self.AD_grace_period, 'attack': self.attack,
+                    'train_exact_ratio': self.train_exact_ratio})
+
     # force execute KitNET on x
     def execute(self, x):
         if self.v is None:
@@ -125,6 +213,8 @@ class KitNET:
                 'KitNET Cannot execute x, because a feature mapping has not yet been learned or provided. Try running '
                 'process(x) instead.')
         else:
+            if self.inference_mode != 'float64':
+                return self.execute_batch(x[np.newaxis, :])[0]
             self.n_executed += 1
             # Ensemble Layer
             S_l1 = np.zeros(len(self.ensembleLayer))
@@ -135,6 +225,64 @@ class KitNET:
             # OutputLayer
             return self.outputLayer.execute(S_l1)
 
+    # force execute KitNET on a batch of instances X: a numpy array of shape (B, n).
+    # returns the B anomaly scores, with a single call per autoencoder.
+    def execute_batch(self, X):
+        if self.v is None:
+            raise RuntimeError(
+                'KitNET Cannot execute X, because a feature mapping has not yet been learned or provided. Try running '
+                'process(x) instead.')
+        else:
+            X = np.atleast_2d(X)
+            self.n_executed += X.shape[0]
+            if self.inference_mode != 'float64':
+                ensemble_q, output_q = self.quantized_layers()
+                return output_q.execute_batch(ensemble_q.execute_batch(X))[:, 0]
+            # Ensemble Layer
+            fused = self.__fused__()
+            if self.workers is not None and X.shape[0] >= MIN_BATCH:
+                S_l1 = self.workers.execute_batch(X)
+            else:
+                S_l1 = fused.execute_batch(X)
+            # OutputLayer
+            return self.outputLayer.execute_batch(S_l1)
+
+    # the compiled ensemble layer (rebuilt if the autoencoders were trained since it was built)
+    def __fused__(self):
+        if self.fused is None:
+            self.fused = FusedEnsemble(self.v, self.ensembleLayer)
+            self.quantized = None
+            if self.workers is not None:
+                self.workers.compile(self.v, self.ensembleLayer)
+        return self.fused
+
+    # the quantized ensemble and output layers, for the inference mode (rebuilt with the compiled ensemble)
+    def quantized_layers(self):
+        fused = self.__fused__()
+        if self.quantized is None:
+            output = FusedEnsemble([list(range(len(self.v)))], [self.outputLayer])
+            self.quantized = (QuantizedEnsemble(fused, self.inference_mode),
+                              QuantizedEnsemble(output, self.inference_mode))
+        return self.quantized
+
+    # Inference mode of execute and execute_batch (the training is always float64):
+    # 'float64' (default), 'float32', or 'int16'/'int8' fixed-point (see QuantizedEnsemble).
+    # The model is quantized when first executed in the mode.
+    def set_inference_mode(self, mode):
+        if mode not in INFERENCE_MODES:
+            raise ValueError(f'Unsupported inference mode: {mode}')
+        self.inference_mode = mode
+        self.quantized = None
+
+    # Opt-in multi-threaded ensemble layer, for the batches of at least MIN_BATCH instances
+    # (train_batch, execute_batch): the autoencoders are evaluated concurrently by n_workers
+    # threads (see EnsembleWorkers). n_workers <= 1: single-threaded.
+    def set_workers(self, n_workers):
+        if self.workers is not None:
+            self.workers.close()
+        self.workers = EnsembleWorkers(n_workers) if n_workers > 1 else None
+        self.fused = None
+
     def __createAD__(self):
         # construct ensemble layer
         for ad_map in self.v:
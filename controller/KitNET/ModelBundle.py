@@ -0,0 +1,189 @@
+import os
+import json
+import zipfile
+import numpy as np
+import pandas as pd
+from .dA import DA, DAParams
+from .FusedEnsemble import FusedEnsemble
+from .Quantized import QuantizedEnsemble
+
+#
+# Single file KitNET model bundle: the feature map and the trained autoencoders, as flat arrays,
+# and a json header (format version, KitNET parameters, autoencoder sizes).
+#
+# The bundle is an uncompressed npz file, so it can also be read with np.load, but it is loaded
+# by memory mapping each array in place (copy-on-write): loading reads almost nothing from disk
+# and the pages are shared read-only by all the processes loading the same bundle.
+#
+# The spatial export (csv files of each layer, see export_spatial) is derived from the model,
+# on demand.
+#
+
+MODEL_FORMAT = 'kitnet-model'
+MODEL_VERSION = 1
+
+# DA parameters (other than the layer sizes) stored in the header, in the order of DAParams.
+DA_PARAMS = ['lr', 'corruption_level', 'gracePeriod', 'hiddenRatio']
+
+
+def save_model(path, v, ensemble_layer, output_layer, params=None):
+    header = {
+        'format': MODEL_FORMAT,
+        'version': MODEL_VERSION,
+        'params': {} if params is None else params,
+        'el_params': {name: getattr(ensemble_layer[0].params, name) for name in DA_PARAMS},
+        'ol_params': {name: getattr(output_layer.params, name) for name in DA_PARAMS},
+        'ol_n': output_layer.n}
+
+    arrays = {
+        'header': np.frombuffer(json.dumps(header).encode(), dtype=np.uint8),
+        # feature map: concatenated feature indices, and autoencoder sizes
+        'map': np.concatenate([np.asarray(ad_map, dtype=np.int64) for ad_map in v]),
+        'el_n_visible': np.array([da.params.n_visible for da in ensemble_layer], dtype=np.int64),
+        'el_n_hidden': np.array([da.params.n_hidden for da in ensemble_layer], dtype=np.int64),
+        'el_n': np.array([da.n for da in ensemble_layer], dtype=np.int64),
+        # ensemble layer: concatenated parameters of the autoencoders (W flattened)
+        'el_W': np.concatenate([da.W.ravel() for da in ensemble_layer]),
+        'el_hbias': np.concatenate([da.hbias for da in ensemble_layer]),
+        'el_vbias': np.concatenate([da.vbias for da in ensemble_layer]),
+        'el_norm_min': np.concatenate([da.norm_min for da in ensemble_layer]),
+        'el_norm_max': np.concatenate([da.norm_max for da in ensemble_layer]),
+        'ol_W': output_layer.W,
+        'ol_hbias': output_layer.hbias,
+        'ol_vbias': output_layer.vbias,
+        'ol_norm_min': output_layer.norm_min,
+        'ol_norm_max': output_layer.norm_max}
+
+    # Write to a temporary file first, so an interrupted save is never loaded.
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        np.savez(f, **arrays)
+    os.replace(tmp_path, path)
+
+
+# Memory maps (copy-on-write) the arrays of an uncompressed npz file.
+def mmap_npz(path):
+    arrays = {}
+    with zipfile.ZipFile(path) as npz, open(path, 'rb') as f:
+        for info in npz.infolist():
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(f'Compressed model bundle: {path}')
+            # local file header: 30 bytes, then the file name and the extra field
+            f.seek(info.header_offset + 26)
+            name_len, extra_len = np.frombuffer(f.read(4), dtype='<u2')
+            f.seek(info.header_offset + 30 + int(name_len) + int(extra_len))
+            if np.lib.format.read_magic(f) == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+            name = info.filename[:-len('.npy')]
+            if np.prod(shape) == 0:
+                arrays[name] = np.zeros(shape, dtype=dtype)
+            else:
+                arrays[name] = np.memmap(f, dtype=dtype, mode='c', offset=f.tell(), shape=shape,
+                                         order='F' if fortran_order else 'C')
+    return arrays
+
+
+# Returns a dict with the header ('header'), the feature map ('v') and the ensemble and output
+# layers ('ensemble_layer', 'output_layer'), whose parameters are views of the mapped arrays.
+def load_model(path):
+    arrays = mmap_npz(path)
+    header = json.loads(bytes(arrays['header']).decode())
+    if header.get('format') != MODEL_FORMAT or header.get('version') != MODEL_VERSION:
+        raise ValueError(f'Unsupported model bundle: {path}')
+
+    n_visible = arrays['el_n_visible']
+    n_hidden = arrays['el_n_hidden']
+    v_start = np.concatenate(([0], np.cumsum(n_visible)))
+    h_start = np.concatenate(([0], np.cumsum(n_hidden)))
+    W_start = np.concatenate(([0], np.cumsum(n_visible * n_hidden)))
+
+    v = []
+    ensemble_layer = []
+    for a in range(len(n_visible)):
+        vs = slice(v_start[a], v_start[a + 1])
+        hs = slice(h_start[a], h_start[a + 1])
+        v.append(arrays['map'][vs].tolist())
+        params = DAParams(int(n_visible[a]), int(n_hidden[a]),
+                          *[header['el_params'][name] for name in DA_PARAMS])
+        ensemble_layer.append(DA.wrap(
+            params, arrays['el_W'][W_start[a]:W_start[a + 1]].reshape(n_visible[a], n_hidden[a]),
+            arrays['el_hbias'][hs], arrays['el_vbias'][vs], arrays['el_norm_min'][vs],
+            arrays['el_norm_max'][vs], int(arrays['el_n'][a])))
+
+    params = DAParams(arrays['ol_W'].shape[0], arrays['ol_W'].shape[1],
+                      *[header['ol_params'][name] for name in DA_PARAMS])
+    output_layer = DA.wrap(params, arrays['ol_W'], arrays['ol_hbias'], arrays['ol_vbias'],
+                           arrays['ol_norm_min'], arrays['ol_norm_max'], header['ol_n'])
+
+    return {'header': header, 'v': v, 'ensemble_layer': ensemble_layer,
+            'output_layer': output_layer}
+
+
+# Spatial export of a model: one csv file per layer parameter (params), norm (norms) and feature
+# map (maps) in outdir. For an inference mode other than float64, the quantized model is also
+# exported (params, norms in outdir/<mode>): fixed-point modes export integers, plus their scales
+# (real value = integer * scale), the norms' shifts (integer norm = norm / 2^shift) and the
+# sigmoid lookup table.
+def export_spatial(outdir, v, ensemble_layer, output_layer, inference_mode='float64'):
+    outdir_params = f'{outdir}/params'
+    outdir_norms = f'{outdir}/norms'
+    outdir_maps = f'{outdir}/maps'
+    for path in [outdir_params, outdir_norms, outdir_maps]:
+        if not os.path.exists(path):
+            os.makedirs(path)
+
+    layers = [(f'L{i}', ensemble_layer[i]) for i in range(len(ensemble_layer))] \
+        + [('OUTL', output_layer)]
+    for name, da in layers:
+        save_layer(outdir_params, outdir_norms, name, {
+            'W': da.W, 'hbias': da.hbias, 'vbias': da.vbias,
+            'norm_min': da.norm_min, 'norm_max': da.norm_max})
+
+    for i in range(len(v)):
+        pd.DataFrame(v[i]).T.to_csv(
+            f'{outdir_maps}/L{i}_MAP.csv', header=False, index=False)
+        pd.DataFrame([len(v[i]), int(np.ceil(len(v[i])*0.75))]).T.to_csv(
+            f'{outdir_maps}/L{i}_NEURONS.csv', header=False, index=False)
+
+    pd.DataFrame([len(v)]).T.to_csv(
+        f'{outdir_maps}/N_LAYERS.csv', header=False, index=False)
+
+    if inference_mode == 'float64':
+        return
+
+    outdir_params = f'{outdir}/{inference_mode}/params'
+    outdir_norms = f'{outdir}/{inference_mode}/norms'
+    for path in [outdir_params, outdir_norms]:
+        if not os.path.exists(path):
+            os.makedirs(path)
+
+    ensemble_q = QuantizedEnsemble(FusedEnsemble(v, ensemble_layer), inference_mode)
+    output_q = QuantizedEnsemble(
+        FusedEnsemble([list(range(len(v)))], [output_layer]), inference_mode)
+    layers = [(f'L{i}', ensemble_q, i) for i in range(len(v))] + [('OUTL', output_q, 0)]
+    for name, layer_q, i in layers:
+        save_layer(outdir_params, outdir_norms, name, layer_q.params(i))
+
+    if inference_mode != 'float32':
+        pd.DataFrame([ensemble_q.scales(), output_q.scales()], index=['L', 'OUTL']).to_csv(
+            f'{outdir_params}/SCALES.csv')
+        pd.DataFrame(ensemble_q.lut).to_csv(
+            f'{outdir_params}/SIGMOID_LUT.csv', header=False, index=False)
+
+
+def save_layer(outdir_params, outdir_norms, name, params):
+    pd.DataFrame(params['W']).to_csv(
+        f'{outdir_params}/{name}_W.csv', header=False, index=False)
+    pd.DataFrame(params['hbias']).to_csv(
+        f'{outdir_params}/{name}_B1.csv', header=False, index=False)
+    pd.DataFrame(params['vbias']).to_csv(
+        f'{outdir_params}/{name}_B2.csv', header=False, index=False)
+    pd.DataFrame(params['norm_min']).to_csv(
+        f'{outdir_norms}/{name}_NORM_MIN.csv', header=False, index=False)
+    pd.DataFrame(params['norm_max']).to_csv(
+        f'{outdir_norms}/{name}_NORM_MAX.csv', header=False, index=False)
+    if 'norm_shift' in params:
+        pd.DataFrame(params['norm_shift']).to_csv(
+            f'{outdir_norms}/{name}_NORM_SHIFT.csv', header=False, index=False)
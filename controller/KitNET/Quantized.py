@@ -0,0 +1,141 @@
+import numpy as np
+from scipy.special import expit
+
+# KitNET inference modes: float64 (the trained model as-is), float32, and int16/int8 fixed-point.
+# The modes other than float64 mirror the arithmetic of a reduced precision (e.g., switch) model, to
+# measure how its scores deviate from float64 (see bench_inference_modes.py). They are not faster:
+# the fixed-point modes add rounding, clipping and lookup table steps to the same (BLAS, float)
+# products, and are slower than float64 packet by packet; float32 keeps the exact sigmoid.
+INFERENCE_MODES = ['float64', 'float32', 'int16', 'int8']
+
+# Fixed-point modes: integer type and largest value of the quantized weights, norms and activations,
+# and number of entries (log2) of the sigmoid lookup table.
+FIXED_POINT = {'int16': (np.int16, 32767, 14), 'int8': (np.int8, 127, 10)}
+
+# The normalized inputs of the autoencoders are represented in [-ACT_RANGE, ACT_RANGE] (inputs outside
+# [0, 1] are the ones outside the values seen during training).
+ACT_RANGE = 2.0
+
+# The sigmoid lookup table covers the inputs in [-LUT_RANGE, LUT_RANGE].
+LUT_RANGE = 8.0
+
+
+# Symmetric linear quantization of a to integers in [-qmax, qmax]: returns the integers and the scale.
+def quantize(a, qmax):
+    scale = np.abs(a).max() / qmax if a.size and np.abs(a).max() > 0 else 1.0
+    return np.round(a / scale), scale
+
+
+# A quantized copy of a compiled ensemble layer (FusedEnsemble), for the float32, int16 and int8
+# inference modes. The output layer is quantized in the same way, as a single autoencoder ensemble.
+#
+# float32: all parameters and activations are float32 (the sigmoid is still expit, not a lookup
+# table: this mode only models the float32 precision).
+# int16/int8 (fixed-point): the weights (one scale) and the activations (fixed scales) are integers,
+# the biases are integers in the scale of the accumulators, and the sigmoid is a lookup table with
+# integer outputs. The norms are quantized per feature, with a power-of-two scale (a shift).
+# The integer matrix products are computed with floats that hold them exactly (float32 for int8,
+# float64 for int16), to make use of BLAS.
+class QuantizedEnsemble:
+    def __init__(self, fused, mode):
+        if mode not in INFERENCE_MODES[1:]:
+            raise ValueError(f'Unsupported inference mode: {mode}')
+        self.mode = mode
+        self.index = fused.index
+        self.v_start = fused.v_start
+        self.n_visible = fused.n_visible
+        self.h_start = fused.h_start
+        self.n_hidden = fused.n_hidden
+        self.in_grace = fused.in_grace
+
+        if mode == 'float32':
+            self.dtype = np.float32
+            self.norm_min = fused.norm_min.astype(np.float32)
+            self.norm_scale = fused.norm_scale.astype(np.float32)
+            self.W = fused.W.astype(np.float32)
+            self.hbias = fused.hbias.astype(np.float32)
+            self.vbias = fused.vbias.astype(np.float32)
+            return
+
+        int_type, qmax, lut_bits = FIXED_POINT[mode]
+        self.int_type = int_type
+        self.qmax = qmax
+        self.dtype = np.float32 if mode == 'int8' else np.float64
+
+        # norms: per feature (signed) shift, so that the largest norm fills the integer type
+        norm_max = fused.norm_min + fused.norm_scale
+        norm_abs = np.maximum(np.abs(fused.norm_min), np.abs(norm_max))
+        self.norm_shift = np.zeros(len(norm_abs))
+        self.norm_shift[norm_abs > 0] = np.ceil(np.log2(norm_abs[norm_abs > 0] / qmax))
+        self.norm_min_q = np.round(fused.norm_min / 2 ** self.norm_shift).astype(int_type)
+        self.norm_max_q = np.round(norm_max / 2 ** self.norm_shift).astype(int_type)
+
+        # activation scales: normalized inputs, sigmoid outputs
+        self.s_x = ACT_RANGE / qmax
+        self.s_y = 1 / qmax
+
+        W_q, self.s_W = quantize(fused.W, qmax)
+        self.W_q = W_q.astype(int_type)
+        self.hbias_q = np.round(fused.hbias / (self.s_x * self.s_W)).astype(np.int64)
+        self.vbias_q = np.round(fused.vbias / (self.s_y * self.s_W)).astype(np.int64)
+
+        # sigmoid lookup table, with integer outputs (in the scale of s_y)
+        lut_size = 2 ** lut_bits
+        self.lut = np.round(expit(np.linspace(-LUT_RANGE, LUT_RANGE, lut_size)) * qmax) \
+            .astype(int_type)
+        self.lut_step = (lut_size - 1) / (2 * LUT_RANGE)
+
+        # integer weights and biases, as the floats used for the matrix products
+        self.W_f = self.W_q.astype(self.dtype)
+        self.hbias_f = self.hbias_q.astype(self.dtype)
+        self.vbias_f = self.vbias_q.astype(self.dtype)
+
+    # sigmoid of the accumulators acc (with scale s_acc), through the lookup table
+    def sigmoid_lut(self, acc, s_acc):
+        index = np.rint(acc * (s_acc * self.lut_step) + (len(self.lut) - 1) / 2)
+        return self.lut[np.clip(index, 0, len(self.lut) - 1).astype(np.intp)]
+
+    # returns the RMSE of each autoencoder for each row of X (a (B, n) array), as a (B, n_ae) array
+    def execute_batch(self, X):
+        if self.mode == 'float32':
+            X = (X[:, self.index].astype(np.float32) - self.norm_min) / self.norm_scale
+            Y = expit(np.dot(X, self.W) + self.hbias)
+            Z = expit(np.dot(Y, self.W.T) + self.vbias)
+            S = np.sqrt(np.add.reduceat((X - Z) ** 2, self.v_start, axis=1) / self.n_visible)
+            S[:, self.in_grace] = 0.0
+            return S.astype(np.float64)
+
+        # 0-1 normalize the (shifted) integer inputs
+        X = np.round(X[:, self.index] / 2 ** self.norm_shift)
+        X = (X - self.norm_min_q) / (self.norm_max_q - self.norm_min_q + 0.0000000000000001)
+        # the network inputs saturate, the reconstruction error is computed with the (wider) inputs
+        X_e = np.round(X / self.s_x)
+        X_q = np.clip(X_e, -self.qmax, self.qmax).astype(self.dtype)
+
+        # encode and decode, with integer accumulators
+        Y_q = self.sigmoid_lut(np.dot(X_q, self.W_f) + self.hbias_f, self.s_x * self.s_W)
+        Z_q = self.sigmoid_lut(np.dot(Y_q.astype(self.dtype), self.W_f.T) + self.vbias_f,
+                               self.s_y * self.s_W)
+
+        E = X_e * self.s_x - Z_q * self.s_y
+        S = np.sqrt(np.add.reduceat(E ** 2, self.v_start, axis=1) / self.n_visible)
+        S[:, self.in_grace] = 0.0
+        return S.astype(np.float64)
+
+    # quantized parameters of autoencoder a (integers, for the fixed-point modes), as in the DA
+    def params(self, a):
+        v = slice(self.v_start[a], self.v_start[a] + self.n_visible[a])
+        h = slice(self.h_start[a], self.h_start[a] + self.n_hidden[a])
+        if self.mode == 'float32':
+            return {'W': self.W[v, h], 'hbias': self.hbias[h], 'vbias': self.vbias[v],
+                    'norm_min': self.norm_min[v], 'norm_max': self.norm_min[v] + self.norm_scale[v]}
+        return {'W': self.W_q[v, h], 'hbias': self.hbias_q[h], 'vbias': self.vbias_q[v],
+                'norm_min': self.norm_min_q[v], 'norm_max': self.norm_max_q[v],
+                'norm_shift': self.norm_shift[v].astype(np.int32)}
+
+    # scales of the fixed-point values (real value = integer * scale)
+    def scales(self):
+        if self.mode == 'float32':
+            return {}
+        return {'W': self.s_W, 'x': self.s_x, 'y': self.s_y,
+                'hbias': self.s_x * self.s_W, 'vbias': self.s_y * self.s_W}
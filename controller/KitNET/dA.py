@@ -46,8 +46,8 @@ class DA:
             self.params.n_hidden = int(numpy.ceil(self.params.n_visible * self.params.hiddenRatio))
 
         # for 0-1 normalization
-        self.norm_max = numpy.ones((self.params.n_visible,)) * -numpy.Inf
-        self.norm_min = numpy.ones((self.params.n_visible,)) * numpy.Inf
+        self.norm_max = numpy.ones((self.params.n_visible,)) * -numpy.inf
+        self.norm_min = numpy.ones((self.params.n_visible,)) * numpy.inf
         self.n = 0
 
         self.rng = numpy.random.RandomState(1234)
@@ -62,6 +62,21 @@ class DA:
         self.vbias = numpy.zeros(self.params.n_visible)  # initialize v bias 0
         self.W_prime = self.W.T
 
+    # DA with the given (trained) parameters, e.g., loaded from a model bundle (see ModelBundle).
+    @staticmethod
+    def wrap(params, W, hbias, vbias, norm_min, norm_max, n):
+        da = DA.__new__(DA)
+        da.params = params
+        da.norm_max = norm_max
+        da.norm_min = norm_min
+        da.n = n
+        da.rng = numpy.random.RandomState(1234)
+        da.W = W
+        da.hbias = hbias
+        da.vbias = vbias
+        da.W_prime = da.W.T
+        return da
+
     def get_corrupted_input(self, input, corruption_level):
         assert corruption_level < 1
 
@@ -105,6 +120,37 @@ class DA:
         self.vbias += self.params.lr * L_vbias
         return numpy.sqrt(numpy.mean(L_h2 ** 2))  # the RMSE reconstruction error during training
 
+    # mini-batch training on X (a (B, n_visible) array): a single gradient step, averaged over the batch.
+    # The norms are updated with the whole batch before normalizing it (so B=1 is the same as train).
+    # returns the RMSE reconstruction error of each row during training
+    def train_batch(self, X):
+        self.n = self.n + X.shape[0]
+        # update norms
+        self.norm_max = numpy.maximum(self.norm_max, X.max(axis=0))
+        self.norm_min = numpy.minimum(self.norm_min, X.min(axis=0))
+
+        # 0-1 normalize
+        X = (X - self.norm_min) / (self.norm_max - self.norm_min + 0.0000000000000001)
+
+        if self.params.corruption_level > 0.0:
+            tilde_X = self.get_corrupted_input(X, self.params.corruption_level)
+        else:
+            tilde_X = X
+        Y = self.get_hidden_values(tilde_X)
+        Z = self.get_reconstructed_input(Y)
+
+        L_h2 = X - Z
+        L_h1 = numpy.dot(L_h2, self.W) * Y * (1 - Y)
+
+        L_vbias = L_h2.mean(axis=0)
+        L_hbias = L_h1.mean(axis=0)
+        L_W = (numpy.dot(tilde_X.T, L_h1) + numpy.dot(L_h2.T, Y)) / X.shape[0]
+
+        self.W += self.params.lr * L_W
+        self.hbias += self.params.lr * L_hbias
+        self.vbias += self.params.lr * L_vbias
+        return numpy.sqrt(numpy.mean(L_h2 ** 2, axis=1))
+
     def reconstruct(self, x):
         y = self.get_hidden_values(x)
         z = self.get_reconstructed_input(y)
@@ -120,5 +166,15 @@ class DA:
             rmse = numpy.sqrt(((x - z) ** 2).mean())  # MSE
             return rmse
 
+    # returns the RMSE of the reconstruction of each row of X (a (B, n_visible) array)
+    def execute_batch(self, X):
+        if self.n < self.params.gracePeriod:
+            return numpy.zeros(X.shape[0])
+        else:
+            # 0-1 normalize
+            X = (X - self.norm_min) / (self.norm_max - self.norm_min + 0.0000000000000001)
+            Z = self.reconstruct(X)
+            return numpy.sqrt(((X - Z) ** 2).mean(axis=1))
+
     def in_grace(self):
         return self.n < self.params.gracePeriod
@@ -1,8 +1,9 @@
 import os
 from KitNET.KitNET import KitNET
+from KitNET.ModelBundle import export_spatial
 import numpy as np
 import pandas as pd
-import pickle
+from train_stats import save_train_stats, load_train_stats
 from pathlib import Path
 
 
@@ -10,13 +11,13 @@ class Peregrine:
     def __init__(self, max_autoencoder_size=10, fm_grace_period=None, ad_grace_period=10000,
                  learning_rate=0.1, hidden_ratio=0.75, lambdas=4,
                  feature_map=None, ensemble_layer=None, output_layer=None, train_stats=None,
-                 attack='', train_skip=False, train_exact_ratio=0):
+                 attack='', train_skip=False, train_exact_ratio=0, model=None):
 
         # Initialize KitNET.
         self.AnomDetector = KitNET(80, max_autoencoder_size, fm_grace_period,
                                    ad_grace_period, learning_rate, hidden_ratio,
                                    feature_map, ensemble_layer, output_layer,
-                                   attack, train_exact_ratio)
+                                   attack, train_exact_ratio, model)
 
         self.decay_to_pos = {0: 0, 1: 0, 2: 1, 3: 2, 4: 3,
                              8192: 1, 16384: 2, 24576: 3}
@@ -33,12 +34,11 @@ class Peregrine:
 
         # If train_skip is true, import the previously generated models.
         if train_skip:
-            with open(train_stats, 'rb') as f_stats:
-                stats = pickle.load(f_stats)
-                self.stats_mac_ip_src = stats[0]
-                self.stats_ip_src = stats[1]
-                self.stats_ip = stats[2]
-                self.stats_five_t = stats[3]
+            cp_stats = load_train_stats(train_stats)['cp_stats']
+            self.stats_mac_ip_src = cp_stats['stats_mac_ip_src']
+            self.stats_ip_src = cp_stats['stats_ip_src']
+            self.stats_ip = cp_stats['stats_ip']
+            self.stats_five_t = cp_stats['stats_five_t']
         else:
             self.stats_mac_ip_src = {}
             self.stats_ip_src = {}
@@ -46,6 +46,23 @@ class Peregrine:
             self.stats_five_t = {}
 
     def proc_next_packet(self, cur_stats):
+        processed_stats = self.update_stats(cur_stats)
+
+        # Run KitNET with the current statistics.
+        return self.AnomDetector.process(processed_stats)
+
+    # Micro-batching mode: during execution, all the packets' statistics are scored
+    # with a single KitNET call. Returns the RMSE scores, in order.
+    def proc_next_packets(self, cur_stats_list):
+        processed_stats = [self.update_stats(cur_stats) for cur_stats in cur_stats_list]
+
+        if not self.AnomDetector.is_executing():
+            return [self.AnomDetector.process(x) for x in processed_stats]
+
+        return self.AnomDetector.execute_batch(np.stack(processed_stats)).tolist()
+
+    # Update the control plane stats with the current packet and return its feature vector.
+    def update_stats(self, cur_stats):
 
         cur_decay_pos = self.decay_to_pos[cur_stats[6]]
 
@@ -87,25 +104,21 @@ class Peregrine:
         else:
             self.df_exec_stats_list.append(processed_stats)
 
-
-        # Run KitNET with the current statistics.
-        return self.AnomDetector.process(processed_stats)
+        return processed_stats
 
 
     def save_train_stats(self):
-        train_stats = [self.stats_mac_ip_src,
-                       self.stats_ip_src,
-                       self.stats_ip,
-                       self.stats_five_t]
+        cp_stats = {'stats_mac_ip_src': self.stats_mac_ip_src,
+                    'stats_ip_src': self.stats_ip_src,
+                    'stats_ip': self.stats_ip,
+                    'stats_five_t': self.stats_five_t}
 
         outdir = str(Path(__file__).parents[0]) + '/KitNET/models'
         if not os.path.exists(str(Path(__file__).parents[0]) + '/KitNET/models'):
             os.mkdir(outdir)
 
-        with open(outdir + '/' + self.attack + '-m-' + str(self.m)
-                  + '-r-' + str(self.train_exact_ratio) + '-train-stats'
-                  + '.txt', 'wb') as f_stats:
-            pickle.dump(train_stats, f_stats)
+        save_train_stats(outdir + '/' + self.attack + '-m-' + str(self.m)
+                         + '-r-' + str(self.train_exact_ratio) + '-train-stats', cp_stats)
 
         for i in range(0, len(self.df_train_stats_list), 50000):
             self.df_train_stats_list[i:i + 50000]
@@ -115,64 +128,11 @@ class Peregrine:
                 f'{self.train_exact_ratio}-train-full-{int(i/50000)}.pkl'
             )
 
-        outdir_params = f'{Path(__file__).parents[0]}/KitNET/models/spatial/{self.attack}'\
-                        f'-m-{self.m}-r-{self.train_exact_ratio}/params'
-        if not os.path.exists(outdir_params):
-            os.makedirs(outdir_params)
-        outdir_norms = f'{Path(__file__).parents[0]}/KitNET/models/spatial/{self.attack}'\
-                       f'-m-{self.m}-r-{self.train_exact_ratio}/norms'
-        if not os.path.exists(outdir_norms):
-            os.makedirs(outdir_norms)
-        outdir_maps = f'{Path(__file__).parents[0]}/KitNET/models/spatial/{self.attack}'\
-                      f'-m-{self.m}-r-{self.train_exact_ratio}/maps'
-        if not os.path.exists(outdir_maps):
-            os.makedirs(outdir_maps)
-
-        for i in range(len(self.AnomDetector.ensembleLayer)):
-            pd.DataFrame(self.AnomDetector.ensembleLayer[i].W).to_csv(
-                f'{outdir_params}/L{i}_W.csv', header=False, index=False
-            )
-            pd.DataFrame(self.AnomDetector.ensembleLayer[i].hbias).to_csv(
-                f'{outdir_params}/L{i}_B1.csv', header=False, index=False
-            )
-            pd.DataFrame(self.AnomDetector.ensembleLayer[i].vbias).to_csv(
-                f'{outdir_params}/L{i}_B2.csv', header=False, index=False
-            )
-            pd.DataFrame(self.AnomDetector.ensembleLayer[i].norm_min).to_csv(
-                f'{outdir_norms}/L{i}_NORM_MIN.csv', header=False, index=False
-            )
-            pd.DataFrame(self.AnomDetector.ensembleLayer[i].norm_max).to_csv(
-                f'{outdir_norms}/L{i}_NORM_MAX.csv', header=False, index=False
-            )
-
-        pd.DataFrame(self.AnomDetector.outputLayer.W).to_csv(
-            f'{outdir_params}/OUTL_W.csv', header=False, index=False
-        )
-        pd.DataFrame(self.AnomDetector.outputLayer.hbias).to_csv(
-            f'{outdir_params}/OUTL_B1.csv', header=False, index=False
-        )
-        pd.DataFrame(self.AnomDetector.outputLayer.vbias).to_csv(
-            f'{outdir_params}/OUTL_B2.csv', header=False, index=False
-        )
-        pd.DataFrame(self.AnomDetector.outputLayer.norm_min).to_csv(
-            f'{outdir_norms}/OUTL_NORM_MIN.csv', header=False, index=False
-        )
-        pd.DataFrame(self.AnomDetector.outputLayer.norm_max).to_csv(
-            f'{outdir_norms}/OUTL_NORM_MAX.csv', header=False, index=False
-        )
-
-        for i in range(len(self.AnomDetector.v)):
-            pd.DataFrame(self.AnomDetector.v[i]).T.to_csv(
-                f'{outdir_maps}/L{i}_MAP.csv', header=False, index=False
-            )
-            pd.DataFrame([len(self.AnomDetector.v[i]),
-                          int(np.ceil(len(self.AnomDetector.v[i])*0.75))]).T.to_csv(
-                f'{outdir_maps}/L{i}_NEURONS.csv', header=False, index=False
-            )
-
-        pd.DataFrame([len(self.AnomDetector.v)]).T.to_csv(
-            f'{outdir_maps}/N_LAYERS.csv', header=False, index=False
-        )
+        # The spatial model is derived from the trained model.
+        export_spatial(
+            f'{Path(__file__).parents[0]}/KitNET/models/spatial/{self.attack}'
+            f'-m-{self.m}-r-{self.train_exact_ratio}',
+            self.AnomDetector.v, self.AnomDetector.ensembleLayer, self.AnomDetector.outputLayer)
 
     def save_exec_stats(self):
         outdir = str(Path(__file__).parents[0]) + '/KitNET/models'
@@ -0,0 +1,162 @@
+import mmap
+import queue
+import select
+import socket
+import struct
+import threading
+
+#
+# Persistent capture of the packets sent by the data plane to the control plane (cur_eg_veth).
+#
+# A single AF_PACKET socket is opened for the whole execution phase, with a TPACKET_V3 ring
+# (the kernel fills blocks of frames in a memory mapped ring, no syscall per packet), or plain
+# recv calls if the ring cannot be set up. A thread reads the frames and feeds a bounded queue of
+# raw frames, which the pipeline consumes in batches (get_batch). If the pipeline falls behind,
+# the frames are dropped and counted, instead of blocking the capture: dropped counts the frames
+# dropped because the queue was full, kernel_dropped the ones dropped by the kernel (ring full).
+#
+
+ETH_P_ALL = 0x0003
+
+# Linux AF_PACKET socket options (linux/if_packet.h).
+SOL_PACKET = 263
+PACKET_RX_RING = 5
+PACKET_STATISTICS = 6
+PACKET_VERSION = 10
+TPACKET_V3 = 2
+TP_STATUS_KERNEL = 0
+TP_STATUS_USER = 1
+
+# Raw frames waiting to be processed by the pipeline.
+CAPTURE_QUEUE = 1 << 16
+
+# TPACKET_V3 ring: RING_BLOCKS blocks of RING_BLOCK_SIZE bytes, each one handed to the thread when
+# full or after RING_BLOCK_TIMEOUT ms.
+RING_BLOCK_SIZE = 1 << 20
+RING_BLOCKS = 64
+RING_FRAME_SIZE = 1 << 11
+RING_BLOCK_TIMEOUT = 10
+
+# Maximum frame size read without the ring.
+RECV_SIZE = 1 << 16
+
+# How often (ms) the capture thread checks if it was stopped.
+POLL_TIMEOUT = 100
+
+
+class PacketCapture:
+    def __init__(self, iface, queue_size=CAPTURE_QUEUE, ring=True):
+        self.iface = iface
+        self.queue = queue.Queue(queue_size)
+        self.received = 0
+        self.dropped = 0
+        self.kernel_dropped = 0
+
+        self.sock = socket.socket(socket.AF_PACKET, socket.SOCK_RAW, socket.htons(ETH_P_ALL))
+        self.ring = None
+        if ring:
+            try:
+                self.__setup_ring__()
+            except OSError as e:
+                print(f'Capture: TPACKET_V3 ring unavailable ({e}), using recv')
+                self.sock.close()
+                self.sock = socket.socket(socket.AF_PACKET, socket.SOCK_RAW,
+                                          socket.htons(ETH_P_ALL))
+        self.sock.bind((iface, 0))
+
+        self.running = True
+        self.thread = threading.Thread(
+            target=self.__read_ring__ if self.ring is not None else self.__read_socket__,
+            daemon=True)
+        self.thread.start()
+
+    def __setup_ring__(self):
+        self.sock.setsockopt(SOL_PACKET, PACKET_VERSION, TPACKET_V3)
+        # struct tpacket_req3: block size, block nr, frame size, frame nr, retire block timeout,
+        # sizeof priv, feature req word.
+        self.sock.setsockopt(SOL_PACKET, PACKET_RX_RING, struct.pack(
+            '7I', RING_BLOCK_SIZE, RING_BLOCKS, RING_FRAME_SIZE,
+            RING_BLOCK_SIZE // RING_FRAME_SIZE * RING_BLOCKS, RING_BLOCK_TIMEOUT, 0, 0))
+        self.ring = mmap.mmap(self.sock.fileno(), RING_BLOCK_SIZE * RING_BLOCKS,
+                              mmap.MAP_SHARED, mmap.PROT_READ | mmap.PROT_WRITE)
+
+    def __put__(self, frame):
+        self.received += 1
+        try:
+            self.queue.put_nowait(frame)
+        except queue.Full:
+            self.dropped += 1
+
+    def __read_ring__(self):
+        poller = select.poll()
+        poller.register(self.sock, select.POLLIN | select.POLLERR)
+        ring = self.ring
+        block = 0
+        while self.running:
+            # struct tpacket_block_desc: version, offset to priv, then struct tpacket_hdr_v1:
+            # block status, num pkts, offset to first pkt, ...
+            offset = block * RING_BLOCK_SIZE
+            status, num_pkts, pkt = struct.unpack_from('3I', ring, offset + 8)
+            if not status & TP_STATUS_USER:
+                poller.poll(POLL_TIMEOUT)
+                continue
+            pkt += offset
+            for _ in range(num_pkts):
+                # struct tpacket3_hdr: next offset, sec, nsec, snaplen, len, status, mac, ...
+                next_offset, snaplen, mac = struct.unpack_from('I8xI8xH', ring, pkt)
+                self.__put__(ring[pkt + mac:pkt + mac + snaplen])
+                pkt += next_offset
+            struct.pack_into('I', ring, offset + 8, TP_STATUS_KERNEL)
+            block = (block + 1) % RING_BLOCKS
+
+    def __read_socket__(self):
+        self.sock.settimeout(POLL_TIMEOUT / 1000)
+        while self.running:
+            try:
+                self.__put__(self.sock.recv(RECV_SIZE))
+            except socket.timeout:
+                continue
+            except OSError:
+                if self.running:
+                    raise
+                return
+
+    # Up to max_frames frames: waits up to timeout seconds for the first one, then returns the
+    # frames already queued. Empty if none arrived in time.
+    def get_batch(self, max_frames, timeout=None):
+        try:
+            frames = [self.queue.get(timeout=timeout)]
+        except queue.Empty:
+            return []
+        while len(frames) < max_frames:
+            try:
+                frames.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return frames
+
+    # Counters of the kernel drops (reset on read), accumulated in kernel_dropped.
+    def update_stats(self):
+        if self.sock is None:
+            return
+        # struct tpacket_stats(_v3): packets, drops (, freeze queue count)
+        size = 12 if self.ring is not None else 8
+        _, drops = struct.unpack_from(
+            '2I', self.sock.getsockopt(SOL_PACKET, PACKET_STATISTICS, size))
+        self.kernel_dropped += drops
+
+    def stats(self):
+        self.update_stats()
+        return {'received': self.received, 'dropped': self.dropped,
+                'kernel_dropped': self.kernel_dropped, 'queued': self.queue.qsize()}
+
+    def close(self):
+        if self.sock is None:
+            return
+        self.update_stats()
+        self.running = False
+        self.thread.join()
+        if self.ring is not None:
+            self.ring.close()
+        self.sock.close()
+        self.sock = None
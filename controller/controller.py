@@ -85,7 +85,9 @@ def setup_grpc_client(server, port, program):
     grpc_client.bind_pipeline_config(args.program)
 
 
-def configure_switch(program, topology):
+def configure_switch(program, topology, reconcile=False):
+    start = time.time()
+
     # get all tables for program
     bfrt_info = grpc_client.bfrt_info_get(program)
 
@@ -129,544 +131,114 @@ def configure_switch(program, topology):
 
     # Setup tables
 
-    a_fwd_recirculation = FwdRecirculation_a(gc, bfrt_info)
-    mac_ip_src_decay_check = MacIpSrcDecayCheck(gc, bfrt_info)
-    ip_src_decay_check = IpSrcDecayCheck(gc, bfrt_info)
-    ip_decay_check = IpDecayCheck(gc, bfrt_info)
-    five_t_decay_check = FiveTDecayCheck(gc, bfrt_info)
-
-    a_fwd_recirculation = FwdRecirculation_a(gc, bfrt_info)
-    b_fwd_recirculation = FwdRecirculation_b(gc, bfrt_info)
-
-    mac_ip_src_mean = MacIpSrcMean(gc, bfrt_info)
-    ip_src_mean = IpSrcMean(gc, bfrt_info)
-
-    ip_mean_0 = IpMean0(gc, bfrt_info)
-    ip_res_struct_update = IpResStructUpdate(gc, bfrt_info)
-    ip_res_prod = IpResProd(gc, bfrt_info)
-    ip_sum_res_prod_get_carry = IpSumResProdGetCarry(gc, bfrt_info)
-    ip_pkt_cnt_1_access = IpPktCnt1Access(gc, bfrt_info)
-    ip_ss_1_access = IpSs1Access(gc, bfrt_info)
-    ip_mean_1_access = IpMean1Access(gc, bfrt_info)
-    ip_mean_ss_0 = IpMeanSs0(gc, bfrt_info)
-    ip_mean_ss_1 = IpMeanSs1(gc, bfrt_info)
-    ip_variance_0_abs = IpVariance0Abs(gc, bfrt_info)
-    ip_variance_1_abs = IpVariance1Abs(gc, bfrt_info)
-    ip_cov = IpCov(gc, bfrt_info)
-    ip_std_dev_prod = IpStdDevProd(gc, bfrt_info)
-    ip_pcc = IpPcc(gc, bfrt_info)
-
-    five_t_mean_0 = FiveTMean0(gc, bfrt_info)
-    five_t_res_struct_update = FiveTResStructUpdate(gc, bfrt_info)
-    five_t_res_prod = FiveTResProd(gc, bfrt_info)
-    five_t_sum_res_prod_get_carry = FiveTSumResProdGetCarry(gc, bfrt_info)
-    five_t_pkt_cnt_1_access = FiveTPktCnt1Access(gc, bfrt_info)
-    five_t_ss_1_access = FiveTSs1Access(gc, bfrt_info)
-    five_t_mean_1_access = FiveTMean1Access(gc, bfrt_info)
-    five_t_mean_ss_0 = FiveTMeanSs0(gc, bfrt_info)
-    five_t_mean_ss_1 = FiveTMeanSs1(gc, bfrt_info)
-    five_t_variance_0_abs = FiveTVariance0Abs(gc, bfrt_info)
-    five_t_variance_1_abs = FiveTVariance1Abs(gc, bfrt_info)
-    five_t_cov = FiveTCov(gc, bfrt_info)
-    five_t_std_dev_prod = FiveTStdDevProd(gc, bfrt_info)
-    five_t_pcc = FiveTPcc(gc, bfrt_info)
-
-    mac_ip_src_decay_check.add_entry(0, '100_ms')
-    mac_ip_src_decay_check.add_entry(8192, '1_s')
-    mac_ip_src_decay_check.add_entry(16384, '10_s')
-    mac_ip_src_decay_check.add_entry(24576, '60_s')
-
-    ip_src_decay_check.add_entry(0, '100_ms')
-    ip_src_decay_check.add_entry(8192, '1_s')
-    ip_src_decay_check.add_entry(16384, '10_s')
-    ip_src_decay_check.add_entry(24576, '60_s')
-
-    ip_decay_check.add_entry(0, '100_ms')
-    ip_decay_check.add_entry(8192, '1_s')
-    ip_decay_check.add_entry(16384, '10_s')
-    ip_decay_check.add_entry(24576, '60_s')
-
-    five_t_decay_check.add_entry(0, '100_ms')
-    five_t_decay_check.add_entry(8192, '1_s')
-    five_t_decay_check.add_entry(16384, '10_s')
-    five_t_decay_check.add_entry(24576, '60_s')
+    a_fwd_recirculation = FwdRecirculation_a(gc, bfrt_info, reconcile)
+    mac_ip_src_decay_check = MacIpSrcDecayCheck(gc, bfrt_info, reconcile)
+    ip_src_decay_check = IpSrcDecayCheck(gc, bfrt_info, reconcile)
+    ip_decay_check = IpDecayCheck(gc, bfrt_info, reconcile)
+    five_t_decay_check = FiveTDecayCheck(gc, bfrt_info, reconcile)
+
+    a_fwd_recirculation = FwdRecirculation_a(gc, bfrt_info, reconcile)
+    b_fwd_recirculation = FwdRecirculation_b(gc, bfrt_info, reconcile)
+
+    mac_ip_src_mean = MacIpSrcMean(gc, bfrt_info, reconcile)
+    ip_src_mean = IpSrcMean(gc, bfrt_info, reconcile)
+
+    ip_mean_0 = IpMean0(gc, bfrt_info, reconcile)
+    ip_res_struct_update = IpResStructUpdate(gc, bfrt_info, reconcile)
+    ip_res_prod = IpResProd(gc, bfrt_info, reconcile)
+    ip_sum_res_prod_get_carry = IpSumResProdGetCarry(gc, bfrt_info, reconcile)
+    ip_pkt_cnt_1_access = IpPktCnt1Access(gc, bfrt_info, reconcile)
+    ip_ss_1_access = IpSs1Access(gc, bfrt_info, reconcile)
+    ip_mean_1_access = IpMean1Access(gc, bfrt_info, reconcile)
+    ip_mean_ss_0 = IpMeanSs0(gc, bfrt_info, reconcile)
+    ip_mean_ss_1 = IpMeanSs1(gc, bfrt_info, reconcile)
+    ip_variance_0_abs = IpVariance0Abs(gc, bfrt_info, reconcile)
+    ip_variance_1_abs = IpVariance1Abs(gc, bfrt_info, reconcile)
+    ip_cov = IpCov(gc, bfrt_info, reconcile)
+    ip_std_dev_prod = IpStdDevProd(gc, bfrt_info, reconcile)
+    ip_pcc = IpPcc(gc, bfrt_info, reconcile)
+
+    five_t_mean_0 = FiveTMean0(gc, bfrt_info, reconcile)
+    five_t_res_struct_update = FiveTResStructUpdate(gc, bfrt_info, reconcile)
+    five_t_res_prod = FiveTResProd(gc, bfrt_info, reconcile)
+    five_t_sum_res_prod_get_carry = FiveTSumResProdGetCarry(gc, bfrt_info, reconcile)
+    five_t_pkt_cnt_1_access = FiveTPktCnt1Access(gc, bfrt_info, reconcile)
+    five_t_ss_1_access = FiveTSs1Access(gc, bfrt_info, reconcile)
+    five_t_mean_1_access = FiveTMean1Access(gc, bfrt_info, reconcile)
+    five_t_mean_ss_0 = FiveTMeanSs0(gc, bfrt_info, reconcile)
+    five_t_mean_ss_1 = FiveTMeanSs1(gc, bfrt_info, reconcile)
+    five_t_variance_0_abs = FiveTVariance0Abs(gc, bfrt_info, reconcile)
+    five_t_variance_1_abs = FiveTVariance1Abs(gc, bfrt_info, reconcile)
+    five_t_cov = FiveTCov(gc, bfrt_info, reconcile)
+    five_t_std_dev_prod = FiveTStdDevProd(gc, bfrt_info, reconcile)
+    five_t_pcc = FiveTPcc(gc, bfrt_info, reconcile)
+
+    tables = [mac_ip_src_decay_check, ip_src_decay_check, ip_decay_check, five_t_decay_check,
+              a_fwd_recirculation, b_fwd_recirculation, mac_ip_src_mean, ip_src_mean,
+              ip_mean_0, ip_res_struct_update, ip_res_prod, ip_sum_res_prod_get_carry,
+              ip_pkt_cnt_1_access, ip_ss_1_access, ip_mean_1_access, ip_mean_ss_0, ip_mean_ss_1,
+              ip_variance_0_abs, ip_variance_1_abs, ip_cov, ip_std_dev_prod, ip_pcc,
+              five_t_mean_0, five_t_res_struct_update, five_t_res_prod,
+              five_t_sum_res_prod_get_carry, five_t_pkt_cnt_1_access, five_t_ss_1_access,
+              five_t_mean_1_access, five_t_mean_ss_0, five_t_mean_ss_1, five_t_variance_0_abs,
+              five_t_variance_1_abs, five_t_cov, five_t_std_dev_prod, five_t_pcc]
+    setup_time = time.time() - start
+
+    # Queue the entries of all tables, written in batches once all are added (Table.batch_end).
+    for table in tables:
+        table.batch_begin()
+
+    for table in [mac_ip_src_decay_check, ip_src_decay_check, ip_decay_check, five_t_decay_check]:
+        for entry in decay_check_entries():
+            table.add_entry(*entry)
 
     # a_fwd_recirculation.add_entry(ig_port, False, eg_port)
     a_fwd_recirculation.add_entry(ig_port, True, int_port)
     b_fwd_recirculation.add_entry(int_port, eg_port)
 
-    mac_ip_src_mean.add_entry(32, 1, 0b11111111111111111111111111111111, 0)
-    mac_ip_src_mean.add_entry(31, 2, 0b11111111111111111111111111111110, 1)
-    mac_ip_src_mean.add_entry(30, 4, 0b11111111111111111111111111111100, 2)
-    mac_ip_src_mean.add_entry(29, 8, 0b11111111111111111111111111111000, 3)
-    mac_ip_src_mean.add_entry(28, 16, 0b11111111111111111111111111110000, 4)
-    mac_ip_src_mean.add_entry(27, 32, 0b11111111111111111111111111100000, 5)
-    mac_ip_src_mean.add_entry(26, 64, 0b11111111111111111111111111000000, 6)
-    mac_ip_src_mean.add_entry(25, 128, 0b11111111111111111111111110000000, 7)
-    mac_ip_src_mean.add_entry(24, 256, 0b11111111111111111111111100000000, 8)
-    mac_ip_src_mean.add_entry(23, 512, 0b11111111111111111111111000000000, 9)
-    mac_ip_src_mean.add_entry(22, 1024, 0b11111111111111111111110000000000, 10)
-    mac_ip_src_mean.add_entry(21, 2048, 0b11111111111111111111100000000000, 11)
-    mac_ip_src_mean.add_entry(20, 4096, 0b11111111111111111111000000000000, 12)
-    mac_ip_src_mean.add_entry(19, 8192, 0b11111111111111111110000000000000, 13)
-    mac_ip_src_mean.add_entry(18, 16384, 0b11111111111111111100000000000000, 14)
-    mac_ip_src_mean.add_entry(17, 32768, 0b11111111111111111000000000000000, 15)
-    mac_ip_src_mean.add_entry(16, 65536, 0b11111111111111110000000000000000, 16)
-    mac_ip_src_mean.add_entry(15, 131072, 0b11111111111111100000000000000000, 17)
-    mac_ip_src_mean.add_entry(14, 262144, 0b11111111111111000000000000000000, 18)
-    mac_ip_src_mean.add_entry(13, 524288, 0b11111111111110000000000000000000, 19)
-    mac_ip_src_mean.add_entry(12, 1048576, 0b11111111111100000000000000000000, 20)
-    mac_ip_src_mean.add_entry(11, 2097152, 0b11111111111000000000000000000000, 21)
-    mac_ip_src_mean.add_entry(10, 4194304, 0b11111111110000000000000000000000, 22)
-    mac_ip_src_mean.add_entry(9, 8388608, 0b11111111100000000000000000000000, 23)
-    mac_ip_src_mean.add_entry(8, 16777216, 0b11111111000000000000000000000000, 24)
-    mac_ip_src_mean.add_entry(7, 33554432, 0b11111110000000000000000000000000, 25)
-    mac_ip_src_mean.add_entry(6, 67108864, 0b11111100000000000000000000000000, 26)
-    mac_ip_src_mean.add_entry(5, 134217728, 0b11111000000000000000000000000000, 27)
-    mac_ip_src_mean.add_entry(4, 268435456, 0b11110000000000000000000000000000, 28)
-    mac_ip_src_mean.add_entry(3, 536870912, 0b11100000000000000000000000000000, 29)
-    mac_ip_src_mean.add_entry(2, 1073741824, 0b11000000000000000000000000000000, 30)
-    mac_ip_src_mean.add_entry(1, 2147483648, 0b10000000000000000000000000000000, 31)
-
-    ip_src_mean.add_entry(32, 1, 0b11111111111111111111111111111111, 0)
-    ip_src_mean.add_entry(31, 2, 0b11111111111111111111111111111110, 1)
-    ip_src_mean.add_entry(30, 4, 0b11111111111111111111111111111100, 2)
-    ip_src_mean.add_entry(29, 8, 0b11111111111111111111111111111000, 3)
-    ip_src_mean.add_entry(28, 16, 0b11111111111111111111111111110000, 4)
-    ip_src_mean.add_entry(27, 32, 0b11111111111111111111111111100000, 5)
-    ip_src_mean.add_entry(26, 64, 0b11111111111111111111111111000000, 6)
-    ip_src_mean.add_entry(25, 128, 0b11111111111111111111111110000000, 7)
-    ip_src_mean.add_entry(24, 256, 0b11111111111111111111111100000000, 8)
-    ip_src_mean.add_entry(23, 512, 0b11111111111111111111111000000000, 9)
-    ip_src_mean.add_entry(22, 1024, 0b11111111111111111111110000000000, 10)
-    ip_src_mean.add_entry(21, 2048, 0b11111111111111111111100000000000, 11)
-    ip_src_mean.add_entry(20, 4096, 0b11111111111111111111000000000000, 12)
-    ip_src_mean.add_entry(19, 8192, 0b11111111111111111110000000000000, 13)
-    ip_src_mean.add_entry(18, 16384, 0b11111111111111111100000000000000, 14)
-    ip_src_mean.add_entry(17, 32768, 0b11111111111111111000000000000000, 15)
-    ip_src_mean.add_entry(16, 65536, 0b11111111111111110000000000000000, 16)
-    ip_src_mean.add_entry(15, 131072, 0b11111111111111100000000000000000, 17)
-    ip_src_mean.add_entry(14, 262144, 0b11111111111111000000000000000000, 18)
-    ip_src_mean.add_entry(13, 524288, 0b11111111111110000000000000000000, 19)
-    ip_src_mean.add_entry(12, 1048576, 0b11111111111100000000000000000000, 20)
-    ip_src_mean.add_entry(11, 2097152, 0b11111111111000000000000000000000, 21)
-    ip_src_mean.add_entry(10, 4194304, 0b11111111110000000000000000000000, 22)
-    ip_src_mean.add_entry(9, 8388608, 0b11111111100000000000000000000000, 23)
-    ip_src_mean.add_entry(8, 16777216, 0b11111111000000000000000000000000, 24)
-    ip_src_mean.add_entry(7, 33554432, 0b11111110000000000000000000000000, 25)
-    ip_src_mean.add_entry(6, 67108864, 0b11111100000000000000000000000000, 26)
-    ip_src_mean.add_entry(5, 134217728, 0b11111000000000000000000000000000, 27)
-    ip_src_mean.add_entry(4, 268435456, 0b11110000000000000000000000000000, 28)
-    ip_src_mean.add_entry(3, 536870912, 0b11100000000000000000000000000000, 29)
-    ip_src_mean.add_entry(2, 1073741824, 0b11000000000000000000000000000000, 30)
-    ip_src_mean.add_entry(1, 2147483648, 0b10000000000000000000000000000000, 31)
-
-    ip_mean_0.add_entry(32, 1, 0b11111111111111111111111111111111, 0)
-    ip_mean_0.add_entry(31, 2, 0b11111111111111111111111111111110, 1)
-    ip_mean_0.add_entry(30, 4, 0b11111111111111111111111111111100, 2)
-    ip_mean_0.add_entry(29, 8, 0b11111111111111111111111111111000, 3)
-    ip_mean_0.add_entry(28, 16, 0b11111111111111111111111111110000, 4)
-    ip_mean_0.add_entry(27, 32, 0b11111111111111111111111111100000, 5)
-    ip_mean_0.add_entry(26, 64, 0b11111111111111111111111111000000, 6)
-    ip_mean_0.add_entry(25, 128, 0b11111111111111111111111110000000, 7)
-    ip_mean_0.add_entry(24, 256, 0b11111111111111111111111100000000, 8)
-    ip_mean_0.add_entry(23, 512, 0b11111111111111111111111000000000, 9)
-    ip_mean_0.add_entry(22, 1024, 0b11111111111111111111110000000000, 10)
-    ip_mean_0.add_entry(21, 2048, 0b11111111111111111111100000000000, 11)
-    ip_mean_0.add_entry(20, 4096, 0b11111111111111111111000000000000, 12)
-    ip_mean_0.add_entry(19, 8192, 0b11111111111111111110000000000000, 13)
-    ip_mean_0.add_entry(18, 16384, 0b11111111111111111100000000000000, 14)
-    ip_mean_0.add_entry(17, 32768, 0b11111111111111111000000000000000, 15)
-    ip_mean_0.add_entry(16, 65536, 0b11111111111111110000000000000000, 16)
-    ip_mean_0.add_entry(15, 131072, 0b11111111111111100000000000000000, 17)
-    ip_mean_0.add_entry(14, 262144, 0b11111111111111000000000000000000, 18)
-    ip_mean_0.add_entry(13, 524288, 0b11111111111110000000000000000000, 19)
-    ip_mean_0.add_entry(12, 1048576, 0b11111111111100000000000000000000, 20)
-
-    ip_res_struct_update.add_entry(0, 'read')
-    ip_res_struct_update.add_entry(1, 'update')
-
-    ip_res_prod.add_entry(32, 1, 0b11111111111111111111111111111111, 0)
-    ip_res_prod.add_entry(31, 2, 0b11111111111111111111111111111110, 1)
-    ip_res_prod.add_entry(30, 4, 0b11111111111111111111111111111100, 2)
-    ip_res_prod.add_entry(29, 8, 0b11111111111111111111111111111000, 3)
-    ip_res_prod.add_entry(28, 16, 0b11111111111111111111111111110000, 4)
-    ip_res_prod.add_entry(27, 32, 0b11111111111111111111111111100000, 5)
-    ip_res_prod.add_entry(26, 64, 0b11111111111111111111111111000000, 6)
-    ip_res_prod.add_entry(25, 128, 0b11111111111111111111111110000000, 7)
-    ip_res_prod.add_entry(24, 256, 0b11111111111111111111111100000000, 8)
-    ip_res_prod.add_entry(23, 512, 0b11111111111111111111111000000000, 9)
-    ip_res_prod.add_entry(22, 1024, 0b11111111111111111111110000000000, 10)
-    ip_res_prod.add_entry(21, 2048, 0b11111111111111111111100000000000, 11)
-    ip_res_prod.add_entry(20, 4096, 0b11111111111111111111000000000000, 12)
-    ip_res_prod.add_entry(19, 8192, 0b11111111111111111110000000000000, 13)
-    ip_res_prod.add_entry(18, 16384, 0b11111111111111111100000000000000, 14)
-    ip_res_prod.add_entry(17, 32768, 0b11111111111111111000000000000000, 15)
-    ip_res_prod.add_entry(16, 65536, 0b11111111111111110000000000000000, 16)
-    ip_res_prod.add_entry(15, 131072, 0b11111111111111100000000000000000, 17)
-    ip_res_prod.add_entry(14, 262144, 0b11111111111111000000000000000000, 18)
-    ip_res_prod.add_entry(13, 524288, 0b11111111111110000000000000000000, 19)
-    ip_res_prod.add_entry(12, 1048576, 0b11111111111100000000000000000000, 20)
-    ip_res_prod.add_entry(11, 2097152, 0b11111111111000000000000000000000, 21)
-    ip_res_prod.add_entry(10, 4194304, 0b11111111110000000000000000000000, 22)
-    ip_res_prod.add_entry(9, 8388608, 0b11111111100000000000000000000000, 23)
-    ip_res_prod.add_entry(8, 16777216, 0b11111111000000000000000000000000, 24)
-    ip_res_prod.add_entry(7, 33554432, 0b11111110000000000000000000000000, 25)
-    ip_res_prod.add_entry(6, 67108864, 0b11111100000000000000000000000000, 26)
-    ip_res_prod.add_entry(5, 134217728, 0b11111000000000000000000000000000, 27)
-    ip_res_prod.add_entry(4, 268435456, 0b11110000000000000000000000000000, 28)
-    ip_res_prod.add_entry(3, 536870912, 0b11100000000000000000000000000000, 29)
-
-    ip_sum_res_prod_get_carry.add_entry(0, '0')
-    ip_sum_res_prod_get_carry.add_entry(1, '1')
-
-    ip_pkt_cnt_1_access.add_entry(0, 'incr')
-    ip_pkt_cnt_1_access.add_entry(1, 'read')
-
-    ip_ss_1_access.add_entry(0, 'incr')
-    ip_ss_1_access.add_entry(1, 'read')
-
-    ip_mean_1_access.add_entry(0, '0_write')
-    ip_mean_1_access.add_entry(1, '1_read')
-
-    ip_mean_ss_0.add_entry(32, 1, 0b11111111111111111111111111111111, 0)
-    ip_mean_ss_0.add_entry(31, 2, 0b11111111111111111111111111111110, 1)
-    ip_mean_ss_0.add_entry(30, 4, 0b11111111111111111111111111111100, 2)
-    ip_mean_ss_0.add_entry(29, 8, 0b11111111111111111111111111111000, 3)
-    ip_mean_ss_0.add_entry(28, 16, 0b11111111111111111111111111110000, 4)
-    ip_mean_ss_0.add_entry(27, 32, 0b11111111111111111111111111100000, 5)
-    ip_mean_ss_0.add_entry(26, 64, 0b11111111111111111111111111000000, 6)
-    ip_mean_ss_0.add_entry(25, 128, 0b11111111111111111111111110000000, 7)
-    ip_mean_ss_0.add_entry(24, 256, 0b11111111111111111111111100000000, 8)
-    ip_mean_ss_0.add_entry(23, 512, 0b11111111111111111111111000000000, 9)
-    ip_mean_ss_0.add_entry(22, 1024, 0b11111111111111111111110000000000, 10)
-    ip_mean_ss_0.add_entry(21, 2048, 0b11111111111111111111100000000000, 11)
-    ip_mean_ss_0.add_entry(20, 4096, 0b11111111111111111111000000000000, 12)
-    ip_mean_ss_0.add_entry(19, 8192, 0b11111111111111111110000000000000, 13)
-    ip_mean_ss_0.add_entry(18, 16384, 0b11111111111111111100000000000000, 14)
-    ip_mean_ss_0.add_entry(17, 32768, 0b11111111111111111000000000000000, 15)
-    ip_mean_ss_0.add_entry(16, 65536, 0b11111111111111110000000000000000, 16)
-    ip_mean_ss_0.add_entry(15, 131072, 0b11111111111111100000000000000000, 17)
-    ip_mean_ss_0.add_entry(14, 262144, 0b11111111111111000000000000000000, 18)
-    ip_mean_ss_0.add_entry(13, 524288, 0b11111111111110000000000000000000, 19)
-    ip_mean_ss_0.add_entry(12, 1048576, 0b11111111111100000000000000000000, 20)
-
-    ip_mean_ss_1.add_entry(32, 1, 0b11111111111111111111111111111111, 0)
-    ip_mean_ss_1.add_entry(31, 2, 0b11111111111111111111111111111110, 1)
-    ip_mean_ss_1.add_entry(30, 4, 0b11111111111111111111111111111100, 2)
-    ip_mean_ss_1.add_entry(29, 8, 0b11111111111111111111111111111000, 3)
-    ip_mean_ss_1.add_entry(28, 16, 0b11111111111111111111111111110000, 4)
-    ip_mean_ss_1.add_entry(27, 32, 0b11111111111111111111111111100000, 5)
-    ip_mean_ss_1.add_entry(26, 64, 0b11111111111111111111111111000000, 6)
-    ip_mean_ss_1.add_entry(25, 128, 0b11111111111111111111111110000000, 7)
-    ip_mean_ss_1.add_entry(24, 256, 0b11111111111111111111111100000000, 8)
-    ip_mean_ss_1.add_entry(23, 512, 0b11111111111111111111111000000000, 9)
-    ip_mean_ss_1.add_entry(22, 1024, 0b11111111111111111111110000000000, 10)
-    ip_mean_ss_1.add_entry(21, 2048, 0b11111111111111111111100000000000, 11)
-    ip_mean_ss_1.add_entry(20, 4096, 0b11111111111111111111000000000000, 12)
-    ip_mean_ss_1.add_entry(19, 8192, 0b11111111111111111110000000000000, 13)
-    ip_mean_ss_1.add_entry(18, 16384, 0b11111111111111111100000000000000, 14)
-    ip_mean_ss_1.add_entry(17, 32768, 0b11111111111111111000000000000000, 15)
-    ip_mean_ss_1.add_entry(16, 65536, 0b11111111111111110000000000000000, 16)
-    ip_mean_ss_1.add_entry(15, 131072, 0b11111111111111100000000000000000, 17)
-    ip_mean_ss_1.add_entry(14, 262144, 0b11111111111111000000000000000000, 18)
-    ip_mean_ss_1.add_entry(13, 524288, 0b11111111111110000000000000000000, 19)
-    ip_mean_ss_1.add_entry(12, 1048576, 0b11111111111100000000000000000000, 20)
-
-    ip_variance_0_abs.add_entry(2,
-                                0b00000000000000000000000000000000,
-                                0b10000000000000000000000000000000,
-                                'pos')
-    ip_variance_0_abs.add_entry(1,
-                                0b10000000000000000000000000000000,
-                                0b10000000000000000000000000000000,
-                                'neg')
-
-    ip_variance_1_abs.add_entry(2,
-                                0b00000000000000000000000000000000,
-                                0b10000000000000000000000000000000,
-                                'pos')
-    ip_variance_1_abs.add_entry(1,
-                                0b10000000000000000000000000000000,
-                                0b10000000000000000000000000000000,
-                                'neg')
-
-    ip_cov.add_entry(32, 1, 0b11111111111111111111111111111111, 0)
-    ip_cov.add_entry(31, 2, 0b11111111111111111111111111111110, 1)
-    ip_cov.add_entry(30, 4, 0b11111111111111111111111111111100, 2)
-    ip_cov.add_entry(29, 8, 0b11111111111111111111111111111000, 3)
-    ip_cov.add_entry(28, 16, 0b11111111111111111111111111110000, 4)
-    ip_cov.add_entry(27, 32, 0b11111111111111111111111111100000, 5)
-    ip_cov.add_entry(26, 64, 0b11111111111111111111111111000000, 6)
-    ip_cov.add_entry(25, 128, 0b11111111111111111111111110000000, 7)
-    ip_cov.add_entry(24, 256, 0b11111111111111111111111100000000, 8)
-    ip_cov.add_entry(23, 512, 0b11111111111111111111111000000000, 9)
-    ip_cov.add_entry(22, 1024, 0b11111111111111111111110000000000, 10)
-    ip_cov.add_entry(21, 2048, 0b11111111111111111111100000000000, 11)
-    ip_cov.add_entry(20, 4096, 0b11111111111111111111000000000000, 12)
-    ip_cov.add_entry(19, 8192, 0b11111111111111111110000000000000, 13)
-    ip_cov.add_entry(18, 16384, 0b11111111111111111100000000000000, 14)
-    ip_cov.add_entry(17, 32768, 0b11111111111111111000000000000000, 15)
-    ip_cov.add_entry(16, 65536, 0b11111111111111110000000000000000, 16)
-    ip_cov.add_entry(15, 131072, 0b11111111111111100000000000000000, 17)
-    ip_cov.add_entry(14, 262144, 0b11111111111111000000000000000000, 18)
-    ip_cov.add_entry(13, 524288, 0b11111111111110000000000000000000, 19)
-    ip_cov.add_entry(12, 1048576, 0b11111111111100000000000000000000, 20)
-
-    ip_std_dev_prod.add_entry(32, 1, 0b11111111111111111111111111111111, 0)
-    ip_std_dev_prod.add_entry(31, 2, 0b11111111111111111111111111111110, 1)
-    ip_std_dev_prod.add_entry(30, 4, 0b11111111111111111111111111111100, 2)
-    ip_std_dev_prod.add_entry(29, 8, 0b11111111111111111111111111111000, 3)
-    ip_std_dev_prod.add_entry(28, 16, 0b11111111111111111111111111110000, 4)
-    ip_std_dev_prod.add_entry(27, 32, 0b11111111111111111111111111100000, 5)
-    ip_std_dev_prod.add_entry(26, 64, 0b11111111111111111111111111000000, 6)
-    ip_std_dev_prod.add_entry(25, 128, 0b11111111111111111111111110000000, 7)
-    ip_std_dev_prod.add_entry(24, 256, 0b11111111111111111111111100000000, 8)
-    ip_std_dev_prod.add_entry(23, 512, 0b11111111111111111111111000000000, 9)
-    ip_std_dev_prod.add_entry(22, 1024, 0b11111111111111111111110000000000, 10)
-    ip_std_dev_prod.add_entry(21, 2048, 0b11111111111111111111100000000000, 11)
-    ip_std_dev_prod.add_entry(20, 4096, 0b11111111111111111111000000000000, 12)
-    ip_std_dev_prod.add_entry(19, 8192, 0b11111111111111111110000000000000, 13)
-    ip_std_dev_prod.add_entry(18, 16384, 0b11111111111111111100000000000000, 14)
-    ip_std_dev_prod.add_entry(17, 32768, 0b11111111111111111000000000000000, 15)
-
-    ip_pcc.add_entry(32, 1, 0b11111111111111111111111111111111, 0)
-    ip_pcc.add_entry(31, 2, 0b11111111111111111111111111111110, 1)
-    ip_pcc.add_entry(30, 4, 0b11111111111111111111111111111100, 2)
-    ip_pcc.add_entry(29, 8, 0b11111111111111111111111111111000, 3)
-    ip_pcc.add_entry(28, 16, 0b11111111111111111111111111110000, 4)
-    ip_pcc.add_entry(27, 32, 0b11111111111111111111111111100000, 5)
-    ip_pcc.add_entry(26, 64, 0b11111111111111111111111111000000, 6)
-    ip_pcc.add_entry(25, 128, 0b11111111111111111111111110000000, 7)
-    ip_pcc.add_entry(24, 256, 0b11111111111111111111111100000000, 8)
-    ip_pcc.add_entry(23, 512, 0b11111111111111111111111000000000, 9)
-    ip_pcc.add_entry(22, 1024, 0b11111111111111111111110000000000, 10)
-    ip_pcc.add_entry(21, 2048, 0b11111111111111111111100000000000, 11)
-    ip_pcc.add_entry(20, 4096, 0b11111111111111111111000000000000, 12)
-    ip_pcc.add_entry(19, 8192, 0b11111111111111111110000000000000, 13)
-    ip_pcc.add_entry(18, 16384, 0b11111111111111111100000000000000, 14)
-    ip_pcc.add_entry(17, 32768, 0b11111111111111111000000000000000, 15)
-    ip_pcc.add_entry(16, 65536, 0b11111111111111110000000000000000, 16)
-    ip_pcc.add_entry(15, 131072, 0b11111111111111100000000000000000, 17)
-    ip_pcc.add_entry(14, 262144, 0b11111111111111000000000000000000, 18)
-    ip_pcc.add_entry(13, 524288, 0b11111111111110000000000000000000, 19)
-    ip_pcc.add_entry(12, 1048576, 0b11111111111100000000000000000000, 20)
-    ip_pcc.add_entry(11, 2097152, 0b11111111111000000000000000000000, 21)
-    ip_pcc.add_entry(10, 4194304, 0b11111111110000000000000000000000, 22)
-    ip_pcc.add_entry(9, 8388608, 0b11111111100000000000000000000000, 23)
-    ip_pcc.add_entry(8, 16777216, 0b11111111000000000000000000000000, 24)
-    ip_pcc.add_entry(7, 33554432, 0b11111110000000000000000000000000, 25)
-    ip_pcc.add_entry(6, 67108864, 0b11111100000000000000000000000000, 26)
-    ip_pcc.add_entry(5, 134217728, 0b11111000000000000000000000000000, 27)
-    ip_pcc.add_entry(4, 268435456, 0b11110000000000000000000000000000, 28)
-    ip_pcc.add_entry(3, 536870912, 0b11100000000000000000000000000000, 29)
-    ip_pcc.add_entry(2, 1073741824, 0b11000000000000000000000000000000, 30)
-    ip_pcc.add_entry(1, 2147483648, 0b10000000000000000000000000000000, 31)
-
-    five_t_mean_0.add_entry(32, 1, 0b11111111111111111111111111111111, 0)
-    five_t_mean_0.add_entry(31, 2, 0b11111111111111111111111111111110, 1)
-    five_t_mean_0.add_entry(30, 4, 0b11111111111111111111111111111100, 2)
-    five_t_mean_0.add_entry(29, 8, 0b11111111111111111111111111111000, 3)
-    five_t_mean_0.add_entry(28, 16, 0b11111111111111111111111111110000, 4)
-    five_t_mean_0.add_entry(27, 32, 0b11111111111111111111111111100000, 5)
-    five_t_mean_0.add_entry(26, 64, 0b11111111111111111111111111000000, 6)
-    five_t_mean_0.add_entry(25, 128, 0b11111111111111111111111110000000, 7)
-    five_t_mean_0.add_entry(24, 256, 0b11111111111111111111111100000000, 8)
-    five_t_mean_0.add_entry(23, 512, 0b11111111111111111111111000000000, 9)
-    five_t_mean_0.add_entry(22, 1024, 0b11111111111111111111110000000000, 10)
-    five_t_mean_0.add_entry(21, 2048, 0b11111111111111111111100000000000, 11)
-    five_t_mean_0.add_entry(20, 4096, 0b11111111111111111111000000000000, 12)
-    five_t_mean_0.add_entry(19, 8192, 0b11111111111111111110000000000000, 13)
-    five_t_mean_0.add_entry(18, 16384, 0b11111111111111111100000000000000, 14)
-    five_t_mean_0.add_entry(17, 32768, 0b11111111111111111000000000000000, 15)
-    five_t_mean_0.add_entry(16, 65536, 0b11111111111111110000000000000000, 16)
-    five_t_mean_0.add_entry(15, 131072, 0b11111111111111100000000000000000, 17)
-    five_t_mean_0.add_entry(14, 262144, 0b11111111111111000000000000000000, 18)
-    five_t_mean_0.add_entry(13, 524288, 0b11111111111110000000000000000000, 19)
-    five_t_mean_0.add_entry(12, 1048576, 0b11111111111100000000000000000000, 20)
-
-    five_t_res_struct_update.add_entry(0, 'read')
-    five_t_res_struct_update.add_entry(1, 'update')
-
-    five_t_res_prod.add_entry(32, 1, 0b11111111111111111111111111111111, 0)
-    five_t_res_prod.add_entry(31, 2, 0b11111111111111111111111111111110, 1)
-    five_t_res_prod.add_entry(30, 4, 0b11111111111111111111111111111100, 2)
-    five_t_res_prod.add_entry(29, 8, 0b11111111111111111111111111111000, 3)
-    five_t_res_prod.add_entry(28, 16, 0b11111111111111111111111111110000, 4)
-    five_t_res_prod.add_entry(27, 32, 0b11111111111111111111111111100000, 5)
-    five_t_res_prod.add_entry(26, 64, 0b11111111111111111111111111000000, 6)
-    five_t_res_prod.add_entry(25, 128, 0b11111111111111111111111110000000, 7)
-    five_t_res_prod.add_entry(24, 256, 0b11111111111111111111111100000000, 8)
-    five_t_res_prod.add_entry(23, 512, 0b11111111111111111111111000000000, 9)
-    five_t_res_prod.add_entry(22, 1024, 0b11111111111111111111110000000000, 10)
-    five_t_res_prod.add_entry(21, 2048, 0b11111111111111111111100000000000, 11)
-    five_t_res_prod.add_entry(20, 4096, 0b11111111111111111111000000000000, 12)
-    five_t_res_prod.add_entry(19, 8192, 0b11111111111111111110000000000000, 13)
-    five_t_res_prod.add_entry(18, 16384, 0b11111111111111111100000000000000, 14)
-    five_t_res_prod.add_entry(17, 32768, 0b11111111111111111000000000000000, 15)
-    five_t_res_prod.add_entry(16, 65536, 0b11111111111111110000000000000000, 16)
-    five_t_res_prod.add_entry(15, 131072, 0b11111111111111100000000000000000, 17)
-    five_t_res_prod.add_entry(14, 262144, 0b11111111111111000000000000000000, 18)
-    five_t_res_prod.add_entry(13, 524288, 0b11111111111110000000000000000000, 19)
-    five_t_res_prod.add_entry(12, 1048576, 0b11111111111100000000000000000000, 20)
-    five_t_res_prod.add_entry(11, 2097152, 0b11111111111000000000000000000000, 21)
-    five_t_res_prod.add_entry(10, 4194304, 0b11111111110000000000000000000000, 22)
-    five_t_res_prod.add_entry(9, 8388608, 0b11111111100000000000000000000000, 23)
-    five_t_res_prod.add_entry(8, 16777216, 0b11111111000000000000000000000000, 24)
-    five_t_res_prod.add_entry(7, 33554432, 0b11111110000000000000000000000000, 25)
-    five_t_res_prod.add_entry(6, 67108864, 0b11111100000000000000000000000000, 26)
-    five_t_res_prod.add_entry(5, 134217728, 0b11111000000000000000000000000000, 27)
-    five_t_res_prod.add_entry(4, 268435456, 0b11110000000000000000000000000000, 28)
-    five_t_res_prod.add_entry(3, 536870912, 0b11100000000000000000000000000000, 29)
-
-    five_t_sum_res_prod_get_carry.add_entry(0, '0')
-    five_t_sum_res_prod_get_carry.add_entry(1, '1')
-
-    five_t_pkt_cnt_1_access.add_entry(0, 'incr')
-    five_t_pkt_cnt_1_access.add_entry(1, 'read')
-
-    five_t_ss_1_access.add_entry(0, 'incr')
-    five_t_ss_1_access.add_entry(1, 'read')
-
-    five_t_mean_1_access.add_entry(0, '0_write')
-    five_t_mean_1_access.add_entry(1, '1_read')
-
-    five_t_mean_ss_0.add_entry(32, 1, 0b11111111111111111111111111111111, 0)
-    five_t_mean_ss_0.add_entry(31, 2, 0b11111111111111111111111111111110, 1)
-    five_t_mean_ss_0.add_entry(30, 4, 0b11111111111111111111111111111100, 2)
-    five_t_mean_ss_0.add_entry(29, 8, 0b11111111111111111111111111111000, 3)
-    five_t_mean_ss_0.add_entry(28, 16, 0b11111111111111111111111111110000, 4)
-    five_t_mean_ss_0.add_entry(27, 32, 0b11111111111111111111111111100000, 5)
-    five_t_mean_ss_0.add_entry(26, 64, 0b11111111111111111111111111000000, 6)
-    five_t_mean_ss_0.add_entry(25, 128, 0b11111111111111111111111110000000, 7)
-    five_t_mean_ss_0.add_entry(24, 256, 0b11111111111111111111111100000000, 8)
-    five_t_mean_ss_0.add_entry(23, 512, 0b11111111111111111111111000000000, 9)
-    five_t_mean_ss_0.add_entry(22, 1024, 0b11111111111111111111110000000000, 10)
-    five_t_mean_ss_0.add_entry(21, 2048, 0b11111111111111111111100000000000, 11)
-    five_t_mean_ss_0.add_entry(20, 4096, 0b11111111111111111111000000000000, 12)
-    five_t_mean_ss_0.add_entry(19, 8192, 0b11111111111111111110000000000000, 13)
-    five_t_mean_ss_0.add_entry(18, 16384, 0b11111111111111111100000000000000, 14)
-    five_t_mean_ss_0.add_entry(17, 32768, 0b11111111111111111000000000000000, 15)
-    five_t_mean_ss_0.add_entry(16, 65536, 0b11111111111111110000000000000000, 16)
-    five_t_mean_ss_0.add_entry(15, 131072, 0b11111111111111100000000000000000, 17)
-    five_t_mean_ss_0.add_entry(14, 262144, 0b11111111111111000000000000000000, 18)
-    five_t_mean_ss_0.add_entry(13, 524288, 0b11111111111110000000000000000000, 19)
-    five_t_mean_ss_0.add_entry(12, 1048576, 0b11111111111100000000000000000000, 20)
-
-    five_t_mean_ss_1.add_entry(32, 1, 0b11111111111111111111111111111111, 0)
-    five_t_mean_ss_1.add_entry(31, 2, 0b11111111111111111111111111111110, 1)
-    five_t_mean_ss_1.add_entry(30, 4, 0b11111111111111111111111111111100, 2)
-    five_t_mean_ss_1.add_entry(29, 8, 0b11111111111111111111111111111000, 3)
-    five_t_mean_ss_1.add_entry(28, 16, 0b11111111111111111111111111110000, 4)
-    five_t_mean_ss_1.add_entry(27, 32, 0b11111111111111111111111111100000, 5)
-    five_t_mean_ss_1.add_entry(26, 64, 0b11111111111111111111111111000000, 6)
-    five_t_mean_ss_1.add_entry(25, 128, 0b11111111111111111111111110000000, 7)
-    five_t_mean_ss_1.add_entry(24, 256, 0b11111111111111111111111100000000, 8)
-    five_t_mean_ss_1.add_entry(23, 512, 0b11111111111111111111111000000000, 9)
-    five_t_mean_ss_1.add_entry(22, 1024, 0b11111111111111111111110000000000, 10)
-    five_t_mean_ss_1.add_entry(21, 2048, 0b11111111111111111111100000000000, 11)
-    five_t_mean_ss_1.add_entry(20, 4096, 0b11111111111111111111000000000000, 12)
-    five_t_mean_ss_1.add_entry(19, 8192, 0b11111111111111111110000000000000, 13)
-    five_t_mean_ss_1.add_entry(18, 16384, 0b11111111111111111100000000000000, 14)
-    five_t_mean_ss_1.add_entry(17, 32768, 0b11111111111111111000000000000000, 15)
-    five_t_mean_ss_1.add_entry(16, 65536, 0b11111111111111110000000000000000, 16)
-    five_t_mean_ss_1.add_entry(15, 131072, 0b11111111111111100000000000000000, 17)
-    five_t_mean_ss_1.add_entry(14, 262144, 0b11111111111111000000000000000000, 18)
-    five_t_mean_ss_1.add_entry(13, 524288, 0b11111111111110000000000000000000, 19)
-    five_t_mean_ss_1.add_entry(12, 1048576, 0b11111111111100000000000000000000, 20)
-
-    five_t_variance_0_abs.add_entry(2,
-                                    0b00000000000000000000000000000000,
-                                    0b10000000000000000000000000000000,
-                                    'pos')
-    five_t_variance_0_abs.add_entry(1,
-                                    0b10000000000000000000000000000000,
-                                    0b10000000000000000000000000000000,
-                                    'neg')
-
-    five_t_variance_1_abs.add_entry(2,
-                                    0b00000000000000000000000000000000,
-                                    0b10000000000000000000000000000000,
-                                    'pos')
-    five_t_variance_1_abs.add_entry(1,
-                                    0b10000000000000000000000000000000,
-                                    0b10000000000000000000000000000000,
-                                    'neg')
-
-    five_t_cov.add_entry(32, 1, 0b11111111111111111111111111111111, 0)
-    five_t_cov.add_entry(31, 2, 0b11111111111111111111111111111110, 1)
-    five_t_cov.add_entry(30, 4, 0b11111111111111111111111111111100, 2)
-    five_t_cov.add_entry(29, 8, 0b11111111111111111111111111111000, 3)
-    five_t_cov.add_entry(28, 16, 0b11111111111111111111111111110000, 4)
-    five_t_cov.add_entry(27, 32, 0b11111111111111111111111111100000, 5)
-    five_t_cov.add_entry(26, 64, 0b11111111111111111111111111000000, 6)
-    five_t_cov.add_entry(25, 128, 0b11111111111111111111111110000000, 7)
-    five_t_cov.add_entry(24, 256, 0b11111111111111111111111100000000, 8)
-    five_t_cov.add_entry(23, 512, 0b11111111111111111111111000000000, 9)
-    five_t_cov.add_entry(22, 1024, 0b11111111111111111111110000000000, 10)
-    five_t_cov.add_entry(21, 2048, 0b11111111111111111111100000000000, 11)
-    five_t_cov.add_entry(20, 4096, 0b11111111111111111111000000000000, 12)
-    five_t_cov.add_entry(19, 8192, 0b11111111111111111110000000000000, 13)
-    five_t_cov.add_entry(18, 16384, 0b11111111111111111100000000000000, 14)
-    five_t_cov.add_entry(17, 32768, 0b11111111111111111000000000000000, 15)
-    five_t_cov.add_entry(16, 65536, 0b11111111111111110000000000000000, 16)
-    five_t_cov.add_entry(15, 131072, 0b11111111111111100000000000000000, 17)
-    five_t_cov.add_entry(14, 262144, 0b11111111111111000000000000000000, 18)
-    five_t_cov.add_entry(13, 524288, 0b11111111111110000000000000000000, 19)
-    five_t_cov.add_entry(12, 1048576, 0b11111111111100000000000000000000, 20)
-
-    five_t_std_dev_prod.add_entry(32, 1, 0b11111111111111111111111111111111, 0)
-    five_t_std_dev_prod.add_entry(31, 2, 0b11111111111111111111111111111110, 1)
-    five_t_std_dev_prod.add_entry(30, 4, 0b11111111111111111111111111111100, 2)
-    five_t_std_dev_prod.add_entry(29, 8, 0b11111111111111111111111111111000, 3)
-    five_t_std_dev_prod.add_entry(28, 16, 0b11111111111111111111111111110000, 4)
-    five_t_std_dev_prod.add_entry(27, 32, 0b11111111111111111111111111100000, 5)
-    five_t_std_dev_prod.add_entry(26, 64, 0b11111111111111111111111111000000, 6)
-    five_t_std_dev_prod.add_entry(25, 128, 0b11111111111111111111111110000000, 7)
-    five_t_std_dev_prod.add_entry(24, 256, 0b11111111111111111111111100000000, 8)
-    five_t_std_dev_prod.add_entry(23, 512, 0b11111111111111111111111000000000, 9)
-    five_t_std_dev_prod.add_entry(22, 1024, 0b11111111111111111111110000000000, 10)
-    five_t_std_dev_prod.add_entry(21, 2048, 0b11111111111111111111100000000000, 11)
-    five_t_std_dev_prod.add_entry(20, 4096, 0b11111111111111111111000000000000, 12)
-    five_t_std_dev_prod.add_entry(19, 8192, 0b11111111111111111110000000000000, 13)
-    five_t_std_dev_prod.add_entry(18, 16384, 0b11111111111111111100000000000000, 14)
-    five_t_std_dev_prod.add_entry(17, 32768, 0b11111111111111111000000000000000, 15)
-
-    five_t_pcc.add_entry(32, 1, 0b11111111111111111111111111111111, 0)
-    five_t_pcc.add_entry(31, 2, 0b11111111111111111111111111111110, 1)
-    five_t_pcc.add_entry(30, 4, 0b11111111111111111111111111111100, 2)
-    five_t_pcc.add_entry(29, 8, 0b11111111111111111111111111111000, 3)
-    five_t_pcc.add_entry(28, 16, 0b11111111111111111111111111110000, 4)
-    five_t_pcc.add_entry(27, 32, 0b11111111111111111111111111100000, 5)
-    five_t_pcc.add_entry(26, 64, 0b11111111111111111111111111000000, 6)
-    five_t_pcc.add_entry(25, 128, 0b11111111111111111111111110000000, 7)
-    five_t_pcc.add_entry(24, 256, 0b11111111111111111111111100000000, 8)
-    five_t_pcc.add_entry(23, 512, 0b11111111111111111111111000000000, 9)
-    five_t_pcc.add_entry(22, 1024, 0b11111111111111111111110000000000, 10)
-    five_t_pcc.add_entry(21, 2048, 0b11111111111111111111100000000000, 11)
-    five_t_pcc.add_entry(20, 4096, 0b11111111111111111111000000000000, 12)
-    five_t_pcc.add_entry(19, 8192, 0b11111111111111111110000000000000, 13)
-    five_t_pcc.add_entry(18, 16384, 0b11111111111111111100000000000000, 14)
-    five_t_pcc.add_entry(17, 32768, 0b11111111111111111000000000000000, 15)
-    five_t_pcc.add_entry(16, 65536, 0b11111111111111110000000000000000, 16)
-    five_t_pcc.add_entry(15, 131072, 0b11111111111111100000000000000000, 17)
-    five_t_pcc.add_entry(14, 262144, 0b11111111111111000000000000000000, 18)
-    five_t_pcc.add_entry(13, 524288, 0b11111111111110000000000000000000, 19)
-    five_t_pcc.add_entry(12, 1048576, 0b11111111111100000000000000000000, 20)
-    five_t_pcc.add_entry(11, 2097152, 0b11111111111000000000000000000000, 21)
-    five_t_pcc.add_entry(10, 4194304, 0b11111111110000000000000000000000, 22)
-    five_t_pcc.add_entry(9, 8388608, 0b11111111100000000000000000000000, 23)
-    five_t_pcc.add_entry(8, 16777216, 0b11111111000000000000000000000000, 24)
-    five_t_pcc.add_entry(7, 33554432, 0b11111110000000000000000000000000, 25)
-    five_t_pcc.add_entry(6, 67108864, 0b11111100000000000000000000000000, 26)
-    five_t_pcc.add_entry(5, 134217728, 0b11111000000000000000000000000000, 27)
-    five_t_pcc.add_entry(4, 268435456, 0b11110000000000000000000000000000, 28)
-    five_t_pcc.add_entry(3, 536870912, 0b11100000000000000000000000000000, 29)
-    five_t_pcc.add_entry(2, 1073741824, 0b11000000000000000000000000000000, 30)
-    five_t_pcc.add_entry(1, 2147483648, 0b10000000000000000000000000000000, 31)
+    # Shift tables and their largest shift (the P4 program defines an action per shift).
+    shift_tables = [(mac_ip_src_mean, 31), (ip_src_mean, 31),
+                    (ip_mean_0, 20), (ip_res_prod, 29), (ip_mean_ss_0, 20), (ip_mean_ss_1, 20),
+                    (ip_cov, 20), (ip_std_dev_prod, 15), (ip_pcc, 31),
+                    (five_t_mean_0, 20), (five_t_res_prod, 29), (five_t_mean_ss_0, 20),
+                    (five_t_mean_ss_1, 20), (five_t_cov, 20), (five_t_std_dev_prod, 15),
+                    (five_t_pcc, 31)]
+    for table, max_shift in shift_tables:
+        for entry in shift_entries(max_shift):
+            table.add_entry(*entry)
+
+    for table in [ip_variance_0_abs, ip_variance_1_abs, five_t_variance_0_abs,
+                  five_t_variance_1_abs]:
+        for entry in sign_entries():
+            table.add_entry(*entry)
+
+    flag_tables = [(ip_res_struct_update, ['read', 'update']),
+                   (ip_sum_res_prod_get_carry, ['0', '1']),
+                   (ip_pkt_cnt_1_access, ['incr', 'read']),
+                   (ip_ss_1_access, ['incr', 'read']),
+                   (ip_mean_1_access, ['0_write', '1_read']),
+                   (five_t_res_struct_update, ['read', 'update']),
+                   (five_t_sum_res_prod_get_carry, ['0', '1']),
+                   (five_t_pkt_cnt_1_access, ['incr', 'read']),
+                   (five_t_ss_1_access, ['incr', 'read']),
+                   (five_t_mean_1_access, ['0_write', '1_read'])]
+    for table, actions in flag_tables:
+        for entry in flag_entries(actions):
+            table.add_entry(*entry)
+
+    program_start = time.time()
+    entries = writes = 0
+    for table in tables:
+        table_entries, table_writes = table.batch_end()
+        entries += table_entries
+        writes += table_writes
+    program_time = time.time() - program_start
+    logger.info("%s %d entries in %d writes (%.3f s)", 'Reconciled' if reconcile else 'Programmed',
+                entries, writes, program_time)
 
     # Done with configuration
-    logger.info("Switch configured successfully!")
+    logger.info("Switch configured successfully! %s time: %.3f s (ports and tables setup: %.3f s)",
+                'Reconfiguration' if reconcile else 'Bring-up', time.time() - start, setup_time)
 
     return cur_eg_veth
 
@@ -692,11 +264,16 @@ if __name__ == "__main__":
     argparser.add_argument('--max_ae', type=int, default=10, help='KitNET: m value')
     argparser.add_argument('--train_exact_ratio', type=float, default=0, help='Ratio of exact stats in the overall training phase.')
     argparser.add_argument('--train_stats', type=str, default=None, help='Prev. trained stats struct path')
+    argparser.add_argument('--model', type=str, default=None, help='Prev. trained model bundle path')
     argparser.add_argument('--fm_model', type=str, default=None, help='Prev. trained FM model path')
     argparser.add_argument('--el_model', type=str, default=None, help='Prev. trained EL path')
     argparser.add_argument('--ol_model', type=str, default=None, help='Prev. trained OL path')
     argparser.add_argument('--attack', type=str, help='Current trace attack name')
     argparser.add_argument('--exact_stats', action='store_true')
+    argparser.add_argument('--exec_batch', type=int, default=pipeline.exec_batch,
+                           help='Execution phase packets scored together by KitNET (1: packet by packet)')
+    argparser.add_argument('--reconcile', action='store_true',
+                           help='Keep the table entries already on the switch, only writing the differences')
     args = argparser.parse_args()
 
     # configure logging
@@ -719,9 +296,12 @@ if __name__ == "__main__":
     from peregrine_tables import FiveTPktCnt1Access, FiveTSs1Access, FiveTMean1Access
     from peregrine_tables import FiveTMeanSs0, FiveTMeanSs1, FiveTVariance0Abs, FiveTVariance1Abs
     from peregrine_tables import FiveTCov, FiveTStdDevProd, FiveTPcc
+    from table_entries import shift_entries, sign_entries, decay_check_entries, flag_entries
     topology = get_topology(args.topo)
     setup_grpc_client(args.grpc_server, args.grpc_port, args.program)
-    cur_eg_veth = configure_switch(args.program, topology)
+    cur_eg_veth = configure_switch(args.program, topology, args.reconcile)
+
+    pipeline.exec_batch = args.exec_batch
 
     start = time.time()
     print(cur_eg_veth)
@@ -731,7 +311,7 @@ if __name__ == "__main__":
     pipeline_out = pkt_pipeline(cur_eg_veth, args.trace, args.labels, args.sampling, args.fm_grace,
                                 args.ad_grace, args.max_ae, args.fm_model, args.el_model,
                                 args.ol_model, args.train_stats, args.attack, args.exact_stats,
-                                args.train_exact_ratio)
+                                args.train_exact_ratio, args.model)
 
     stop = time.time()
     total_time = stop - start
@@ -740,9 +320,8 @@ if __name__ == "__main__":
     print('Threshold: ', pipeline.threshold)
 
     # Call function to perform eval/csv, also based on kitsune's main.
-    # pipeline_out: rmse_list [0], cur_stats_global [1], peregrine_eval[2],
-    # threshold [3], train_skip flag [4].
-    eval_metrics(pipeline_out[0], pipeline_out[1], pipeline_out[2], pipeline_out[3], pipeline_out[4],
+    # pipeline_out: cur_stats_global [0], peregrine_eval[1], threshold [2], train_skip flag [3].
+    eval_metrics(pipeline_out[0], pipeline_out[1], pipeline_out[2], pipeline_out[3],
                  args.fm_grace, args.ad_grace, args.attack, args.sampling, args.max_ae,
                  args.train_exact_ratio, total_time)
 
@@ -8,8 +8,8 @@ from sklearn import metrics
 ts_datetime = datetime.now().strftime('%Y-%m-%d-%H-%M-%S-%f')[:-3]
 
 
-def eval_metrics(rmse_list, cur_stats_global, peregrine_eval, threshold, train_skip, fm_grace,
-                 ad_grace, attack, sampling, max_ae, train_exact_ratio, total_time):
+def eval_metrics(cur_stats_global, peregrine_eval, threshold, train_skip, fm_grace, ad_grace,
+                  attack, sampling, max_ae, train_exact_ratio, total_time):
     outdir = str(Path(__file__).parents[0]) + '/eval/'
     if not os.path.exists(str(Path(__file__).parents[0]) + '/eval'):
         os.makedirs(outdir, exist_ok=True)
@@ -24,32 +24,27 @@ def eval_metrics(rmse_list, cur_stats_global, peregrine_eval, threshold, train_s
     df_cur_stats_global = pd.DataFrame(cur_stats_global)
     df_cur_stats_global.to_csv(outpath_cur_stats_global, index=None)
 
-    # Collect the processed packets' RMSE, label, and save to a csv.
-    df_peregrine = pd.DataFrame(peregrine_eval,
-                                columns=['mac_src', 'ip_src', 'ip_dst', 'ip_type', 'src_proto',
-                                         'dst_proto', 'rmse', 'label'])
-    df_peregrine.to_csv(outpath_peregrine, index=None)
+    # Save the processed packets' RMSE, label to a csv.
+    peregrine_eval.to_csv(outpath_peregrine)
 
-    # Cut all training rows.
+    # Cut all training rows (the columns are read in place).
+    rmse = peregrine_eval.column('rmse')
+    label = peregrine_eval.column('label')
     if train_skip is False:
-        df_peregrine_cut = df_peregrine.drop(df_peregrine.index[range(fm_grace + ad_grace)])
-    else:
-        df_peregrine_cut = df_peregrine
-
-    # Sort by RMSE.
-    df_peregrine_cut.sort_values(by='rmse', ascending=False, inplace=True)
+        rmse = rmse[fm_grace + ad_grace:]
+        label = label[fm_grace + ad_grace:]
 
     # Split by threshold.
-    peregrine_benign = df_peregrine_cut[df_peregrine_cut.rmse < threshold]
-    print(peregrine_benign.shape[0])
-    peregrine_alert = df_peregrine_cut[df_peregrine_cut.rmse >= threshold]
-    print(peregrine_alert.shape[0])
+    benign = rmse < threshold
+    print(np.count_nonzero(benign))
+    alert = rmse >= threshold
+    print(np.count_nonzero(alert))
 
     # Calculate statistics.
-    TP = peregrine_alert[peregrine_alert.label == 1].shape[0]
-    FP = peregrine_alert[peregrine_alert.label == 0].shape[0]
-    TN = peregrine_benign[peregrine_benign.label == 0].shape[0]
-    FN = peregrine_benign[peregrine_benign.label == 1].shape[0]
+    TP = int(np.count_nonzero(alert & (label == 1)))
+    FP = int(np.count_nonzero(alert & (label == 0)))
+    TN = int(np.count_nonzero(benign & (label == 0)))
+    FN = int(np.count_nonzero(benign & (label == 1)))
 
     try:
         TPR = TP / (TP + FN)
@@ -91,11 +86,11 @@ def eval_metrics(rmse_list, cur_stats_global, peregrine_eval, threshold, train_s
     except ZeroDivisionError:
         f1_score = 0
 
-    roc_curve_fpr, roc_curve_tpr, roc_curve_thres = metrics.roc_curve(df_peregrine_cut.label, df_peregrine_cut.rmse)
+    roc_curve_fpr, roc_curve_tpr, roc_curve_thres = metrics.roc_curve(label, rmse)
     roc_curve_fnr = 1 - roc_curve_tpr
 
     try:
-        auc = metrics.roc_auc_score(df_peregrine_cut.label, df_peregrine_cut.rmse)
+        auc = metrics.roc_auc_score(label, rmse)
         eer = roc_curve_fpr[np.nanargmin(np.absolute((roc_curve_fnr - roc_curve_fpr)))]
         eer_sanity = roc_curve_fnr[np.nanargmin(np.absolute((roc_curve_fnr - roc_curve_fpr)))]
     except ValueError:
@@ -0,0 +1,98 @@
+import numpy as np
+
+#
+# Table-driven CRC16 hash engine, following the TNA CRC16
+# (polynomial 0x18005, reflected, init 0x0000, xor out 0x0000).
+#
+# The flow key fields are hashed directly from their integer values, byte by byte in network
+# order, either as python ints (a single packet) or as numpy arrays (many packets at once).
+#
+
+CRC16_POLY = 0x18005
+
+# Hashes are sliced to 13 bits (0-8191).
+HASH_BITS = 13
+HASH_MASK = (1 << HASH_BITS) - 1
+
+# Number of packets hashed together when hashing a whole trace.
+HASH_BLOCK = 1 << 16
+
+# Order of the base hash indexes returned by flow_hashes().
+FLOW_HASHES = ['mac_ip_src', 'ip_src', 'ip_0', 'ip_1', 'ip_xor',
+               'five_t_0', 'five_t_1', 'five_t_xor']
+
+
+class HashEngine:
+    def __init__(self, poly=CRC16_POLY):
+        # Reflected polynomial, without the implicit x^16 term.
+        poly_rev = int('{:016b}'.format(poly & 0xffff)[::-1], 2)
+
+        self.table = []
+        for byte in range(256):
+            crc = byte
+            for _ in range(8):
+                crc = (crc >> 1) ^ poly_rev if crc & 1 else crc >> 1
+            self.table.append(crc)
+        self.table_np = np.array(self.table, dtype=np.uint64)
+
+    # Same interface as the crcmod generated functions.
+    def crc16(self, data, crc=0):
+        for byte in data:
+            crc = (crc >> 8) ^ self.table[(crc ^ byte) & 0xff]
+        return crc
+
+    # Continue the crc with the n_bytes big-endian bytes of value.
+    # Works both for python ints and for numpy arrays (element-wise).
+    def update(self, crc, value, n_bytes):
+        table = self.table_np if isinstance(crc, np.ndarray) else self.table
+        for shift in range(8 * (n_bytes - 1), -1, -8):
+            crc = (crc >> 8) ^ table[(crc ^ (value >> shift)) & 0xff]
+        return crc
+
+    # Base hash indexes (before the decay counter offset) for all flow keys, in the
+    # FLOW_HASHES order. The arguments are either ints or numpy arrays.
+    # Hash xor values are used to access the sum of residual products.
+    # Xor is used since the value is the same for both flow directions.
+    def flow_hashes(self, mac_src, ip_src, ip_dst, ip_proto, port_src, port_dst):
+        if isinstance(ip_src, np.ndarray):
+            fields = [np.asarray(f, dtype=np.uint64)
+                      for f in [mac_src, ip_src, ip_dst, ip_proto, port_src, port_dst]]
+            mac_src, ip_src, ip_dst, ip_proto, port_src, port_dst = fields
+            init = np.zeros(len(ip_src), dtype=np.uint64)
+        else:
+            mac_src, ip_src, ip_dst, ip_proto, port_src, port_dst = \
+                int(mac_src), int(ip_src), int(ip_dst), int(ip_proto), int(port_src), int(port_dst)
+            init = 0
+
+        crc_ip_src = self.update(init, ip_src, 4)
+        crc_ip_dst = self.update(init, ip_dst, 4)
+
+        crc_mac_ip_src = self.update(self.update(init, mac_src, 6), ip_src, 4)
+
+        crc_ip_0 = self.update(crc_ip_src, ip_dst, 4)
+        crc_ip_1 = self.update(crc_ip_dst, ip_src, 4)
+
+        crc_five_t_0 = self.update(self.update(self.update(
+            crc_ip_0, ip_proto, 1), port_src, 2), port_dst, 2)
+        crc_five_t_1 = self.update(self.update(self.update(
+            crc_ip_1, ip_proto, 1), port_dst, 2), port_src, 2)
+
+        hash_ip_0 = crc_ip_0 & HASH_MASK
+        hash_ip_1 = crc_ip_1 & HASH_MASK
+        hash_five_t_0 = crc_five_t_0 & HASH_MASK
+        hash_five_t_1 = crc_five_t_1 & HASH_MASK
+
+        return [crc_mac_ip_src & HASH_MASK, crc_ip_src & HASH_MASK,
+                hash_ip_0, hash_ip_1, hash_ip_0 ^ hash_ip_1,
+                hash_five_t_0, hash_five_t_1, hash_five_t_0 ^ hash_five_t_1]
+
+    # Base hash indexes of all packets of a trace, given its flow key columns
+    # (as returned by trace_cache.flow_keys), as an (n_pkts, 8) int64 array.
+    # Hashed HASH_BLOCK packets at a time, to bound the temporary arrays.
+    def trace_hashes(self, keys, block_size=HASH_BLOCK):
+        n_pkts = len(keys['ip_src'])
+        hashes = np.empty((n_pkts, len(FLOW_HASHES)), dtype=np.int64)
+        for start in range(0, n_pkts, block_size):
+            block = {k: np.asarray(v[start:start + block_size]) for k, v in keys.items()}
+            hashes[start:start + block_size] = np.stack(self.flow_hashes(**block), axis=1)
+        return hashes
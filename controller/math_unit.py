@@ -14,6 +14,16 @@ from __future__ import print_function
 #  result = math_unit.compute(100)
 #  # Hopefully this is close to 10000 :) Should be 9216, so 7.84% error
 #
+#  results = math_unit.compute_array(np.array([100, 200, 300]))
+#
+# All results are precomputed at init: the result only depends on the exponent
+# of the argument and on the lookup table entry selected by its mantissa.
+#
+
+import numpy as np
+
+# Exponents covered by the precomputed table (arguments up to 2^MAX_EXP).
+MAX_EXP = 128
 
 
 class MathUnit():
@@ -51,32 +61,13 @@ class MathUnit():
         self.size = size
         self.mask = (1 << size) - 1
 
-    def compute(self, arg):
-
-        sqrt_flag = False
-
-        arg = int(arg)
-
-        if arg == 0:
-            return 0
-
-        # Get the exponent and mantissa
-        arg1 = arg << 3               # Add 3 extra zeroes on the left
-        exp1 = arg1.bit_length() - 1
-
-        # If we are going to calculate sqrt, we need an even exponent
-        if self.shift == -1 and exp1 % 2 != 0:
-            sqrt_flag = True
-            exp1 += 1
-
-        exp = exp1 - 3                # Compensate for the initial shift
-
-        # First 4 bits
-        if sqrt_flag:
-            mantissa = int(bin(arg)[2:2 + 4], base=2)
-        else:
-            mantissa = (arg1 >> exp) & 0xF
+        # Precomputed results, indexed by [exponent][lookup table index].
+        self.table = [[self.__entry__(exp, idx) for idx in range(16)]
+                      for exp in range(MAX_EXP + 1)]
+        self.table_np = np.array(self.table, dtype=np.int64)
 
+    # Result for a given exponent and lookup table index.
+    def __entry__(self, exp, idx):
         # Calculate the new exponent
 
         # First let's do linear, square or square root
@@ -84,10 +75,8 @@ class MathUnit():
             new_exp = exp >> 1
         elif self.shift == 0:
             new_exp = exp
-        elif self.shift == 1:
-            new_exp = exp << 1
         else:
-            raise ValueError("Shift can only be 0, 1 or -1")
+            new_exp = exp << 1
 
         # For the reciprocals the exponent is inverted
         if self.invert:
@@ -96,14 +85,63 @@ class MathUnit():
         # Finally, add the scale
         new_exp += self.scale
 
-        if sqrt_flag:
-            new_mantissa = self.lookup[mantissa-8]
-        else:
-            new_mantissa = self.lookup[mantissa]
-
         if new_exp < 0:
-            result = new_mantissa >> -new_exp
+            result = self.lookup[idx] >> -new_exp
         else:
-            result = new_mantissa << new_exp
+            result = self.lookup[idx] << new_exp
 
         return result & self.mask
+
+    def compute(self, arg):
+
+        arg = int(arg)
+
+        if arg == 0:
+            return 0
+
+        # Get the exponent (with 3 extra zeroes on the left) and the mantissa.
+        length = arg.bit_length()
+
+        # If we are going to calculate sqrt, we need an even exponent.
+        # In that case, the mantissa is taken from the first 4 bits of the argument,
+        # and the lookup index (mantissa - 8) wraps around the table.
+        if self.shift == -1 and length % 2 != 0:
+            exp = length
+            mantissa = arg >> (length - 4) if length >= 4 else arg
+            idx = (mantissa - 8) & 0xF
+        else:
+            exp = length - 1
+            idx = ((arg << 3) >> exp) & 0xF
+
+        if exp > MAX_EXP:
+            return self.__entry__(exp, idx)
+
+        return self.table[exp][idx]
+
+    # Element-wise compute() over an array of (at most 64-bit) arguments.
+    def compute_array(self, args):
+        args = np.asarray(args).astype(np.int64)
+
+        # Bit length of the arguments' magnitude.
+        mag = np.abs(args).astype(np.uint64)
+        length = np.zeros(args.shape, dtype=np.int64)
+        for step in [32, 16, 8, 4, 2, 1]:
+            big = (mag >> np.uint64(step)) != 0
+            length += big * step
+            mag = np.where(big, mag >> np.uint64(step), mag)
+        length += mag != 0
+
+        exp = length - 1
+        idx = np.where(exp >= 3, args >> np.maximum(exp - 3, 0),
+                       args << np.maximum(3 - exp, 0)) & 0xF
+
+        if self.shift == -1:
+            sqrt_flag = length % 2 != 0
+            mantissa = np.where(length >= 4, args >> np.maximum(length - 4, 0), args)
+            exp = np.where(sqrt_flag, length, exp)
+            idx = np.where(sqrt_flag, (mantissa - 8) & 0xF, idx)
+
+        results = self.table_np[np.maximum(exp, 0), idx]
+        results[args == 0] = 0
+
+        return results
@@ -0,0 +1,365 @@
+import mmap
+import struct
+import numpy as np
+import pandas as pd
+
+#
+# Streaming pcap/pcapng reader, used in place of the tshark -> csv conversion.
+#
+# The trace is mmap'd and the packet records are walked once to collect the offset,
+# captured length, original length and timestamp of every frame. The header fields are
+# then gathered for a whole chunk of packets at once with NumPy, straight from the
+# mapped bytes, so no packet is ever converted to text.
+#
+# Usage:
+#
+#  reader = PcapReader('trace.pcap')
+#  for chunk in reader.iter_chunks():
+#      chunk['ip_src']      # uint32 array, valid where chunk['flags'] & FLAG_IPV4
+#
+#  df = reader.to_dataframe()  # same layout as the tshark csv (first 14 columns)
+#
+
+# Per-packet flags, stored in the 'flags' column.
+FLAG_IPV4 = 0x01
+FLAG_TCP = 0x02
+FLAG_UDP = 0x04
+FLAG_ICMP = 0x08
+
+# Typed columns produced for each packet.
+# The TCP/UDP ports share the port columns, the flags tell which protocol they belong to.
+COLUMNS = [
+    ('ts_sec', np.int64),
+    ('ts_nsec', np.uint32),
+    ('frame_len', np.uint32),
+    ('eth_src', np.uint64),
+    ('eth_dst', np.uint64),
+    ('flags', np.uint8),
+    ('ip_src', np.uint32),
+    ('ip_dst', np.uint32),
+    ('ip_len', np.uint16),
+    ('ip_proto', np.uint8),
+    ('port_src', np.uint16),
+    ('port_dst', np.uint16),
+    ('icmp_type', np.uint8),
+    ('icmp_code', np.uint8)]
+
+# Column names of the tshark csv previously generated by parse_pcap.
+# The ARP and IPv6 columns are not read by the feature extraction and are not produced.
+TSHARK_COLUMNS = [
+    'frame.time_epoch', 'frame.len', 'eth.src', 'eth.dst', 'ip.src', 'ip.dst', 'ip.len',
+    'ip.proto', 'tcp.srcport', 'tcp.dstport', 'udp.srcport', 'udp.dstport', 'icmp.type',
+    'icmp.code']
+
+LINKTYPE_ETHERNET = 1
+
+ETH_P_IP = 0x0800
+ETH_P_IPV6 = 0x86dd
+ETH_P_VLAN = [0x8100, 0x88a8, 0x9100]
+
+IP_PROTO_ICMP = 1
+IP_PROTO_TCP = 6
+IP_PROTO_UDP = 17
+
+PCAP_MAGIC_USEC = 0xa1b2c3d4
+PCAP_MAGIC_NSEC = 0xa1b23c4d
+PCAPNG_SHB = 0x0a0d0d0a
+PCAPNG_BYTE_ORDER_MAGIC = 0x1a2b3c4d
+
+# pcapng block types.
+PCAPNG_IDB = 0x00000001
+PCAPNG_PB = 0x00000002
+PCAPNG_SPB = 0x00000003
+PCAPNG_EPB = 0x00000006
+
+# Number of packets gathered per chunk.
+CHUNK_SIZE = 1 << 20
+
+
+class PcapReader:
+    def __init__(self, file_path, chunk_size=CHUNK_SIZE):
+        self.file_path = file_path
+        self.chunk_size = chunk_size
+
+    def iter_chunks(self):
+        with open(self.file_path, 'rb') as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            buf = np.frombuffer(mm, dtype=np.uint8)
+            try:
+                magic = struct.unpack_from('<I', mm, 0)[0]
+                if magic == PCAPNG_SHB:
+                    records = self.__walk_pcapng__(mm)
+                else:
+                    records = self.__walk_pcap__(mm)
+
+                for record in records:
+                    yield self.__gather__(buf, *record)
+            finally:
+                # The gathered columns are copies, so the mapping can be released.
+                del buf
+                mm.close()
+
+    def read(self):
+        chunks = list(self.iter_chunks())
+        if not chunks:
+            return {name: np.zeros(0, dtype=dtype) for name, dtype in COLUMNS}
+        return {name: np.concatenate([c[name] for c in chunks]) for name, _ in COLUMNS}
+
+    def to_dataframe(self, columns=None):
+        if columns is None:
+            columns = self.read()
+        return columns_to_dataframe(columns)
+
+    def __walk_pcap__(self, mm):
+        magic_le = struct.unpack_from('<I', mm, 0)[0]
+        if magic_le in [PCAP_MAGIC_USEC, PCAP_MAGIC_NSEC]:
+            endian = '<'
+        elif struct.unpack_from('>I', mm, 0)[0] in [PCAP_MAGIC_USEC, PCAP_MAGIC_NSEC]:
+            endian = '>'
+        else:
+            raise ValueError(f'{self.file_path}: not a pcap/pcapng file')
+
+        magic = struct.unpack_from(endian + 'I', mm, 0)[0]
+        ts_mult = 1000 if magic == PCAP_MAGIC_USEC else 1
+        linktype = struct.unpack_from(endian + 'I', mm, 20)[0] & 0x0fffffff
+        if linktype != LINKTYPE_ETHERNET:
+            raise ValueError(f'{self.file_path}: unsupported link type {linktype}')
+
+        rec_hdr = struct.Struct(endian + 'IIII')
+        size = len(mm)
+        pos = 24
+
+        while pos < size:
+            offsets, caplens, lens, ts_secs, ts_nsecs = [], [], [], [], []
+            while pos + 16 <= size and len(offsets) < self.chunk_size:
+                ts_sec, ts_frac, caplen, length = rec_hdr.unpack_from(mm, pos)
+                pos += 16
+                # Truncated last record.
+                caplen = min(caplen, size - pos)
+                offsets.append(pos)
+                caplens.append(caplen)
+                lens.append(length)
+                ts_secs.append(ts_sec)
+                ts_nsecs.append(ts_frac * ts_mult)
+                pos += caplen
+            if not offsets:
+                break
+            yield offsets, caplens, lens, ts_secs, ts_nsecs
+
+    def __walk_pcapng__(self, mm):
+        size = len(mm)
+        pos = 0
+        endian = '<'
+        # Per-interface link type and timestamp resolution of the current section.
+        if_linktypes = []
+        if_tsresol = []
+
+        offsets, caplens, lens, ts_secs, ts_nsecs = [], [], [], [], []
+        while pos + 12 <= size:
+            block_type = struct.unpack_from(endian + 'I', mm, pos)[0]
+            if block_type == PCAPNG_SHB:
+                if struct.unpack_from('<I', mm, pos + 8)[0] == PCAPNG_BYTE_ORDER_MAGIC:
+                    endian = '<'
+                else:
+                    endian = '>'
+                if_linktypes = []
+                if_tsresol = []
+            block_len = struct.unpack_from(endian + 'I', mm, pos + 4)[0]
+            if block_len < 12 or pos + block_len > size:
+                break
+
+            if block_type == PCAPNG_IDB:
+                linktype = struct.unpack_from(endian + 'H', mm, pos + 8)[0]
+                if_linktypes.append(linktype)
+                if_tsresol.append(self.__idb_tsresol__(mm, endian, pos + 16, pos + block_len - 4))
+            elif block_type in [PCAPNG_EPB, PCAPNG_PB]:
+                if block_type == PCAPNG_EPB:
+                    if_id, ts_high, ts_low, caplen, length = \
+                        struct.unpack_from(endian + 'IIIII', mm, pos + 8)
+                else:
+                    if_id, _, ts_high, ts_low, caplen, length = \
+                        struct.unpack_from(endian + 'HHIIII', mm, pos + 8)
+                self.__check_linktype__(if_linktypes, if_id)
+                ts_sec, ts_nsec = self.__ts_split__((ts_high << 32) | ts_low, if_tsresol[if_id])
+                offsets.append(pos + 28)
+                caplens.append(min(caplen, block_len - 32))
+                lens.append(length)
+                ts_secs.append(ts_sec)
+                ts_nsecs.append(ts_nsec)
+            elif block_type == PCAPNG_SPB:
+                # Simple packet blocks carry no timestamp and always refer to interface 0.
+                self.__check_linktype__(if_linktypes, 0)
+                length = struct.unpack_from(endian + 'I', mm, pos + 8)[0]
+                offsets.append(pos + 12)
+                caplens.append(min(length, block_len - 16))
+                lens.append(length)
+                ts_secs.append(0)
+                ts_nsecs.append(0)
+
+            pos += block_len
+
+            if len(offsets) == self.chunk_size:
+                yield offsets, caplens, lens, ts_secs, ts_nsecs
+                offsets, caplens, lens, ts_secs, ts_nsecs = [], [], [], [], []
+
+        if offsets:
+            yield offsets, caplens, lens, ts_secs, ts_nsecs
+
+    def __check_linktype__(self, if_linktypes, if_id):
+        if if_id >= len(if_linktypes):
+            raise ValueError(f'{self.file_path}: packet refers to an undefined interface')
+        if if_linktypes[if_id] != LINKTYPE_ETHERNET:
+            raise ValueError(f'{self.file_path}: unsupported link type {if_linktypes[if_id]}')
+
+    def __idb_tsresol__(self, mm, endian, pos, end):
+        # Default resolution: microseconds.
+        tsresol = 6
+        while pos + 4 <= end:
+            code, length = struct.unpack_from(endian + 'HH', mm, pos)
+            if code == 0:
+                break
+            if code == 9 and length == 1:
+                tsresol = mm[pos + 4]
+            pos += 4 + ((length + 3) & ~3)
+        return tsresol
+
+    def __ts_split__(self, ts, tsresol):
+        # MSB clear: negative power of 10. MSB set: negative power of 2.
+        if tsresol & 0x80:
+            units = 1 << (tsresol & 0x7f)
+            ts_sec, ts_frac = divmod(ts, units)
+            return ts_sec, (ts_frac * 1000000000) // units
+        units = 10 ** tsresol
+        ts_sec, ts_frac = divmod(ts, units)
+        if tsresol <= 9:
+            return ts_sec, ts_frac * 10 ** (9 - tsresol)
+        return ts_sec, ts_frac // 10 ** (tsresol - 9)
+
+    def __gather__(self, buf, offsets, caplens, lens, ts_secs, ts_nsecs):
+        n = len(offsets)
+        start = np.array(offsets, dtype=np.int64)
+        end = start + np.array(caplens, dtype=np.int64)
+        last = len(buf) - 1
+
+        def u8(pos, valid):
+            return np.where(valid, buf[np.minimum(pos, last)], 0).astype(np.uint64)
+
+        def be(pos, nbytes, valid):
+            valid = valid & (pos + nbytes <= end)
+            value = np.zeros(n, dtype=np.uint64)
+            for i in range(nbytes):
+                value = (value << np.uint64(8)) | u8(pos + i, valid)
+            return value, valid
+
+        chunk = {name: np.zeros(n, dtype=dtype) for name, dtype in COLUMNS}
+        chunk['ts_sec'][:] = ts_secs
+        chunk['ts_nsec'][:] = ts_nsecs
+        chunk['frame_len'][:] = lens
+
+        # Ethernet, with up to two VLAN tags.
+        eth_dst, has_eth = be(start, 6, np.ones(n, dtype=bool))
+        eth_src, _ = be(start + 6, 6, has_eth)
+        chunk['eth_dst'][:] = eth_dst
+        chunk['eth_src'][:] = eth_src
+
+        l3 = start + 14
+        ethertype, has_l3 = be(l3 - 2, 2, has_eth)
+        for _ in range(2):
+            tagged = has_l3 & np.isin(ethertype, ETH_P_VLAN)
+            l3 = np.where(tagged, l3 + 4, l3)
+            inner, valid = be(l3 - 2, 2, tagged)
+            ethertype = np.where(tagged, inner, ethertype)
+            has_l3 = np.where(tagged, valid, has_l3)
+
+        # IPv4.
+        ver_ihl, ipv4 = be(l3, 1, has_l3 & (ethertype == ETH_P_IP))
+        ipv4 &= (ver_ihl >> np.uint64(4)) == 4
+        ip_len, _ = be(l3 + 2, 2, ipv4)
+        frag, _ = be(l3 + 6, 2, ipv4)
+        ip_proto, _ = be(l3 + 9, 1, ipv4)
+        ip_src, ipv4 = be(l3 + 12, 4, ipv4)
+        ip_dst, _ = be(l3 + 16, 4, ipv4)
+        chunk['ip_len'][:] = ip_len
+        chunk['ip_proto'][:] = ip_proto
+        chunk['ip_src'][:] = ip_src
+        chunk['ip_dst'][:] = ip_dst
+
+        # IPv6 (without extension headers), only decoded for the transport ports.
+        next_hdr, ipv6 = be(l3 + 6, 1, has_l3 & (ethertype == ETH_P_IPV6))
+
+        # Transport headers are only present in the first fragment.
+        l4 = np.where(ipv6, l3 + 40,
+                      l3 + ((ver_ihl & np.uint64(0xf)) * np.uint64(4)).astype(np.int64))
+        first_frag = ipv4 & ((frag & np.uint64(0x1fff)) == 0)
+        l4_proto = np.where(ipv6, next_hdr, ip_proto)
+        has_l4 = first_frag | ipv6
+
+        port_src, tcp = be(l4, 2, has_l4 & (l4_proto == IP_PROTO_TCP))
+        port_dst, tcp = be(l4 + 2, 2, tcp)
+        udp_src, udp = be(l4, 2, has_l4 & (l4_proto == IP_PROTO_UDP))
+        udp_dst, udp = be(l4 + 2, 2, udp)
+        chunk['port_src'][:] = np.where(udp, udp_src, port_src)
+        chunk['port_dst'][:] = np.where(udp, udp_dst, port_dst)
+
+        icmp_type, icmp = be(l4, 1, first_frag & (ip_proto == IP_PROTO_ICMP))
+        icmp_code, icmp = be(l4 + 1, 1, icmp)
+        chunk['icmp_type'][:] = icmp_type
+        chunk['icmp_code'][:] = icmp_code
+
+        chunk['flags'][:] = (ipv4 * FLAG_IPV4) | (tcp * FLAG_TCP) | (udp * FLAG_UDP) \
+            | (icmp * FLAG_ICMP)
+
+        return chunk
+
+
+# MAC address (uint64) -> 'aa:bb:cc:dd:ee:ff', for an array of addresses.
+def mac_to_str(macs):
+    uniq, inverse = np.unique(np.asarray(macs, dtype=np.uint64), return_inverse=True)
+    strs = np.array([':'.join(f'{b:02x}' for b in int(m).to_bytes(6, 'big')) for m in uniq],
+                    dtype=object)
+    return strs[inverse.reshape(-1)]
+
+
+# IPv4 address (uint32) -> dotted quad, for an array of addresses.
+def ip_to_str(ips):
+    uniq, inverse = np.unique(np.asarray(ips, dtype=np.uint32), return_inverse=True)
+    strs = np.array(['.'.join(str(b) for b in int(ip).to_bytes(4, 'big')) for ip in uniq],
+                    dtype=object)
+    return strs[inverse.reshape(-1)]
+
+
+# Builds a dataframe with the same layout (and NaN semantics) as the tshark csv.
+def columns_to_dataframe(columns):
+    flags = np.asarray(columns['flags'])
+    ipv4 = (flags & FLAG_IPV4) != 0
+    tcp = (flags & FLAG_TCP) != 0
+    udp = (flags & FLAG_UDP) != 0
+    icmp = (flags & FLAG_ICMP) != 0
+
+    def opt(values, mask):
+        return np.where(mask, values, np.nan)
+
+    def opt_str(values, mask):
+        out = np.full(len(mask), np.nan, dtype=object)
+        if mask.any():
+            out[mask] = values[mask]
+        return out
+
+    ts = np.asarray(columns['ts_sec'], dtype=np.float64) \
+        + np.asarray(columns['ts_nsec'], dtype=np.float64) / 1e9
+
+    return pd.DataFrame({
+        'frame.time_epoch': ts,
+        'frame.len': np.asarray(columns['frame_len'], dtype=np.int64),
+        'eth.src': mac_to_str(columns['eth_src']),
+        'eth.dst': mac_to_str(columns['eth_dst']),
+        'ip.src': opt_str(ip_to_str(columns['ip_src']), ipv4),
+        'ip.dst': opt_str(ip_to_str(columns['ip_dst']), ipv4),
+        'ip.len': opt(columns['ip_len'], ipv4),
+        'ip.proto': opt(columns['ip_proto'], ipv4),
+        'tcp.srcport': opt(columns['port_src'], tcp),
+        'tcp.dstport': opt(columns['port_dst'], tcp),
+        'udp.srcport': opt(columns['port_src'], udp),
+        'udp.dstport': opt(columns['port_dst'], udp),
+        'icmp.type': opt(columns['icmp_type'], icmp),
+        'icmp.code': opt(columns['icmp_code'], icmp)}, columns=TSHARK_COLUMNS)
@@ -0,0 +1,155 @@
+import socket
+import struct
+import numpy as np
+from eval_buffer import bytes_to_str, HEX_BYTES, DEC_BYTES
+
+#
+# Decoder of the packets sent by the data plane to the control plane.
+#
+# The data plane emits fixed-size headers (see p4/tna/includes): Ethernet, IPv4 (20 bytes), then
+# UDP (8 bytes), TCP (20 bytes) or ICMP (4 bytes), and the Peregrine header with the data plane
+# stats. So each frame is read at fixed offsets, with a precompiled struct per L4 protocol
+# (decode, a single frame) or a numpy structured dtype per L4 protocol (decode_batch, a batch of
+# frames at once). The scapy definition of the Peregrine header (peregrine_header.py) is only a
+# debugging aid.
+#
+
+# Peregrine header fields, in order: 29 unsigned 32-bit integers, then 4 unsigned 64-bit integers.
+PEREGRINE_HDR_FIELDS = [
+    'decay',
+    'mac_ip_src_pkt_cnt', 'mac_ip_src_pkt_len', 'mac_ip_src_ss', 'mac_ip_src_mean',
+    'mac_ip_src_std_dev',
+    'ip_src_pkt_cnt', 'ip_src_pkt_len', 'ip_src_ss', 'ip_src_mean', 'ip_src_std_dev',
+    'ip_pkt_cnt', 'ip_ss_0', 'ip_ss_1', 'ip_mean_0', 'ip_pkt_cnt_1', 'ip_mean_1', 'ip_std_dev_0',
+    'ip_magnitude', 'ip_radius',
+    'five_t_pkt_cnt', 'five_t_ss_0', 'five_t_ss_1', 'five_t_mean_0', 'five_t_pkt_cnt_1',
+    'five_t_mean_1', 'five_t_std_dev_0', 'five_t_magnitude', 'five_t_radius',
+    'ip_sum_res_prod_cov', 'ip_pcc', 'five_t_sum_res_prod_cov', 'five_t_pcc']
+PEREGRINE_HDR_FMT = '29I4Q'
+
+# Fields sent to the pipeline (cur_stats), in order.
+STATS_FIELDS = [
+    'decay',
+    'mac_ip_src_pkt_cnt', 'mac_ip_src_mean', 'mac_ip_src_std_dev',
+    'ip_src_pkt_cnt', 'ip_src_mean', 'ip_src_std_dev',
+    'ip_pkt_cnt', 'ip_mean_0', 'ip_std_dev_0', 'ip_magnitude', 'ip_radius',
+    'ip_sum_res_prod_cov', 'ip_pcc',
+    'five_t_pkt_cnt', 'five_t_mean_0', 'five_t_std_dev_0', 'five_t_magnitude', 'five_t_radius',
+    'five_t_sum_res_prod_cov', 'five_t_pcc']
+STATS_INDEX = [PEREGRINE_HDR_FIELDS.index(name) for name in STATS_FIELDS]
+
+ETH_P_IP = 0x0800
+IP_PROTO_ICMP = 1
+IP_PROTO_TCP = 6
+IP_PROTO_UDP = 17
+
+# Ethernet type and IP protocol of a frame.
+FRAME_TYPE = struct.Struct('!12xH9xB')
+
+# Ethernet (source MAC) and IPv4 (protocol, source and destination IPs) headers, then the L4
+# header of each protocol: its format and whether it has ports.
+ETH_IP_FMT = '!6x6s2x9xB2x4s4s'
+L4_HDRS = {IP_PROTO_UDP: ('HH4x', True),
+           IP_PROTO_TCP: ('HH16x', True),
+           IP_PROTO_ICMP: ('4x', False)}
+
+FRAME = {proto: struct.Struct(ETH_IP_FMT + fmt + PEREGRINE_HDR_FMT)
+         for proto, (fmt, _) in L4_HDRS.items()}
+
+
+# Structured dtype of a frame of an L4 protocol, with the same layout as its struct (FRAME).
+def frame_dtype(proto):
+    eth_ip_size = struct.calcsize(ETH_IP_FMT)
+    fields = [('mac_src_hi', '>u2', 6), ('mac_src_lo', '>u4', 8), ('ip_proto', 'u1', 23),
+              ('ip_src', '>u4', 26), ('ip_dst', '>u4', 30)]
+    if L4_HDRS[proto][1]:
+        fields += [('port_src', '>u2', eth_ip_size), ('port_dst', '>u2', eth_ip_size + 2)]
+    offset = FRAME[proto].size - struct.calcsize('!' + PEREGRINE_HDR_FMT)
+    for i, name in enumerate(PEREGRINE_HDR_FIELDS):
+        fields.append((name, '>u4' if i < 29 else '>u8', offset))
+        offset += 4 if i < 29 else 8
+    return np.dtype({'names': [name for name, _, _ in fields],
+                     'formats': [fmt for _, fmt, _ in fields],
+                     'offsets': [offset for _, _, offset in fields],
+                     'itemsize': FRAME[proto].size})
+
+
+FRAME_DTYPE = {proto: frame_dtype(proto) for proto in L4_HDRS}
+
+# Packet headers decoded by decode_batch.
+HDRS_DTYPE = np.dtype([('mac_src', np.uint64), ('ip_src', np.uint32), ('ip_dst', np.uint32),
+                       ('ip_proto', np.uint8), ('port_src', np.uint16), ('port_dst', np.uint16)])
+
+
+# Decodes a frame: ([mac_src, ip_src, ip_dst, ip_proto, port_src, port_dst] as strings,
+# [STATS_FIELDS values]), or None if the frame carries no Peregrine header.
+def decode(frame):
+    view = memoryview(frame)
+    if len(view) < FRAME_TYPE.size:
+        return None
+    eth_type, ip_proto = FRAME_TYPE.unpack_from(view)
+    frame_struct = FRAME.get(ip_proto)
+    if eth_type != ETH_P_IP or frame_struct is None or len(view) < frame_struct.size:
+        return None
+
+    values = frame_struct.unpack_from(view)
+    mac_src, _, ip_src, ip_dst = values[:4]
+    if L4_HDRS[ip_proto][1]:
+        port_src, port_dst = values[4:6]
+        fields = values[6:]
+    else:
+        # If not UDP/TCP, the sport and dport values will be 0.
+        port_src = port_dst = 0
+        fields = values[4:]
+    return ([mac_src.hex(':'), socket.inet_ntoa(ip_src), socket.inet_ntoa(ip_dst),
+             str(ip_proto), str(port_src), str(port_dst)],
+            [fields[i] for i in STATS_INDEX])
+
+
+# Decodes a batch of frames: (valid, hdrs, fields), where valid flags the frames carrying a
+# Peregrine header, hdrs their headers (HDRS_DTYPE) and fields the (N, PEREGRINE_HDR_FIELDS) array
+# of their Peregrine header (uint64). The rows of the invalid frames are 0.
+def decode_batch(frames):
+    n = len(frames)
+    lens = np.array([len(frame) for frame in frames], dtype=np.int64)
+    width = max(frame.size for frame in FRAME.values())
+    buf = np.zeros((n, max(int(lens.max(initial=0)), width)), dtype=np.uint8)
+    for i, frame in enumerate(frames):
+        buf[i, :lens[i]] = np.frombuffer(frame, dtype=np.uint8)
+
+    eth_ip = (buf[:, 12].astype(np.uint16) << 8 | buf[:, 13]) == ETH_P_IP
+    ip_proto = buf[:, 23]
+    valid = np.zeros(n, dtype=bool)
+    hdrs = np.zeros(n, dtype=HDRS_DTYPE)
+    fields = np.zeros((n, len(PEREGRINE_HDR_FIELDS)), dtype=np.uint64)
+    for proto, dtype in FRAME_DTYPE.items():
+        rows = np.flatnonzero(eth_ip & (ip_proto == proto) & (lens >= dtype.itemsize))
+        if len(rows) == 0:
+            continue
+        valid[rows] = True
+        decoded = np.ascontiguousarray(buf[rows, :dtype.itemsize]).view(dtype)[:, 0]
+        hdrs['mac_src'][rows] = (decoded['mac_src_hi'].astype(np.uint64) << np.uint64(32)) \
+            | decoded['mac_src_lo']
+        for name in ('ip_src', 'ip_dst', 'ip_proto'):
+            hdrs[name][rows] = decoded[name]
+        if L4_HDRS[proto][1]:
+            hdrs['port_src'][rows] = decoded['port_src']
+            hdrs['port_dst'][rows] = decoded['port_dst']
+        for i, name in enumerate(PEREGRINE_HDR_FIELDS):
+            fields[rows, i] = decoded[name]
+
+    return valid, hdrs, fields
+
+
+# Decodes a batch of frames as decode, for each frame.
+def decode_rows(frames):
+    valid, hdrs, fields = decode_batch(frames)
+    hdrs_str = list(zip(
+        bytes_to_str(hdrs['mac_src'], 6, HEX_BYTES, ':').tolist(),
+        bytes_to_str(hdrs['ip_src'], 4, DEC_BYTES, '.').tolist(),
+        bytes_to_str(hdrs['ip_dst'], 4, DEC_BYTES, '.').tolist(),
+        hdrs['ip_proto'].astype(str).tolist(),
+        hdrs['port_src'].astype(str).tolist(),
+        hdrs['port_dst'].astype(str).tolist()))
+    stats = fields[:, STATS_INDEX].tolist()
+    return [(list(hdrs_str[i]), stats[i]) if valid[i] else None for i in range(len(frames))]
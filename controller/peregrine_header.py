@@ -1,5 +1,8 @@
 from scapy.all import Packet, IntField, ShortField, ByteField, LongField
 
+# scapy definition of the Peregrine header, a debugging aid (e.g. to dissect or craft packets).
+# The pipeline decodes the data plane packets with peregrine_decoder.py.
+
 
 class PeregrineHdr(Packet):
     name = 'peregrine'
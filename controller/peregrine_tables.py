@@ -5,9 +5,9 @@ from table import Table
 
 class SamplingRate(Table):
 
-    def __init__(self, client, bfrt_info):
+    def __init__(self, client, bfrt_info, reconcile=False):
         # set up base class
-        super(SamplingRate, self).__init__(client, bfrt_info)
+        super(SamplingRate, self).__init__(client, bfrt_info, reconcile)
 
         self.logger = logging.getLogger('sampling_rate')
         self.logger.info('Setting up sampling_rate table...')
@@ -15,8 +15,9 @@ class SamplingRate(Table):
         # get this table
         self.table = self.bfrt_info.table_get('SwitchIngress_a.sampling_rate')
 
-        # clear and add defaults
-        self.clear()
+        # clear and add defaults (unless reconciling, see Table.batch_end)
+        if not self.reconcile:
+            self.clear()
 
     def add_entry(self, dummy_key, rate):
         # target all pipes on device 0
@@ -24,7 +25,7 @@ class SamplingRate(Table):
 
         self.logger.info('Programming entries on sampling_rate table...')
 
-        self.table.entry_add(
+        self.entry_add(
            target,
            [self.table.make_key(
                [gc.KeyTuple('ig_md.meta.sampling_rate_key', dummy_key)])],
@@ -35,9 +36,9 @@ class SamplingRate(Table):
 
 class FwdRecirculation_a(Table):
 
-    def __init__(self, client, bfrt_info):
+    def __init__(self, client, bfrt_info, reconcile=False):
         # set up base class
-        super(FwdRecirculation_a, self).__init__(client, bfrt_info)
+        super(FwdRecirculation_a, self).__init__(client, bfrt_info, reconcile)
 
         self.logger = logging.getLogger('a_fwd_recirculation')
         self.logger.info('Setting up a_fwd_recirculation table...')
@@ -45,8 +46,9 @@ class FwdRecirculation_a(Table):
         # get this table
         self.table = self.bfrt_info.table_get('SwitchIngress_a.fwd_recirculation')
 
-        # clear and add defaults
-        self.clear()
+        # clear and add defaults (unless reconciling, see Table.batch_end)
+        if not self.reconcile:
+            self.clear()
 
     def add_entry(self, ig_port, recirc_toggle, int_port):
         # target all pipes on device 0
@@ -55,7 +57,7 @@ class FwdRecirculation_a(Table):
         self.logger.info('Programming entries on a_fwd_recirculation table...')
 
         if recirc_toggle:
-            self.table.entry_add(
+            self.entry_add(
                 target,
                 [self.table.make_key(
                     [gc.KeyTuple('ig_intr_md.ingress_port', ig_port),
@@ -64,7 +66,7 @@ class FwdRecirculation_a(Table):
                     [gc.DataTuple('port', int_port)],
                     'SwitchIngress_a.modify_eg_port')])
         else:
-            self.table.entry_add(
+            self.entry_add(
                 target,
                 [self.table.make_key(
                     [gc.KeyTuple('ig_intr_md.ingress_port', ig_port),
@@ -76,9 +78,9 @@ class FwdRecirculation_a(Table):
 
 class FwdRecirculation_b(Table):
 
-    def __init__(self, client, bfrt_info):
+    def __init__(self, client, bfrt_info, reconcile=False):
         # set up base class
-        super(FwdRecirculation_b, self).__init__(client, bfrt_info)
+        super(FwdRecirculation_b, self).__init__(client, bfrt_info, reconcile)
 
         self.logger = logging.getLogger('b_fwd_recirculation')
         self.logger.info('Setting up b_fwd_recirculation table...')
@@ -86,8 +88,9 @@ class FwdRecirculation_b(Table):
         # get this table
         self.table = self.bfrt_info.table_get('SwitchIngress_b.fwd_recirculation')
 
-        # clear and add defaults
-        self.clear()
+        # clear and add defaults (unless reconciling, see Table.batch_end)
+        if not self.reconcile:
+            self.clear()
 
     def add_entry(self, ig_port, eg_port):
         # target all pipes on device 0
@@ -95,7 +98,7 @@ class FwdRecirculation_b(Table):
 
         self.logger.info('Programming entries on b_fwd_recirculation table...')
 
-        self.table.entry_add(
+        self.entry_add(
            target,
            [self.table.make_key(
                [gc.KeyTuple('ig_intr_md.ingress_port', ig_port)])],
@@ -106,9 +109,9 @@ class FwdRecirculation_b(Table):
 
 class MacIpSrcDecayCheck(Table):
 
-    def __init__(self, client, bfrt_info):
+    def __init__(self, client, bfrt_info, reconcile=False):
         # set up base class
-        super(MacIpSrcDecayCheck, self).__init__(client, bfrt_info)
+        super(MacIpSrcDecayCheck, self).__init__(client, bfrt_info, reconcile)
 
         self.logger = logging.getLogger('mac_ip_src_decay_check')
         self.logger.info('Setting up mac_ip_src_decay_check table...')
@@ -116,8 +119,9 @@ class MacIpSrcDecayCheck(Table):
         # get this table
         self.table = self.bfrt_info.table_get('SwitchIngress_a.stats_mac_ip_src_a.decay_check')
 
-        # clear and add defaults
-        self.clear()
+        # clear and add defaults (unless reconciling, see Table.batch_end)
+        if not self.reconcile:
+            self.clear()
 
     def add_entry(self, counter, interval):
         # target all pipes on device 0
@@ -125,7 +129,7 @@ class MacIpSrcDecayCheck(Table):
 
         self.logger.info('Programming entries on mac_ip_src_decay_check table...')
 
-        self.table.entry_add(
+        self.entry_add(
            target,
            [self.table.make_key(
                [gc.KeyTuple('ig_md.meta.decay_cntr', counter)])],
@@ -134,9 +138,9 @@ class MacIpSrcDecayCheck(Table):
 
 class IpSrcDecayCheck(Table):
 
-    def __init__(self, client, bfrt_info):
+    def __init__(self, client, bfrt_info, reconcile=False):
         # set up base class
-        super(IpSrcDecayCheck, self).__init__(client, bfrt_info)
+        super(IpSrcDecayCheck, self).__init__(client, bfrt_info, reconcile)
 
         self.logger = logging.getLogger('ip_src_decay_check')
         self.logger.info('Setting up ip_src_decay_check table...')
@@ -144,8 +148,9 @@ class IpSrcDecayCheck(Table):
         # get this table
         self.table = self.bfrt_info.table_get('SwitchIngress_a.stats_ip_src_a.decay_check')
 
-        # clear and add defaults
-        self.clear()
+        # clear and add defaults (unless reconciling, see Table.batch_end)
+        if not self.reconcile:
+            self.clear()
 
     def add_entry(self, counter, interval):
         # target all pipes on device 0
@@ -153,7 +158,7 @@ class IpSrcDecayCheck(Table):
 
         self.logger.info('Programming entries on ip_src_decay_check table...')
 
-        self.table.entry_add(
+        self.entry_add(
            target,
            [self.table.make_key(
                [gc.KeyTuple('ig_md.meta.decay_cntr', counter)])],
@@ -162,9 +167,9 @@ class IpSrcDecayCheck(Table):
 
 class IpDecayCheck(Table):
 
-    def __init__(self, client, bfrt_info):
+    def __init__(self, client, bfrt_info, reconcile=False):
         # set up base class
-        super(IpDecayCheck, self).__init__(client, bfrt_info)
+        super(IpDecayCheck, self).__init__(client, bfrt_info, reconcile)
 
         self.logger = logging.getLogger('ip_decay_check')
         self.logger.info('Setting up ip_decay_check table...')
@@ -172,8 +177,9 @@ class IpDecayCheck(Table):
         # get this table
         self.table = self.bfrt_info.table_get('SwitchIngress_a.stats_ip_a.decay_check')
 
-        # clear and add defaults
-        self.clear()
+        # clear and add defaults (unless reconciling, see Table.batch_end)
+        if not self.reconcile:
+            self.clear()
 
     def add_entry(self, counter, interval):
         # target all pipes on device 0
@@ -181,7 +187,7 @@ class IpDecayCheck(Table):
 
         self.logger.info('Programming entries on ip_decay_check table...')
 
-        self.table.entry_add(
+        self.entry_add(
            target,
            [self.table.make_key(
                [gc.KeyTuple('ig_md.meta.decay_cntr', counter)])],
@@ -190,9 +196,9 @@ class IpDecayCheck(Table):
 
 class FiveTDecayCheck(Table):
 
-    def __init__(self, client, bfrt_info):
+    def __init__(self, client, bfrt_info, reconcile=False):
         # set up base class
-        super(FiveTDecayCheck, self).__init__(client, bfrt_info)
+        super(FiveTDecayCheck, self).__init__(client, bfrt_info, reconcile)
 
         self.logger = logging.getLogger('five_t_decay_check')
         self.logger.info('Setting up five_t_decay_check table...')
@@ -200,8 +206,9 @@ class FiveTDecayCheck(Table):
         # get this table
         self.table = self.bfrt_info.table_get('SwitchIngress_a.stats_five_t_a.decay_check')
 
-        # clear and add defaults
-        self.clear()
+        # clear and add defaults (unless reconciling, see Table.batch_end)
+        if not self.reconcile:
+            self.clear()
 
     def add_entry(self, counter, interval):
         # target all pipes on device 0
@@ -209,7 +216,7 @@ class FiveTDecayCheck(Table):
 
         self.logger.info('Programming entries on five_t_decay_check table...')
 
-        self.table.entry_add(
+        self.entry_add(
            target,
            [self.table.make_key(
                [gc.KeyTuple('ig_md.meta.decay_cntr', counter)])],
@@ -218,9 +225,9 @@ class FiveTDecayCheck(Table):
 
 class MacIpSrcMean(Table):
 
-    def __init__(self, client, bfrt_info):
+    def __init__(self, client, bfrt_info, reconcile=False):
         # set up base class
-        super(MacIpSrcMean, self).__init__(client, bfrt_info)
+        super(MacIpSrcMean, self).__init__(client, bfrt_info, reconcile)
 
         self.logger = logging.getLogger('mac_ip_src_mean')
         self.logger.info('Setting up mac_ip_src_mean table...')
@@ -228,8 +235,9 @@ class MacIpSrcMean(Table):
         # get this table
         self.table = self.bfrt_info.table_get('SwitchIngress_b.stats_mac_ip_src_b.mean')
 
-        # clear and add defaults
-        self.clear()
+        # clear and add defaults (unless reconciling, see Table.batch_end)
+        if not self.reconcile:
+            self.clear()
 
     def add_entry(self, priority, power, mask, div):
         # target all pipes on device 0
@@ -237,7 +245,7 @@ class MacIpSrcMean(Table):
 
         self.logger.info('Programming entries on mac_ip_src_mean table...')
 
-        self.table.entry_add(
+        self.entry_add(
            target,
            [self.table.make_key(
                [gc.KeyTuple('hdr.peregrine.mac_ip_src_pkt_cnt', power, mask),
@@ -247,9 +255,9 @@ class MacIpSrcMean(Table):
 
 class IpSrcMean(Table):
 
-    def __init__(self, client, bfrt_info):
+    def __init__(self, client, bfrt_info, reconcile=False):
         # set up base class
-        super(IpSrcMean, self).__init__(client, bfrt_info)
+        super(IpSrcMean, self).__init__(client, bfrt_info, reconcile)
 
         self.logger = logging.getLogger('ip_src_mean')
         self.logger.info('Setting up ip_src_mean table...')
@@ -257,8 +265,9 @@ class IpSrcMean(Table):
         # get this table
         self.table = self.bfrt_info.table_get('SwitchIngress_b.stats_ip_src_b.mean')
 
-        # clear and add defaults
-        self.clear()
+        # clear and add defaults (unless reconciling, see Table.batch_end)
+        if not self.reconcile:
+            self.clear()
 
     def add_entry(self, priority, power, mask, div):
         # target all pipes on device 0
@@ -266,7 +275,7 @@ class IpSrcMean(Table):
 
         self.logger.info('Programming entries on ip_src_mean table...')
 
-        self.table.entry_add(
+        self.entry_add(
            target,
            [self.table.make_key(
                [gc.KeyTuple('hdr.peregrine.ip_src_pkt_cnt', power, mask),
@@ -276,9 +285,9 @@ class IpSrcMean(Table):
 
 class IpMean0(Table):
 
-    def __init__(self, client, bfrt_info):
+    def __init__(self, client, bfrt_info, reconcile=False):
         # set up base class
-        super(IpMean0, self).__init__(client, bfrt_info)
+        super(IpMean0, self).__init__(client, bfrt_info, reconcile)
 
         self.logger = logging.getLogger('ip_mean_0')
         self.logger.info('Setting up ip_mean_0 table...')
@@ -286,8 +295,9 @@ class IpMean0(Table):
         # get this table
         self.table = self.bfrt_info.table_get('SwitchIngress_a.stats_ip_a.mean_0')
 
-        # clear and add defaults
-        self.clear()
+        # clear and add defaults (unless reconciling, see Table.batch_end)
+        if not self.reconcile:
+            self.clear()
 
     def add_entry(self, priority, power, mask, div):
         # target all pipes on device 0
@@ -295,7 +305,7 @@ class IpMean0(Table):
 
         self.logger.info('Programming entries on ip_mean_0 table...')
 
-        self.table.entry_add(
+        self.entry_add(
            target,
            [self.table.make_key(
                [gc.KeyTuple('ig_md.stats_ip.pkt_cnt_0', power, mask),
@@ -305,9 +315,9 @@ class IpMean0(Table):
 
 class IpResStructUpdate(Table):
 
-    def __init__(self, client, bfrt_info):
+    def __init__(self, client, bfrt_info, reconcile=False):
         # set up base class
-        super(IpResStructUpdate, self).__init__(client, bfrt_info)
+        super(IpResStructUpdate, self).__init__(client, bfrt_info, reconcile)
 
         self.logger = logging.getLogger('ip_res_struct_update')
         self.logger.info('Setting up ip_res_struct_update table...')
@@ -315,8 +325,9 @@ class IpResStructUpdate(Table):
         # get this table
         self.table = self.bfrt_info.table_get('SwitchIngress_a.stats_ip_a.res_struct_update')
 
-        # clear and add defaults
-        self.clear()
+        # clear and add defaults (unless reconciling, see Table.batch_end)
+        if not self.reconcile:
+            self.clear()
 
     def add_entry(self, flag, div):
         # target all pipes on device 0
@@ -324,7 +335,7 @@ class IpResStructUpdate(Table):
 
         self.logger.info('Programming entries on ip_res_struct_update table...')
 
-        self.table.entry_add(
+        self.entry_add(
            target,
            [self.table.make_key(
                [gc.KeyTuple('ig_md.stats_ip.res_check', flag)])],
@@ -333,9 +344,9 @@ class IpResStructUpdate(Table):
 
 class IpResProd(Table):
 
-    def __init__(self, client, bfrt_info):
+    def __init__(self, client, bfrt_info, reconcile=False):
         # set up base class
-        super(IpResProd, self).__init__(client, bfrt_info)
+        super(IpResProd, self).__init__(client, bfrt_info, reconcile)
 
         self.logger = logging.getLogger('ip_res_prod')
         self.logger.info('Setting up ip_res_prod table...')
@@ -343,8 +354,9 @@ class IpResProd(Table):
         # get this table
         self.table = self.bfrt_info.table_get('SwitchIngress_a.stats_ip_a.res_prod')
 
-        # clear and add defaults
-        self.clear()
+        # clear and add defaults (unless reconciling, see Table.batch_end)
+        if not self.reconcile:
+            self.clear()
 
     def add_entry(self, priority, power, mask, div):
         # target all pipes on device 0
@@ -352,7 +364,7 @@ class IpResProd(Table):
 
         self.logger.info('Programming entries on ip_res_prod table...')
 
-        self.table.entry_add(
+        self.entry_add(
            target,
            [self.table.make_key(
                [gc.KeyTuple('ig_md.stats_ip.res_1', power, mask),
@@ -362,9 +374,9 @@ class IpResProd(Table):
 
 class IpSumResProdGetCarry(Table):
 
-    def __init__(self, client, bfrt_info):
+    def __init__(self, client, bfrt_info, reconcile=False):
         # set up base class
-        super(IpSumResProdGetCarry, self).__init__(client, bfrt_info)
+        super(IpSumResProdGetCarry, self).__init__(client, bfrt_info, reconcile)
 
         self.logger = logging.getLogger('ip_sum_res_prod_get_carry')
         self.logger.info('Setting up ip_sum_res_prod_get_carry table...')
@@ -372,8 +384,9 @@ class IpSumResProdGetCarry(Table):
         # get this table
         self.table = self.bfrt_info.table_get('SwitchIngress_a.stats_ip_a.sum_res_prod_get_carry')
 
-        # clear and add defaults
-        self.clear()
+        # clear and add defaults (unless reconciling, see Table.batch_end)
+        if not self.reconcile:
+            self.clear()
 
     def add_entry(self, power, div):
         # target all pipes on device 0
@@ -381,7 +394,7 @@ class IpSumResProdGetCarry(Table):
 
         self.logger.info('Programming entries on ip_sum_res_prod_get_carry table...')
 
-        self.table.entry_add(
+        self.entry_add(
            target,
            [self.table.make_key(
                [gc.KeyTuple('ig_md.stats_ip.decay_check', power)])],
@@ -390,9 +403,9 @@ class IpSumResProdGetCarry(Table):
 
 class IpPktCnt1Access(Table):
 
-    def __init__(self, client, bfrt_info):
+    def __init__(self, client, bfrt_info, reconcile=False):
         # set up base class
-        super(IpPktCnt1Access, self).__init__(client, bfrt_info)
+        super(IpPktCnt1Access, self).__init__(client, bfrt_info, reconcile)
 
         self.logger = logging.getLogger('ip_pkt_cnt_1_access')
         self.logger.info('Setting up ip_pkt_cnt_1_access table...')
@@ -400,8 +413,9 @@ class IpPktCnt1Access(Table):
         # get this table
         self.table = self.bfrt_info.table_get('SwitchIngress_a.stats_ip_a.pkt_cnt_1_access')
 
-        # clear and add defaults
-        self.clear()
+        # clear and add defaults (unless reconciling, see Table.batch_end)
+        if not self.reconcile:
+            self.clear()
 
     def add_entry(self, const, div):
         # target all pipes on device 0
@@ -409,7 +423,7 @@ class IpPktCnt1Access(Table):
 
         self.logger.info('Programming entries on ip_pkt_cnt_1_access table...')
 
-        self.table.entry_add(
+        self.entry_add(
            target,
            [self.table.make_key(
                [gc.KeyTuple('ig_md.meta.recirc_toggle', const)])],
@@ -418,9 +432,9 @@ class IpPktCnt1Access(Table):
 
 class IpSs1Access(Table):
 
-    def __init__(self, client, bfrt_info):
+    def __init__(self, client, bfrt_info, reconcile=False):
         # set up base class
-        super(IpSs1Access, self).__init__(client, bfrt_info)
+        super(IpSs1Access, self).__init__(client, bfrt_info, reconcile)
 
         self.logger = logging.getLogger('ip_ss_1_access')
         self.logger.info('Setting up ip_ss_1_access table...')
@@ -428,8 +442,9 @@ class IpSs1Access(Table):
         # get this table
         self.table = self.bfrt_info.table_get('SwitchIngress_a.stats_ip_a.ss_1_access')
 
-        # clear and add defaults
-        self.clear()
+        # clear and add defaults (unless reconciling, see Table.batch_end)
+        if not self.reconcile:
+            self.clear()
 
     def add_entry(self, const, div):
         # target all pipes on device 0
@@ -437,7 +452,7 @@ class IpSs1Access(Table):
 
         self.logger.info('Programming entries on ip_ss_1_access table...')
 
-        self.table.entry_add(
+        self.entry_add(
            target,
            [self.table.make_key(
                [gc.KeyTuple('ig_md.meta.recirc_toggle', const)])],
@@ -446,9 +461,9 @@ class IpSs1Access(Table):
 
 class IpMean1Access(Table):
 
-    def __init__(self, client, bfrt_info):
+    def __init__(self, client, bfrt_info, reconcile=False):
         # set up base class
-        super(IpMean1Access, self).__init__(client, bfrt_info)
+        super(IpMean1Access, self).__init__(client, bfrt_info, reconcile)
 
         self.logger = logging.getLogger('ip_mean_1_access')
         self.logger.info('Setting up ip_mean_1_access table...')
@@ -456,8 +471,9 @@ class IpMean1Access(Table):
         # get this table
         self.table = self.bfrt_info.table_get('SwitchIngress_a.stats_ip_a.mean_1_access')
 
-        # clear and add defaults
-        self.clear()
+        # clear and add defaults (unless reconciling, see Table.batch_end)
+        if not self.reconcile:
+            self.clear()
 
     def add_entry(self, const, div):
         # target all pipes on device 0
@@ -465,7 +481,7 @@ class IpMean1Access(Table):
 
         self.logger.info('Programming entries on ip_mean_1_access table...')
 
-        self.table.entry_add(
+        self.entry_add(
            target,
            [self.table.make_key(
                [gc.KeyTuple('ig_md.meta.recirc_toggle', const)])],
@@ -474,9 +490,9 @@ class IpMean1Access(Table):
 
 class IpMeanSs0(Table):
 
-    def __init__(self, client, bfrt_info):
+    def __init__(self, client, bfrt_info, reconcile=False):
         # set up base class
-        super(IpMeanSs0, self).__init__(client, bfrt_info)
+        super(IpMeanSs0, self).__init__(client, bfrt_info, reconcile)
 
         self.logger = logging.getLogger('ip_mean_ss_0')
         self.logger.info('Setting up ip_mean_ss_0 table...')
@@ -484,8 +500,9 @@ class IpMeanSs0(Table):
         # get this table
         self.table = self.bfrt_info.table_get('SwitchIngress_b.stats_ip_b.mean_ss_0')
 
-        # clear and add defaults
-        self.clear()
+        # clear and add defaults (unless reconciling, see Table.batch_end)
+        if not self.reconcile:
+            self.clear()
 
     def add_entry(self, priority, const, mask, div):
         # target all pipes on device 0
@@ -493,7 +510,7 @@ class IpMeanSs0(Table):
 
         self.logger.info('Programming entries on ip_mean_ss_0 table...')
 
-        self.table.entry_add(
+        self.entry_add(
            target,
            [self.table.make_key(
                [gc.KeyTuple('hdr.peregrine.ip_pkt_cnt', const, mask),
@@ -503,9 +520,9 @@ class IpMeanSs0(Table):
 
 class IpMeanSs1(Table):
 
-    def __init__(self, client, bfrt_info):
+    def __init__(self, client, bfrt_info, reconcile=False):
         # set up base class
-        super(IpMeanSs1, self).__init__(client, bfrt_info)
+        super(IpMeanSs1, self).__init__(client, bfrt_info, reconcile)
 
         self.logger = logging.getLogger('ip_mean_ss_1')
         self.logger.info('Setting up ip_mean_ss_1 table...')
@@ -513,8 +530,9 @@ class IpMeanSs1(Table):
         # get this table
         self.table = self.bfrt_info.table_get('SwitchIngress_b.stats_ip_b.mean_ss_1')
 
-        # clear and add defaults
-        self.clear()
+        # clear and add defaults (unless reconciling, see Table.batch_end)
+        if not self.reconcile:
+            self.clear()
 
     def add_entry(self, priority, const, mask, div):
         # target all pipes on device 0
@@ -522,7 +540,7 @@ class IpMeanSs1(Table):
 
         self.logger.info('Programming entries on ip_mean_ss_1 table...')
 
-        self.table.entry_add(
+        self.entry_add(
            target,
            [self.table.make_key(
                [gc.KeyTuple('hdr.peregrine.ip_pkt_cnt_1', const, mask),
@@ -532,9 +550,9 @@ class IpMeanSs1(Table):
 
 class IpVariance0Abs(Table):
 
-    def __init__(self, client, bfrt_info):
+    def __init__(self, client, bfrt_info, reconcile=False):
         # set up base class
-        super(IpVariance0Abs, self).__init__(client, bfrt_info)
+        super(IpVariance0Abs, self).__init__(client, bfrt_info, reconcile)
 
         self.logger = logging.getLogger('ip_variance_0_abs')
         self.logger.info('Setting up ip_variance_0_abs table...')
@@ -542,8 +560,9 @@ class IpVariance0Abs(Table):
         # get this table
         self.table = self.bfrt_info.table_get('SwitchIngress_b.stats_ip_b.variance_0_abs')
 
-        # clear and add defaults
-        self.clear()
+        # clear and add defaults (unless reconciling, see Table.batch_end)
+        if not self.reconcile:
+            self.clear()
 
     def add_entry(self, priority, const, mask, div):
         # target all pipes on device 0
@@ -551,7 +570,7 @@ class IpVariance0Abs(Table):
 
         self.logger.info('Programming entries on ip_variance_0_abs table...')
 
-        self.table.entry_add(
+        self.entry_add(
            target,
            [self.table.make_key(
                [gc.KeyTuple('ig_md.stats_ip.variance_0', const, mask),
@@ -561,9 +580,9 @@ class IpVariance0Abs(Table):
 
 class IpVariance1Abs(Table):
 
-    def __init__(self, client, bfrt_info):
+    def __init__(self, client, bfrt_info, reconcile=False):
         # set up base class
-        super(IpVariance1Abs, self).__init__(client, bfrt_info)
+        super(IpVariance1Abs, self).__init__(client, bfrt_info, reconcile)
 
         self.logger = logging.getLogger('ip_variance_1_abs')
         self.logger.info('Setting up ip_variance_1_abs table...')
@@ -571,8 +590,9 @@ class IpVariance1Abs(Table):
         # get this table
         self.table = self.bfrt_info.table_get('SwitchIngress_b.stats_ip_b.variance_1_abs')
 
-        # clear and add defaults
-        self.clear()
+        # clear and add defaults (unless reconciling, see Table.batch_end)
+        if not self.reconcile:
+            self.clear()
 
     def add_entry(self, priority, const, mask, div):
         # target all pipes on device 0
@@ -580,7 +600,7 @@ class IpVariance1Abs(Table):
 
         self.logger.info('Programming entries on ip_variance_1_abs table...')
 
-        self.table.entry_add(
+        self.entry_add(
            target,
            [self.table.make_key(
                [gc.KeyTuple('ig_md.stats_ip.variance_1', const, mask),
@@ -590,9 +610,9 @@ class IpVariance1Abs(Table):
 
 class IpCov(Table):
 
-    def __init__(self, client, bfrt_info):
+    def __init__(self, client, bfrt_info, reconcile=False):
         # set up base class
-        super(IpCov, self).__init__(client, bfrt_info)
+        super(IpCov, self).__init__(client, bfrt_info, reconcile)
 
         self.logger = logging.getLogger('ip_cov')
         self.logger.info('Setting up ip_cov table...')
@@ -600,8 +620,9 @@ class IpCov(Table):
         # get this table
         self.table = self.bfrt_info.table_get('SwitchIngress_b.stats_ip_b.cov')
 
-        # clear and add defaults
-        self.clear()
+        # clear and add defaults (unless reconciling, see Table.batch_end)
+        if not self.reconcile:
+            self.clear()
 
     def add_entry(self, priority, power, mask, div):
         # target all pipes on device 0
@@ -609,7 +630,7 @@ class IpCov(Table):
 
         self.logger.info('Programming entries on ip_cov table...')
 
-        self.table.entry_add(
+        self.entry_add(
            target,
            [self.table.make_key(
                [gc.KeyTuple('hdr.peregrine.ip_pkt_cnt_1', power, mask),
@@ -619,9 +640,9 @@ class IpCov(Table):
 
 class IpStdDevProd(Table):
 
-    def __init__(self, client, bfrt_info):
+    def __init__(self, client, bfrt_info, reconcile=False):
         # set up base class
-        super(IpStdDevProd, self).__init__(client, bfrt_info)
+        super(IpStdDevProd, self).__init__(client, bfrt_info, reconcile)
 
         self.logger = logging.getLogger('ip_std_dev_prod')
         self.logger.info('Setting up ip_std_dev_prod table...')
@@ -629,8 +650,9 @@ class IpStdDevProd(Table):
         # get this table
         self.table = self.bfrt_info.table_get('SwitchIngress_b.stats_ip_b.std_dev_prod')
 
-        # clear and add defaults
-        self.clear()
+        # clear and add defaults (unless reconciling, see Table.batch_end)
+        if not self.reconcile:
+            self.clear()
 
     def add_entry(self, priority, power, mask, div):
         # target all pipes on device 0
@@ -638,7 +660,7 @@ class IpStdDevProd(Table):
 
         self.logger.info('Programming entries on ip_std_dev_prod table...')
 
-        self.table.entry_add(
+        self.entry_add(
            target,
            [self.table.make_key(
                [gc.KeyTuple('ig_md.stats_ip.std_dev_1', power, mask),
@@ -648,9 +670,9 @@ class IpStdDevProd(Table):
 
 class IpPcc(Table):
 
-    def __init__(self, client, bfrt_info):
+    def __init__(self, client, bfrt_info, reconcile=False):
         # set up base class
-        super(IpPcc, self).__init__(client, bfrt_info)
+        super(IpPcc, self).__init__(client, bfrt_info, reconcile)
 
         self.logger = logging.getLogger('ip_pcc')
         self.logger.info('Setting up ip_pcc table...')
@@ -658,8 +680,9 @@ class IpPcc(Table):
         # get this table
         self.table = self.bfrt_info.table_get('SwitchIngress_b.stats_ip_b.pcc')
 
-        # clear and add defaults
-        self.clear()
+        # clear and add defaults (unless reconciling, see Table.batch_end)
+        if not self.reconcile:
+            self.clear()
 
     def add_entry(self, priority, power, mask, div):
         # target all pipes on device 0
@@ -667,7 +690,7 @@ class IpPcc(Table):
 
         self.logger.info('Programming entries on ip_pcc table...')
 
-        self.table.entry_add(
+        self.entry_add(
            target,
            [self.table.make_key(
                [gc.KeyTuple('ig_md.stats_ip.std_dev_prod', power, mask),
@@ -677,9 +700,9 @@ class IpPcc(Table):
 
 class FiveTMean0(Table):
 
-    def __init__(self, client, bfrt_info):
+    def __init__(self, client, bfrt_info, reconcile=False):
         # set up base class
-        super(FiveTMean0, self).__init__(client, bfrt_info)
+        super(FiveTMean0, self).__init__(client, bfrt_info, reconcile)
 
         self.logger = logging.getLogger('five_t_mean_0')
         self.logger.info('Setting up five_t_mean_0 table...')
@@ -687,8 +710,9 @@ class FiveTMean0(Table):
         # get this table
         self.table = self.bfrt_info.table_get('SwitchIngress_a.stats_five_t_a.mean_0')
 
-        # clear and add defaults
-        self.clear()
+        # clear and add defaults (unless reconciling, see Table.batch_end)
+        if not self.reconcile:
+            self.clear()
 
     def add_entry(self, priority, power, mask, div):
         # target all pipes on device 0
@@ -696,7 +720,7 @@ class FiveTMean0(Table):
 
         self.logger.info('Programming entries on five_t_mean_0 table...')
 
-        self.table.entry_add(
+        self.entry_add(
            target,
            [self.table.make_key(
                [gc.KeyTuple('ig_md.stats_five_t.pkt_cnt_0', power, mask),
@@ -706,9 +730,9 @@ class FiveTMean0(Table):
 
 class FiveTResStructUpdate(Table):
 
-    def __init__(self, client, bfrt_info):
+    def __init__(self, client, bfrt_info, reconcile=False):
         # set up base class
-        super(FiveTResStructUpdate, self).__init__(client, bfrt_info)
+        super(FiveTResStructUpdate, self).__init__(client, bfrt_info, reconcile)
 
         self.logger = logging.getLogger('five_t_res_struct_update')
         self.logger.info('Setting up five_t_res_struct_update table...')
@@ -716,8 +740,9 @@ class FiveTResStructUpdate(Table):
         # get this table
         self.table = self.bfrt_info.table_get('SwitchIngress_a.stats_five_t_a.res_struct_update')
 
-        # clear and add defaults
-        self.clear()
+        # clear and add defaults (unless reconciling, see Table.batch_end)
+        if not self.reconcile:
+            self.clear()
 
     def add_entry(self, flag, div):
         # target all pipes on device 0
@@ -725,7 +750,7 @@ class FiveTResStructUpdate(Table):
 
         self.logger.info('Programming entries on five_t_res_struct_update table...')
 
-        self.table.entry_add(
+        self.entry_add(
            target,
            [self.table.make_key(
                [gc.KeyTuple('ig_md.stats_five_t.res_check', flag)])],
@@ -734,9 +759,9 @@ class FiveTResStructUpdate(Table):
 
 class FiveTResProd(Table):
 
-    def __init__(self, client, bfrt_info):
+    def __init__(self, client, bfrt_info, reconcile=False):
         # set up base class
-        super(FiveTResProd, self).__init__(client, bfrt_info)
+        super(FiveTResProd, self).__init__(client, bfrt_info, reconcile)
 
         self.logger = logging.getLogger('five_t_res_prod')
         self.logger.info('Setting up five_t_res_prod table...')
@@ -744,8 +769,9 @@ class FiveTResProd(Table):
         # get this table
         self.table = self.bfrt_info.table_get('SwitchIngress_a.stats_five_t_a.res_prod')
 
-        # clear and add defaults
-        self.clear()
+        # clear and add defaults (unless reconciling, see Table.batch_end)
+        if not self.reconcile:
+            self.clear()
 
     def add_entry(self, priority, power, mask, div):
         # target all pipes on device 0
@@ -753,7 +779,7 @@ class FiveTResProd(Table):
 
         self.logger.info('Programming entries on five_t_res_prod table...')
 
-        self.table.entry_add(
+        self.entry_add(
            target,
            [self.table.make_key(
                [gc.KeyTuple('ig_md.stats_five_t.res_1', power, mask),
@@ -763,9 +789,9 @@ class FiveTResProd(Table):
 
 class FiveTSumResProdGetCarry(Table):
 
-    def __init__(self, client, bfrt_info):
+    def __init__(self, client, bfrt_info, reconcile=False):
         # set up base class
-        super(FiveTSumResProdGetCarry, self).__init__(client, bfrt_info)
+        super(FiveTSumResProdGetCarry, self).__init__(client, bfrt_info, reconcile)
 
         self.logger = logging.getLogger('five_t_sum_res_prod_get_carry')
         self.logger.info('Setting up five_t_sum_res_prod_get_carry table...')
@@ -773,8 +799,9 @@ class FiveTSumResProdGetCarry(Table):
         # get this table
         self.table = self.bfrt_info.table_get('SwitchIngress_a.stats_five_t_a.sum_res_prod_get_carry')
 
-        # clear and add defaults
-        self.clear()
+        # clear and add defaults (unless reconciling, see Table.batch_end)
+        if not self.reconcile:
+            self.clear()
 
     def add_entry(self, power, div):
         # target all pipes on device 0
@@ -782,7 +809,7 @@ class FiveTSumResProdGetCarry(Table):
 
         self.logger.info('Programming entries on five_t_sum_res_prod_get_carry table...')
 
-        self.table.entry_add(
+        self.entry_add(
            target,
            [self.table.make_key(
                [gc.KeyTuple('ig_md.stats_five_t.decay_check', power)])],
@@ -791,9 +818,9 @@ class FiveTSumResProdGetCarry(Table):
 
 class FiveTPktCnt1Access(Table):
 
-    def __init__(self, client, bfrt_info):
+    def __init__(self, client, bfrt_info, reconcile=False):
         # set up base class
-        super(FiveTPktCnt1Access, self).__init__(client, bfrt_info)
+        super(FiveTPktCnt1Access, self).__init__(client, bfrt_info, reconcile)
 
         self.logger = logging.getLogger('five_t_pkt_cnt_1_access')
         self.logger.info('Setting up five_t_pkt_cnt_1_access table...')
@@ -801,8 +828,9 @@ class FiveTPktCnt1Access(Table):
         # get this table
         self.table = self.bfrt_info.table_get('SwitchIngress_a.stats_five_t_a.pkt_cnt_1_access')
 
-        # clear and add defaults
-        self.clear()
+        # clear and add defaults (unless reconciling, see Table.batch_end)
+        if not self.reconcile:
+            self.clear()
 
     def add_entry(self, const, div):
         # target all pipes on device 0
@@ -810,7 +838,7 @@ class FiveTPktCnt1Access(Table):
 
         self.logger.info('Programming entries on five_t_pkt_cnt_1_access table...')
 
-        self.table.entry_add(
+        self.entry_add(
            target,
            [self.table.make_key(
                [gc.KeyTuple('ig_md.meta.recirc_toggle', const)])],
@@ -819,9 +847,9 @@ class FiveTPktCnt1Access(Table):
 
 class FiveTSs1Access(Table):
 
-    def __init__(self, client, bfrt_info):
+    def __init__(self, client, bfrt_info, reconcile=False):
         # set up base class
-        super(FiveTSs1Access, self).__init__(client, bfrt_info)
+        super(FiveTSs1Access, self).__init__(client, bfrt_info, reconcile)
 
         self.logger = logging.getLogger('five_t_ss_1_access')
         self.logger.info('Setting up five_t_ss_1_access table...')
@@ -829,8 +857,9 @@ class FiveTSs1Access(Table):
         # get this table
         self.table = self.bfrt_info.table_get('SwitchIngress_a.stats_five_t_a.ss_1_access')
 
-        # clear and add defaults
-        self.clear()
+        # clear and add defaults (unless reconciling, see Table.batch_end)
+        if not self.reconcile:
+            self.clear()
 
     def add_entry(self, const, div):
         # target all pipes on device 0
@@ -838,7 +867,7 @@ class FiveTSs1Access(Table):
 
         self.logger.info('Programming entries on five_t_ss_1_access table...')
 
-        self.table.entry_add(
+        self.entry_add(
            target,
            [self.table.make_key(
                [gc.KeyTuple('ig_md.meta.recirc_toggle', const)])],
@@ -847,9 +876,9 @@ class FiveTSs1Access(Table):
 
 class FiveTMean1Access(Table):
 
-    def __init__(self, client, bfrt_info):
+    def __init__(self, client, bfrt_info, reconcile=False):
         # set up base class
-        super(FiveTMean1Access, self).__init__(client, bfrt_info)
+        super(FiveTMean1Access, self).__init__(client, bfrt_info, reconcile)
 
         self.logger = logging.getLogger('five_t_mean_1_access')
         self.logger.info('Setting up five_t_mean_1_access table...')
@@ -857,8 +886,9 @@ class FiveTMean1Access(Table):
         # get this table
         self.table = self.bfrt_info.table_get('SwitchIngress_a.stats_five_t_a.mean_1_access')
 
-        # clear and add defaults
-        self.clear()
+        # clear and add defaults (unless reconciling, see Table.batch_end)
+        if not self.reconcile:
+            self.clear()
 
     def add_entry(self, const, div):
         # target all pipes on device 0
@@ -866,7 +896,7 @@ class FiveTMean1Access(Table):
 
         self.logger.info('Programming entries on five_t_mean_1_access table...')
 
-        self.table.entry_add(
+        self.entry_add(
            target,
            [self.table.make_key(
                [gc.KeyTuple('ig_md.meta.recirc_toggle', const)])],
@@ -875,9 +905,9 @@ class FiveTMean1Access(Table):
 
 class FiveTMeanSs0(Table):
 
-    def __init__(self, client, bfrt_info):
+    def __init__(self, client, bfrt_info, reconcile=False):
         # set up base class
-        super(FiveTMeanSs0, self).__init__(client, bfrt_info)
+        super(FiveTMeanSs0, self).__init__(client, bfrt_info, reconcile)
 
         self.logger = logging.getLogger('five_t_mean_ss_0')
         self.logger.info('Setting up five_t_mean_ss_0 table...')
@@ -885,8 +915,9 @@ class FiveTMeanSs0(Table):
         # get this table
         self.table = self.bfrt_info.table_get('SwitchIngress_b.stats_five_t_b.mean_ss_0')
 
-        # clear and add defaults
-        self.clear()
+        # clear and add defaults (unless reconciling, see Table.batch_end)
+        if not self.reconcile:
+            self.clear()
 
     def add_entry(self, priority, const, mask, div):
         # target all pipes on device 0
@@ -894,7 +925,7 @@ class FiveTMeanSs0(Table):
 
         self.logger.info('Programming entries on five_t_mean_ss_0 table...')
 
-        self.table.entry_add(
+        self.entry_add(
            target,
            [self.table.make_key(
                [gc.KeyTuple('hdr.peregrine.five_t_pkt_cnt', const, mask),
@@ -904,9 +935,9 @@ class FiveTMeanSs0(Table):
 
 class FiveTMeanSs1(Table):
 
-    def __init__(self, client, bfrt_info):
+    def __init__(self, client, bfrt_info, reconcile=False):
         # set up base class
-        super(FiveTMeanSs1, self).__init__(client, bfrt_info)
+        super(FiveTMeanSs1, self).__init__(client, bfrt_info, reconcile)
 
         self.logger = logging.getLogger('five_t_mean_ss_1')
         self.logger.info('Setting up five_t_mean_ss_1 table...')
@@ -914,8 +945,9 @@ class FiveTMeanSs1(Table):
         # get this table
         self.table = self.bfrt_info.table_get('SwitchIngress_b.stats_five_t_b.mean_ss_1')
 
-        # clear and add defaults
-        self.clear()
+        # clear and add defaults (unless reconciling, see Table.batch_end)
+        if not self.reconcile:
+            self.clear()
 
     def add_entry(self, priority, const, mask, div):
         # target all pipes on device 0
@@ -923,7 +955,7 @@ class FiveTMeanSs1(Table):
 
         self.logger.info('Programming entries on five_t_mean_ss_1 table...')
 
-        self.table.entry_add(
+        self.entry_add(
            target,
            [self.table.make_key(
                [gc.KeyTuple('hdr.peregrine.five_t_pkt_cnt_1', const, mask),
@@ -933,9 +965,9 @@ class FiveTMeanSs1(Table):
 
 class FiveTVariance0Abs(Table):
 
-    def __init__(self, client, bfrt_info):
+    def __init__(self, client, bfrt_info, reconcile=False):
         # set up base class
-        super(FiveTVariance0Abs, self).__init__(client, bfrt_info)
+        super(FiveTVariance0Abs, self).__init__(client, bfrt_info, reconcile)
 
         self.logger = logging.getLogger('five_t_variance_0_abs')
         self.logger.info('Setting up five_t_variance_0_abs table...')
@@ -943,8 +975,9 @@ class FiveTVariance0Abs(Table):
         # get this table
         self.table = self.bfrt_info.table_get('SwitchIngress_b.stats_five_t_b.variance_0_abs')
 
-        # clear and add defaults
-        self.clear()
+        # clear and add defaults (unless reconciling, see Table.batch_end)
+        if not self.reconcile:
+            self.clear()
 
     def add_entry(self, priority, const, mask, div):
         # target all pipes on device 0
@@ -952,7 +985,7 @@ class FiveTVariance0Abs(Table):
 
         self.logger.info('Programming entries on five_t_variance_0_abs table...')
 
-        self.table.entry_add(
+        self.entry_add(
            target,
            [self.table.make_key(
                [gc.KeyTuple('ig_md.stats_five_t.variance_0', const, mask),
@@ -962,9 +995,9 @@ class FiveTVariance0Abs(Table):
 
 class FiveTVariance1Abs(Table):
 
-    def __init__(self, client, bfrt_info):
+    def __init__(self, client, bfrt_info, reconcile=False):
         # set up base class
-        super(FiveTVariance1Abs, self).__init__(client, bfrt_info)
+        super(FiveTVariance1Abs, self).__init__(client, bfrt_info, reconcile)
 
         self.logger = logging.getLogger('five_t_variance_1_abs')
         self.logger.info('Setting up five_t_variance_1_abs table...')
@@ -972,8 +1005,9 @@ class FiveTVariance1Abs(Table):
         # get this table
         self.table = self.bfrt_info.table_get('SwitchIngress_b.stats_five_t_b.variance_1_abs')
 
-        # clear and add defaults
-        self.clear()
+        # clear and add defaults (unless reconciling, see Table.batch_end)
+        if not self.reconcile:
+            self.clear()
 
     def add_entry(self, priority, const, mask, div):
         # target all pipes on device 0
@@ -981,7 +1015,7 @@ class FiveTVariance1Abs(Table):
 
         self.logger.info('Programming entries on five_t_variance_1_abs table...')
 
-        self.table.entry_add(
+        self.entry_add(
            target,
            [self.table.make_key(
                [gc.KeyTuple('ig_md.stats_five_t.variance_1', const, mask),
@@ -991,9 +1025,9 @@ class FiveTVariance1Abs(Table):
 
 class FiveTCov(Table):
 
-    def __init__(self, client, bfrt_info):
+    def __init__(self, client, bfrt_info, reconcile=False):
         # set up base class
-        super(FiveTCov, self).__init__(client, bfrt_info)
+        super(FiveTCov, self).__init__(client, bfrt_info, reconcile)
 
         self.logger = logging.getLogger('five_t_cov')
         self.logger.info('Setting up five_t_cov table...')
@@ -1001,8 +1035,9 @@ class FiveTCov(Table):
         # get this table
         self.table = self.bfrt_info.table_get('SwitchIngress_b.stats_five_t_b.cov')
 
-        # clear and add defaults
-        self.clear()
+        # clear and add defaults (unless reconciling, see Table.batch_end)
+        if not self.reconcile:
+            self.clear()
 
     def add_entry(self, priority, power, mask, div):
         # target all pipes on device 0
@@ -1010,7 +1045,7 @@ class FiveTCov(Table):
 
         self.logger.info('Programming entries on five_t_cov table...')
 
-        self.table.entry_add(
+        self.entry_add(
            target,
            [self.table.make_key(
                [gc.KeyTuple('hdr.peregrine.five_t_pkt_cnt_1', power, mask),
@@ -1020,9 +1055,9 @@ class FiveTCov(Table):
 
 class FiveTStdDevProd(Table):
 
-    def __init__(self, client, bfrt_info):
+    def __init__(self, client, bfrt_info, reconcile=False):
         # set up base class
-        super(FiveTStdDevProd, self).__init__(client, bfrt_info)
+        super(FiveTStdDevProd, self).__init__(client, bfrt_info, reconcile)
 
         self.logger = logging.getLogger('five_t_std_dev_prod')
         self.logger.info('Setting up five_t_std_dev_prod table...')
@@ -1030,8 +1065,9 @@ class FiveTStdDevProd(Table):
         # get this table
         self.table = self.bfrt_info.table_get('SwitchIngress_b.stats_five_t_b.std_dev_prod')
 
-        # clear and add defaults
-        self.clear()
+        # clear and add defaults (unless reconciling, see Table.batch_end)
+        if not self.reconcile:
+            self.clear()
 
     def add_entry(self, priority, power, mask, div):
         # target all pipes on device 0
@@ -1039,7 +1075,7 @@ class FiveTStdDevProd(Table):
 
         self.logger.info('Programming entries on five_t_std_dev_prod table...')
 
-        self.table.entry_add(
+        self.entry_add(
            target,
            [self.table.make_key(
                [gc.KeyTuple('ig_md.stats_five_t.std_dev_1', power, mask),
@@ -1049,9 +1085,9 @@ class FiveTStdDevProd(Table):
 
 class FiveTPcc(Table):
 
-    def __init__(self, client, bfrt_info):
+    def __init__(self, client, bfrt_info, reconcile=False):
         # set up base class
-        super(FiveTPcc, self).__init__(client, bfrt_info)
+        super(FiveTPcc, self).__init__(client, bfrt_info, reconcile)
 
         self.logger = logging.getLogger('five_t_pcc')
         self.logger.info('Setting up five_t_pcc table...')
@@ -1059,8 +1095,9 @@ class FiveTPcc(Table):
         # get this table
         self.table = self.bfrt_info.table_get('SwitchIngress_b.stats_five_t_b.pcc')
 
-        # clear and add defaults
-        self.clear()
+        # clear and add defaults (unless reconciling, see Table.batch_end)
+        if not self.reconcile:
+            self.clear()
 
     def add_entry(self, priority, power, mask, div):
         # target all pipes on device 0
@@ -1068,7 +1105,7 @@ class FiveTPcc(Table):
 
         self.logger.info('Programming entries on five_t_pcc table...')
 
-        self.table.entry_add(
+        self.entry_add(
            target,
            [self.table.make_key(
                [gc.KeyTuple('ig_md.stats_five_t.std_dev_prod', power, mask),
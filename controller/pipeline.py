@@ -1,8 +1,11 @@
 import sys
 import pandas as pd
-from scapy.all import sniff, bind_layers, TCP, UDP, ICMP, Ether, IP
-from peregrine_header import PeregrineHdr
+from collections import deque
 from Peregrine import Peregrine
+from capture import PacketCapture
+from peregrine_decoder import decode_rows
+from threshold import StreamingThreshold
+from eval_buffer import EvalBuffer
 import itertools
 
 sys.path.insert(0, 'path/to/your/py_file')
@@ -23,68 +26,73 @@ cur_stats_global = []
 # List containing relevant header fields from the last received packet.
 pkt_header = []
 
-# List of RMSE classification scores for all incoming packets.
-rmse_list = []
+# Number of packets classified (RMSE scores obtained).
+rmse_cnt = 0
 
-# List containing the global eval data. Relevant packet stats + RMSE + ground truth.
-peregrine_eval = []
+# Global eval data (columnar buffer). Relevant packet stats + RMSE + ground truth.
+peregrine_eval = EvalBuffer()
 
 # Data plane-based global packet counter.
 # Needed to keep track of the total pkt num, as not all pkts are sent to the control plane.
 pkt_cnt_global = 0
 
-# The threshold value is obtained from the highest RMSE score during the training phase.
+# The threshold value is obtained from the highest RMSE score during the training phase (None),
+# or from this quantile of the training phase RMSE scores (e.g., 0.99), see threshold.py.
 threshold = 0
+threshold_quantile = None
 
+# Number of execution phase packets scored by KitNET in a single call (1 disables batching), set
+# by the controller --exec_batch option. Batched scoring is faster, but its RMSEs may differ from
+# the packet by packet ones in the last bits (float rounding of the batched products).
+exec_batch = 1
 
+# Execution phase packets waiting to be scored: (stats, data plane packet counter).
+exec_pending = []
+
+# Captured frames read from the capture queue at a time (see capture.py).
+capture_batch = 256
+
+
+# Decoded data plane packet (see peregrine_decoder.py): its header and stats, or None.
 def pkt_callback(pkt):
     global cur_stats
     cur_stats = 0
-    if PeregrineHdr in pkt:
+    if pkt is not None:
         global pkt_header
         global pkt_cnt_global
         pkt_cnt_global += 1
-        cur_stats = [[pkt[PeregrineHdr].decay,
-                     pkt[PeregrineHdr].mac_ip_src_pkt_cnt,
-                     pkt[PeregrineHdr].mac_ip_src_mean,
-                     pkt[PeregrineHdr].mac_ip_src_std_dev,
-                     pkt[PeregrineHdr].ip_src_pkt_cnt,
-                     pkt[PeregrineHdr].ip_src_mean,
-                     pkt[PeregrineHdr].ip_src_std_dev,
-                     pkt[PeregrineHdr].ip_pkt_cnt,
-                     pkt[PeregrineHdr].ip_mean_0,
-                     pkt[PeregrineHdr].ip_std_dev_0,
-                     pkt[PeregrineHdr].ip_magnitude,
-                     pkt[PeregrineHdr].ip_radius,
-                     pkt[PeregrineHdr].ip_sum_res_prod_cov,
-                     pkt[PeregrineHdr].ip_pcc,
-                     pkt[PeregrineHdr].five_t_pkt_cnt,
-                     pkt[PeregrineHdr].five_t_mean_0,
-                     pkt[PeregrineHdr].five_t_std_dev_0,
-                     pkt[PeregrineHdr].five_t_magnitude,
-                     pkt[PeregrineHdr].five_t_radius,
-                     pkt[PeregrineHdr].five_t_sum_res_prod_cov,
-                     pkt[PeregrineHdr].five_t_pcc]]
-        pkt_header = [str(pkt[Ether].src), str(pkt[IP].src), str(pkt[IP].dst), str(pkt[IP].proto)]
-        if UDP in pkt:
-            pkt_header.append(str(pkt[UDP].sport))
-            pkt_header.append(str(pkt[UDP].dport))
-        elif TCP in pkt:
-            pkt_header.append(str(pkt[TCP].sport))
-            pkt_header.append(str(pkt[TCP].dport))
-        else:
-            # If not UDP/TCP, the sport and dport values will be 0.
-            pkt_header.append('0')
-            pkt_header.append('0')
-        cur_stats.insert(0, pkt_header)
+        pkt_header, stats = pkt
+        cur_stats = [pkt_header, stats]
+
+
+# Score the pending execution phase packets and append their eval data, in order.
+def proc_exec_pending(peregrine, trace_labels, fm_grace, ad_grace):
+    global exec_pending
+    global rmse_cnt
+    if not exec_pending:
+        return
+
+    rmse_batch = peregrine.proc_next_packets([stats for stats, _ in exec_pending])
+    for (stats, pkt_cnt), rmse in zip(exec_pending, rmse_batch):
+        rmse_cnt += 1
+        try:
+            peregrine_eval.append(stats[0], stats[1], stats[2],
+                                  stats[3], stats[4], stats[5],
+                                  rmse,
+                                  trace_labels.iat[fm_grace + ad_grace + pkt_cnt - 1, 0])
+        except IndexError:
+            print(trace_labels.shape[0])
+            print(pkt_cnt)
+            print(fm_grace + ad_grace + pkt_cnt - 1)
+    exec_pending = []
 
 
 def pkt_pipeline(cur_eg_veth, pcap_path, trace_labels_path, sampling_rate, fm_grace, ad_grace,
                  max_ae, feature_map, ensemble_layer, output_layer, train_stats, attack,
-                 exact_stats, train_exact_ratio):
+                 exact_stats, train_exact_ratio, model=None):
     global cur_stats
     global threshold
-    global rmse_list
+    global rmse_cnt
     global pkt_header
     global pkt_cnt_global
     train_skip = False
@@ -99,60 +107,74 @@ def pkt_pipeline(cur_eg_veth, pcap_path, trace_labels_path, sampling_rate, fm_gr
     # Read the csv containing the ground truth labels.
     trace_labels = pd.read_csv(trace_labels_path, header=None)
 
-    bind_layers(UDP, PeregrineHdr)
-    bind_layers(TCP, PeregrineHdr)
-    bind_layers(ICMP, PeregrineHdr)
-
-    if feature_map is not None and \
-            ensemble_layer is not None and \
-            output_layer is not None and \
+    # Previously trained model: a model bundle, or else the (legacy) pickled FM, EL and OL.
+    if model is not None:
+        feature_map = ensemble_layer = output_layer = None
+    if (model is not None or
+            feature_map is not None and
+            ensemble_layer is not None and
+            output_layer is not None) and \
             train_stats is not None:
         train_skip = True
 
     # Build Peregrine.
     peregrine = Peregrine(max_ae, fm_grace, ad_grace, learning_rate, hidden_ratio, lambdas,
                           feature_map, ensemble_layer, output_layer, train_stats, attack, train_skip,
-                          train_exact_ratio)
+                          train_exact_ratio, model)
 
     # Initialize the feature extraction and calculation of statistics class.
     peregrine_stats = StatsCalc(pcap_path, sampling_rate, fm_grace+ad_grace, train_skip)
 
     trace_size = peregrine_stats.trace_size()
 
+    threshold_est = StreamingThreshold(threshold_quantile)
+
+    # Capture of the data plane packets, started with the execution phase, and the captured
+    # packets not processed yet (decoded).
+    capture = None
+    frames = deque()
+
     # Process the trace, packet by packet.
     while True:
         cur_stats = -1
 
         if not train_skip:
-            if len(rmse_list) % 1000 == 0 and len(rmse_list) < fm_grace + ad_grace:
-                print('Processed packets: ', len(rmse_list))
-            elif pkt_cnt_global % 1000 == 0 and len(rmse_list) >= fm_grace + ad_grace:
+            if rmse_cnt % 1000 == 0 and rmse_cnt < fm_grace + ad_grace:
+                print('Processed packets: ', rmse_cnt)
+            elif pkt_cnt_global % 1000 == 0 and rmse_cnt >= fm_grace + ad_grace:
                 print('Processed packets: ', fm_grace + ad_grace + pkt_cnt_global)
         else:
             if pkt_cnt_global % 1000 == 0:
                 print('Processed packets: ', fm_grace + ad_grace + pkt_cnt_global)
 
         # Training phase.
-        if len(rmse_list) < (train_exact_ratio * (fm_grace + ad_grace)) and not train_skip:
+        if rmse_cnt < (train_exact_ratio * (fm_grace + ad_grace)) and not train_skip:
             peregrine_stats.feature_extract()
             cur_stats = peregrine_stats.process_exact('training')
-        elif len(rmse_list) < fm_grace + ad_grace and not train_skip:
+        elif rmse_cnt < fm_grace + ad_grace and not train_skip:
             peregrine_stats.feature_extract()
             cur_stats = peregrine_stats.process('training')
 
         # Execution phase.
         else:
             # Execution:  data plane
+            # The packets are captured by a persistent capture thread, read and decoded in batches.
+            if capture is None:
+                capture = PacketCapture(cur_eg_veth)
+            if not frames:
+                frames.extend(decode_rows(capture.get_batch(capture_batch, timeout=60)))
             # Callback function to retrieve the packet's custom header.
-            sniff(iface=cur_eg_veth, count=1, prn=pkt_callback, timeout=60)
+            if frames:
+                pkt_callback(frames.popleft())
 
         # If any statistics were obtained, send them to the ML pipeline.
         if cur_stats != -1:
             # Execution phase: only proceed according to the sampling rate.
-            # if len(rmse_list) >= fm_grace + ad_grace and pkt_cnt_global % sampling_rate != 0:
+            # if rmse_cnt >= fm_grace + ad_grace and pkt_cnt_global % sampling_rate != 0:
             if pkt_cnt_global % sampling_rate != 0:
                 # Break when we reach the end of the trace file.
                 if fm_grace + ad_grace + pkt_cnt_global == trace_size:
+                    proc_exec_pending(peregrine, trace_labels, fm_grace, ad_grace)
                     break
                 else:
                     continue
@@ -163,23 +185,42 @@ def pkt_pipeline(cur_eg_veth, pcap_path, trace_labels_path, sampling_rate, fm_gr
             # Flatten the statistics' list of lists.
             cur_stats = list(itertools.chain(*cur_stats))
             cur_stats_global.append(cur_stats)
+
+            # Execution phase: buffer the packet and score the buffered packets in a single call.
+            if exec_batch > 1 and (train_skip or rmse_cnt >= fm_grace + ad_grace):
+                exec_pending.append((cur_stats, pkt_cnt_global))
+                if len(exec_pending) >= exec_batch:
+                    proc_exec_pending(peregrine, trace_labels, fm_grace, ad_grace)
+
+                # Break when we reach the end of the trace file.
+                if fm_grace + ad_grace + pkt_cnt_global >= trace_size:
+                    proc_exec_pending(peregrine, trace_labels, fm_grace, ad_grace)
+                    peregrine.save_exec_stats()
+                    break
+                continue
+
             # Call function with the content of kitsune's main (before the eval/csv part).
+            mapping = peregrine.AnomDetector.is_mapping()
             rmse = peregrine.proc_next_packet(cur_stats)
-            rmse_list.append(rmse)
+            rmse_cnt += 1
+            # Training phase RMSE scores (past the feature mapping) set the threshold.
+            if not train_skip and not mapping and rmse_cnt <= fm_grace + ad_grace:
+                threshold_est.update(rmse)
             try:
-                peregrine_eval.append([cur_stats[0], cur_stats[1], cur_stats[2],
-                                       cur_stats[3], cur_stats[4], cur_stats[5],
-                                       rmse,
-                                       trace_labels.iat[fm_grace + ad_grace + pkt_cnt_global - 1, 0]])
+                peregrine_eval.append(cur_stats[0], cur_stats[1], cur_stats[2],
+                                      cur_stats[3], cur_stats[4], cur_stats[5],
+                                      rmse,
+                                      trace_labels.iat[fm_grace + ad_grace + pkt_cnt_global - 1, 0])
             except IndexError:
                 print(trace_labels.shape[0])
                 print(pkt_cnt_global)
                 print(fm_grace + ad_grace + pkt_cnt_global - 1)
 
-            # At the end of the training phase, store the highest rmse value as the threshold.
+            # At the end of the training phase, store the threshold (by default, the highest
+            # rmse value).
             # Also, save the stored stat values.
-            if not train_skip and len(rmse_list) == fm_grace + ad_grace:
-                threshold = max(rmse_list, key=float)
+            if not train_skip and rmse_cnt == fm_grace + ad_grace:
+                threshold = threshold_est.threshold()
                 peregrine.save_train_stats()
                 print('Starting execution phase...')
 
@@ -189,6 +230,11 @@ def pkt_pipeline(cur_eg_veth, pcap_path, trace_labels_path, sampling_rate, fm_gr
                 break
         else:
             print('TIMEOUT.')
+            proc_exec_pending(peregrine, trace_labels, fm_grace, ad_grace)
             break
 
-    return [rmse_list, cur_stats_global, peregrine_eval, threshold, train_skip]
+    if capture is not None:
+        print('Capture: ', capture.stats())
+        capture.close()
+
+    return [cur_stats_global, peregrine_eval, threshold, train_skip]
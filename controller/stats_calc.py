@@ -1,12 +1,8 @@
-import os
-import subprocess
 import pandas as pd
-import binascii
-import socket
-import struct
-from math import isnan, sqrt, pow, log
+from math import sqrt, pow, log
 from math_unit import MathUnit
-import crcmod
+from trace_cache import load_trace, decode_trace, flow_keys, pkt_strs
+from hash_engine import HashEngine
 
 sqr = MathUnit(shift=1, invert=False, scale=-6,
                lookup=[x*x for x in range(15, -1, -1)])
@@ -20,7 +16,10 @@ sqrt_mu = MathUnit(shift=-1, invert=False, scale=-7,
 class StatsCalc:
     def __init__(self, file_path, sampling_rate, train_pkts, train_skip):
         self.file_path = file_path              # Path of the trace file / csv.
-        self.df_csv = None                      # Dataframe for the trace csv.
+        self.trace = None                       # Parsed trace columns.
+        self.pkts = None                        # Decoded per-packet fields.
+        self.pkt_hashes = None                  # Base hash indexes of all packets.
+        self.cur_pkt_index = 0                  # Trace index of the packet being processed.
         self.cur_pkt = pd.DataFrame()           # Stats of the packet being processed.
         self.sampling_rate = sampling_rate      # Sampling rate during the execution phase.
         self.train_pkts = train_pkts            # Number of packets in the training phase.
@@ -48,8 +47,8 @@ class StatsCalc:
         self.five_t_res = {}
         self.five_t_res_sum = {}
 
-        # CRC 16 parameters, following the TNA.
-        self.crc16 = crcmod.mkCrcFun(0x18005, rev=True, initCrc=0x0000, xorOut=0x0000)
+        # CRC16 hash engine, following the TNA.
+        self.hash_engine = HashEngine()
 
         # Hash values for all flow keys.
         self.hash_mac_ip_src = 0
@@ -61,36 +60,19 @@ class StatsCalc:
         self.hash_five_t_1 = 0
         self.hash_five_t_xor = 0
 
-        # Check if the pcap -> csv already exists and pass it to a dataframe.
-        self.__check_csv__()
+        # Load the parsed trace columns, building the trace cache if needed,
+        # and decode them into the per-packet fields.
+        self.trace = load_trace(self.file_path)
+        self.pkts = decode_trace(self.trace)
 
-    def __check_csv__(self):
-        # Check the file type.
-        file_path = self.file_path.split('.')[0]
-
-        if not os.path.isfile(file_path + '.csv'):
-            self.parse_pcap(self.file_path)
-
-        self.df_csv = pd.read_csv(file_path + '.csv')
+        # Base hash indexes of all packets, hashed vectorized over the whole trace.
+        self.pkt_hashes = self.hash_engine.trace_hashes(flow_keys(self.trace))
 
     def trace_size(self):
-        return len(self.df_csv)
-
-    def parse_pcap(self, pcap_path):
-        fields = "-e frame.time_epoch -e frame.len -e eth.src -e eth.dst \
-                    -e ip.src -e ip.dst -e ip.len -e ip.proto -e tcp.srcport \
-                    -e tcp.dstport -e udp.srcport -e udp.dstport -e icmp.type \
-                    -e icmp.code -e arp.opcode -e arp.src.hw_mac \
-                    -e arp.src.proto_ipv4 -e arp.dst.hw_mac -e arp.dst.proto_ipv4 \
-                    -e ipv6.src -e ipv6.dst"
-        cmd = 'tshark -r ' + pcap_path + ' -T fields ' + \
-            fields + ' -E separator=\',\' -E header=y -E occurrence=f > ' + self.file_path.split('.')[0] + '.csv'
-
-        print('Parsing pcap file to csv.')
-        subprocess.call(cmd, shell=True)
+        return len(self.pkts['ts'])
 
     def feature_extract(self):
-        # Parse the next packet from the csv.
+        # Parse the next packet from the trace.
         if self.global_pkt_index == self.train_pkts:
             self.stats_mac_ip_src = {}
             self.stats_ip_src = {}
@@ -103,38 +85,14 @@ class StatsCalc:
             self.decay_cntr = 1
             self.phase_pkt_index = 0
 
-        timestamp = float(self.df_csv.iat[self.global_pkt_index, 0])
-        mac_src = str(self.df_csv.iat[self.global_pkt_index, 2])
-        mac_dst = str(self.df_csv.iat[self.global_pkt_index, 3])
-        pkt_len = self.df_csv.iat[self.global_pkt_index, 6]
-        if isnan(pkt_len):
-            pkt_len = 0
-        ip_src = self.df_csv.iat[self.global_pkt_index, 4]
-        if str(ip_src) == 'nan':
-            ip_src = '0.0.0.0'
-        ip_dst = self.df_csv.iat[self.global_pkt_index, 5]
-        if str(ip_dst) == 'nan':
-            ip_dst = '0.0.0.0'
-        ip_proto = self.df_csv.iat[self.global_pkt_index, 7]
-        if isnan(ip_proto):
-            ip_proto = 0
-        if ip_proto == 17:
-            port_src = self.df_csv.iat[self.global_pkt_index, 10]
-            port_dst = self.df_csv.iat[self.global_pkt_index, 11]
-        elif ip_proto == 6:
-            port_src = self.df_csv.iat[self.global_pkt_index, 8]
-            port_dst = self.df_csv.iat[self.global_pkt_index, 9]
-        else:
-            port_src = 0
-            port_dst = 0
-        if isnan(port_src) or isnan(port_dst):
-            port_src = 0
-            port_dst = 0
+        # Non-IPv4 packets are kept, with a zero length and 0.0.0.0 addresses.
+        i = self.global_pkt_index
+        self.cur_pkt_index = i
+        pkt_len = self.pkts['pkt_len'].item(i) if self.pkts['ipv4'][i] else 0
 
         self.global_pkt_index = self.global_pkt_index + 1
         self.phase_pkt_index = self.phase_pkt_index + 1
-        self.cur_pkt = [pkt_len, timestamp, mac_dst, mac_src, ip_src, ip_dst,
-                        str(int(ip_proto)), str(int(port_src)), str(int(port_dst))]
+        self.cur_pkt = [pkt_len, self.pkts['ts'].item(i)] + pkt_strs(self.pkts, i)
 
     def process(self, phase):
         # Update the current decay counter value.
@@ -161,60 +119,24 @@ class StatsCalc:
                 self.sampl_pkt_index = 1
 
         # Hash calculation.
-        # CRC16, sliced to 13 bits (0-8191).
+        # CRC16, sliced to 13 bits (0-8191), precomputed for the whole trace.
         # To each hash value we then sum 8192 * (self.decay_cntr - 1)
         # in order to obtain the current position based on the decay counter value.
-        mac_src_bytes = binascii.unhexlify(self.cur_pkt[3].replace(':', ''))
-        ip_src_bytes = socket.inet_aton(self.cur_pkt[4])
-        ip_dst_bytes = socket.inet_aton(self.cur_pkt[5])
-        ip_proto_bytes = struct.pack("!B", int(self.cur_pkt[6]))
-        proto_src_bytes = struct.pack("!H", int(self.cur_pkt[7]))
-        proto_dst_bytes = struct.pack("!H", int(self.cur_pkt[8]))
-
-        hash_mac_ip_src_temp = self.crc16(mac_src_bytes)
-        hash_mac_ip_src_temp = '{:016b}'.format(self.crc16(ip_src_bytes, hash_mac_ip_src_temp))
-
-        self.hash_mac_ip_src = int(hash_mac_ip_src_temp[-13:], 2) + 8192 * (self.decay_cntr - 1)
-
-        hash_ip_src_temp = '{:016b}'.format(self.crc16(ip_src_bytes))
-        self.hash_ip_src = int(hash_ip_src_temp[-13:], 2) + 8192 * (self.decay_cntr - 1)
-
-        # Hash xor value is used to access the sum of residual products.
-        # Xor is used since the value is the same for both flow directions.
+        (hash_mac_ip_src, hash_ip_src, hash_ip_0, hash_ip_1, hash_ip_xor,
+         hash_five_t_0, hash_five_t_1, hash_five_t_xor) = \
+            self.pkt_hashes[self.cur_pkt_index].tolist()
+        hash_offset = 8192 * (self.decay_cntr - 1)
 
-        hash_ip_0_temp = self.crc16(ip_src_bytes)
-        hash_ip_0_temp = '{:016b}'.format(self.crc16(ip_dst_bytes, hash_ip_0_temp))
-        self.hash_ip_0 = int(hash_ip_0_temp[-13:], 2)
+        self.hash_mac_ip_src = hash_mac_ip_src + hash_offset
+        self.hash_ip_src = hash_ip_src + hash_offset
 
-        hash_ip_1_temp = self.crc16(ip_dst_bytes)
-        hash_ip_1_temp = '{:016b}'.format(self.crc16(ip_src_bytes, hash_ip_1_temp))
-        self.hash_ip_1 = int(hash_ip_1_temp[-13:], 2)
+        self.hash_ip_0 = hash_ip_0 + hash_offset
+        self.hash_ip_1 = hash_ip_1 + hash_offset
+        self.hash_ip_xor = hash_ip_xor + hash_offset
 
-        self.hash_ip_xor = self.hash_ip_0 ^ self.hash_ip_1
-
-        self.hash_ip_0 += 8192 * (self.decay_cntr - 1)
-        self.hash_ip_1 += 8192 * (self.decay_cntr - 1)
-        self.hash_ip_xor += 8192 * (self.decay_cntr - 1)
-
-        hash_five_t_0_temp = self.crc16(ip_src_bytes)
-        hash_five_t_0_temp = self.crc16(ip_dst_bytes, hash_five_t_0_temp)
-        hash_five_t_0_temp = self.crc16(ip_proto_bytes, hash_five_t_0_temp)
-        hash_five_t_0_temp = self.crc16(proto_src_bytes, hash_five_t_0_temp)
-        hash_five_t_0_temp = '{:016b}'.format(self.crc16(proto_dst_bytes, hash_five_t_0_temp))
-        self.hash_five_t_0 = int(hash_five_t_0_temp[-13:], 2)
-
-        hash_five_t_1_temp = self.crc16(ip_dst_bytes)
-        hash_five_t_1_temp = self.crc16(ip_src_bytes, hash_five_t_1_temp)
-        hash_five_t_1_temp = self.crc16(ip_proto_bytes, hash_five_t_1_temp)
-        hash_five_t_1_temp = self.crc16(proto_dst_bytes, hash_five_t_1_temp)
-        hash_five_t_1_temp = '{:016b}'.format(self.crc16(proto_src_bytes, hash_five_t_1_temp))
-        self.hash_five_t_1 = int(hash_five_t_1_temp[-13:], 2)
-
-        self.hash_five_t_xor = self.hash_five_t_0 ^ self.hash_five_t_1
-
-        self.hash_five_t_0 += 8192 * (self.decay_cntr - 1)
-        self.hash_five_t_1 += 8192 * (self.decay_cntr - 1)
-        self.hash_five_t_xor += 8192 * (self.decay_cntr - 1)
+        self.hash_five_t_0 = hash_five_t_0 + hash_offset
+        self.hash_five_t_1 = hash_five_t_1 + hash_offset
+        self.hash_five_t_xor = hash_five_t_xor + hash_offset
 
         # Decay check for all flow keys.
         self.decay_check()
@@ -417,59 +339,24 @@ class StatsCalc:
                 self.sampl_pkt_index = 1
 
         # Hash calculation.
-        # CRC16, sliced to 13 bits (0-8191).
+        # CRC16, sliced to 13 bits (0-8191), precomputed for the whole trace.
         # To each hash value we then sum 8192 * (self.decay_cntr - 1)
         # in order to obtain the current position based on the decay counter value.
-        mac_src_bytes = binascii.unhexlify(self.cur_pkt[3].replace(':', ''))
-        ip_src_bytes = socket.inet_aton(self.cur_pkt[4])
-        ip_dst_bytes = socket.inet_aton(self.cur_pkt[5])
-        ip_proto_bytes = struct.pack("!B", int(self.cur_pkt[6]))
-        proto_src_bytes = struct.pack("!H", int(self.cur_pkt[7]))
-        proto_dst_bytes = struct.pack("!H", int(self.cur_pkt[8]))
-
-        hash_mac_ip_src_temp = self.crc16(mac_src_bytes)
-        hash_mac_ip_src_temp = '{:016b}'.format(self.crc16(ip_src_bytes, hash_mac_ip_src_temp))
-        self.hash_mac_ip_src = int(hash_mac_ip_src_temp[-13:], 2) + 8192 * (self.decay_cntr - 1)
-
-        hash_ip_src_temp = '{:016b}'.format(self.crc16(ip_src_bytes))
-        self.hash_ip_src = int(hash_ip_src_temp[-13:], 2) + 8192 * (self.decay_cntr - 1)
-
-        # Hash xor value is used to access the sum of residual products.
-        # Xor is used since the value is the same for both flow directions.
-
-        hash_ip_0_temp = self.crc16(ip_src_bytes)
-        hash_ip_0_temp = '{:016b}'.format(self.crc16(ip_dst_bytes, hash_ip_0_temp))
-        self.hash_ip_0 = int(hash_ip_0_temp[-13:], 2)
-
-        hash_ip_1_temp = self.crc16(ip_dst_bytes)
-        hash_ip_1_temp = '{:016b}'.format(self.crc16(ip_src_bytes, hash_ip_1_temp))
-        self.hash_ip_1 = int(hash_ip_1_temp[-13:], 2)
-
-        self.hash_ip_xor = self.hash_ip_0 ^ self.hash_ip_1
-
-        self.hash_ip_0 += 8192 * (self.decay_cntr - 1)
-        self.hash_ip_1 += 8192 * (self.decay_cntr - 1)
-        self.hash_ip_xor += 8192 * (self.decay_cntr - 1)
-
-        hash_five_t_0_temp = self.crc16(ip_src_bytes)
-        hash_five_t_0_temp = self.crc16(ip_dst_bytes, hash_five_t_0_temp)
-        hash_five_t_0_temp = self.crc16(ip_proto_bytes, hash_five_t_0_temp)
-        hash_five_t_0_temp = self.crc16(proto_src_bytes, hash_five_t_0_temp)
-        hash_five_t_0_temp = '{:016b}'.format(self.crc16(proto_dst_bytes, hash_five_t_0_temp))
-        self.hash_five_t_0 = int(hash_five_t_0_temp[-13:], 2)
-
-        hash_five_t_1_temp = self.crc16(ip_dst_bytes)
-        hash_five_t_1_temp = self.crc16(ip_src_bytes, hash_five_t_1_temp)
-        hash_five_t_1_temp = self.crc16(ip_proto_bytes, hash_five_t_1_temp)
-        hash_five_t_1_temp = self.crc16(proto_dst_bytes, hash_five_t_1_temp)
-        hash_five_t_1_temp = '{:016b}'.format(self.crc16(proto_src_bytes, hash_five_t_1_temp))
-        self.hash_five_t_1 = int(hash_five_t_1_temp[-13:], 2)
-
-        self.hash_five_t_xor = self.hash_five_t_0 ^ self.hash_five_t_1
-
-        self.hash_five_t_0 += 8192 * (self.decay_cntr - 1)
-        self.hash_five_t_1 += 8192 * (self.decay_cntr - 1)
-        self.hash_five_t_xor += 8192 * (self.decay_cntr - 1)
+        (hash_mac_ip_src, hash_ip_src, hash_ip_0, hash_ip_1, hash_ip_xor,
+         hash_five_t_0, hash_five_t_1, hash_five_t_xor) = \
+            self.pkt_hashes[self.cur_pkt_index].tolist()
+        hash_offset = 8192 * (self.decay_cntr - 1)
+
+        self.hash_mac_ip_src = hash_mac_ip_src + hash_offset
+        self.hash_ip_src = hash_ip_src + hash_offset
+
+        self.hash_ip_0 = hash_ip_0 + hash_offset
+        self.hash_ip_1 = hash_ip_1 + hash_offset
+        self.hash_ip_xor = hash_ip_xor + hash_offset
+
+        self.hash_five_t_0 = hash_five_t_0 + hash_offset
+        self.hash_five_t_1 = hash_five_t_1 + hash_offset
+        self.hash_five_t_xor = hash_five_t_xor + hash_offset
 
         # Decay check for all flow keys.
         self.decay_check_exact()
@@ -3,15 +3,44 @@ import bfrt_grpc.client as gc
 import grpc
 
 import logging
+import time
 
 from pprint import pprint, pformat
 
 PADDING = 30
 
+# Maximum entries sent in a single write (entry_add with a list of keys and data) when batching.
+BATCH_SIZE = 512
+
+
+# Comparable form of an entry key and data (as read from the switch or made by the controller).
+def key_id(key):
+    return tuple(sorted((name, repr(field)) for name, field in key.to_dict().items()))
+
+
+def data_id(data):
+    return tuple(sorted((name, repr(value)) for name, value in data.to_dict().items()
+                        if name != 'is_default_entry'))
+
+
+# Consecutive entries with the same target, in chunks of up to BATCH_SIZE: (target, keys, data).
+def batches(entries):
+    start = 0
+    while start < len(entries):
+        target = entries[start][0]
+        stop = start + 1
+        while stop < len(entries) and stop - start < BATCH_SIZE and \
+                vars(entries[stop][0]) == vars(target):
+            stop += 1
+        yield (target,
+               [key for _, key, _ in entries[start:stop]],
+               [data for _, _, data in entries[start:stop]])
+        start = stop
+
 
 class Table(object):
 
-    def __init__(self, client, bfrt_info):
+    def __init__(self, client, bfrt_info, reconcile=False):
         # get logging, client, and global program info
         self.logger = logging.getLogger('Table')
         self.gc = client
@@ -23,19 +52,104 @@ class Table(object):
         # lowest possible  priority for ternary match rules
         self.lowest_priority = 1 << 24
 
+        # entries queued while batching (see batch_begin), as (target, key, data)
+        self.batching = False
+        self.pending = []
+
+        # if reconciling, the table is not cleared on setup and batch_end only writes the
+        # differences between the queued entries and the ones already on the switch
+        self.reconcile = reconcile
+
+    def entry_add(self, target, keys, data):
+        """Add entries to the table, or queue them until batch_end if batching."""
+        if self.batching:
+            self.pending.extend(zip([target] * len(keys), keys, data))
+        else:
+            self.table.entry_add(target, keys, data)
+
+    def batch_begin(self):
+        """Queue the added entries instead of writing each one to the switch."""
+        self.batching = True
+
+    def batch_end(self):
+        """Write the queued entries, up to BATCH_SIZE per write, and stop batching.
+
+        If reconciling, the queued entries replace the ones on the switch: only the missing
+        entries are added, the changed ones modified and the others deleted.
+        Returns the number of entries and writes sent.
+        """
+        self.batching = False
+        pending = self.pending
+        self.pending = []
+
+        if not self.reconcile:
+            writes = 0
+            for target, keys, data in batches(pending):
+                self.table.entry_add(target, keys, data)
+                writes += 1
+            return len(pending), writes
+
+        # target all pipes on device 0
+        target = gc.Target(device_id=0, pipe_id=0xffff)
+
+        # read the current entries once
+        current = {}
+        for data, key in self.table.entry_get(target, [], {"from_hw": False}):
+            if key:
+                current[key_id(key)] = (key, data_id(data))
+
+        desired = {key_id(key): (target, key, data) for target, key, data in pending}
+        added = [entry for key, entry in desired.items() if key not in current]
+        modified = [entry for key, entry in desired.items()
+                    if key in current and current[key][1] != data_id(entry[2])]
+        deleted = [(target, key, None) for kid, (key, _) in current.items()
+                   if kid not in desired]
+
+        writes = 0
+        for target, keys, _ in batches(deleted):
+            self.table.entry_del(target, keys)
+            writes += 1
+        for target, keys, data in batches(modified):
+            self.table.entry_mod(target, keys, data)
+            writes += 1
+        for target, keys, data in batches(added):
+            self.table.entry_add(target, keys, data)
+            writes += 1
+
+        self.logger.info('Reconciled: %d entries added, %d modified, %d deleted, %d unchanged',
+                         len(added), len(modified), len(deleted),
+                         len(desired) - len(added) - len(modified))
+        return len(added) + len(modified) + len(deleted), writes
+
     def clear(self):
-        """Remove all existing entries in table."""
+        """Remove all existing entries in table.
+
+        Deletes the whole table in a single write if the SDK allows it, otherwise deletes all
+        its keys, up to BATCH_SIZE per write.
+        """
         if self.table is not None:
+            start = time.time()
+
             # target all pipes on device 0
             target = gc.Target(device_id=0, pipe_id=0xffff)
 
-            # get all keys in table
-            resp = self.table.entry_get(target, [], {"from_hw": False})
-
-            # delete all keys in table
-            for _, key in resp:
-                if key:
-                    self.table.entry_del(target, [key])
+            try:
+                # delete all keys in table (no key list: the whole table)
+                self.table.entry_del(target)
+                method = 'table delete'
+            except (gc.BfruntimeRpcException, grpc.RpcError, TypeError):
+                # get all keys in table
+                resp = self.table.entry_get(target, [], {"from_hw": False})
+                keys = [(target, key, None) for _, key in resp if key]
+
+                # delete all keys in table
+                writes = 0
+                for target, batch_keys, _ in batches(keys):
+                    self.table.entry_del(target, batch_keys)
+                    writes += 1
+                method = '{} entries in {} writes'.format(len(keys), writes)
+
+            self.logger.info('Cleared in %.3f s (%s)', time.time() - start, method)
 
         # # try to reinsert default entry if it exists
         # try:
@@ -0,0 +1,38 @@
+#
+# Entries of the lookup tables programmed by configure_switch, generated from the width of the
+# matched field and the type of table instead of written one by one.
+#
+
+# Width (bits) of the fields matched by the shift and sign tables.
+FIELD_WIDTH = 32
+
+# Decay intervals, in the order of the decay counter values (see p4 decay_cntr_check): each one
+# is selected by the counter value i << DECAY_CNTR_SHIFT.
+DECAY_INTERVALS = ['100_ms', '1_s', '10_s', '60_s']
+DECAY_CNTR_SHIFT = 13
+
+
+# Shift tables (divisions/multiplications by a power of two): an entry per shift in
+# [0, max_shift], matching the field values whose highest set bit is the shift.
+# (priority, power, mask, shift) entries.
+def shift_entries(max_shift, width=FIELD_WIDTH):
+    ones = (1 << width) - 1
+    return [(width - shift, 1 << shift, (ones << shift) & ones, shift)
+            for shift in range(max_shift + 1)]
+
+
+# Sign tables (absolute values): the positive and negative values, by the sign bit.
+# (priority, value, mask, action) entries.
+def sign_entries(width=FIELD_WIDTH):
+    sign = 1 << (width - 1)
+    return [(2, 0, sign, 'pos'), (1, sign, sign, 'neg')]
+
+
+# Decay check tables: (counter, interval) entries.
+def decay_check_entries():
+    return [(i << DECAY_CNTR_SHIFT, interval) for i, interval in enumerate(DECAY_INTERVALS)]
+
+
+# Tables selecting an action by a flag (0, 1, ...): (flag, action) entries.
+def flag_entries(actions):
+    return list(enumerate(actions))
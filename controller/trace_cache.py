@@ -0,0 +1,262 @@
+import os
+import json
+import socket
+import struct
+import hashlib
+import shutil
+import numpy as np
+import pandas as pd
+from pcap_reader import PcapReader, COLUMNS, FLAG_IPV4, FLAG_TCP, FLAG_UDP, FLAG_ICMP
+
+#
+# Columnar binary cache of a parsed trace.
+#
+# The first run converts the trace (pcap/pcapng, or a previously generated tshark csv)
+# into one raw file per column, next to the trace (<trace>.cache/). The following runs
+# simply np.memmap the columns, so loading does not depend on the trace size.
+#
+# The cache is rebuilt whenever the source file changes: its size, mtime and a hash of
+# its first/last bytes are stored in the cache metadata and checked on every load.
+#
+
+CACHE_VERSION = 1
+
+# Number of bytes hashed at the beginning and at the end of the source file.
+HASH_BYTES = 1 << 20
+
+
+def cache_path(trace_path):
+    return f'{trace_path}.cache'
+
+
+def load_trace(trace_path):
+    # Check the file type.
+    # A tshark csv may exist for traces parsed before the native pcap reader.
+    csv_path = trace_path.split('.')[0] + '.csv'
+    if os.path.isfile(trace_path):
+        source = trace_path
+    elif os.path.isfile(csv_path):
+        source = csv_path
+    else:
+        raise FileNotFoundError(trace_path)
+
+    cache_dir = cache_path(trace_path)
+    fingerprint = source_fingerprint(source)
+
+    meta = read_meta(cache_dir)
+    if meta is None or meta['version'] != CACHE_VERSION or meta['source'] != fingerprint:
+        print('Building the trace cache.')
+        meta = build_cache(source, cache_dir, fingerprint)
+
+    columns = {}
+    for name, dtype in COLUMNS:
+        if meta['n_pkts'] == 0:
+            columns[name] = np.zeros(0, dtype=dtype)
+        else:
+            columns[name] = np.memmap(os.path.join(cache_dir, f'{name}.bin'), dtype=dtype,
+                                      mode='r', shape=(meta['n_pkts'],))
+    return columns
+
+
+def source_fingerprint(source):
+    stat = os.stat(source)
+    sha1 = hashlib.sha1()
+    with open(source, 'rb') as f:
+        sha1.update(f.read(HASH_BYTES))
+        if stat.st_size > HASH_BYTES:
+            f.seek(max(HASH_BYTES, stat.st_size - HASH_BYTES))
+            sha1.update(f.read(HASH_BYTES))
+    return {
+        'path': os.path.abspath(source),
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha1': sha1.hexdigest()}
+
+
+def read_meta(cache_dir):
+    try:
+        with open(os.path.join(cache_dir, 'meta.json'), 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def build_cache(source, cache_dir, fingerprint):
+    # Write to a temporary directory first, so an interrupted build is never loaded.
+    tmp_dir = cache_dir + '.tmp'
+    if os.path.exists(tmp_dir):
+        shutil.rmtree(tmp_dir)
+    os.makedirs(tmp_dir)
+
+    if source.endswith('.csv'):
+        chunks = [read_tshark_csv(source)]
+    else:
+        chunks = PcapReader(source).iter_chunks()
+
+    n_pkts = 0
+    files = {name: open(os.path.join(tmp_dir, f'{name}.bin'), 'wb') for name, _ in COLUMNS}
+    try:
+        for chunk in chunks:
+            for name, dtype in COLUMNS:
+                files[name].write(np.ascontiguousarray(chunk[name], dtype=dtype).tobytes())
+            n_pkts += len(chunk['flags'])
+    finally:
+        for f in files.values():
+            f.close()
+
+    meta = {
+        'version': CACHE_VERSION,
+        'source': fingerprint,
+        'n_pkts': n_pkts,
+        'columns': {name: np.dtype(dtype).str for name, dtype in COLUMNS}}
+    with open(os.path.join(tmp_dir, 'meta.json'), 'w') as f:
+        json.dump(meta, f, indent=4)
+
+    if os.path.exists(cache_dir):
+        shutil.rmtree(cache_dir)
+    os.rename(tmp_dir, cache_dir)
+
+    return meta
+
+
+# Converts a tshark csv (as generated by the former parse_pcap) into typed columns.
+def read_tshark_csv(csv_path):
+    df = pd.read_csv(csv_path, dtype={'frame.time_epoch': str})
+    n = len(df)
+
+    def col(i):
+        return df.iloc[:, i]
+
+    def present(i):
+        return col(i).notna().to_numpy()
+
+    def num(i, dtype):
+        return col(i).fillna(0).to_numpy(dtype=np.float64).astype(dtype)
+
+    # Split the epoch timestamp without going through a float.
+    ts = col(0).str.partition('.')
+    ts_frac = ts[2].fillna('').str.ljust(9, '0').str.slice(0, 9)
+
+    chunk = {name: np.zeros(n, dtype=dtype) for name, dtype in COLUMNS}
+    chunk['ts_sec'][:] = ts[0].astype(np.int64).to_numpy()
+    chunk['ts_nsec'][:] = ts_frac.astype(np.int64).to_numpy()
+    chunk['frame_len'][:] = num(1, np.uint32)
+    chunk['eth_src'][:] = mac_from_str(col(2))
+    chunk['eth_dst'][:] = mac_from_str(col(3))
+
+    ipv4 = present(4) & present(5)
+    tcp = present(8) & present(9)
+    udp = present(10) & present(11)
+    icmp = present(12) & present(13)
+    chunk['flags'][:] = (ipv4 * FLAG_IPV4) | (tcp * FLAG_TCP) | (udp * FLAG_UDP) \
+        | (icmp * FLAG_ICMP)
+
+    chunk['ip_src'][:] = ip_from_str(col(4))
+    chunk['ip_dst'][:] = ip_from_str(col(5))
+    chunk['ip_len'][:] = num(6, np.uint16)
+    chunk['ip_proto'][:] = num(7, np.uint8)
+    chunk['port_src'][:] = np.where(udp, num(10, np.uint16), num(8, np.uint16))
+    chunk['port_dst'][:] = np.where(udp, num(11, np.uint16), num(9, np.uint16))
+    chunk['icmp_type'][:] = num(12, np.uint8)
+    chunk['icmp_code'][:] = num(13, np.uint8)
+
+    return chunk
+
+
+def mac_from_str(macs):
+    uniq, inverse = np.unique(macs.fillna('00:00:00:00:00:00').astype(str).to_numpy(),
+                              return_inverse=True)
+    values = np.array([int(m.replace(':', ''), 16) for m in uniq], dtype=np.uint64)
+    return values[inverse.reshape(-1)]
+
+
+def ip_from_str(ips):
+    uniq, inverse = np.unique(ips.fillna('0.0.0.0').astype(str).to_numpy(),
+                              return_inverse=True)
+    values = np.array([struct.unpack('!I', socket.inet_aton(ip))[0] for ip in uniq],
+                      dtype=np.uint32)
+    return values[inverse.reshape(-1)]
+
+
+# Numeric flow key fields of every packet, following the tshark csv semantics:
+# missing fields become 0 and the ports are only taken from the TCP/UDP header
+# matching the IP protocol.
+def flow_keys(columns):
+    flags = np.asarray(columns['flags'])
+    ipv4 = (flags & FLAG_IPV4) != 0
+    tcp = (flags & FLAG_TCP) != 0
+    udp = (flags & FLAG_UDP) != 0
+
+    ip_proto = np.where(ipv4, columns['ip_proto'], 0)
+    ports = ((ip_proto == 17) & udp) | ((ip_proto == 6) & tcp)
+
+    return {
+        'mac_src': np.asarray(columns['eth_src']),
+        'ip_src': np.where(ipv4, columns['ip_src'], 0),
+        'ip_dst': np.where(ipv4, columns['ip_dst'], 0),
+        'ip_proto': ip_proto,
+        'port_src': np.where(ports, columns['port_src'], 0),
+        'port_dst': np.where(ports, columns['port_dst'], 0)}
+
+
+# Decodes the trace columns into the per-packet field arrays used by the feature extraction.
+# Non-IPv4 packets are flagged through the ipv4 mask.
+# The string fields (STR_FIELDS) are dictionary-encoded: pkts[name] holds the code of each
+# packet, indexing the small table of its distinct values, pkts['tables'][name] (each value is
+# only formatted once).
+def decode_trace(columns):
+    ipv4 = (np.asarray(columns['flags']) & FLAG_IPV4) != 0
+    keys = flow_keys(columns)
+    values = {
+        'mac_dst': (columns['eth_dst'], mac_str),
+        'mac_src': (keys['mac_src'], mac_str),
+        'ip_src': (keys['ip_src'], ip_str),
+        'ip_dst': (keys['ip_dst'], ip_str),
+        'ip_proto': (keys['ip_proto'], int_str),
+        'port_src': (keys['port_src'], int_str),
+        'port_dst': (keys['port_dst'], int_str)}
+
+    pkts = {
+        'ipv4': ipv4,
+        'pkt_len': np.where(ipv4, columns['ip_len'], 0).astype(np.float64),
+        'ts': timestamps(columns['ts_sec'], columns['ts_nsec']),
+        'tables': {}}
+    for name in STR_FIELDS:
+        pkts[name], pkts['tables'][name] = str_table(*values[name])
+    return pkts
+
+
+# String fields of a packet, as returned by pkt_strs.
+STR_FIELDS = ['mac_dst', 'mac_src', 'ip_src', 'ip_dst', 'ip_proto', 'port_src', 'port_dst']
+
+
+# String fields (STR_FIELDS order) of the i-th packet of a decoded trace.
+def pkt_strs(pkts, i):
+    tables = pkts['tables']
+    return [tables[name][pkts[name].item(i)] for name in STR_FIELDS]
+
+
+# Dictionary encoding of values: (code of each value, table of the distinct values as strings).
+def str_table(values, to_str):
+    uniq, inverse = np.unique(np.asarray(values), return_inverse=True)
+    table = np.empty(len(uniq), dtype=object)
+    table[:] = [to_str(v) for v in uniq]
+    return inverse.reshape(-1).astype(np.int32), table
+
+
+def timestamps(ts_sec, ts_nsec):
+    return np.asarray(ts_sec, dtype=np.float64) + np.asarray(ts_nsec, dtype=np.float64) / 1e9
+
+
+# Scalar conversions back to the string form used by the feature extraction.
+
+def mac_str(mac):
+    return '%02x:%02x:%02x:%02x:%02x:%02x' % tuple(int(mac).to_bytes(6, 'big'))
+
+
+def ip_str(ip):
+    return socket.inet_ntoa(struct.pack('!I', int(ip)))
+
+
+def int_str(value):
+    return str(int(value))
@@ -0,0 +1,33 @@
+import tempfile
+import numpy as np
+from stats_writer import load_stats
+
+#
+# Setup shared by the KitNET benchmarks (bench_*.py).
+#
+
+# The trained model bundles are saved to a temporary directory (removed on exit), not to the
+# KitNET models directory.
+MODEL_DIR = tempfile.TemporaryDirectory(prefix='bench-models-')
+
+# Stats per feature vector.
+N_STATS = 80
+
+
+# Feature vectors read from a global stats file (save_stats_global in the config, one row of
+# N_STATS stats per packet, see stats_writer.py), or n_random random vectors if no file is given.
+# At least min_vectors are required.
+# outliers_start: the random vectors from this index on are scaled up every 100 vectors,
+# as some out of distribution vectors.
+def load_vectors(stats_path, n_random, min_vectors, outliers_start=None):
+    if stats_path is not None:
+        X = np.asarray(load_stats(stats_path), dtype=np.float64)
+    else:
+        rng = np.random.RandomState(1234)
+        X = rng.rand(n_random, N_STATS) * rng.rand(N_STATS) * 1000
+        if outliers_start is not None:
+            X[outliers_start::100] *= 1 + 10 * rng.rand(len(X[outliers_start::100]), 1)
+
+    if X.shape[0] < min_vectors:
+        raise ValueError(f'Not enough feature vectors ({X.shape[0]}) for the grace periods')
+    return X
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+
+# Benchmark of the multi-threaded KitNET ensemble layer (KitNET.set_workers).
+# For each max autoencoder size (m), trains a KitNET on the first fm_grace + ad_grace feature vectors,
+# then reports the batched inference (execute_batch) and mini-batch training (train_batch) throughput
+# with 1 to N worker threads, and the speedup over a single thread.
+#
+# The feature vectors are loaded by bench_common.load_vectors.
+# Limit the BLAS threads, so that only the workers run in parallel.
+#
+# Usage:
+#   OPENBLAS_NUM_THREADS=1 OMP_NUM_THREADS=1 python3 bench_ensemble_workers.py -m 10 5 -w 1 2 4 8
+
+import os
+import time
+import argparse
+import numpy as np
+from plugins.KitNET.KitNET import KitNET
+from pipeline_kitnet import LEARNING_RATE, HIDDEN_RATIO
+from bench_common import MODEL_DIR, load_vectors
+
+
+def bench(kitnet, X, batch_size, rounds, train):
+    batches = [X[i:i + batch_size] for i in range(0, X.shape[0] - batch_size + 1, batch_size)]
+    process = kitnet.train_batch if train else kitnet.execute_batch
+
+    time_start = time.time()
+    for _ in range(rounds):
+        for batch in batches:
+            process(batch)
+    return rounds * len(batches) * batch_size / (time.time() - time_start)
+
+
+if __name__ == "__main__":
+    argparser = argparse.ArgumentParser(description='KitNET multi-threaded ensemble layer benchmark')
+    argparser.add_argument('-s', '--stats', type=str, default=None, help='Global stats file')
+    argparser.add_argument('-m', '--max-ae', type=int, nargs='+', default=[10, 5])
+    argparser.add_argument('-w', '--workers', type=int, nargs='+',
+                           default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    argparser.add_argument('-b', '--batch-size', type=int, default=1024)
+    argparser.add_argument('-r', '--rounds', type=int, default=5)
+    argparser.add_argument('--fm-grace', type=int, default=10000)
+    argparser.add_argument('--ad-grace', type=int, default=50000)
+    args = argparser.parse_args()
+
+    train_grace = args.fm_grace + args.ad_grace
+    X = load_vectors(args.stats, train_grace + 10 * args.batch_size,
+                     train_grace + args.batch_size)
+
+    for max_ae in args.max_ae:
+        kitnet = KitNET(X.shape[1], max_ae, args.fm_grace, args.ad_grace, LEARNING_RATE,
+                        HIDDEN_RATIO, attack=f'bench-workers-m-{max_ae}', model_dir=MODEL_DIR.name)
+        for i in range(0, train_grace, args.batch_size):
+            kitnet.train_batch(X[i:min(i + args.batch_size, train_grace)])
+        X_exec = X[train_grace:]
+
+        print(f'm={max_ae}: {len(kitnet.v)} autoencoders, batch size {args.batch_size}')
+        print(f'{"workers":>8} {"execute (vec/s)":>16} {"speedup":>8} '
+              f'{"train (vec/s)":>16} {"speedup":>8}')
+        exec_ref = train_ref = None
+        for n_workers in args.workers:
+            kitnet.set_workers(n_workers)
+            exec_rate = bench(kitnet, X_exec, args.batch_size, args.rounds, False)
+            train_rate = bench(kitnet, X_exec, args.batch_size, args.rounds, True)
+            if exec_ref is None:
+                exec_ref, train_ref = exec_rate, train_rate
+            print(f'{n_workers:>8} {exec_rate:>16.0f} {exec_rate / exec_ref:>8.2f} '
+                  f'{train_rate:>16.0f} {train_rate / train_ref:>8.2f}')
+        kitnet.set_workers(0)
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+
+# Report of the KitNET inference modes (KitNET.set_inference_mode) against float64.
+# Trains a KitNET on the first fm_grace + ad_grace feature vectors, executes the remaining ones in
+# each mode and reports the deviation of the anomaly scores (RMSE) from float64, the packets whose
+# detection changes (score above the threshold, the highest training RMSE), and the speedup.
+# The reduced precision modes mirror a switch model's arithmetic: they are not expected to be
+# faster than float64 (see Quantized.py).
+#
+# The feature vectors are loaded by bench_common.load_vectors.
+#
+# Usage:
+#   python3 bench_inference_modes.py -s eval/kitnet/<attack>-<sampl>-stats.f32
+
+import time
+import argparse
+import numpy as np
+from plugins.KitNET.KitNET import KitNET
+from plugins.KitNET.Quantized import INFERENCE_MODES
+from pipeline_kitnet import LEARNING_RATE, HIDDEN_RATIO
+from bench_common import MODEL_DIR, load_vectors
+
+
+def execute(kitnet, X, batch_size, rounds):
+    rmse = np.concatenate([kitnet.execute_batch(X[i:i + batch_size])
+                           for i in range(0, X.shape[0], batch_size)])
+    time_start = time.time()
+    for _ in range(rounds):
+        for i in range(0, X.shape[0], batch_size):
+            kitnet.execute_batch(X[i:i + batch_size])
+    return rmse, (time.time() - time_start) / rounds
+
+
+if __name__ == "__main__":
+    argparser = argparse.ArgumentParser(description='KitNET inference modes report')
+    argparser.add_argument('-s', '--stats', type=str, default=None, help='Global stats file')
+    argparser.add_argument('-b', '--batch-size', type=int, default=256)
+    argparser.add_argument('-r', '--rounds', type=int, default=3)
+    argparser.add_argument('--fm-grace', type=int, default=10000)
+    argparser.add_argument('--ad-grace', type=int, default=90000)
+    argparser.add_argument('--max-ae', type=int, default=10)
+    argparser.add_argument('--exec', type=int, default=50000,
+                           help='Executed vectors (random data only)')
+    args = argparser.parse_args()
+
+    train_grace = args.fm_grace + args.ad_grace
+    X = load_vectors(args.stats, train_grace + args.exec, train_grace + 1,
+                     outliers_start=train_grace)
+
+    kitnet = KitNET(X.shape[1], args.max_ae, args.fm_grace, args.ad_grace, LEARNING_RATE,
+                    HIDDEN_RATIO, attack='bench-inference-modes', model_dir=MODEL_DIR.name)
+    threshold = max(kitnet.train(x) for x in X[:train_grace])
+    X_exec = X[train_grace:]
+
+    print(f'{len(kitnet.v)} autoencoders, {X_exec.shape[0]} executed vectors, '
+          f'threshold {threshold:.6f}')
+    print(f'{"mode":>8} {"time (s)":>10} {"speedup":>8} {"mean |dev|":>12} {"max |dev|":>12} '
+          f'{"mean rel dev":>13} {"det changes":>12}')
+    rmse_ref = time_ref = None
+    for mode in INFERENCE_MODES:
+        kitnet.set_inference_mode(mode)
+        rmse, time_exec = execute(kitnet, X_exec, args.batch_size, args.rounds)
+        if rmse_ref is None:
+            rmse_ref, time_ref = rmse, time_exec
+        dev = np.abs(rmse - rmse_ref)
+        rel_dev = dev / np.maximum(np.abs(rmse_ref), 1e-12)
+        det_changes = np.sum((rmse > threshold) != (rmse_ref > threshold))
+        print(f'{mode:>8} {time_exec:>10.3f} {time_ref / time_exec:>8.2f} {dev.mean():>12.3e} '
+              f'{dev.max():>12.3e} {rel_dev.mean():>13.3e} {det_changes:>12}')
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+
+# Benchmark of the KitNET mini-batch training (KitNET.train_batch) against the per-sample path.
+# For each batch size, trains a KitNET on the first fm_grace + ad_grace feature vectors and reports
+# the training wall time, the resulting threshold (highest training RMSE, as in PipelineKitNET)
+# and the mean RMSE over the remaining (executed) vectors. Batch size 1 is the per-sample path.
+#
+# The feature vectors are loaded by bench_common.load_vectors.
+#
+# Usage:
+#   python3 bench_train_batch.py -s eval/kitnet/<attack>-<sampl>-stats.f32 -b 1 16 64 256
+
+import time
+import argparse
+import numpy as np
+from plugins.KitNET.KitNET import KitNET
+from pipeline_kitnet import LEARNING_RATE, HIDDEN_RATIO
+from bench_common import MODEL_DIR, load_vectors
+
+
+def bench(X, batch_size, fm_grace, ad_grace, max_ae):
+    kitnet = KitNET(X.shape[1], max_ae, fm_grace, ad_grace, LEARNING_RATE, HIDDEN_RATIO,
+                    attack=f'bench-b-{batch_size}', model_dir=MODEL_DIR.name)
+    train_grace = fm_grace + ad_grace
+
+    time_start = time.time()
+    if batch_size == 1:
+        rmse_train = np.array([kitnet.train(x) for x in X[:train_grace]])
+    else:
+        rmse_train = np.concatenate([kitnet.train_batch(X[i:min(i + batch_size, train_grace)])
+                                     for i in range(0, train_grace, batch_size)])
+    time_train = time.time() - time_start
+
+    rmse_exec = kitnet.execute_batch(X[train_grace:]) if X.shape[0] > train_grace else np.zeros(1)
+
+    return time_train, rmse_train.max(), rmse_exec.mean()
+
+
+if __name__ == "__main__":
+    argparser = argparse.ArgumentParser(description='KitNET mini-batch training benchmark')
+    argparser.add_argument('-s', '--stats', type=str, default=None, help='Global stats file')
+    argparser.add_argument('-b', '--batch-sizes', type=int, nargs='+', default=[1, 16, 64, 256])
+    argparser.add_argument('--fm-grace', type=int, default=10000)
+    argparser.add_argument('--ad-grace', type=int, default=90000)
+    argparser.add_argument('--max-ae', type=int, default=10)
+    argparser.add_argument('--exec', type=int, default=10000,
+                           help='Executed vectors (random data only)')
+    args = argparser.parse_args()
+
+    X = load_vectors(args.stats, args.fm_grace + args.ad_grace + args.exec,
+                     args.fm_grace + args.ad_grace)
+
+    print(f'{"batch":>8} {"train time (s)":>16} {"speedup":>8} {"threshold":>12} {"exec rmse":>12}')
+    time_ref = None
+    for batch_size in args.batch_sizes:
+        time_train, threshold, rmse_exec = bench(
+            X, batch_size, args.fm_grace, args.ad_grace, args.max_ae)
+        if time_ref is None:
+            time_ref = time_train
+        print(f'{batch_size:>8} {time_train:>16.3f} {time_ref / time_train:>8.2f} '
+              f'{threshold:>12.6f} {rmse_exec:>12.6f}')
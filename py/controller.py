@@ -6,7 +6,7 @@ import argparse
 import time
 import yaml
 from eval_metrics import eval_kitnet
-from pipeline_kitnet import PipelineKitNET
+from pipeline_kitnet import PipelineKitNET, EXEC_BATCH, INFERENCE_MODE
 
 logger = None
 
@@ -32,7 +32,9 @@ if __name__ == "__main__":
                 conf['exec_sampl_offset'], conf['fm_grace'], conf['ad_grace'], conf['max_ae'],
                 conf['fm_model'], conf['el_model'], conf['ol_model'], conf['train_stats'],
                 conf['attack'], conf['train_exact_ratio'], conf['exact_stats'],
-                conf['save_stats_global'], conf['save_spatial'], time_start)
+                conf['save_stats_global'], conf['save_spatial'], time_start,
+                conf.get('model'), conf.get('exec_batch', EXEC_BATCH),
+                conf.get('inference_mode', INFERENCE_MODE))
     pipeline.process()
 
     time_stop = time.time()
@@ -43,7 +45,7 @@ if __name__ == "__main__":
     # Call function to perform eval/csv.
     if args.plugin == 'kitnet':
         print('Threshold: ', pipeline.threshold)
-        eval_kitnet(pipeline.rmse_list, pipeline.stats_global, pipeline.peregrine_eval,
+        eval_kitnet(pipeline.peregrine_eval,
                     pipeline.threshold, pipeline.det_init_time, pipeline.det_init_pkt_num,
                     pipeline.det_init_pkt_num_dp, pipeline.train_skip, conf['fm_grace'], 
                     conf['ad_grace'], conf['attack'], conf['sampl'], conf['exec_sampl_offset'], 
@@ -0,0 +1,139 @@
+import socket
+import struct
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+
+#
+# Columnar buffer of the eval data of the processed packets (headers, RMSE, ground truth label).
+#
+# Each column is a typed numpy array (MAC and IPs as integers), preallocated and grown by doubling
+# its capacity, instead of a list of 8 python objects per packet. The RMSE stays float64, as
+# compared with the (float64) threshold by the eval. The appended rows are staged and moved to the
+# columns in blocks of STAGE_ROWS. The eval reads the columns as views (see column), and the csv is
+# written in chunks, with the MAC and IPs formatted back to strings as before (see to_csv).
+#
+
+# Column names (as in the eval csv) and types.
+EVAL_COLUMNS = [
+    ('mac_src', np.uint64),
+    ('ip_src', np.uint32),
+    ('ip_dst', np.uint32),
+    ('ip_type', np.uint8),
+    ('src_proto', np.uint16),
+    ('dst_proto', np.uint16),
+    ('rmse', np.float64),
+    ('label', np.uint8)]
+
+INITIAL_CAPACITY = 1 << 16
+
+# Appended rows moved to the columns at a time.
+STAGE_ROWS = 4096
+
+# Rows per chunk of the csv.
+CSV_CHUNK = 1 << 20
+
+# Parsed header strings cached (the same MACs and IPs repeat along the trace).
+PARSE_CACHE = 1 << 16
+
+HEX_BYTES = np.array([f'{i:02x}' for i in range(256)])
+DEC_BYTES = np.array([str(i) for i in range(256)])
+
+
+@lru_cache(maxsize=PARSE_CACHE)
+def mac_to_int(mac):
+    if isinstance(mac, str):
+        return int(mac.replace(':', ''), 16) if mac else 0
+    return int(mac)
+
+
+@lru_cache(maxsize=PARSE_CACHE)
+def ip_to_int(ip):
+    if isinstance(ip, str):
+        return struct.unpack('!I', socket.inet_aton(ip))[0] if ip else 0
+    return int(ip)
+
+
+@lru_cache(maxsize=PARSE_CACHE)
+def port_to_int(port):
+    if isinstance(port, str):
+        return int(port) if port else 0
+    return int(port)
+
+
+# Formats an array of integers as strings of bytes (most significant first), joined by sep.
+def bytes_to_str(values, n_bytes, table, sep):
+    values = values.astype(np.uint64)
+    out = table[(values >> np.uint64(8 * (n_bytes - 1))) & np.uint64(0xff)]
+    for i in range(n_bytes - 2, -1, -1):
+        byte = table[(values >> np.uint64(8 * i)) & np.uint64(0xff)]
+        out = np.char.add(np.char.add(out, sep), byte)
+    return out
+
+
+class EvalBuffer:
+    def __init__(self, capacity=INITIAL_CAPACITY):
+        self.n = 0  # rows in the columns
+        self.arrays = {name: np.empty(max(capacity, 1), dtype) for name, dtype in EVAL_COLUMNS}
+        self.staged = []  # rows appended since the last flush
+
+    def __len__(self):
+        return self.n + len(self.staged)
+
+    def capacity(self):
+        return len(self.arrays['rmse'])
+
+    def grow(self):
+        for name, values in self.arrays.items():
+            grown = np.empty(2 * len(values), values.dtype)
+            grown[:self.n] = values[:self.n]
+            self.arrays[name] = grown
+
+    # The headers may be strings (as in the FC and in the data plane packets) or integers.
+    def append(self, mac_src, ip_src, ip_dst, ip_type, src_proto, dst_proto, rmse, label):
+        self.staged.append((mac_src, ip_src, ip_dst, ip_type, src_proto, dst_proto, rmse, label))
+        if len(self.staged) == STAGE_ROWS:
+            self.flush()
+
+    # Move the staged rows to the columns.
+    def flush(self):
+        if not self.staged:
+            return
+        rows = self.staged
+        self.staged = []
+        while self.n + len(rows) > self.capacity():
+            self.grow()
+
+        mac_src, ip_src, ip_dst, ip_type, src_proto, dst_proto, rmse, label = zip(*rows)
+        filled = slice(self.n, self.n + len(rows))
+        arrays = self.arrays
+        arrays['mac_src'][filled] = [mac_to_int(mac) for mac in mac_src]
+        arrays['ip_src'][filled] = [ip_to_int(ip) for ip in ip_src]
+        arrays['ip_dst'][filled] = [ip_to_int(ip) for ip in ip_dst]
+        arrays['ip_type'][filled] = [port_to_int(proto) for proto in ip_type]
+        arrays['src_proto'][filled] = [port_to_int(port) for port in src_proto]
+        arrays['dst_proto'][filled] = [port_to_int(port) for port in dst_proto]
+        arrays['rmse'][filled] = rmse
+        arrays['label'][filled] = label
+        self.n += len(rows)
+
+    # View of the filled rows of a column.
+    def column(self, name):
+        self.flush()
+        return self.arrays[name][:self.n]
+
+    # Rows [start, stop) as a DataFrame, with the MAC and IPs as strings.
+    def to_frame(self, start=0, stop=None):
+        self.flush()
+        stop = self.n if stop is None else min(stop, self.n)
+        columns = {name: self.arrays[name][start:stop] for name, _ in EVAL_COLUMNS}
+        columns['mac_src'] = bytes_to_str(columns['mac_src'], 6, HEX_BYTES, ':')
+        columns['ip_src'] = bytes_to_str(columns['ip_src'], 4, DEC_BYTES, '.')
+        columns['ip_dst'] = bytes_to_str(columns['ip_dst'], 4, DEC_BYTES, '.')
+        return pd.DataFrame(columns)
+
+    def to_csv(self, path):
+        self.flush()
+        for start in range(0, max(self.n, 1), CSV_CHUNK):
+            self.to_frame(start, start + CSV_CHUNK).to_csv(
+                path, mode='w' if start == 0 else 'a', header=start == 0, index=None)
@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+
+# Spatial export of a trained KitNET model bundle (see plugins/KitNET/ModelBundle.py): one csv file
+# per layer parameter, norm and feature map, and for an inference mode other than float64, the
+# quantized model.
+#
+# Usage:
+#   python3 export_spatial.py -m plugins/KitNET/models/os-scan-m-10-r-0-model.npz \
+#       -o plugins/KitNET/models/spatial/os-scan-m-10-r-0 -i int16
+
+import argparse
+from plugins.KitNET.ModelBundle import load_model, export_spatial
+from plugins.KitNET.Quantized import INFERENCE_MODES
+
+
+if __name__ == "__main__":
+    argparser = argparse.ArgumentParser(description='KitNET model bundle spatial export')
+    argparser.add_argument('-m', '--model', type=str, required=True, help='Model bundle path')
+    argparser.add_argument('-o', '--outdir', type=str, required=True, help='Output directory')
+    argparser.add_argument('-i', '--inference-mode', type=str, default='float64',
+                           choices=INFERENCE_MODES)
+    args = argparser.parse_args()
+
+    model = load_model(args.model)
+    export_spatial(args.outdir, model['v'], model['ensemble_layer'], model['output_layer'],
+                   args.inference_mode)
+    print(f"{len(model['v'])} autoencoders exported to {args.outdir}")
@@ -0,0 +1,471 @@
+import numpy as np
+import multiprocessing
+from math import log
+from multiprocessing import shared_memory
+from register_file import RegisterFile
+
+#
+# Block kernels of the FC (see FCKitNET.process_batch).
+#
+# The flow key families (MAC+IP src, IP src, IP, 5-tuple) share no registers, so each one
+# is processed by its own kernel, over a whole block of packets at a time.
+#
+# The register updates are inherently sequential: a packet reads the values written by
+# the previous packets of the same flow (or, for the 2D stats, of the reverse flow).
+# Each kernel therefore walks the block in packet order, with the register updates
+# (the data plane part) in a tight loop, and only collects the raw register values.
+# The 1D/2D stats (the math unit part) are then calculated for the whole block at once.
+#
+# The families can also be processed in parallel, by worker processes (FamilyWorkers):
+# the register files and the decoded trace arrays are then placed in shared memory, and
+# only the packet indexes and decay counters of each block are sent to the workers.
+# The python int registers (sums of residual products) can not be shared: the slots
+# used by each block are sent along, and sent back updated.
+#
+
+# Flow key families: name and base hash columns (see FLOW_HASHES).
+FAMILIES = [
+    ('mac_ip_src', [0]),
+    ('ip_src', [1]),
+    ('ip', [2, 3, 4]),
+    ('five_t', [5, 6, 7])]
+
+# Decay intervals, per decay counter value (1-4).
+DECAY_INTERVALS = [0.1, 1, 10, 60]
+
+# Below this value, int(log(n, 2)) matches the bit length of n.
+# Above, the float rounding of log() may round it up to the next power of two.
+POW_2_EXACT = 1 << 47
+
+
+# Returns the nearest lower power of two (same as FCKitNET.pow_2).
+def pow_2(n):
+    if n > 1:
+        return int(log(n, 2))
+    else:
+        return 0
+
+
+# Python ints as an int64 array, or as an object array if they do not fit.
+def int_array(values):
+    try:
+        return np.array(values, dtype=np.int64)
+    except OverflowError:
+        return np.array(values, dtype=object)
+
+
+def pow_2_array(n):
+    if n.dtype == object:
+        return np.array([pow_2(x) for x in n.tolist()], dtype=np.int64)
+
+    exp = np.frexp(np.maximum(n, 1).astype(np.float64))[1].astype(np.int64) - 1
+    exp[n <= 1] = 0
+    big = n >= POW_2_EXACT
+    if big.any():
+        exp[big] = [pow_2(x) for x in n[big].tolist()]
+    return exp
+
+
+def shift_right(x, shift):
+    if x.dtype == object:
+        return np.array([a >> b for a, b in zip(x.tolist(), shift.tolist())], dtype=object)
+    return x >> shift
+
+
+def shift_left(x, shift):
+    if x.dtype != object and len(x) \
+            and int(np.abs(x).max()).bit_length() + int(shift.max()) < 63:
+        return x << shift
+    return int_array([a << b for a, b in zip(x.tolist(), shift.tolist())])
+
+
+def sub(x, y):
+    if x.dtype == object or y.dtype == object:
+        return int_array([a - b for a, b in zip(x.tolist(), y.tolist())])
+    return x - y
+
+
+# MathUnit.compute over an array.
+def compute(math_unit, x):
+    if x.dtype == object:
+        return np.array([math_unit.compute(a) for a in x.tolist()], dtype=np.int64)
+    return math_unit.compute_array(x)
+
+
+def variance(sqr, pkt_cnt, pkt_len_sqr, mean):
+    return np.abs(sub(shift_right(pkt_len_sqr, pow_2_array(pkt_cnt)), compute(sqr, mean)))
+
+
+# Mean and std. dev. (see FCKitNET.stats_calc_1d), plus the variance (used by the 2D stats).
+def stats_1d(sqr, sqrt_mu, pkt_cnt, pkt_len, pkt_len_sqr):
+    mean = shift_right(pkt_len, pow_2_array(pkt_cnt))
+    var = variance(sqr, pkt_cnt, pkt_len_sqr, mean)
+    return mean, compute(sqrt_mu, var), var
+
+
+# Magnitude, radius, covariance and PCC (see FCKitNET.stats_calc_2d).
+def stats_2d(sqr, sqrt_mu, pkt_cnt_0, pkt_cnt_1, mean_0, mean_1, res_sum,
+             variance_0, variance_1, std_dev_0, std_dev_1):
+    magnitude = compute(sqrt_mu, compute(sqr, mean_0) + compute(sqr, mean_1))
+    radius = compute(sqrt_mu, compute(sqr, variance_0) + compute(sqr, variance_1))
+    cov = shift_right(res_sum, pow_2_array(pkt_cnt_0 + pkt_cnt_1))
+
+    shift_1 = pow_2_array(std_dev_1)
+    shift_0 = pow_2_array(shift_left(std_dev_0, shift_1))
+    pcc = shift_right(cov, shift_0)
+    pcc[(shift_1 == 0) | (shift_0 == 0)] = 0
+
+    return magnitude, radius, cov, pcc
+
+
+# Register slots used by a block of packets, as compact slot numbers (one per hash
+# value, in order), and the decay counter value of each slot. A slot is only ever
+# used with one decay counter value, as the hash values include its offset.
+def block_slots(hashes, decay_cntrs):
+    slots, index = np.unique(hashes, return_inverse=True)
+    slot_decay = np.empty(len(slots), dtype=np.int64)
+    slot_decay[index] = np.resize(decay_cntrs, len(index))
+    return slots, slot_decay, index.reshape(-1)
+
+
+# Values of the slots of a register file newly set as valid are reset, as they are
+# initialized by a new flow.
+def reset_slots(reg, slots, valid):
+    valid = np.array(valid, dtype=np.bool_)
+    reg.array[slots[valid & ~reg.valid[slots]]] = 0
+    reg.valid[slots] = valid
+
+
+# 1D flow keys (MAC+IP src, IP src): decay check and register update of each packet.
+# Returns the pkt count, pkt length and pkt length squared of each packet's flow.
+#
+# The used register values are gathered into lists, the packets are processed over
+# these lists, and the lists are then written back to the register file.
+def flow_1d(reg, hashes, decay_cntrs, ts, pkt_len, pkt_len_sqr):
+    slots, slot_decay, index = block_slots(hashes, decay_cntrs)
+    array = reg.array
+    valid = reg.valid[slots].tolist()
+    slot_ts = array[slots, 0, slot_decay - 1].tolist()
+    slot_cnt = array[slots, slot_decay, 0].tolist()
+    slot_len = array[slots, slot_decay, 1].tolist()
+    slot_len_sqr = array[slots, slot_decay, 2].tolist()
+
+    intervals = np.array(DECAY_INTERVALS)[np.asarray(decay_cntrs) - 1].tolist()
+    index = index.tolist()
+
+    n = len(index)
+    pkt_cnt_out = [0] * n
+    pkt_len_out = [0] * n
+    pkt_len_sqr_out = [0] * n
+
+    for i in range(n):
+        k = index[i]
+
+        if valid[k]:
+            last_ts = slot_ts[k]
+            if last_ts and ts[i] - last_ts > intervals[i]:
+                slot_ts[k] = last_ts + intervals[i]
+                cnt = int(0.5 * slot_cnt[k] + 1)
+                length = int(0.5 * slot_len[k])
+                length_sqr = int(0.5 * slot_len_sqr[k])
+            else:
+                slot_ts[k] = ts[i]
+                cnt = int(slot_cnt[k] + 1)
+                length = int(slot_len[k] + pkt_len[i])
+                length_sqr = int(slot_len_sqr[k] + pkt_len_sqr[i])
+        else:
+            valid[k] = True
+            slot_ts[k] = ts[i]
+            cnt = 1
+            length = int(pkt_len[i])
+            length_sqr = pkt_len_sqr[i]
+
+        slot_cnt[k] = cnt
+        slot_len[k] = length
+        slot_len_sqr[k] = length_sqr
+
+        pkt_cnt_out[i] = cnt
+        pkt_len_out[i] = length
+        pkt_len_sqr_out[i] = length_sqr
+
+    reset_slots(reg, slots, valid)
+    array[slots, 0, slot_decay - 1] = slot_ts
+    array[slots, slot_decay, 0] = slot_cnt
+    array[slots, slot_decay, 1] = slot_len
+    array[slots, slot_decay, 2] = slot_len_sqr
+
+    return pkt_cnt_out, pkt_len_out, pkt_len_sqr_out
+
+
+# 2D flow keys (IP, 5-tuple): decay check, register update and residue calculation
+# of each packet. The reverse flow counters are written for the packets in write,
+# and read for the packets in read (see FCKitNET.process).
+# Returns the 1D values of each packet's flow, and the reverse flow counters and the
+# sum of residual products (0 if not read).
+def flow_2d(reg, res, res_sum, res_sum_ts, hashes_0, hashes_1, hashes_xor, decay_cntrs,
+            ts, pkt_len, pkt_len_sqr, write, read):
+    n = len(hashes_0)
+
+    # Flow slots (both directions).
+    slots, slot_decay, index = block_slots(np.concatenate([hashes_0, hashes_1]), decay_cntrs)
+    array = reg.array
+    valid = reg.valid[slots].tolist()
+    slot_ts = array[slots, 0, slot_decay - 1].tolist()
+    slot_cnt, slot_len, slot_len_sqr, slot_cnt_rev, slot_len_sqr_rev, slot_mean_rev = \
+        [array[slots, slot_decay, j].tolist() for j in range(6)]
+    slot_res = res.array[slots, slot_decay - 1].tolist()
+
+    # Sum of residual products slots.
+    xor_slots, xor_decay, xor_index = block_slots(hashes_xor, decay_cntrs)
+    xor_res_sum = res_sum.array[xor_slots, xor_decay].tolist()
+    xor_ts = res_sum_ts.array[xor_slots, xor_decay - 1].tolist()
+
+    intervals = np.array(DECAY_INTERVALS)[np.asarray(decay_cntrs) - 1].tolist()
+    index_0 = index[:n].tolist()
+    index_1 = index[n:].tolist()
+    xor_index = xor_index.tolist()
+
+    out = [[0] * n for _ in range(7)]
+    pkt_cnt_out, pkt_len_out, pkt_len_sqr_out, \
+        pkt_cnt_1_out, pkt_len_sqr_1_out, mean_1_out, res_sum_out = out
+
+    for i in range(n):
+        k = index_0[i]
+        k_1 = index_1[i]
+        x = xor_index[i]
+        decay = 1
+
+        if valid[k]:
+            last_ts = slot_ts[k]
+            if last_ts and ts[i] - last_ts > intervals[i]:
+                decay = 0.5
+                slot_ts[k] = last_ts + intervals[i]
+                xor_ts[x] += intervals[i]
+                cnt = int(0.5 * slot_cnt[k] + 1)
+                length = int(0.5 * slot_len[k])
+                length_sqr = int(0.5 * slot_len_sqr[k])
+                xor_res_sum[x] = int(0.5 * xor_res_sum[x])
+            else:
+                slot_ts[k] = ts[i]
+                xor_ts[x] = ts[i]
+                cnt = int(slot_cnt[k] + 1)
+                length = int(slot_len[k] + pkt_len[i])
+                length_sqr = int(slot_len_sqr[k] + pkt_len_sqr[i])
+        else:
+            valid[k] = True
+            slot_ts[k] = ts[i]
+            cnt = 1
+            length = int(pkt_len[i])
+            length_sqr = pkt_len_sqr[i]
+            slot_cnt_rev[k] = 0
+            slot_len_sqr_rev[k] = 0
+            slot_mean_rev[k] = 0
+
+        slot_cnt[k] = cnt
+        slot_len[k] = length
+        slot_len_sqr[k] = length_sqr
+
+        # Residual products from flows A->B and B->A.
+        # (the pkt count is far below POW_2_EXACT: pow_2() is its bit length - 1)
+        mean = length >> (cnt.bit_length() - 1) if cnt > 1 else length
+        res_0 = length - mean
+        slot_res[k] = res_0
+        res_1 = int(slot_res[k_1]) if valid[k_1] else 0
+        if res_1 != 0 and decay == 1:
+            xor_res_sum[x] += res_0 << pow_2(res_1)
+
+        # Counters for flow A->B / B->A.
+        if write[i]:
+            slot_cnt_rev[k] = cnt
+            slot_len_sqr_rev[k] = length_sqr
+            slot_mean_rev[k] = mean
+        if read[i]:
+            if valid[k_1]:
+                pkt_cnt_1_out[i] = int(slot_cnt_rev[k_1])
+                pkt_len_sqr_1_out[i] = int(slot_len_sqr_rev[k_1])
+                mean_1_out[i] = int(slot_mean_rev[k_1])
+            res_sum_out[i] = int(xor_res_sum[x])
+
+        pkt_cnt_out[i] = cnt
+        pkt_len_out[i] = length
+        pkt_len_sqr_out[i] = length_sqr
+
+    reset_slots(reg, slots, valid)
+    array[slots, 0, slot_decay - 1] = slot_ts
+    for j, values in enumerate([slot_cnt, slot_len, slot_len_sqr,
+                                slot_cnt_rev, slot_len_sqr_rev, slot_mean_rev]):
+        array[slots, slot_decay, j] = values
+    res.array[slots, slot_decay - 1] = slot_res
+    res_sum.array[xor_slots, xor_decay] = xor_res_sum
+    res_sum_ts.array[xor_slots, xor_decay - 1] = xor_ts
+
+    return out
+
+
+# Stats of a flow key family over a block of packets (see FCKitNET.process_batch),
+# as a list of columns: the 1D stats (pkt count, mean, std. dev.), followed by the
+# 2D stats (magnitude, radius, covariance, PCC) for the IP and 5-tuple families.
+#
+#   trace: decoded trace arrays (base hashes, timestamps and pkt lengths of all packets);
+#   pkt_index, decay_cntrs: trace index and decay counter of each packet of the block;
+#   read: packets reading the reverse flow counters (None: all packets, both updating
+#         and reading them).
+def family_stats(family, regs, trace, pkt_index, decay_cntrs, read, sqr, sqrt_mu):
+    name, columns = FAMILIES[family]
+    n = len(pkt_index)
+
+    hashes = (trace['hashes'][pkt_index][:, columns] + (8192 * (decay_cntrs - 1))[:, None])
+    hashes = hashes.T.tolist()
+    d = decay_cntrs.tolist()
+    ts = trace['ts'][pkt_index].tolist()
+    pkt_len = trace['pkt_len'][pkt_index].tolist()
+    pkt_len_sqr = sqr.compute_array(pkt_len).tolist()
+
+    if len(columns) == 1:
+        pkt_cnt, length, length_sqr = \
+            map(int_array, flow_1d(regs[f'fc_{name}'], hashes[0], d, ts, pkt_len, pkt_len_sqr))
+        mean, std_dev, _ = stats_1d(sqr, sqrt_mu, pkt_cnt, length, length_sqr)
+        return [pkt_cnt, mean, std_dev]
+
+    if read is None:
+        write = [True] * n
+        read = write
+    else:
+        write = [not r for r in read]
+
+    pkt_cnt_0, length, length_sqr, pkt_cnt_1, length_sqr_1, mean_1, res_sum = \
+        map(int_array, flow_2d(regs[f'fc_{name}'], regs[f'{name}_res'], regs[f'{name}_res_sum'],
+                               regs[f'{name}_res_sum_ts'], *hashes, d, ts, pkt_len,
+                               pkt_len_sqr, write, read))
+    mean_0, std_dev_0, variance_0 = stats_1d(sqr, sqrt_mu, pkt_cnt_0, length, length_sqr)
+    variance_1 = variance(sqr, pkt_cnt_1, length_sqr_1, mean_1)
+    std_dev_1 = compute(sqrt_mu, variance_1)
+    stats = stats_2d(sqr, sqrt_mu, pkt_cnt_0, pkt_cnt_1, mean_0, mean_1, res_sum,
+                     variance_0, variance_1, std_dev_0, std_dev_1)
+
+    # The 2D stats are only calculated for the packets reading the reverse flow counters.
+    not_read = ~np.array(read)
+    for values in stats:
+        values[not_read] = 0
+
+    return [pkt_cnt_0, mean_0, std_dev_0] + list(stats)
+
+
+# Copy of an array in a new shared memory block.
+def share_array(array, blocks):
+    block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    shared = np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)
+    shared[...] = array
+    blocks.append(block)
+    return shared, (block.name, array.shape, array.dtype.str)
+
+
+def attach_array(spec, blocks):
+    name, shape, dtype = spec
+    block = shared_memory.SharedMemory(name=name)
+    blocks.append(block)
+    return np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+
+# State of a worker process.
+worker = {}
+
+
+def init_worker(reg_specs, private_specs, trace_specs, sqr, sqrt_mu):
+    worker['blocks'] = []
+    worker['regs'] = {
+        name: RegisterFile.wrap(attach_array(array, worker['blocks']),
+                                attach_array(valid, worker['blocks']))
+        for name, (array, valid) in reg_specs.items()}
+    for name, (shape, valid) in private_specs.items():
+        worker['regs'][name] = RegisterFile.wrap(np.zeros(shape, dtype=object),
+                                                 attach_array(valid, worker['blocks']))
+    worker['trace'] = {name: attach_array(spec, worker['blocks'])
+                       for name, spec in trace_specs.items()}
+    worker['sqr'] = sqr
+    worker['sqrt_mu'] = sqrt_mu
+
+
+# Returns the stats, and the updated slots of the private registers (slot numbers, values).
+def worker_family_stats(family, pkt_index, decay_cntrs, read, private_slots):
+    regs = worker['regs']
+    for name, (slots, values) in private_slots.items():
+        regs[name].array[slots] = values
+
+    stats = family_stats(family, regs, worker['trace'], pkt_index, decay_cntrs, read,
+                         worker['sqr'], worker['sqrt_mu'])
+
+    return stats, {name: (slots, regs[name].array[slots])
+                   for name, (slots, _) in private_slots.items()}
+
+
+#
+# Pool of worker processes, each one computing the stats of a flow key family.
+#
+# The register files are moved to shared memory (they are replaced in regs, so the
+# caller must rebind any view on them), and moved back by close().
+# The shared memory blocks are then freed by unlink(), once nothing views them.
+# The object arrays (python int registers) stay in this process (see private_slots).
+#
+class FamilyWorkers:
+    def __init__(self, regs, trace, sqr, sqrt_mu, processes=len(FAMILIES)):
+        self.regs = regs
+        self.trace = trace
+        self.blocks = []
+
+        reg_specs = {}
+        private_specs = {}
+        for name, reg in regs.items():
+            valid, valid_spec = share_array(reg.valid, self.blocks)
+            if reg.array.dtype == object:
+                reg.__setstate__({'array': reg.array, 'valid': valid})
+                private_specs[name] = (reg.array.shape, valid_spec)
+                continue
+            array, array_spec = share_array(reg.array, self.blocks)
+            reg.__setstate__({'array': array, 'valid': valid})
+            reg_specs[name] = (array_spec, valid_spec)
+        self.private = list(private_specs)
+
+        trace_specs = {name: share_array(array, self.blocks)[1] for name, array in trace.items()}
+
+        self.pool = multiprocessing.Pool(
+            processes, initializer=init_worker,
+            initargs=(reg_specs, private_specs, trace_specs, sqr, sqrt_mu))
+
+    # Slots of the private registers of a family used by a block of packets, with their
+    # values. Those registers are indexed by the XOR hash (the last base hash column).
+    def private_slots(self, family, pkt_index, decay_cntrs):
+        name, columns = FAMILIES[family]
+        names = [reg for reg in self.private if reg.startswith(f'{name}_')]
+        if not names:
+            return {}
+
+        slots = np.unique(self.trace['hashes'][pkt_index, columns[-1]] +
+                          8192 * (decay_cntrs - 1))
+        return {reg: (slots, self.regs[reg].array[slots]) for reg in names}
+
+    # Stats of all families over a block of packets (see family_stats), joined in order.
+    def family_stats(self, pkt_index, decay_cntrs, read):
+        results = self.pool.starmap(worker_family_stats, [
+            (family, pkt_index, decay_cntrs, read,
+             self.private_slots(family, pkt_index, decay_cntrs))
+            for family in range(len(FAMILIES))])
+
+        for _, private_slots in results:
+            for name, (slots, values) in private_slots.items():
+                self.regs[name].array[slots] = values
+
+        return [stats for stats, _ in results]
+
+    def close(self):
+        self.pool.close()
+        self.pool.join()
+
+        for reg in self.regs.values():
+            reg.__setstate__({'array': reg.array.copy(), 'valid': reg.valid.copy()})
+
+    def unlink(self):
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+        self.blocks = []
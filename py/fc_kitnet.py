@@ -1,13 +1,12 @@
-import os
-import subprocess
+import numpy as np
 import pandas as pd
-import binascii
-import socket
-import struct
-import pickle
-import crcmod
-from math import isnan, sqrt, pow, log
+from math import sqrt, pow, log
 from math_unit import MathUnit
+from register_file import flow_registers, registers_from_arrays, legacy_flow_registers
+from train_stats import load_train_stats
+from trace_cache import load_trace, decode_trace, flow_keys, pkt_strs
+from hash_engine import HashEngine
+from fc_batch import FAMILIES, FamilyWorkers, family_stats
 
 sqr = MathUnit(shift=1, invert=False, scale=-6,
                lookup=[x*x for x in range(15, -1, -1)])
@@ -17,11 +16,17 @@ lookup_sqrt = [240, 240, 222, 222, 202, 202, 182, 182, 175, 169, 163, 157, 150,
 sqrt_mu = MathUnit(shift=-1, invert=False, scale=-7,
                    lookup=lookup_sqrt)
 
+# Header arrays returned by FCKitNET.process_batch.
+BATCH_HDRS = ['ts', 'mac_src', 'ip_src', 'ip_dst', 'ip_proto', 'port_src', 'port_dst']
+
 
 class FCKitNET:
     def __init__(self, file_path, sampling_rate, train_pkts, offset, train_skip, train_stats):
         self.file_path = file_path              # Path of the trace file / csv.
-        self.df_csv = None                      # Dataframe for the trace csv.
+        self.trace = None                       # Parsed trace columns.
+        self.pkts = None                        # Decoded per-packet fields.
+        self.pkt_hashes = None                  # Base hash indexes of all packets.
+        self.cur_pkt_index = 0                  # Trace index of the packet being processed.
         self.cur_pkt = pd.DataFrame()           # Stats of the packet being processed.
         self.sampling_rate = sampling_rate      # Sampling rate during the execution phase.
         self.exec_phase_offset = offset         # offset from which to start the sampling.
@@ -30,33 +35,24 @@ class FCKitNET:
         if train_skip:
             self.global_pkt_index = train_pkts
 
-            with open(train_stats, 'rb') as f_stats:
-                stats = pickle.load(f_stats)
-                # Calculated 1D and 2D statistics for all flow keys.
-                self.fc_mac_ip_src = stats[4]
-                self.fc_ip_src = stats[5]
-                self.fc_ip = stats[6]
-                self.fc_five_t = stats[7]
-
-                # Support structures for residue calculation.
-                self.ip_res = stats[8]
-                self.ip_res_sum = stats[9]
-                self.five_t_res = stats[10]
-                self.five_t_res_sum = stats[11]
+            # Flow key registers at the end of the training phase.
+            snapshot = load_train_stats(train_stats, cp_stats=False)
+            if 'legacy' in snapshot:
+                self.regs = legacy_flow_registers(*snapshot['legacy'])
+            else:
+                self.regs = registers_from_arrays(snapshot['arrays'])
         else:
             self.global_pkt_index = 0
 
-            # Calculated 1D and 2D statistics for all flow keys.
-            self.fc_mac_ip_src = {}
-            self.fc_ip_src = {}
-            self.fc_ip = {}
-            self.fc_five_t = {}
+            # Flow key registers (see register_file.py).
+            self.regs = flow_registers()
 
-            # Support structures for residue calculation.
-            self.ip_res = {}
-            self.ip_res_sum = {}
-            self.five_t_res = {}
-            self.five_t_res_sum = {}
+        # Calculated 1D and 2D statistics for all flow keys,
+        # and support structures for residue calculation.
+        self.bind_registers()
+
+        # Worker processes computing the packet blocks (see start_workers).
+        self.workers = None
 
         self.phase_pkt_index = 0    # Packet index for the current phase.
         self.sampl_pkt_index = 0    # Packet index to track the sampling rate (tna impl).
@@ -66,8 +62,8 @@ class FCKitNET:
         self.decay_ip = 1
         self.decay_five_t = 1
 
-        # CRC 16 parameters, following the TNA.
-        self.crc16 = crcmod.mkCrcFun(0x18005, rev=True, initCrc=0x0000, xorOut=0x0000)
+        # CRC16 hash engine, following the TNA.
+        self.hash_engine = HashEngine()
 
         # Hash values for all flow keys.
         self.hash_mac_ip_src = 0
@@ -79,39 +75,42 @@ class FCKitNET:
         self.hash_five_t_1 = 0
         self.hash_five_t_xor = 0
 
-        # Check if the pcap -> csv already exists and pass it to a dataframe.
-        self.__check_csv__()
-
-    def __check_csv__(self):
-        # Check the file type.
-        file_path = self.file_path.split('.')[0]
-
-        if not os.path.isfile(file_path + '.csv'):
-            self.parse_pcap(self.file_path)
-
-        self.df_csv = pd.read_csv(file_path + '.csv')
+        # Load the parsed trace columns, building the trace cache if needed,
+        # and decode them into the per-packet fields.
+        self.trace = load_trace(self.file_path)
+        self.pkts = decode_trace(self.trace)
+
+        # Base hash indexes of all packets, hashed vectorized over the whole trace.
+        self.pkt_hashes = self.hash_engine.trace_hashes(flow_keys(self.trace))
+
+    # Binds the register files' memoryviews (after the register files are replaced).
+    def bind_registers(self):
+        # Calculated 1D and 2D statistics for all flow keys.
+        self.fc_mac_ip_src = self.regs['fc_mac_ip_src'].cells
+        self.fc_mac_ip_src_valid = self.regs['fc_mac_ip_src'].valid_bits
+        self.fc_ip_src = self.regs['fc_ip_src'].cells
+        self.fc_ip_src_valid = self.regs['fc_ip_src'].valid_bits
+        self.fc_ip = self.regs['fc_ip'].cells
+        self.fc_ip_valid = self.regs['fc_ip'].valid_bits
+        self.fc_five_t = self.regs['fc_five_t'].cells
+        self.fc_five_t_valid = self.regs['fc_five_t'].valid_bits
+
+        # Support structures for residue calculation.
+        self.ip_res = self.regs['ip_res'].cells
+        self.ip_res_sum = self.regs['ip_res_sum'].cells
+        self.ip_res_sum_ts = self.regs['ip_res_sum_ts'].cells
+        self.five_t_res = self.regs['five_t_res'].cells
+        self.five_t_res_sum = self.regs['five_t_res_sum'].cells
+        self.five_t_res_sum_ts = self.regs['five_t_res_sum_ts'].cells
 
     def trace_size(self):
-        return len(self.df_csv)
+        return len(self.pkts['ts'])
 
     def trace_initial_ts(self):
-        return float(self.df_csv.iat[0, 0])
-
-    def parse_pcap(self, pcap_path):
-        fields = "-e frame.time_epoch -e frame.len -e eth.src -e eth.dst \
-                    -e ip.src -e ip.dst -e ip.len -e ip.proto -e tcp.srcport \
-                    -e tcp.dstport -e udp.srcport -e udp.dstport -e icmp.type \
-                    -e icmp.code -e arp.opcode -e arp.src.hw_mac \
-                    -e arp.src.proto_ipv4 -e arp.dst.hw_mac -e arp.dst.proto_ipv4 \
-                    -e ipv6.src -e ipv6.dst"
-        cmd = 'tshark -r ' + pcap_path + ' -T fields ' + \
-            fields + ' -E separator=\',\' -E header=y -E occurrence=f > ' + self.file_path.split('.')[0] + '.csv'
-
-        print('Parsing pcap file to csv.')
-        subprocess.call(cmd, shell=True)
+        return self.pkts['ts'].item(0)
 
     def feature_extract(self):
-        # Parse the next packet from the csv.
+        # Parse the next packet from the trace.
         if self.global_pkt_index == self.train_pkts:
             # self.fc_mac_ip_src = {}
             # self.fc_ip_src = {}
@@ -125,39 +124,15 @@ class FCKitNET:
             self.phase_pkt_index = 0
             self.global_pkt_index += self.exec_phase_offset
 
-        ip_src = self.df_csv.iat[self.global_pkt_index, 4]
-        ip_dst = self.df_csv.iat[self.global_pkt_index, 5]
-        if str(ip_src) == 'nan' or str(ip_dst) == 'nan':
-            self.cur_pkt = []
-            self.global_pkt_index = self.global_pkt_index + 1
-            self.phase_pkt_index = self.phase_pkt_index + 1
-            return
-        timestamp = float(self.df_csv.iat[self.global_pkt_index, 0])
-        mac_src = str(self.df_csv.iat[self.global_pkt_index, 2])
-        mac_dst = str(self.df_csv.iat[self.global_pkt_index, 3])
-        pkt_len = self.df_csv.iat[self.global_pkt_index, 6]
-        if isnan(pkt_len):
-            pkt_len = 0
-        ip_proto = self.df_csv.iat[self.global_pkt_index, 7]
-        if isnan(ip_proto):
-            ip_proto = 0
-        if ip_proto == 17:
-            port_src = self.df_csv.iat[self.global_pkt_index, 10]
-            port_dst = self.df_csv.iat[self.global_pkt_index, 11]
-        elif ip_proto == 6:
-            port_src = self.df_csv.iat[self.global_pkt_index, 8]
-            port_dst = self.df_csv.iat[self.global_pkt_index, 9]
-        else:
-            port_src = 0
-            port_dst = 0
-        if isnan(port_src) or isnan(port_dst):
-            port_src = 0
-            port_dst = 0
-
+        i = self.global_pkt_index
+        self.cur_pkt_index = i
         self.global_pkt_index = self.global_pkt_index + 1
         self.phase_pkt_index = self.phase_pkt_index + 1
-        self.cur_pkt = [pkt_len, timestamp, mac_dst, mac_src, ip_src, ip_dst,
-                        str(int(ip_proto)), str(int(port_src)), str(int(port_dst))]
+        if not self.pkts['ipv4'][i]:
+            self.cur_pkt = []
+            return
+        self.cur_pkt = [self.pkts['pkt_len'].item(i), self.pkts['ts'].item(i)] + \
+            pkt_strs(self.pkts, i)
 
     def process(self, phase):
         # If the packet is not IPv4.
@@ -188,60 +163,24 @@ class FCKitNET:
                 self.sampl_pkt_index = 1
 
         # Hash calculation.
-        # CRC16, sliced to 13 bits (0-8191).
+        # CRC16, sliced to 13 bits (0-8191), precomputed for the whole trace.
         # To each hash value we then sum 8192 * (self.decay_cntr - 1)
         # in order to obtain the current position based on the decay counter value.
-        mac_src_bytes = binascii.unhexlify(self.cur_pkt[3].replace(':', ''))
-        ip_src_bytes = socket.inet_aton(self.cur_pkt[4])
-        ip_dst_bytes = socket.inet_aton(self.cur_pkt[5])
-        ip_proto_bytes = struct.pack("!B", int(self.cur_pkt[6]))
-        proto_src_bytes = struct.pack("!H", int(self.cur_pkt[7]))
-        proto_dst_bytes = struct.pack("!H", int(self.cur_pkt[8]))
-
-        hash_mac_ip_src_temp = self.crc16(mac_src_bytes)
-        hash_mac_ip_src_temp = '{:016b}'.format(self.crc16(ip_src_bytes, hash_mac_ip_src_temp))
+        (hash_mac_ip_src, hash_ip_src, hash_ip_0, hash_ip_1, hash_ip_xor,
+         hash_five_t_0, hash_five_t_1, hash_five_t_xor) = \
+            self.pkt_hashes[self.cur_pkt_index].tolist()
+        hash_offset = 8192 * (self.decay_cntr - 1)
 
-        self.hash_mac_ip_src = int(hash_mac_ip_src_temp[-13:], 2) + 8192 * (self.decay_cntr - 1)
+        self.hash_mac_ip_src = hash_mac_ip_src + hash_offset
+        self.hash_ip_src = hash_ip_src + hash_offset
 
-        hash_ip_src_temp = '{:016b}'.format(self.crc16(ip_src_bytes))
-        self.hash_ip_src = int(hash_ip_src_temp[-13:], 2) + 8192 * (self.decay_cntr - 1)
+        self.hash_ip_0 = hash_ip_0 + hash_offset
+        self.hash_ip_1 = hash_ip_1 + hash_offset
+        self.hash_ip_xor = hash_ip_xor + hash_offset
 
-        # Hash xor value is used to access the sum of residual products.
-        # Xor is used since the value is the same for both flow directions.
-
-        hash_ip_0_temp = self.crc16(ip_src_bytes)
-        hash_ip_0_temp = '{:016b}'.format(self.crc16(ip_dst_bytes, hash_ip_0_temp))
-        self.hash_ip_0 = int(hash_ip_0_temp[-13:], 2)
-
-        hash_ip_1_temp = self.crc16(ip_dst_bytes)
-        hash_ip_1_temp = '{:016b}'.format(self.crc16(ip_src_bytes, hash_ip_1_temp))
-        self.hash_ip_1 = int(hash_ip_1_temp[-13:], 2)
-
-        self.hash_ip_xor = self.hash_ip_0 ^ self.hash_ip_1
-
-        self.hash_ip_0 += 8192 * (self.decay_cntr - 1)
-        self.hash_ip_1 += 8192 * (self.decay_cntr - 1)
-        self.hash_ip_xor += 8192 * (self.decay_cntr - 1)
-
-        hash_five_t_0_temp = self.crc16(ip_src_bytes)
-        hash_five_t_0_temp = self.crc16(ip_dst_bytes, hash_five_t_0_temp)
-        hash_five_t_0_temp = self.crc16(ip_proto_bytes, hash_five_t_0_temp)
-        hash_five_t_0_temp = self.crc16(proto_src_bytes, hash_five_t_0_temp)
-        hash_five_t_0_temp = '{:016b}'.format(self.crc16(proto_dst_bytes, hash_five_t_0_temp))
-        self.hash_five_t_0 = int(hash_five_t_0_temp[-13:], 2)
-
-        hash_five_t_1_temp = self.crc16(ip_dst_bytes)
-        hash_five_t_1_temp = self.crc16(ip_src_bytes, hash_five_t_1_temp)
-        hash_five_t_1_temp = self.crc16(ip_proto_bytes, hash_five_t_1_temp)
-        hash_five_t_1_temp = self.crc16(proto_dst_bytes, hash_five_t_1_temp)
-        hash_five_t_1_temp = '{:016b}'.format(self.crc16(proto_src_bytes, hash_five_t_1_temp))
-        self.hash_five_t_1 = int(hash_five_t_1_temp[-13:], 2)
-
-        self.hash_five_t_xor = self.hash_five_t_0 ^ self.hash_five_t_1
-
-        self.hash_five_t_0 += 8192 * (self.decay_cntr - 1)
-        self.hash_five_t_1 += 8192 * (self.decay_cntr - 1)
-        self.hash_five_t_xor += 8192 * (self.decay_cntr - 1)
+        self.hash_five_t_0 = hash_five_t_0 + hash_offset
+        self.hash_five_t_1 = hash_five_t_1 + hash_offset
+        self.hash_five_t_xor = hash_five_t_xor + hash_offset
 
         # Decay check for all flow keys.
         self.decay_check()
@@ -249,47 +188,47 @@ class FCKitNET:
         # Calculate the 1D/2D statistics for each flow key.
 
         # 1D: Mac src, IP src
-        mac_ip_src_pkt_cnt = int(self.fc_mac_ip_src[self.hash_mac_ip_src][self.decay_cntr][0])
+        mac_ip_src_pkt_cnt = int(self.fc_mac_ip_src[self.hash_mac_ip_src, self.decay_cntr, 0])
         mac_ip_src_mean, mac_ip_src_std_dev = \
             self.stats_calc_1d(mac_ip_src_pkt_cnt,
-                               int(self.fc_mac_ip_src[self.hash_mac_ip_src][self.decay_cntr][1]),
-                               int(self.fc_mac_ip_src[self.hash_mac_ip_src][self.decay_cntr][2]))
+                               int(self.fc_mac_ip_src[self.hash_mac_ip_src, self.decay_cntr, 1]),
+                               int(self.fc_mac_ip_src[self.hash_mac_ip_src, self.decay_cntr, 2]))
         # 1D: IP src
-        ip_src_pkt_cnt = int(self.fc_ip_src[self.hash_ip_src][self.decay_cntr][0])
+        ip_src_pkt_cnt = int(self.fc_ip_src[self.hash_ip_src, self.decay_cntr, 0])
         ip_src_mean, ip_src_std_dev = \
             self.stats_calc_1d(ip_src_pkt_cnt,
-                               int(self.fc_ip_src[self.hash_ip_src][self.decay_cntr][1]),
-                               int(self.fc_ip_src[self.hash_ip_src][self.decay_cntr][2]))
+                               int(self.fc_ip_src[self.hash_ip_src, self.decay_cntr, 1]),
+                               int(self.fc_ip_src[self.hash_ip_src, self.decay_cntr, 2]))
         # 1D: IP
 
-        ip_pkt_cnt_0 = int(self.fc_ip[self.hash_ip_0][self.decay_cntr][0])
-        ip_pkt_len = int(self.fc_ip[self.hash_ip_0][self.decay_cntr][1])
-        ip_pkt_len_sqr = int(self.fc_ip[self.hash_ip_0][self.decay_cntr][2])
+        ip_pkt_cnt_0 = int(self.fc_ip[self.hash_ip_0, self.decay_cntr, 0])
+        ip_pkt_len = int(self.fc_ip[self.hash_ip_0, self.decay_cntr, 1])
+        ip_pkt_len_sqr = int(self.fc_ip[self.hash_ip_0, self.decay_cntr, 2])
         ip_mean_0, ip_std_dev_0 = \
             self.stats_calc_1d(ip_pkt_cnt_0, ip_pkt_len, ip_pkt_len_sqr)
 
         # Calculate the residual products from flows A->B and B->A.
         ip_res_0 = ip_pkt_len - ip_mean_0
-        self.ip_res[self.hash_ip_0][self.decay_cntr-1] = ip_res_0
-        if self.hash_ip_1 in self.fc_ip:
-            ip_res_1 = int(self.ip_res[self.hash_ip_1][self.decay_cntr-1])
+        self.ip_res[self.hash_ip_0, self.decay_cntr-1] = ip_res_0
+        if self.fc_ip_valid[self.hash_ip_1]:
+            ip_res_1 = int(self.ip_res[self.hash_ip_1, self.decay_cntr-1])
         else:
             ip_res_1 = 0
 
         # Update the Sum of Residual Products.
         if ip_res_1 != 0 and self.decay_ip == 1:
-            self.ip_res_sum[self.hash_ip_xor][self.decay_cntr] += (ip_res_0 << self.pow_2(ip_res_1))
+            self.ip_res_sum[self.hash_ip_xor, self.decay_cntr] += (ip_res_0 << self.pow_2(ip_res_1))
 
         # Update the counters for flow A->B / Read the counters for flow B->A.
         # Training phase: both are performed for all flows.
         if phase == 'training' or self.sampling_rate == 1:
-            self.fc_ip[self.hash_ip_0][self.decay_cntr][3] = ip_pkt_cnt_0
-            self.fc_ip[self.hash_ip_0][self.decay_cntr][4] = ip_pkt_len_sqr
-            self.fc_ip[self.hash_ip_0][self.decay_cntr][5] = ip_mean_0
-            if self.hash_ip_1 in self.fc_ip:
-                ip_pkt_cnt_1 = int(self.fc_ip[self.hash_ip_1][self.decay_cntr][3])
-                ip_pkt_len_sqr_1 = int(self.fc_ip[self.hash_ip_1][self.decay_cntr][4])
-                ip_mean_1 = int(self.fc_ip[self.hash_ip_1][self.decay_cntr][5])
+            self.fc_ip[self.hash_ip_0, self.decay_cntr, 3] = ip_pkt_cnt_0
+            self.fc_ip[self.hash_ip_0, self.decay_cntr, 4] = ip_pkt_len_sqr
+            self.fc_ip[self.hash_ip_0, self.decay_cntr, 5] = ip_mean_0
+            if self.fc_ip_valid[self.hash_ip_1]:
+                ip_pkt_cnt_1 = int(self.fc_ip[self.hash_ip_1, self.decay_cntr, 3])
+                ip_pkt_len_sqr_1 = int(self.fc_ip[self.hash_ip_1, self.decay_cntr, 4])
+                ip_mean_1 = int(self.fc_ip[self.hash_ip_1, self.decay_cntr, 5])
             else:
                 ip_pkt_cnt_1 = 0
                 ip_pkt_len_sqr_1 = 0
@@ -299,15 +238,15 @@ class FCKitNET:
         # and reading the previously stored counters for flow B->A according to the sampling rate.
         elif self.phase_pkt_index % self.sampling_rate != 0:
             # Update
-            self.fc_ip[self.hash_ip_0][self.decay_cntr][3] = ip_pkt_cnt_0
-            self.fc_ip[self.hash_ip_0][self.decay_cntr][4] = ip_pkt_len_sqr
-            self.fc_ip[self.hash_ip_0][self.decay_cntr][5] = ip_mean_0
+            self.fc_ip[self.hash_ip_0, self.decay_cntr, 3] = ip_pkt_cnt_0
+            self.fc_ip[self.hash_ip_0, self.decay_cntr, 4] = ip_pkt_len_sqr
+            self.fc_ip[self.hash_ip_0, self.decay_cntr, 5] = ip_mean_0
         else:
             # Read
-            if self.hash_ip_1 in self.fc_ip:
-                ip_pkt_cnt_1 = int(self.fc_ip[self.hash_ip_1][self.decay_cntr][3])
-                ip_pkt_len_sqr_1 = int(self.fc_ip[self.hash_ip_1][self.decay_cntr][4])
-                ip_mean_1 = int(self.fc_ip[self.hash_ip_1][self.decay_cntr][5])
+            if self.fc_ip_valid[self.hash_ip_1]:
+                ip_pkt_cnt_1 = int(self.fc_ip[self.hash_ip_1, self.decay_cntr, 3])
+                ip_pkt_len_sqr_1 = int(self.fc_ip[self.hash_ip_1, self.decay_cntr, 4])
+                ip_mean_1 = int(self.fc_ip[self.hash_ip_1, self.decay_cntr, 5])
             else:
                 ip_pkt_cnt_1 = 0
                 ip_pkt_len_sqr_1 = 0
@@ -315,34 +254,34 @@ class FCKitNET:
 
         # 1D: 5-tuple
 
-        five_t_pkt_cnt_0 = int(self.fc_five_t[self.hash_five_t_0][self.decay_cntr][0])
-        five_t_pkt_len = int(self.fc_five_t[self.hash_five_t_0][self.decay_cntr][1])
-        five_t_pkt_len_sqr = int(self.fc_five_t[self.hash_five_t_0][self.decay_cntr][2])
+        five_t_pkt_cnt_0 = int(self.fc_five_t[self.hash_five_t_0, self.decay_cntr, 0])
+        five_t_pkt_len = int(self.fc_five_t[self.hash_five_t_0, self.decay_cntr, 1])
+        five_t_pkt_len_sqr = int(self.fc_five_t[self.hash_five_t_0, self.decay_cntr, 2])
         five_t_mean_0, five_t_std_dev_0 = \
             self.stats_calc_1d(five_t_pkt_cnt_0, five_t_pkt_len, five_t_pkt_len_sqr)
 
         # Calculate the residual products from flows A->B and B->A.
         five_t_res_0 = five_t_pkt_len - five_t_mean_0
-        self.five_t_res[self.hash_five_t_0][self.decay_cntr-1] = five_t_res_0
-        if self.hash_five_t_1 in self.fc_five_t:
-            five_t_res_1 = int(self.five_t_res[self.hash_five_t_1][self.decay_cntr-1])
+        self.five_t_res[self.hash_five_t_0, self.decay_cntr-1] = five_t_res_0
+        if self.fc_five_t_valid[self.hash_five_t_1]:
+            five_t_res_1 = int(self.five_t_res[self.hash_five_t_1, self.decay_cntr-1])
         else:
             five_t_res_1 = 0
 
         # Update the Sum of Residual Products.
         if five_t_res_1 != 0 and self.decay_five_t == 1:
-            self.five_t_res_sum[self.hash_five_t_xor][self.decay_cntr] += (five_t_res_0 << self.pow_2(five_t_res_1))
+            self.five_t_res_sum[self.hash_five_t_xor, self.decay_cntr] += (five_t_res_0 << self.pow_2(five_t_res_1))
 
         # Update the counters for flow A->B / Read the counters for flow B->A.
         # Training phase: both are performed for all flows.
         if phase == 'training' or self.sampling_rate == 1:
-            self.fc_five_t[self.hash_five_t_0][self.decay_cntr][3] = five_t_pkt_cnt_0
-            self.fc_five_t[self.hash_five_t_0][self.decay_cntr][4] = five_t_pkt_len_sqr
-            self.fc_five_t[self.hash_five_t_0][self.decay_cntr][5] = five_t_mean_0
-            if self.hash_five_t_1 in self.fc_five_t:
-                five_t_pkt_cnt_1 = int(self.fc_five_t[self.hash_five_t_1][self.decay_cntr][3])
-                five_t_pkt_len_sqr_1 = int(self.fc_five_t[self.hash_five_t_1][self.decay_cntr][4])
-                five_t_mean_1 = int(self.fc_five_t[self.hash_five_t_1][self.decay_cntr][5])
+            self.fc_five_t[self.hash_five_t_0, self.decay_cntr, 3] = five_t_pkt_cnt_0
+            self.fc_five_t[self.hash_five_t_0, self.decay_cntr, 4] = five_t_pkt_len_sqr
+            self.fc_five_t[self.hash_five_t_0, self.decay_cntr, 5] = five_t_mean_0
+            if self.fc_five_t_valid[self.hash_five_t_1]:
+                five_t_pkt_cnt_1 = int(self.fc_five_t[self.hash_five_t_1, self.decay_cntr, 3])
+                five_t_pkt_len_sqr_1 = int(self.fc_five_t[self.hash_five_t_1, self.decay_cntr, 4])
+                five_t_mean_1 = int(self.fc_five_t[self.hash_five_t_1, self.decay_cntr, 5])
             else:
                 five_t_pkt_cnt_1 = 0
                 five_t_pkt_len_sqr_1 = 0
@@ -352,15 +291,15 @@ class FCKitNET:
         # and reading the previously stored counters for flow B->A according to the sampling rate.
         elif self.phase_pkt_index % self.sampling_rate != 0:
             # Update
-            self.fc_five_t[self.hash_five_t_0][self.decay_cntr][3] = five_t_pkt_cnt_0
-            self.fc_five_t[self.hash_five_t_0][self.decay_cntr][4] = five_t_pkt_len_sqr
-            self.fc_five_t[self.hash_five_t_0][self.decay_cntr][5] = five_t_mean_0
+            self.fc_five_t[self.hash_five_t_0, self.decay_cntr, 3] = five_t_pkt_cnt_0
+            self.fc_five_t[self.hash_five_t_0, self.decay_cntr, 4] = five_t_pkt_len_sqr
+            self.fc_five_t[self.hash_five_t_0, self.decay_cntr, 5] = five_t_mean_0
         else:
             # Read
-            if self.hash_five_t_1 in self.fc_five_t:
-                five_t_pkt_cnt_1 = int(self.fc_five_t[self.hash_five_t_1][self.decay_cntr][3])
-                five_t_pkt_len_sqr_1 = int(self.fc_five_t[self.hash_five_t_1][self.decay_cntr][4])
-                five_t_mean_1 = int(self.fc_five_t[self.hash_five_t_1][self.decay_cntr][5])
+            if self.fc_five_t_valid[self.hash_five_t_1]:
+                five_t_pkt_cnt_1 = int(self.fc_five_t[self.hash_five_t_1, self.decay_cntr, 3])
+                five_t_pkt_len_sqr_1 = int(self.fc_five_t[self.hash_five_t_1, self.decay_cntr, 4])
+                five_t_mean_1 = int(self.fc_five_t[self.hash_five_t_1, self.decay_cntr, 5])
             else:
                 five_t_pkt_cnt_1 = 0
                 five_t_pkt_len_sqr_1 = 0
@@ -377,7 +316,7 @@ class FCKitNET:
             ip_std_dev_1 = sqrt_mu.compute(ip_variance_1)
             ip_magnitude, ip_radius, ip_cov, ip_pcc \
                 = self.stats_calc_2d(ip_pkt_cnt_0, ip_pkt_cnt_1, ip_mean_0, ip_mean_1,
-                                     int(self.ip_res_sum[self.hash_ip_xor][self.decay_cntr]),
+                                     int(self.ip_res_sum[self.hash_ip_xor, self.decay_cntr]),
                                      ip_variance_0, ip_variance_1, ip_std_dev_0, ip_std_dev_1)
         else:
             ip_magnitude = 0
@@ -397,7 +336,7 @@ class FCKitNET:
             five_t_magnitude, five_t_radius, five_t_cov, five_t_pcc \
                 = self.stats_calc_2d(five_t_pkt_cnt_0, five_t_pkt_cnt_1,
                                      five_t_mean_0, five_t_mean_1,
-                                     int(self.five_t_res_sum[self.hash_five_t_xor][self.decay_cntr]),
+                                     int(self.five_t_res_sum[self.hash_five_t_xor, self.decay_cntr]),
                                      five_t_variance_0, five_t_variance_1,
                                      five_t_std_dev_0, five_t_std_dev_1)
         else:
@@ -419,6 +358,125 @@ class FCKitNET:
 
         return [self.cur_pkt, cur_stats]
 
+    # Process a block of count packets, starting from the global packet index start
+    # (usually, self.global_pkt_index): same results and register updates as calling
+    # feature_extract() and process(phase) for each packet.
+    # Packets set in skip (optional, one flag per packet) are only parsed, as if
+    # process(phase) was not called for them.
+    # The packets of the block from the end of the training phase on are processed in the
+    # execution phase.
+    #
+    # Returns:
+    #   rows: row of each packet in hdrs/stats, -1 if not processed (non-IPv4 or skipped);
+    #   hdrs: header arrays of the processed packets (see BATCH_HDRS);
+    #   stats: (n, 21) array with the stats of the processed packets (as in process()).
+    def process_batch(self, start, count, phase, skip=None):
+        if start < self.train_pkts < start + count:
+            split = self.train_pkts - start
+            rows_0, hdrs_0, stats_0 = self.process_batch(
+                start, split, phase, None if skip is None else skip[:split])
+            rows_1, hdrs_1, stats_1 = self.process_batch(
+                self.train_pkts, count - split, 'execution',
+                None if skip is None else skip[split:])
+            rows = np.concatenate([rows_0, np.where(rows_1 < 0, -1, rows_1 + len(stats_0))])
+            if len(stats_0) == 0:
+                return rows, hdrs_1, stats_1
+            if len(stats_1) == 0:
+                return rows, hdrs_0, stats_0
+            return rows, {name: np.concatenate([hdrs_0[name], hdrs_1[name]]) for name in hdrs_0}, \
+                np.concatenate([stats_0, stats_1])
+
+        ipv4 = self.pkts['ipv4']
+        training = phase == 'training' or self.sampling_rate == 1
+
+        # Packet index and decay counter bookkeeping (feature_extract() and process()).
+        self.global_pkt_index = start
+        rows = np.full(count, -1, dtype=np.int64)
+        pkt_index = []
+        decay_cntrs = []
+        phase_pkt_index = []
+        for j in range(count):
+            if self.global_pkt_index == self.train_pkts:
+                self.decay_cntr = 1
+                self.phase_pkt_index = 0
+                self.global_pkt_index += self.exec_phase_offset
+
+            i = self.global_pkt_index
+            self.cur_pkt_index = i
+            self.global_pkt_index += 1
+            self.phase_pkt_index += 1
+            if (skip is not None and skip[j]) or not ipv4[i]:
+                continue
+
+            if training or self.sampl_pkt_index < self.sampling_rate:
+                if self.decay_cntr < 4:
+                    self.decay_cntr += 1
+                else:
+                    self.decay_cntr = 1
+                if not training:
+                    self.sampl_pkt_index += 1
+            else:
+                self.sampl_pkt_index = 1
+
+            rows[j] = len(pkt_index)
+            pkt_index.append(i)
+            decay_cntrs.append(self.decay_cntr)
+            phase_pkt_index.append(self.phase_pkt_index)
+
+        n = len(pkt_index)
+        self.cur_pkt = []
+        if n == 0:
+            return rows, {name: np.empty(0) for name in BATCH_HDRS}, \
+                np.empty((0, 21), dtype=np.int64)
+
+        pkt_index = np.array(pkt_index)
+        decay_cntrs = np.array(decay_cntrs)
+
+        # Packets updating / reading the counters of the reverse flows (see process()).
+        if training:
+            read = None
+        else:
+            read = (np.array(phase_pkt_index) % self.sampling_rate == 0).tolist()
+
+        if self.workers is None:
+            family_columns = [family_stats(family, self.regs, self.batch_arrays(), pkt_index,
+                                           decay_cntrs, read, sqr, sqrt_mu)
+                              for family in range(len(FAMILIES))]
+        else:
+            family_columns = self.workers.family_stats(pkt_index, decay_cntrs, read)
+        stats = [decay_cntrs] + [values for columns in family_columns for values in columns]
+
+        if any(values.dtype == object for values in stats):
+            stats = np.stack([values.astype(object) for values in stats], axis=1)
+        else:
+            stats = np.stack(stats, axis=1)
+
+        # Timestamp, mac src, ip_src, ip_dst, ip_proto, port_src, port_dst
+        hdrs = {'ts': self.batch_arrays()['ts'][pkt_index]}
+        for name in BATCH_HDRS[1:]:
+            hdrs[name] = self.pkts['tables'][name][self.pkts[name][pkt_index]]
+
+        return rows, hdrs, stats
+
+    # Decoded trace arrays used by process_batch.
+    def batch_arrays(self):
+        return {'hashes': self.pkt_hashes, 'ts': self.pkts['ts'], 'pkt_len': self.pkts['pkt_len']}
+
+    # Compute the flow key families of process_batch in parallel, each one by a worker
+    # process (see fc_batch.py). The register files are moved to shared memory.
+    def start_workers(self, processes=len(FAMILIES)):
+        if self.workers is None:
+            self.workers = FamilyWorkers(self.regs, self.batch_arrays(), sqr, sqrt_mu, processes)
+            self.bind_registers()
+
+    def stop_workers(self):
+        if self.workers is not None:
+            workers = self.workers
+            self.workers = None
+            workers.close()
+            self.bind_registers()
+            workers.unlink()
+
     def process_exact(self, phase):
         # If the packet is not IPv4.
         if self.cur_pkt == []:
@@ -448,59 +506,24 @@ class FCKitNET:
                 self.sampl_pkt_index = 1
 
         # Hash calculation.
-        # CRC16, sliced to 13 bits (0-8191).
+        # CRC16, sliced to 13 bits (0-8191), precomputed for the whole trace.
         # To each hash value we then sum 8192 * (self.decay_cntr - 1)
         # in order to obtain the current position based on the decay counter value.
-        mac_src_bytes = binascii.unhexlify(self.cur_pkt[3].replace(':', ''))
-        ip_src_bytes = socket.inet_aton(self.cur_pkt[4])
-        ip_dst_bytes = socket.inet_aton(self.cur_pkt[5])
-        ip_proto_bytes = struct.pack("!B", int(self.cur_pkt[6]))
-        proto_src_bytes = struct.pack("!H", int(self.cur_pkt[7]))
-        proto_dst_bytes = struct.pack("!H", int(self.cur_pkt[8]))
-
-        hash_mac_ip_src_temp = self.crc16(mac_src_bytes)
-        hash_mac_ip_src_temp = '{:016b}'.format(self.crc16(ip_src_bytes, hash_mac_ip_src_temp))
-        self.hash_mac_ip_src = int(hash_mac_ip_src_temp[-13:], 2) + 8192 * (self.decay_cntr - 1)
+        (hash_mac_ip_src, hash_ip_src, hash_ip_0, hash_ip_1, hash_ip_xor,
+         hash_five_t_0, hash_five_t_1, hash_five_t_xor) = \
+            self.pkt_hashes[self.cur_pkt_index].tolist()
+        hash_offset = 8192 * (self.decay_cntr - 1)
 
-        hash_ip_src_temp = '{:016b}'.format(self.crc16(ip_src_bytes))
-        self.hash_ip_src = int(hash_ip_src_temp[-13:], 2) + 8192 * (self.decay_cntr - 1)
+        self.hash_mac_ip_src = hash_mac_ip_src + hash_offset
+        self.hash_ip_src = hash_ip_src + hash_offset
 
-        # Hash xor value is used to access the sum of residual products.
-        # Xor is used since the value is the same for both flow directions.
+        self.hash_ip_0 = hash_ip_0 + hash_offset
+        self.hash_ip_1 = hash_ip_1 + hash_offset
+        self.hash_ip_xor = hash_ip_xor + hash_offset
 
-        hash_ip_0_temp = self.crc16(ip_src_bytes)
-        hash_ip_0_temp = '{:016b}'.format(self.crc16(ip_dst_bytes, hash_ip_0_temp))
-        self.hash_ip_0 = int(hash_ip_0_temp[-13:], 2)
-
-        hash_ip_1_temp = self.crc16(ip_dst_bytes)
-        hash_ip_1_temp = '{:016b}'.format(self.crc16(ip_src_bytes, hash_ip_1_temp))
-        self.hash_ip_1 = int(hash_ip_1_temp[-13:], 2)
-
-        self.hash_ip_xor = self.hash_ip_0 ^ self.hash_ip_1
-
-        self.hash_ip_0 += 8192 * (self.decay_cntr - 1)
-        self.hash_ip_1 += 8192 * (self.decay_cntr - 1)
-        self.hash_ip_xor += 8192 * (self.decay_cntr - 1)
-
-        hash_five_t_0_temp = self.crc16(ip_src_bytes)
-        hash_five_t_0_temp = self.crc16(ip_dst_bytes, hash_five_t_0_temp)
-        hash_five_t_0_temp = self.crc16(ip_proto_bytes, hash_five_t_0_temp)
-        hash_five_t_0_temp = self.crc16(proto_src_bytes, hash_five_t_0_temp)
-        hash_five_t_0_temp = '{:016b}'.format(self.crc16(proto_dst_bytes, hash_five_t_0_temp))
-        self.hash_five_t_0 = int(hash_five_t_0_temp[-13:], 2)
-
-        hash_five_t_1_temp = self.crc16(ip_dst_bytes)
-        hash_five_t_1_temp = self.crc16(ip_src_bytes, hash_five_t_1_temp)
-        hash_five_t_1_temp = self.crc16(ip_proto_bytes, hash_five_t_1_temp)
-        hash_five_t_1_temp = self.crc16(proto_dst_bytes, hash_five_t_1_temp)
-        hash_five_t_1_temp = '{:016b}'.format(self.crc16(proto_src_bytes, hash_five_t_1_temp))
-        self.hash_five_t_1 = int(hash_five_t_1_temp[-13:], 2)
-
-        self.hash_five_t_xor = self.hash_five_t_0 ^ self.hash_five_t_1
-
-        self.hash_five_t_0 += 8192 * (self.decay_cntr - 1)
-        self.hash_five_t_1 += 8192 * (self.decay_cntr - 1)
-        self.hash_five_t_xor += 8192 * (self.decay_cntr - 1)
+        self.hash_five_t_0 = hash_five_t_0 + hash_offset
+        self.hash_five_t_1 = hash_five_t_1 + hash_offset
+        self.hash_five_t_xor = hash_five_t_xor + hash_offset
 
         # Decay check for all flow keys.
         self.decay_check_exact()
@@ -508,23 +531,23 @@ class FCKitNET:
         # Calculate the 1D/2D statistics for each flow key.
 
         # 1D: Mac src, IP src
-        mac_ip_src_pkt_cnt = self.fc_mac_ip_src[self.hash_mac_ip_src][self.decay_cntr][0]
+        mac_ip_src_pkt_cnt = self.fc_mac_ip_src[self.hash_mac_ip_src, self.decay_cntr, 0]
         mac_ip_src_mean, mac_ip_src_std_dev = self.stats_calc_1d_exact(
                 mac_ip_src_pkt_cnt,
-                self.fc_mac_ip_src[self.hash_mac_ip_src][self.decay_cntr][1],
-                self.fc_mac_ip_src[self.hash_mac_ip_src][self.decay_cntr][2])
+                self.fc_mac_ip_src[self.hash_mac_ip_src, self.decay_cntr, 1],
+                self.fc_mac_ip_src[self.hash_mac_ip_src, self.decay_cntr, 2])
 
         # 1D: IP src
-        ip_src_pkt_cnt = self.fc_ip_src[self.hash_ip_src][self.decay_cntr][0]
+        ip_src_pkt_cnt = self.fc_ip_src[self.hash_ip_src, self.decay_cntr, 0]
         ip_src_mean, ip_src_std_dev = self.stats_calc_1d_exact(
             ip_src_pkt_cnt,
-            self.fc_ip_src[self.hash_ip_src][self.decay_cntr][1],
-            self.fc_ip_src[self.hash_ip_src][self.decay_cntr][2])
+            self.fc_ip_src[self.hash_ip_src, self.decay_cntr, 1],
+            self.fc_ip_src[self.hash_ip_src, self.decay_cntr, 2])
         # 1D: IP
 
-        ip_pkt_cnt_0 = self.fc_ip[self.hash_ip_0][self.decay_cntr][0]
-        ip_pkt_len = self.fc_ip[self.hash_ip_0][self.decay_cntr][1]
-        ip_pkt_len_sqr = self.fc_ip[self.hash_ip_0][self.decay_cntr][2]
+        ip_pkt_cnt_0 = self.fc_ip[self.hash_ip_0, self.decay_cntr, 0]
+        ip_pkt_len = self.fc_ip[self.hash_ip_0, self.decay_cntr, 1]
+        ip_pkt_len_sqr = self.fc_ip[self.hash_ip_0, self.decay_cntr, 2]
         ip_mean_0, ip_std_dev_0 = self.stats_calc_1d_exact(
                 ip_pkt_cnt_0,
                 ip_pkt_len,
@@ -532,26 +555,26 @@ class FCKitNET:
 
         # Calculate the residual products from flows A->B and B->A.
         ip_res_0 = ip_pkt_len - ip_mean_0
-        self.ip_res[self.hash_ip_0][self.decay_cntr-1] = ip_res_0
-        if self.hash_ip_1 in self.fc_ip:
-            ip_res_1 = self.ip_res[self.hash_ip_1][self.decay_cntr-1]
+        self.ip_res[self.hash_ip_0, self.decay_cntr-1] = ip_res_0
+        if self.fc_ip_valid[self.hash_ip_1]:
+            ip_res_1 = self.ip_res[self.hash_ip_1, self.decay_cntr-1]
         else:
             ip_res_1 = 0
 
         # Update the Sum of Residual Products.
         if ip_res_1 != 0 and self.decay_ip == 1:
-            self.ip_res_sum[self.hash_ip_xor][self.decay_cntr] += (ip_res_0 * ip_res_1)
+            self.ip_res_sum[self.hash_ip_xor, self.decay_cntr] += (ip_res_0 * ip_res_1)
 
         # Update the counters for flow A->B / Read the counters for flow B->A.
         # Training phase: both are performed for all flows.
         if phase == 'training' or self.sampling_rate == 1:
-            self.fc_ip[self.hash_ip_0][self.decay_cntr][3] = ip_pkt_cnt_0
-            self.fc_ip[self.hash_ip_0][self.decay_cntr][4] = ip_pkt_len_sqr
-            self.fc_ip[self.hash_ip_0][self.decay_cntr][5] = ip_mean_0
-            if self.hash_ip_1 in self.fc_ip:
-                ip_pkt_cnt_1 = self.fc_ip[self.hash_ip_1][self.decay_cntr][3]
-                ip_pkt_len_sqr_1 = self.fc_ip[self.hash_ip_1][self.decay_cntr][4]
-                ip_mean_1 = self.fc_ip[self.hash_ip_1][self.decay_cntr][5]
+            self.fc_ip[self.hash_ip_0, self.decay_cntr, 3] = ip_pkt_cnt_0
+            self.fc_ip[self.hash_ip_0, self.decay_cntr, 4] = ip_pkt_len_sqr
+            self.fc_ip[self.hash_ip_0, self.decay_cntr, 5] = ip_mean_0
+            if self.fc_ip_valid[self.hash_ip_1]:
+                ip_pkt_cnt_1 = self.fc_ip[self.hash_ip_1, self.decay_cntr, 3]
+                ip_pkt_len_sqr_1 = self.fc_ip[self.hash_ip_1, self.decay_cntr, 4]
+                ip_mean_1 = self.fc_ip[self.hash_ip_1, self.decay_cntr, 5]
             else:
                 ip_pkt_cnt_1 = 0
                 ip_pkt_len_sqr_1 = 0
@@ -561,15 +584,15 @@ class FCKitNET:
         # and reading the previously stored counters for flow B->A according to the sampling rate.
         elif self.phase_pkt_index % self.sampling_rate != 0:
             # Update
-            self.fc_ip[self.hash_ip_0][self.decay_cntr][3] = ip_pkt_cnt_0
-            self.fc_ip[self.hash_ip_0][self.decay_cntr][4] = ip_pkt_len_sqr
-            self.fc_ip[self.hash_ip_0][self.decay_cntr][5] = ip_mean_0
+            self.fc_ip[self.hash_ip_0, self.decay_cntr, 3] = ip_pkt_cnt_0
+            self.fc_ip[self.hash_ip_0, self.decay_cntr, 4] = ip_pkt_len_sqr
+            self.fc_ip[self.hash_ip_0, self.decay_cntr, 5] = ip_mean_0
         else:
             # Read
-            if self.hash_ip_1 in self.fc_ip:
-                ip_pkt_cnt_1 = self.fc_ip[self.hash_ip_1][self.decay_cntr][3]
-                ip_pkt_len_sqr_1 = self.fc_ip[self.hash_ip_1][self.decay_cntr][4]
-                ip_mean_1 = self.fc_ip[self.hash_ip_1][self.decay_cntr][5]
+            if self.fc_ip_valid[self.hash_ip_1]:
+                ip_pkt_cnt_1 = self.fc_ip[self.hash_ip_1, self.decay_cntr, 3]
+                ip_pkt_len_sqr_1 = self.fc_ip[self.hash_ip_1, self.decay_cntr, 4]
+                ip_mean_1 = self.fc_ip[self.hash_ip_1, self.decay_cntr, 5]
             else:
                 ip_pkt_cnt_1 = 0
                 ip_pkt_len_sqr_1 = 0
@@ -577,9 +600,9 @@ class FCKitNET:
 
         # 1D: 5-tuple
 
-        five_t_pkt_cnt_0 = self.fc_five_t[self.hash_five_t_0][self.decay_cntr][0]
-        five_t_pkt_len = self.fc_five_t[self.hash_five_t_0][self.decay_cntr][1]
-        five_t_pkt_len_sqr = self.fc_five_t[self.hash_five_t_0][self.decay_cntr][2]
+        five_t_pkt_cnt_0 = self.fc_five_t[self.hash_five_t_0, self.decay_cntr, 0]
+        five_t_pkt_len = self.fc_five_t[self.hash_five_t_0, self.decay_cntr, 1]
+        five_t_pkt_len_sqr = self.fc_five_t[self.hash_five_t_0, self.decay_cntr, 2]
         five_t_mean_0, five_t_std_dev_0 = \
             self.stats_calc_1d_exact(
                 five_t_pkt_cnt_0,
@@ -588,27 +611,27 @@ class FCKitNET:
 
         # Calculate the residual products from flows A->B and B->A.
         five_t_res_0 = five_t_pkt_len - five_t_mean_0
-        self.five_t_res[self.hash_five_t_0][self.decay_cntr-1] = five_t_res_0
-        if self.hash_five_t_1 in self.fc_five_t:
-            five_t_res_1 = self.five_t_res[self.hash_five_t_1][self.decay_cntr-1]
+        self.five_t_res[self.hash_five_t_0, self.decay_cntr-1] = five_t_res_0
+        if self.fc_five_t_valid[self.hash_five_t_1]:
+            five_t_res_1 = self.five_t_res[self.hash_five_t_1, self.decay_cntr-1]
         else:
             five_t_res_1 = 0
 
         # Update the Sum of Residual Products.
         if five_t_res_1 != 0 and self.decay_five_t == 1:
-            self.five_t_res_sum[self.hash_five_t_xor][self.decay_cntr] += \
+            self.five_t_res_sum[self.hash_five_t_xor, self.decay_cntr] += \
                 (five_t_res_0 * five_t_res_1)
 
         # Update the counters for flow A->B / Read the counters for flow B->A.
         # Training phase: both are performed for all flows.
         if phase == 'training' or self.sampling_rate == 1:
-            self.fc_five_t[self.hash_five_t_0][self.decay_cntr][3] = five_t_pkt_cnt_0
-            self.fc_five_t[self.hash_five_t_0][self.decay_cntr][4] = five_t_pkt_len_sqr
-            self.fc_five_t[self.hash_five_t_0][self.decay_cntr][5] = five_t_mean_0
-            if self.hash_five_t_1 in self.fc_five_t:
-                five_t_pkt_cnt_1 = self.fc_five_t[self.hash_five_t_1][self.decay_cntr][3]
-                five_t_pkt_len_sqr_1 = self.fc_five_t[self.hash_five_t_1][self.decay_cntr][4]
-                five_t_mean_1 = self.fc_five_t[self.hash_five_t_1][self.decay_cntr][5]
+            self.fc_five_t[self.hash_five_t_0, self.decay_cntr, 3] = five_t_pkt_cnt_0
+            self.fc_five_t[self.hash_five_t_0, self.decay_cntr, 4] = five_t_pkt_len_sqr
+            self.fc_five_t[self.hash_five_t_0, self.decay_cntr, 5] = five_t_mean_0
+            if self.fc_five_t_valid[self.hash_five_t_1]:
+                five_t_pkt_cnt_1 = self.fc_five_t[self.hash_five_t_1, self.decay_cntr, 3]
+                five_t_pkt_len_sqr_1 = self.fc_five_t[self.hash_five_t_1, self.decay_cntr, 4]
+                five_t_mean_1 = self.fc_five_t[self.hash_five_t_1, self.decay_cntr, 5]
             else:
                 five_t_pkt_cnt_1 = 0
                 five_t_pkt_len_sqr_1 = 0
@@ -618,15 +641,15 @@ class FCKitNET:
         # and reading the previously stored counters for flow B->A according to the sampling rate.
         elif self.phase_pkt_index % self.sampling_rate != 0:
             # Update
-            self.fc_five_t[self.hash_five_t_0][self.decay_cntr][3] = five_t_pkt_cnt_0
-            self.fc_five_t[self.hash_five_t_0][self.decay_cntr][4] = five_t_pkt_len_sqr
-            self.fc_five_t[self.hash_five_t_0][self.decay_cntr][5] = five_t_mean_0
+            self.fc_five_t[self.hash_five_t_0, self.decay_cntr, 3] = five_t_pkt_cnt_0
+            self.fc_five_t[self.hash_five_t_0, self.decay_cntr, 4] = five_t_pkt_len_sqr
+            self.fc_five_t[self.hash_five_t_0, self.decay_cntr, 5] = five_t_mean_0
         else:
             # Read
-            if self.hash_five_t_1 in self.fc_five_t:
-                five_t_pkt_cnt_1 = self.fc_five_t[self.hash_five_t_1][self.decay_cntr][3]
-                five_t_pkt_len_sqr_1 = self.fc_five_t[self.hash_five_t_1][self.decay_cntr][4]
-                five_t_mean_1 = self.fc_five_t[self.hash_five_t_1][self.decay_cntr][5]
+            if self.fc_five_t_valid[self.hash_five_t_1]:
+                five_t_pkt_cnt_1 = self.fc_five_t[self.hash_five_t_1, self.decay_cntr, 3]
+                five_t_pkt_len_sqr_1 = self.fc_five_t[self.hash_five_t_1, self.decay_cntr, 4]
+                five_t_mean_1 = self.fc_five_t[self.hash_five_t_1, self.decay_cntr, 5]
             else:
                 five_t_pkt_cnt_1 = 0
                 five_t_pkt_len_sqr_1 = 0
@@ -645,7 +668,7 @@ class FCKitNET:
             ip_magnitude, ip_radius, ip_cov, ip_pcc \
                 = self.stats_calc_2d_exact(
                     ip_pkt_cnt_0, ip_pkt_cnt_1, ip_mean_0, ip_mean_1,
-                    self.ip_res_sum[self.hash_ip_xor][self.decay_cntr],
+                    self.ip_res_sum[self.hash_ip_xor, self.decay_cntr],
                     ip_variance_0, ip_variance_1, ip_std_dev_0, ip_std_dev_1)
         else:
             ip_magnitude = 0
@@ -669,7 +692,7 @@ class FCKitNET:
                 = self.stats_calc_2d_exact(
                     five_t_pkt_cnt_0, five_t_pkt_cnt_1,
                     five_t_mean_0, five_t_mean_1,
-                    self.five_t_res_sum[self.hash_five_t_xor][self.decay_cntr],
+                    self.five_t_res_sum[self.hash_five_t_xor, self.decay_cntr],
                     five_t_variance_0, five_t_variance_1,
                     five_t_std_dev_0, five_t_std_dev_1)
         else:
@@ -758,62 +781,58 @@ class FCKitNET:
         # Check if the current flow ID has already been seen.
         # If it exists, calculate the decay.
         # Else, initialize all values and perform the update from the current pkt.
-        if self.hash_mac_ip_src in self.fc_mac_ip_src:
+        if self.fc_mac_ip_src_valid[self.hash_mac_ip_src]:
             mac_ip_src_ts_interval = \
-                self.cur_pkt[1] - self.fc_mac_ip_src[self.hash_mac_ip_src][0][self.decay_cntr-1]
+                self.cur_pkt[1] - self.fc_mac_ip_src[self.hash_mac_ip_src, 0, self.decay_cntr-1]
 
             decay = 1
 
             # Check if the current decay counter has been previously updated.
             # If so, perform the decay factor update.
             # Else, the current decay counter value becomes the current pkt timestamp.
-            if self.fc_mac_ip_src[self.hash_mac_ip_src][0][self.decay_cntr-1]:
+            if self.fc_mac_ip_src[self.hash_mac_ip_src, 0, self.decay_cntr-1]:
                 if self.decay_cntr == 1 and mac_ip_src_ts_interval > 0.1:
                     decay = 0.5
-                    self.fc_mac_ip_src[self.hash_mac_ip_src][0][0] += 0.1
+                    self.fc_mac_ip_src[self.hash_mac_ip_src, 0, 0] += 0.1
                 elif self.decay_cntr == 2 and mac_ip_src_ts_interval > 1:
                     decay = 0.5
-                    self.fc_mac_ip_src[self.hash_mac_ip_src][0][1] += 1
+                    self.fc_mac_ip_src[self.hash_mac_ip_src, 0, 1] += 1
                 elif self.decay_cntr == 3 and mac_ip_src_ts_interval > 10:
                     decay = 0.5
-                    self.fc_mac_ip_src[self.hash_mac_ip_src][0][2] += 10
+                    self.fc_mac_ip_src[self.hash_mac_ip_src, 0, 2] += 10
                 elif self.decay_cntr == 4 and mac_ip_src_ts_interval > 60:
                     decay = 0.5
-                    self.fc_mac_ip_src[self.hash_mac_ip_src][0][3] += 60
+                    self.fc_mac_ip_src[self.hash_mac_ip_src, 0, 3] += 60
                 else:
-                    self.fc_mac_ip_src[self.hash_mac_ip_src][0][self.decay_cntr-1] = self.cur_pkt[1]
+                    self.fc_mac_ip_src[self.hash_mac_ip_src, 0, self.decay_cntr-1] = self.cur_pkt[1]
             else:
-                self.fc_mac_ip_src[self.hash_mac_ip_src][0][self.decay_cntr-1] = self.cur_pkt[1]
+                self.fc_mac_ip_src[self.hash_mac_ip_src, 0, self.decay_cntr-1] = self.cur_pkt[1]
 
             # Decay factor: pkt count.
-            self.fc_mac_ip_src[self.hash_mac_ip_src][self.decay_cntr][0] = \
-                int(decay * self.fc_mac_ip_src[self.hash_mac_ip_src][self.decay_cntr][0] + 1)
+            self.fc_mac_ip_src[self.hash_mac_ip_src, self.decay_cntr, 0] = \
+                int(decay * self.fc_mac_ip_src[self.hash_mac_ip_src, self.decay_cntr, 0] + 1)
 
             # If the decay will not be applied, simply update the values from the current pkt.
             # Else, update the values with the current decay factor.
             if decay == 1:
                 # Pkt length.
-                self.fc_mac_ip_src[self.hash_mac_ip_src][self.decay_cntr][1] = \
-                    int(self.fc_mac_ip_src[self.hash_mac_ip_src][self.decay_cntr][1] + self.cur_pkt[0])
+                self.fc_mac_ip_src[self.hash_mac_ip_src, self.decay_cntr, 1] = \
+                    int(self.fc_mac_ip_src[self.hash_mac_ip_src, self.decay_cntr, 1] + self.cur_pkt[0])
                 # Pkt length squared.
-                self.fc_mac_ip_src[self.hash_mac_ip_src][self.decay_cntr][2] = \
-                    int(self.fc_mac_ip_src[self.hash_mac_ip_src][self.decay_cntr][2] + sqr.compute(self.cur_pkt[0]))
+                self.fc_mac_ip_src[self.hash_mac_ip_src, self.decay_cntr, 2] = \
+                    int(self.fc_mac_ip_src[self.hash_mac_ip_src, self.decay_cntr, 2] + sqr.compute(self.cur_pkt[0]))
             else:
                 # Pkt length.
-                self.fc_mac_ip_src[self.hash_mac_ip_src][self.decay_cntr][1] = \
-                    int(decay * self.fc_mac_ip_src[self.hash_mac_ip_src][self.decay_cntr][1])
+                self.fc_mac_ip_src[self.hash_mac_ip_src, self.decay_cntr, 1] = \
+                    int(decay * self.fc_mac_ip_src[self.hash_mac_ip_src, self.decay_cntr, 1])
                 # Pkt length squared.
-                self.fc_mac_ip_src[self.hash_mac_ip_src][self.decay_cntr][2] = \
-                    int(decay * self.fc_mac_ip_src[self.hash_mac_ip_src][self.decay_cntr][2])
+                self.fc_mac_ip_src[self.hash_mac_ip_src, self.decay_cntr, 2] = \
+                    int(decay * self.fc_mac_ip_src[self.hash_mac_ip_src, self.decay_cntr, 2])
 
         else:
-            self.fc_mac_ip_src[self.hash_mac_ip_src] = ([[0, 0, 0, 0],
-                                                            [0, 0, 0],
-                                                            [0, 0, 0],
-                                                            [0, 0, 0],
-                                                            [0, 0, 0]])
-            self.fc_mac_ip_src[self.hash_mac_ip_src][0][self.decay_cntr-1] = self.cur_pkt[1]
-            self.fc_mac_ip_src[self.hash_mac_ip_src][self.decay_cntr] = \
+            self.regs['fc_mac_ip_src'].reset(self.hash_mac_ip_src)
+            self.fc_mac_ip_src[self.hash_mac_ip_src, 0, self.decay_cntr-1] = self.cur_pkt[1]
+            self.regs['fc_mac_ip_src'].array[self.hash_mac_ip_src, self.decay_cntr, :3] = \
                 [1, self.cur_pkt[0], sqr.compute(self.cur_pkt[0])]
 
         # IP src
@@ -821,217 +840,193 @@ class FCKitNET:
         # Check if the current flow ID has already been seen.
         # If it exists, calculate the decay.
         # Else, initialize all values and perform the update from the current pkt.
-        if self.hash_ip_src in self.fc_ip_src:
-            ip_src_ts_interval = self.cur_pkt[1] - self.fc_ip_src[self.hash_ip_src][0][self.decay_cntr-1]
+        if self.fc_ip_src_valid[self.hash_ip_src]:
+            ip_src_ts_interval = self.cur_pkt[1] - self.fc_ip_src[self.hash_ip_src, 0, self.decay_cntr-1]
 
             decay = 1
 
             # Check if the current decay counter has been previously updated.
             # If so, perform the decay factor update.
             # Else, the current decay counter value becomes the current pkt timestamp.
-            if self.fc_ip_src[self.hash_ip_src][0][self.decay_cntr-1]:
+            if self.fc_ip_src[self.hash_ip_src, 0, self.decay_cntr-1]:
                 if self.decay_cntr == 1 and ip_src_ts_interval > 0.1:
                     decay = 0.5
-                    self.fc_ip_src[self.hash_ip_src][0][0] += 0.1
+                    self.fc_ip_src[self.hash_ip_src, 0, 0] += 0.1
                 elif self.decay_cntr == 2 and ip_src_ts_interval > 1:
                     decay = 0.5
-                    self.fc_ip_src[self.hash_ip_src][0][1] += 1
+                    self.fc_ip_src[self.hash_ip_src, 0, 1] += 1
                 elif self.decay_cntr == 3 and ip_src_ts_interval > 10:
                     decay = 0.5
-                    self.fc_ip_src[self.hash_ip_src][0][2] += 10
+                    self.fc_ip_src[self.hash_ip_src, 0, 2] += 10
                 elif self.decay_cntr == 4 and ip_src_ts_interval > 60:
                     decay = 0.5
-                    self.fc_ip_src[self.hash_ip_src][0][3] += 60
+                    self.fc_ip_src[self.hash_ip_src, 0, 3] += 60
                 else:
-                    self.fc_ip_src[self.hash_ip_src][0][self.decay_cntr-1] = self.cur_pkt[1]
+                    self.fc_ip_src[self.hash_ip_src, 0, self.decay_cntr-1] = self.cur_pkt[1]
             else:
-                self.fc_ip_src[self.hash_ip_src][0][self.decay_cntr-1] = self.cur_pkt[1]
+                self.fc_ip_src[self.hash_ip_src, 0, self.decay_cntr-1] = self.cur_pkt[1]
 
             # Decay factor: pkt count.
-            self.fc_ip_src[self.hash_ip_src][self.decay_cntr][0] = \
-                int(decay * self.fc_ip_src[self.hash_ip_src][self.decay_cntr][0] + 1)
+            self.fc_ip_src[self.hash_ip_src, self.decay_cntr, 0] = \
+                int(decay * self.fc_ip_src[self.hash_ip_src, self.decay_cntr, 0] + 1)
 
             # If the decay will not be applied, simply update the values from the current pkt.
             # Else, update the values with the current decay factor.
             if decay == 1:
                 # Pkt length.
-                self.fc_ip_src[self.hash_ip_src][self.decay_cntr][1] = \
-                    int(self.fc_ip_src[self.hash_ip_src][self.decay_cntr][1] + self.cur_pkt[0])
+                self.fc_ip_src[self.hash_ip_src, self.decay_cntr, 1] = \
+                    int(self.fc_ip_src[self.hash_ip_src, self.decay_cntr, 1] + self.cur_pkt[0])
                 # Pkt length squared.
-                self.fc_ip_src[self.hash_ip_src][self.decay_cntr][2] = \
-                    int(self.fc_ip_src[self.hash_ip_src][self.decay_cntr][2] + sqr.compute(self.cur_pkt[0]))
+                self.fc_ip_src[self.hash_ip_src, self.decay_cntr, 2] = \
+                    int(self.fc_ip_src[self.hash_ip_src, self.decay_cntr, 2] + sqr.compute(self.cur_pkt[0]))
             else:
                 # Pkt length.
-                self.fc_ip_src[self.hash_ip_src][self.decay_cntr][1] = \
-                    int(decay * self.fc_ip_src[self.hash_ip_src][self.decay_cntr][1])
+                self.fc_ip_src[self.hash_ip_src, self.decay_cntr, 1] = \
+                    int(decay * self.fc_ip_src[self.hash_ip_src, self.decay_cntr, 1])
                 # Pkt length squared.
-                self.fc_ip_src[self.hash_ip_src][self.decay_cntr][2] = \
-                    int(decay * self.fc_ip_src[self.hash_ip_src][self.decay_cntr][2])
+                self.fc_ip_src[self.hash_ip_src, self.decay_cntr, 2] = \
+                    int(decay * self.fc_ip_src[self.hash_ip_src, self.decay_cntr, 2])
 
         else:
-            self.fc_ip_src[self.hash_ip_src] = ([[0, 0, 0, 0],
-                                                    [0, 0, 0],
-                                                    [0, 0, 0],
-                                                    [0, 0, 0],
-                                                    [0, 0, 0]])
-            self.fc_ip_src[self.hash_ip_src][0][self.decay_cntr-1] = self.cur_pkt[1]
-            self.fc_ip_src[self.hash_ip_src][self.decay_cntr] = \
+            self.regs['fc_ip_src'].reset(self.hash_ip_src)
+            self.fc_ip_src[self.hash_ip_src, 0, self.decay_cntr-1] = self.cur_pkt[1]
+            self.regs['fc_ip_src'].array[self.hash_ip_src, self.decay_cntr, :3] = \
                 [1, self.cur_pkt[0], sqr.compute(self.cur_pkt[0])]
 
         # IP
 
-        if self.hash_ip_0 not in self.ip_res:
-            self.ip_res[self.hash_ip_0] = [0, 0, 0, 0]
-
-        if self.hash_ip_xor not in self.ip_res_sum:
-            self.ip_res_sum[self.hash_ip_xor] = ([[0, 0, 0, 0], 0, 0, 0, 0])
-
         # Check if the current flow ID has already been seen.
         # If it exists, calculate the decay.
         # Else, initialize all values and perform the update from the current pkt.
-        if self.hash_ip_0 in self.fc_ip:
-            ip_ts_interval = self.cur_pkt[1] - self.fc_ip[self.hash_ip_0][0][self.decay_cntr-1]
+        if self.fc_ip_valid[self.hash_ip_0]:
+            ip_ts_interval = self.cur_pkt[1] - self.fc_ip[self.hash_ip_0, 0, self.decay_cntr-1]
 
             # Check if the current decay counter has been previously updated.
             # If so, perform the decay factor update.
             # Else, the current decay counter value becomes the current pkt timestamp.
-            if self.fc_ip[self.hash_ip_0][0][self.decay_cntr-1]:
+            if self.fc_ip[self.hash_ip_0, 0, self.decay_cntr-1]:
                 if self.decay_cntr == 1 and ip_ts_interval > 0.1:
                     self.decay_ip = 0.5
-                    self.fc_ip[self.hash_ip_0][0][0] += 0.1
-                    self.ip_res_sum[self.hash_ip_xor][0][0] += 0.1
+                    self.fc_ip[self.hash_ip_0, 0, 0] += 0.1
+                    self.ip_res_sum_ts[self.hash_ip_xor, 0] += 0.1
                 elif self.decay_cntr == 2 and ip_ts_interval > 1:
                     self.decay_ip = 0.5
-                    self.fc_ip[self.hash_ip_0][0][1] += 1
-                    self.ip_res_sum[self.hash_ip_xor][0][1] += 1
+                    self.fc_ip[self.hash_ip_0, 0, 1] += 1
+                    self.ip_res_sum_ts[self.hash_ip_xor, 1] += 1
                 elif self.decay_cntr == 3 and ip_ts_interval > 10:
                     self.decay_ip = 0.5
-                    self.fc_ip[self.hash_ip_0][0][2] += 10
-                    self.ip_res_sum[self.hash_ip_xor][0][2] += 10
+                    self.fc_ip[self.hash_ip_0, 0, 2] += 10
+                    self.ip_res_sum_ts[self.hash_ip_xor, 2] += 10
                 elif self.decay_cntr == 4 and ip_ts_interval > 60:
                     self.decay_ip = 0.5
-                    self.fc_ip[self.hash_ip_0][0][3] += 60
-                    self.ip_res_sum[self.hash_ip_xor][0][3] += 60
+                    self.fc_ip[self.hash_ip_0, 0, 3] += 60
+                    self.ip_res_sum_ts[self.hash_ip_xor, 3] += 60
                 else:
-                    self.fc_ip[self.hash_ip_0][0][self.decay_cntr-1] = self.cur_pkt[1]
-                    self.ip_res_sum[self.hash_ip_xor][0][self.decay_cntr-1] = self.cur_pkt[1]
+                    self.fc_ip[self.hash_ip_0, 0, self.decay_cntr-1] = self.cur_pkt[1]
+                    self.ip_res_sum_ts[self.hash_ip_xor, self.decay_cntr-1] = self.cur_pkt[1]
             else:
-                self.fc_ip[self.hash_ip_0][0][self.decay_cntr-1] = self.cur_pkt[1]
-                self.ip_res_sum[self.hash_ip_xor][0][self.decay_cntr-1] = self.cur_pkt[1]
+                self.fc_ip[self.hash_ip_0, 0, self.decay_cntr-1] = self.cur_pkt[1]
+                self.ip_res_sum_ts[self.hash_ip_xor, self.decay_cntr-1] = self.cur_pkt[1]
 
             # Decay factor: pkt count.
-            self.fc_ip[self.hash_ip_0][self.decay_cntr][0] = \
-                int(self.decay_ip * self.fc_ip[self.hash_ip_0][self.decay_cntr][0] + 1)
+            self.fc_ip[self.hash_ip_0, self.decay_cntr, 0] = \
+                int(self.decay_ip * self.fc_ip[self.hash_ip_0, self.decay_cntr, 0] + 1)
 
             # If the decay will not be applied, simply update the values from the current pkt.
             # Else, update the values with the current decay factor.
             if self.decay_ip == 1:
                 # Pkt length.
-                self.fc_ip[self.hash_ip_0][self.decay_cntr][1] = \
-                    int(self.fc_ip[self.hash_ip_0][self.decay_cntr][1] + self.cur_pkt[0])
+                self.fc_ip[self.hash_ip_0, self.decay_cntr, 1] = \
+                    int(self.fc_ip[self.hash_ip_0, self.decay_cntr, 1] + self.cur_pkt[0])
                 # Pkt length squared.
-                self.fc_ip[self.hash_ip_0][self.decay_cntr][2] = \
-                    int(self.fc_ip[self.hash_ip_0][self.decay_cntr][2] + sqr.compute(self.cur_pkt[0]))
+                self.fc_ip[self.hash_ip_0, self.decay_cntr, 2] = \
+                    int(self.fc_ip[self.hash_ip_0, self.decay_cntr, 2] + sqr.compute(self.cur_pkt[0]))
             else:
                 # Pkt length.
-                self.fc_ip[self.hash_ip_0][self.decay_cntr][1] = \
-                    int(self.decay_ip * self.fc_ip[self.hash_ip_0][self.decay_cntr][1])
+                self.fc_ip[self.hash_ip_0, self.decay_cntr, 1] = \
+                    int(self.decay_ip * self.fc_ip[self.hash_ip_0, self.decay_cntr, 1])
                 # Pkt length squared.
-                self.fc_ip[self.hash_ip_0][self.decay_cntr][2] = \
-                    int(self.decay_ip * self.fc_ip[self.hash_ip_0][self.decay_cntr][2])
+                self.fc_ip[self.hash_ip_0, self.decay_cntr, 2] = \
+                    int(self.decay_ip * self.fc_ip[self.hash_ip_0, self.decay_cntr, 2])
                 # Sum of residual products.
-                self.ip_res_sum[self.hash_ip_xor][self.decay_cntr] = \
-                    int(self.decay_ip * self.ip_res_sum[self.hash_ip_xor][self.decay_cntr])
+                self.ip_res_sum[self.hash_ip_xor, self.decay_cntr] = \
+                    int(self.decay_ip * self.ip_res_sum[self.hash_ip_xor, self.decay_cntr])
 
         else:
-            self.fc_ip[self.hash_ip_0] = ([[0, 0, 0, 0],
-                                              [0, 0, 0, 0, 0, 0],
-                                              [0, 0, 0, 0, 0, 0],
-                                              [0, 0, 0, 0, 0, 0],
-                                              [0, 0, 0, 0, 0, 0]])
-            self.fc_ip[self.hash_ip_0][0][self.decay_cntr-1] = self.cur_pkt[1]
-            self.fc_ip[self.hash_ip_0][self.decay_cntr] = \
+            self.regs['fc_ip'].reset(self.hash_ip_0)
+            self.fc_ip[self.hash_ip_0, 0, self.decay_cntr-1] = self.cur_pkt[1]
+            self.regs['fc_ip'].array[self.hash_ip_0, self.decay_cntr, :6] = \
                 [1, self.cur_pkt[0], sqr.compute(self.cur_pkt[0]), 0, 0, 0]
 
         # Five tuple
 
-        if self.hash_five_t_0 not in self.five_t_res:
-            self.five_t_res[self.hash_five_t_0] = [0, 0, 0, 0]
-
-        if self.hash_five_t_xor not in self.five_t_res_sum:
-            self.five_t_res_sum[self.hash_five_t_xor] = ([[0, 0, 0, 0], 0, 0, 0, 0])
-
         # Check if the current flow ID has already been seen.
         # If it exists, calculate the decay.
         # Else, initialize all values and perform the update from the current pkt.
-        if self.hash_five_t_0 in self.fc_five_t:
+        if self.fc_five_t_valid[self.hash_five_t_0]:
             five_t_ts_interval = \
-                self.cur_pkt[1] - self.fc_five_t[self.hash_five_t_0][0][self.decay_cntr-1]
+                self.cur_pkt[1] - self.fc_five_t[self.hash_five_t_0, 0, self.decay_cntr-1]
 
             # Check if the current decay counter has been previously updated.
             # If so, perform the decay factor update.
             # Else, the current decay counter value becomes the current pkt timestamp.
-            if self.fc_five_t[self.hash_five_t_0][0][self.decay_cntr-1]:
+            if self.fc_five_t[self.hash_five_t_0, 0, self.decay_cntr-1]:
                 if self.decay_cntr == 1 and five_t_ts_interval > 0.1:
                     self.decay_five_t = 0.5
-                    self.fc_five_t[self.hash_five_t_0][0][0] += 0.1
-                    self.five_t_res_sum[self.hash_five_t_xor][0][0] += 0.1
+                    self.fc_five_t[self.hash_five_t_0, 0, 0] += 0.1
+                    self.five_t_res_sum_ts[self.hash_five_t_xor, 0] += 0.1
                 elif self.decay_cntr == 2 and five_t_ts_interval > 1:
                     self.decay_five_t = 0.5
-                    self.fc_five_t[self.hash_five_t_0][0][1] += 1
-                    self.five_t_res_sum[self.hash_five_t_xor][0][1] += 1
+                    self.fc_five_t[self.hash_five_t_0, 0, 1] += 1
+                    self.five_t_res_sum_ts[self.hash_five_t_xor, 1] += 1
                 elif self.decay_cntr == 3 and five_t_ts_interval > 10:
                     self.decay_five_t = 0.5
-                    self.fc_five_t[self.hash_five_t_0][0][2] += 10
-                    self.five_t_res_sum[self.hash_five_t_xor][0][2] += 10
+                    self.fc_five_t[self.hash_five_t_0, 0, 2] += 10
+                    self.five_t_res_sum_ts[self.hash_five_t_xor, 2] += 10
                 elif self.decay_cntr == 4 and five_t_ts_interval > 60:
                     self.decay_five_t = 0.5
-                    self.fc_five_t[self.hash_five_t_0][0][3] += 60
-                    self.five_t_res_sum[self.hash_five_t_xor][0][3] += 60
+                    self.fc_five_t[self.hash_five_t_0, 0, 3] += 60
+                    self.five_t_res_sum_ts[self.hash_five_t_xor, 3] += 60
                 else:
-                    self.fc_five_t[self.hash_five_t_0][0][self.decay_cntr-1] = self.cur_pkt[1]
-                    self.five_t_res_sum[self.hash_five_t_xor][0][self.decay_cntr-1] = \
+                    self.fc_five_t[self.hash_five_t_0, 0, self.decay_cntr-1] = self.cur_pkt[1]
+                    self.five_t_res_sum_ts[self.hash_five_t_xor, self.decay_cntr-1] = \
                         self.cur_pkt[1]
             else:
-                self.fc_five_t[self.hash_five_t_0][0][self.decay_cntr-1] = self.cur_pkt[1]
-                self.five_t_res_sum[self.hash_five_t_xor][0][self.decay_cntr-1] = self.cur_pkt[1]
+                self.fc_five_t[self.hash_five_t_0, 0, self.decay_cntr-1] = self.cur_pkt[1]
+                self.five_t_res_sum_ts[self.hash_five_t_xor, self.decay_cntr-1] = self.cur_pkt[1]
 
             # Decay factor: pkt count.
-            self.fc_five_t[self.hash_five_t_0][self.decay_cntr][0] = \
+            self.fc_five_t[self.hash_five_t_0, self.decay_cntr, 0] = \
                 int(self.decay_five_t *
-                    self.fc_five_t[self.hash_five_t_0][self.decay_cntr][0] + 1)
+                    self.fc_five_t[self.hash_five_t_0, self.decay_cntr, 0] + 1)
 
             # If the decay will not be applied, simply update the values from the current pkt.
             # Else, update the values with the current decay factor.
             if self.decay_five_t == 1:
                 # Pkt length.
-                self.fc_five_t[self.hash_five_t_0][self.decay_cntr][1] = \
-                    int(self.fc_five_t[self.hash_five_t_0][self.decay_cntr][1] + self.cur_pkt[0])
+                self.fc_five_t[self.hash_five_t_0, self.decay_cntr, 1] = \
+                    int(self.fc_five_t[self.hash_five_t_0, self.decay_cntr, 1] + self.cur_pkt[0])
                 # Pkt length squared.
-                self.fc_five_t[self.hash_five_t_0][self.decay_cntr][2] = \
-                    int(self.fc_five_t[self.hash_five_t_0][self.decay_cntr][2] +
+                self.fc_five_t[self.hash_five_t_0, self.decay_cntr, 2] = \
+                    int(self.fc_five_t[self.hash_five_t_0, self.decay_cntr, 2] +
                         sqr.compute(self.cur_pkt[0]))
             else:
                 # Pkt length.
-                self.fc_five_t[self.hash_five_t_0][self.decay_cntr][1] = \
+                self.fc_five_t[self.hash_five_t_0, self.decay_cntr, 1] = \
                     int(self.decay_five_t *
-                        self.fc_five_t[self.hash_five_t_0][self.decay_cntr][1])
+                        self.fc_five_t[self.hash_five_t_0, self.decay_cntr, 1])
                 # Pkt length squared.
-                self.fc_five_t[self.hash_five_t_0][self.decay_cntr][2] = \
+                self.fc_five_t[self.hash_five_t_0, self.decay_cntr, 2] = \
                     int(self.decay_five_t *
-                        self.fc_five_t[self.hash_five_t_0][self.decay_cntr][2])
+                        self.fc_five_t[self.hash_five_t_0, self.decay_cntr, 2])
                 # Sum of residual products.
-                self.five_t_res_sum[self.hash_five_t_xor][self.decay_cntr] = \
-                    int(self.decay_five_t * self.five_t_res_sum[self.hash_five_t_xor][self.decay_cntr])
+                self.five_t_res_sum[self.hash_five_t_xor, self.decay_cntr] = \
+                    int(self.decay_five_t * self.five_t_res_sum[self.hash_five_t_xor, self.decay_cntr])
 
         else:
-            self.fc_five_t[self.hash_five_t_0] = ([[0, 0, 0, 0],
-                                                      [0, 0, 0, 0, 0, 0],
-                                                      [0, 0, 0, 0, 0, 0],
-                                                      [0, 0, 0, 0, 0, 0],
-                                                      [0, 0, 0, 0, 0, 0]])
-            self.fc_five_t[self.hash_five_t_0][0][self.decay_cntr-1] = self.cur_pkt[1]
-            self.fc_five_t[self.hash_five_t_0][self.decay_cntr] = \
+            self.regs['fc_five_t'].reset(self.hash_five_t_0)
+            self.fc_five_t[self.hash_five_t_0, 0, self.decay_cntr-1] = self.cur_pkt[1]
+            self.regs['fc_five_t'].array[self.hash_five_t_0, self.decay_cntr, :6] = \
                 [1, self.cur_pkt[0], sqr.compute(self.cur_pkt[0]), 0, 0, 0]
 
     def decay_check_exact(self):
@@ -1045,89 +1040,85 @@ class FCKitNET:
         # Check if the current flow ID has already been seen.
         # If it exists, calculate the decay.
         # Else, initialize all values and perform the update from the current pkt.
-        if self.hash_mac_ip_src in self.fc_mac_ip_src:
+        if self.fc_mac_ip_src_valid[self.hash_mac_ip_src]:
             mac_ip_src_ts_interval_0 = \
-                self.cur_pkt[1] - self.fc_mac_ip_src[self.hash_mac_ip_src][0][0]
+                self.cur_pkt[1] - self.fc_mac_ip_src[self.hash_mac_ip_src, 0, 0]
             mac_ip_src_ts_interval_1 = \
-                self.cur_pkt[1] - self.fc_mac_ip_src[self.hash_mac_ip_src][0][1]
+                self.cur_pkt[1] - self.fc_mac_ip_src[self.hash_mac_ip_src, 0, 1]
             mac_ip_src_ts_interval_2 = \
-                self.cur_pkt[1] - self.fc_mac_ip_src[self.hash_mac_ip_src][0][2]
+                self.cur_pkt[1] - self.fc_mac_ip_src[self.hash_mac_ip_src, 0, 2]
             mac_ip_src_ts_interval_3 = \
-                self.cur_pkt[1] - self.fc_mac_ip_src[self.hash_mac_ip_src][0][3]
+                self.cur_pkt[1] - self.fc_mac_ip_src[self.hash_mac_ip_src, 0, 3]
 
             # Check if the current decay counter has been previously updated.
             # If so, perform the decay factor update.
             # Else, the current decay counter value becomes the current pkt timestamp.
 
-            self.fc_mac_ip_src[self.hash_mac_ip_src][0][0] = self.cur_pkt[1]
-            self.fc_mac_ip_src[self.hash_mac_ip_src][0][1] = self.cur_pkt[1]
-            self.fc_mac_ip_src[self.hash_mac_ip_src][0][2] = self.cur_pkt[1]
-            self.fc_mac_ip_src[self.hash_mac_ip_src][0][3] = self.cur_pkt[1]
+            self.fc_mac_ip_src[self.hash_mac_ip_src, 0, 0] = self.cur_pkt[1]
+            self.fc_mac_ip_src[self.hash_mac_ip_src, 0, 1] = self.cur_pkt[1]
+            self.fc_mac_ip_src[self.hash_mac_ip_src, 0, 2] = self.cur_pkt[1]
+            self.fc_mac_ip_src[self.hash_mac_ip_src, 0, 3] = self.cur_pkt[1]
 
             # Decay factor: pkt count.
-            self.fc_mac_ip_src[self.hash_mac_ip_src][1][0] = \
+            self.fc_mac_ip_src[self.hash_mac_ip_src, 1, 0] = \
                 pow(2, (-10 * mac_ip_src_ts_interval_0)) * \
-                self.fc_mac_ip_src[self.hash_mac_ip_src][1][0] + 1
-            self.fc_mac_ip_src[self.hash_mac_ip_src][2][0] = \
+                self.fc_mac_ip_src[self.hash_mac_ip_src, 1, 0] + 1
+            self.fc_mac_ip_src[self.hash_mac_ip_src, 2, 0] = \
                 pow(2, (-1 * mac_ip_src_ts_interval_1)) * \
-                self.fc_mac_ip_src[self.hash_mac_ip_src][2][0] + 1
-            self.fc_mac_ip_src[self.hash_mac_ip_src][3][0] = \
+                self.fc_mac_ip_src[self.hash_mac_ip_src, 2, 0] + 1
+            self.fc_mac_ip_src[self.hash_mac_ip_src, 3, 0] = \
                 pow(2, (-0.1 * mac_ip_src_ts_interval_2)) * \
-                self.fc_mac_ip_src[self.hash_mac_ip_src][3][0] + 1
-            self.fc_mac_ip_src[self.hash_mac_ip_src][4][0] = \
+                self.fc_mac_ip_src[self.hash_mac_ip_src, 3, 0] + 1
+            self.fc_mac_ip_src[self.hash_mac_ip_src, 4, 0] = \
                 pow(2, (-(1/60) * mac_ip_src_ts_interval_3)) * \
-                self.fc_mac_ip_src[self.hash_mac_ip_src][4][0] + 1
+                self.fc_mac_ip_src[self.hash_mac_ip_src, 4, 0] + 1
 
             # Decay factor: pkt length.
-            self.fc_mac_ip_src[self.hash_mac_ip_src][1][1] = \
+            self.fc_mac_ip_src[self.hash_mac_ip_src, 1, 1] = \
                 pow(2, (-10 * mac_ip_src_ts_interval_0)) * \
-                self.fc_mac_ip_src[self.hash_mac_ip_src][1][1] + self.cur_pkt[0]
-            self.fc_mac_ip_src[self.hash_mac_ip_src][2][1] = \
+                self.fc_mac_ip_src[self.hash_mac_ip_src, 1, 1] + self.cur_pkt[0]
+            self.fc_mac_ip_src[self.hash_mac_ip_src, 2, 1] = \
                 pow(2, (-1 * mac_ip_src_ts_interval_1)) * \
-                self.fc_mac_ip_src[self.hash_mac_ip_src][2][1] + self.cur_pkt[0]
-            self.fc_mac_ip_src[self.hash_mac_ip_src][3][1] = \
+                self.fc_mac_ip_src[self.hash_mac_ip_src, 2, 1] + self.cur_pkt[0]
+            self.fc_mac_ip_src[self.hash_mac_ip_src, 3, 1] = \
                 pow(2, (-0.1 * mac_ip_src_ts_interval_2)) * \
-                self.fc_mac_ip_src[self.hash_mac_ip_src][3][1] + self.cur_pkt[0]
-            self.fc_mac_ip_src[self.hash_mac_ip_src][4][1] = \
+                self.fc_mac_ip_src[self.hash_mac_ip_src, 3, 1] + self.cur_pkt[0]
+            self.fc_mac_ip_src[self.hash_mac_ip_src, 4, 1] = \
                 pow(2, (-(1/60) * mac_ip_src_ts_interval_3)) * \
-                self.fc_mac_ip_src[self.hash_mac_ip_src][4][1] + self.cur_pkt[0]
+                self.fc_mac_ip_src[self.hash_mac_ip_src, 4, 1] + self.cur_pkt[0]
 
             # Decay factor: pkt length squared.
-            self.fc_mac_ip_src[self.hash_mac_ip_src][1][2] = \
+            self.fc_mac_ip_src[self.hash_mac_ip_src, 1, 2] = \
                 pow(2, (-10 * mac_ip_src_ts_interval_0)) * \
-                self.fc_mac_ip_src[self.hash_mac_ip_src][1][2] + pow(self.cur_pkt[0], 2)
-            self.fc_mac_ip_src[self.hash_mac_ip_src][2][2] = \
+                self.fc_mac_ip_src[self.hash_mac_ip_src, 1, 2] + pow(self.cur_pkt[0], 2)
+            self.fc_mac_ip_src[self.hash_mac_ip_src, 2, 2] = \
                 pow(2, (-1 * mac_ip_src_ts_interval_1)) * \
-                self.fc_mac_ip_src[self.hash_mac_ip_src][2][2] + pow(self.cur_pkt[0], 2)
-            self.fc_mac_ip_src[self.hash_mac_ip_src][3][2] = \
+                self.fc_mac_ip_src[self.hash_mac_ip_src, 2, 2] + pow(self.cur_pkt[0], 2)
+            self.fc_mac_ip_src[self.hash_mac_ip_src, 3, 2] = \
                 pow(2, (-0.1 * mac_ip_src_ts_interval_2)) * \
-                self.fc_mac_ip_src[self.hash_mac_ip_src][3][2] + pow(self.cur_pkt[0], 2)
-            self.fc_mac_ip_src[self.hash_mac_ip_src][4][2] = \
+                self.fc_mac_ip_src[self.hash_mac_ip_src, 3, 2] + pow(self.cur_pkt[0], 2)
+            self.fc_mac_ip_src[self.hash_mac_ip_src, 4, 2] = \
                 pow(2, (-(1/60) * mac_ip_src_ts_interval_3)) * \
-                self.fc_mac_ip_src[self.hash_mac_ip_src][4][2] + pow(self.cur_pkt[0], 2)
+                self.fc_mac_ip_src[self.hash_mac_ip_src, 4, 2] + pow(self.cur_pkt[0], 2)
         else:
-            self.fc_mac_ip_src[self.hash_mac_ip_src] = ([[0, 0, 0, 0],
-                                                            [0, 0, 0],
-                                                            [0, 0, 0],
-                                                            [0, 0, 0],
-                                                            [0, 0, 0]])
-            self.fc_mac_ip_src[self.hash_mac_ip_src][0][0] = self.cur_pkt[1]
-            self.fc_mac_ip_src[self.hash_mac_ip_src][0][1] = self.cur_pkt[1]
-            self.fc_mac_ip_src[self.hash_mac_ip_src][0][2] = self.cur_pkt[1]
-            self.fc_mac_ip_src[self.hash_mac_ip_src][0][3] = self.cur_pkt[1]
-            self.fc_mac_ip_src[self.hash_mac_ip_src][1] = \
+            self.regs['fc_mac_ip_src'].reset(self.hash_mac_ip_src)
+            self.fc_mac_ip_src[self.hash_mac_ip_src, 0, 0] = self.cur_pkt[1]
+            self.fc_mac_ip_src[self.hash_mac_ip_src, 0, 1] = self.cur_pkt[1]
+            self.fc_mac_ip_src[self.hash_mac_ip_src, 0, 2] = self.cur_pkt[1]
+            self.fc_mac_ip_src[self.hash_mac_ip_src, 0, 3] = self.cur_pkt[1]
+            self.regs['fc_mac_ip_src'].array[self.hash_mac_ip_src, 1, :3] = \
                 [1,
                  self.cur_pkt[0],
                  pow(self.cur_pkt[0], 2)]
-            self.fc_mac_ip_src[self.hash_mac_ip_src][2] = \
+            self.regs['fc_mac_ip_src'].array[self.hash_mac_ip_src, 2, :3] = \
                 [1,
                  self.cur_pkt[0],
                  pow(self.cur_pkt[0], 2)]
-            self.fc_mac_ip_src[self.hash_mac_ip_src][3] = \
+            self.regs['fc_mac_ip_src'].array[self.hash_mac_ip_src, 3, :3] = \
                 [1,
                  self.cur_pkt[0],
                  pow(self.cur_pkt[0], 2)]
-            self.fc_mac_ip_src[self.hash_mac_ip_src][4] = \
+            self.regs['fc_mac_ip_src'].array[self.hash_mac_ip_src, 4, :3] = \
                 [1,
                  self.cur_pkt[0],
                  pow(self.cur_pkt[0], 2)]
@@ -1137,299 +1128,275 @@ class FCKitNET:
         # Check if the current flow ID has already been seen.
         # If it exists, calculate the decay.
         # Else, initialize all values and perform the update from the current pkt.
-        if self.hash_ip_src in self.fc_ip_src:
+        if self.fc_ip_src_valid[self.hash_ip_src]:
             ip_src_ts_interval_0 = \
-                self.cur_pkt[1] - self.fc_ip_src[self.hash_ip_src][0][0]
+                self.cur_pkt[1] - self.fc_ip_src[self.hash_ip_src, 0, 0]
             ip_src_ts_interval_1 = \
-                self.cur_pkt[1] - self.fc_ip_src[self.hash_ip_src][0][1]
+                self.cur_pkt[1] - self.fc_ip_src[self.hash_ip_src, 0, 1]
             ip_src_ts_interval_2 = \
-                self.cur_pkt[1] - self.fc_ip_src[self.hash_ip_src][0][2]
+                self.cur_pkt[1] - self.fc_ip_src[self.hash_ip_src, 0, 2]
             ip_src_ts_interval_3 = \
-                self.cur_pkt[1] - self.fc_ip_src[self.hash_ip_src][0][3]
+                self.cur_pkt[1] - self.fc_ip_src[self.hash_ip_src, 0, 3]
 
             # Check if the current decay counter has been previously updated.
             # If so, perform the decay factor update.
             # Else, the current decay counter value becomes the current pkt timestamp.
 
-            self.fc_ip_src[self.hash_ip_src][0][0] = self.cur_pkt[1]
-            self.fc_ip_src[self.hash_ip_src][0][1] = self.cur_pkt[1]
-            self.fc_ip_src[self.hash_ip_src][0][2] = self.cur_pkt[1]
-            self.fc_ip_src[self.hash_ip_src][0][3] = self.cur_pkt[1]
+            self.fc_ip_src[self.hash_ip_src, 0, 0] = self.cur_pkt[1]
+            self.fc_ip_src[self.hash_ip_src, 0, 1] = self.cur_pkt[1]
+            self.fc_ip_src[self.hash_ip_src, 0, 2] = self.cur_pkt[1]
+            self.fc_ip_src[self.hash_ip_src, 0, 3] = self.cur_pkt[1]
 
             # Decay factor: pkt count.
-            self.fc_ip_src[self.hash_ip_src][1][0] = \
+            self.fc_ip_src[self.hash_ip_src, 1, 0] = \
                 pow(2, (-10 * ip_src_ts_interval_0)) * \
-                self.fc_ip_src[self.hash_ip_src][1][0] + 1
-            self.fc_ip_src[self.hash_ip_src][2][0] = \
+                self.fc_ip_src[self.hash_ip_src, 1, 0] + 1
+            self.fc_ip_src[self.hash_ip_src, 2, 0] = \
                 pow(2, (-1 * ip_src_ts_interval_1)) * \
-                self.fc_ip_src[self.hash_ip_src][2][0] + 1
-            self.fc_ip_src[self.hash_ip_src][3][0] = \
+                self.fc_ip_src[self.hash_ip_src, 2, 0] + 1
+            self.fc_ip_src[self.hash_ip_src, 3, 0] = \
                 pow(2, (-0.1 * ip_src_ts_interval_2)) * \
-                self.fc_ip_src[self.hash_ip_src][3][0] + 1
-            self.fc_ip_src[self.hash_ip_src][4][0] = \
+                self.fc_ip_src[self.hash_ip_src, 3, 0] + 1
+            self.fc_ip_src[self.hash_ip_src, 4, 0] = \
                 pow(2, (-(1/60) * ip_src_ts_interval_3)) * \
-                self.fc_ip_src[self.hash_ip_src][4][0] + 1
+                self.fc_ip_src[self.hash_ip_src, 4, 0] + 1
 
             # Decay factor: pkt length.
-            self.fc_ip_src[self.hash_ip_src][1][1] = \
+            self.fc_ip_src[self.hash_ip_src, 1, 1] = \
                 pow(2, (-10 * ip_src_ts_interval_0)) * \
-                self.fc_ip_src[self.hash_ip_src][1][1] + self.cur_pkt[0]
-            self.fc_ip_src[self.hash_ip_src][2][1] = \
+                self.fc_ip_src[self.hash_ip_src, 1, 1] + self.cur_pkt[0]
+            self.fc_ip_src[self.hash_ip_src, 2, 1] = \
                 pow(2, (-1 * ip_src_ts_interval_1)) * \
-                self.fc_ip_src[self.hash_ip_src][2][1] + self.cur_pkt[0]
-            self.fc_ip_src[self.hash_ip_src][3][1] = \
+                self.fc_ip_src[self.hash_ip_src, 2, 1] + self.cur_pkt[0]
+            self.fc_ip_src[self.hash_ip_src, 3, 1] = \
                 pow(2, (-0.1 * ip_src_ts_interval_2)) * \
-                self.fc_ip_src[self.hash_ip_src][3][1] + self.cur_pkt[0]
-            self.fc_ip_src[self.hash_ip_src][4][1] = \
+                self.fc_ip_src[self.hash_ip_src, 3, 1] + self.cur_pkt[0]
+            self.fc_ip_src[self.hash_ip_src, 4, 1] = \
                 pow(2, (-(1/60) * ip_src_ts_interval_3)) * \
-                self.fc_ip_src[self.hash_ip_src][4][1] + self.cur_pkt[0]
+                self.fc_ip_src[self.hash_ip_src, 4, 1] + self.cur_pkt[0]
 
             # Decay factor: pkt length squared.
-            self.fc_ip_src[self.hash_ip_src][1][2] = \
+            self.fc_ip_src[self.hash_ip_src, 1, 2] = \
                 pow(2, (-10 * ip_src_ts_interval_0)) * \
-                self.fc_ip_src[self.hash_ip_src][1][2] + pow(self.cur_pkt[0], 2)
-            self.fc_ip_src[self.hash_ip_src][2][2] = \
+                self.fc_ip_src[self.hash_ip_src, 1, 2] + pow(self.cur_pkt[0], 2)
+            self.fc_ip_src[self.hash_ip_src, 2, 2] = \
                 pow(2, (-1 * ip_src_ts_interval_1)) * \
-                self.fc_ip_src[self.hash_ip_src][2][2] + pow(self.cur_pkt[0], 2)
-            self.fc_ip_src[self.hash_ip_src][3][2] = \
+                self.fc_ip_src[self.hash_ip_src, 2, 2] + pow(self.cur_pkt[0], 2)
+            self.fc_ip_src[self.hash_ip_src, 3, 2] = \
                 pow(2, (-0.1 * ip_src_ts_interval_2)) * \
-                self.fc_ip_src[self.hash_ip_src][3][2] + pow(self.cur_pkt[0], 2)
-            self.fc_ip_src[self.hash_ip_src][4][2] = \
+                self.fc_ip_src[self.hash_ip_src, 3, 2] + pow(self.cur_pkt[0], 2)
+            self.fc_ip_src[self.hash_ip_src, 4, 2] = \
                 pow(2, (-(1/60) * ip_src_ts_interval_3)) * \
-                self.fc_ip_src[self.hash_ip_src][4][2] + pow(self.cur_pkt[0], 2)
+                self.fc_ip_src[self.hash_ip_src, 4, 2] + pow(self.cur_pkt[0], 2)
         else:
-            self.fc_ip_src[self.hash_ip_src] = ([[0, 0, 0, 0],
-                                                    [0, 0, 0],
-                                                    [0, 0, 0],
-                                                    [0, 0, 0],
-                                                    [0, 0, 0]])
-            self.fc_ip_src[self.hash_ip_src][0][0] = self.cur_pkt[1]
-            self.fc_ip_src[self.hash_ip_src][0][1] = self.cur_pkt[1]
-            self.fc_ip_src[self.hash_ip_src][0][2] = self.cur_pkt[1]
-            self.fc_ip_src[self.hash_ip_src][0][3] = self.cur_pkt[1]
-            self.fc_ip_src[self.hash_ip_src][1] = \
+            self.regs['fc_ip_src'].reset(self.hash_ip_src)
+            self.fc_ip_src[self.hash_ip_src, 0, 0] = self.cur_pkt[1]
+            self.fc_ip_src[self.hash_ip_src, 0, 1] = self.cur_pkt[1]
+            self.fc_ip_src[self.hash_ip_src, 0, 2] = self.cur_pkt[1]
+            self.fc_ip_src[self.hash_ip_src, 0, 3] = self.cur_pkt[1]
+            self.regs['fc_ip_src'].array[self.hash_ip_src, 1, :3] = \
                 [1,
                  self.cur_pkt[0],
                  pow(self.cur_pkt[0], 2)]
-            self.fc_ip_src[self.hash_ip_src][2] = \
+            self.regs['fc_ip_src'].array[self.hash_ip_src, 2, :3] = \
                 [1,
                  self.cur_pkt[0],
                  pow(self.cur_pkt[0], 2)]
-            self.fc_ip_src[self.hash_ip_src][3] = \
+            self.regs['fc_ip_src'].array[self.hash_ip_src, 3, :3] = \
                 [1,
                  self.cur_pkt[0],
                  pow(self.cur_pkt[0], 2)]
-            self.fc_ip_src[self.hash_ip_src][4] = \
+            self.regs['fc_ip_src'].array[self.hash_ip_src, 4, :3] = \
                 [1,
                  self.cur_pkt[0],
                  pow(self.cur_pkt[0], 2)]
 
         # IP
 
-        if self.hash_ip_0 not in self.ip_res:
-            self.ip_res[self.hash_ip_0] = [0, 0, 0, 0]
-
-        if self.hash_ip_xor not in self.ip_res_sum:
-            self.ip_res_sum[self.hash_ip_xor] = ([[0, 0, 0, 0], 0, 0, 0, 0])
-
         # Check if the current flow ID has already been seen.
         # If it exists, calculate the decay.
         # Else, initialize all values and perform the update from the current pkt.
-        if self.hash_ip_0 in self.fc_ip:
+        if self.fc_ip_valid[self.hash_ip_0]:
             ip_ts_interval_0 = \
-                self.cur_pkt[1] - self.fc_ip[self.hash_ip_0][0][0]
+                self.cur_pkt[1] - self.fc_ip[self.hash_ip_0, 0, 0]
             ip_ts_interval_1 = \
-                self.cur_pkt[1] - self.fc_ip[self.hash_ip_0][0][1]
+                self.cur_pkt[1] - self.fc_ip[self.hash_ip_0, 0, 1]
             ip_ts_interval_2 = \
-                self.cur_pkt[1] - self.fc_ip[self.hash_ip_0][0][2]
+                self.cur_pkt[1] - self.fc_ip[self.hash_ip_0, 0, 2]
             ip_ts_interval_3 = \
-                self.cur_pkt[1] - self.fc_ip[self.hash_ip_0][0][3]
+                self.cur_pkt[1] - self.fc_ip[self.hash_ip_0, 0, 3]
 
             # Check if the current decay counter has been previously updated.
             # If so, perform the decay factor update.
             # Else, the current decay counter value becomes the current pkt timestamp.
 
-            self.fc_ip[self.hash_ip_0][0][0] = self.cur_pkt[1]
-            self.fc_ip[self.hash_ip_0][0][1] = self.cur_pkt[1]
-            self.fc_ip[self.hash_ip_0][0][2] = self.cur_pkt[1]
-            self.fc_ip[self.hash_ip_0][0][3] = self.cur_pkt[1]
+            self.fc_ip[self.hash_ip_0, 0, 0] = self.cur_pkt[1]
+            self.fc_ip[self.hash_ip_0, 0, 1] = self.cur_pkt[1]
+            self.fc_ip[self.hash_ip_0, 0, 2] = self.cur_pkt[1]
+            self.fc_ip[self.hash_ip_0, 0, 3] = self.cur_pkt[1]
 
-            self.ip_res_sum[self.hash_ip_xor][0][0] = self.cur_pkt[1]
-            self.ip_res_sum[self.hash_ip_xor][0][1] = self.cur_pkt[1]
-            self.ip_res_sum[self.hash_ip_xor][0][2] = self.cur_pkt[1]
-            self.ip_res_sum[self.hash_ip_xor][0][3] = self.cur_pkt[1]
+            self.ip_res_sum_ts[self.hash_ip_xor, 0] = self.cur_pkt[1]
+            self.ip_res_sum_ts[self.hash_ip_xor, 1] = self.cur_pkt[1]
+            self.ip_res_sum_ts[self.hash_ip_xor, 2] = self.cur_pkt[1]
+            self.ip_res_sum_ts[self.hash_ip_xor, 3] = self.cur_pkt[1]
 
             # Decay factor: pkt count.
-            self.fc_ip[self.hash_ip_0][1][0] = \
+            self.fc_ip[self.hash_ip_0, 1, 0] = \
                 pow(2, (-10 * ip_ts_interval_0)) * \
-                self.fc_ip[self.hash_ip_0][1][0] + 1
-            self.fc_ip[self.hash_ip_0][2][0] = \
+                self.fc_ip[self.hash_ip_0, 1, 0] + 1
+            self.fc_ip[self.hash_ip_0, 2, 0] = \
                 pow(2, (-1 * ip_ts_interval_0)) * \
-                self.fc_ip[self.hash_ip_0][2][0] + 1
-            self.fc_ip[self.hash_ip_0][3][0] = \
+                self.fc_ip[self.hash_ip_0, 2, 0] + 1
+            self.fc_ip[self.hash_ip_0, 3, 0] = \
                 pow(2, (-0.1 * ip_ts_interval_0)) * \
-                self.fc_ip[self.hash_ip_0][3][0] + 1
-            self.fc_ip[self.hash_ip_0][4][0] = \
+                self.fc_ip[self.hash_ip_0, 3, 0] + 1
+            self.fc_ip[self.hash_ip_0, 4, 0] = \
                 pow(2, (-(1/60) * ip_ts_interval_0)) * \
-                self.fc_ip[self.hash_ip_0][4][0] + 1
+                self.fc_ip[self.hash_ip_0, 4, 0] + 1
 
             # Decay factor: pkt length.
-            self.fc_ip[self.hash_ip_0][1][1] = \
+            self.fc_ip[self.hash_ip_0, 1, 1] = \
                 pow(2, (-10 * ip_ts_interval_0)) * \
-                self.fc_ip[self.hash_ip_0][1][1] + self.cur_pkt[0]
-            self.fc_ip[self.hash_ip_0][2][1] = \
+                self.fc_ip[self.hash_ip_0, 1, 1] + self.cur_pkt[0]
+            self.fc_ip[self.hash_ip_0, 2, 1] = \
                 pow(2, (-1 * ip_ts_interval_1)) * \
-                self.fc_ip[self.hash_ip_0][2][1] + self.cur_pkt[0]
-            self.fc_ip[self.hash_ip_0][3][1] = \
+                self.fc_ip[self.hash_ip_0, 2, 1] + self.cur_pkt[0]
+            self.fc_ip[self.hash_ip_0, 3, 1] = \
                 pow(2, (-0.1 * ip_ts_interval_2)) * \
-                self.fc_ip[self.hash_ip_0][3][1] + self.cur_pkt[0]
-            self.fc_ip[self.hash_ip_0][4][1] = \
+                self.fc_ip[self.hash_ip_0, 3, 1] + self.cur_pkt[0]
+            self.fc_ip[self.hash_ip_0, 4, 1] = \
                 pow(2, (-(1/60) * ip_ts_interval_3)) * \
-                self.fc_ip[self.hash_ip_0][4][1] + self.cur_pkt[0]
+                self.fc_ip[self.hash_ip_0, 4, 1] + self.cur_pkt[0]
 
             # Decay factor: pkt length squared.
-            self.fc_ip[self.hash_ip_0][1][2] = \
+            self.fc_ip[self.hash_ip_0, 1, 2] = \
                 pow(2, (-10 * ip_ts_interval_0)) * \
-                self.fc_ip[self.hash_ip_0][1][2] + pow(self.cur_pkt[0], 2)
-            self.fc_ip[self.hash_ip_0][2][2] = \
+                self.fc_ip[self.hash_ip_0, 1, 2] + pow(self.cur_pkt[0], 2)
+            self.fc_ip[self.hash_ip_0, 2, 2] = \
                 pow(2, (-1 * ip_ts_interval_1)) * \
-                self.fc_ip[self.hash_ip_0][2][2] + pow(self.cur_pkt[0], 2)
-            self.fc_ip[self.hash_ip_0][3][2] = \
+                self.fc_ip[self.hash_ip_0, 2, 2] + pow(self.cur_pkt[0], 2)
+            self.fc_ip[self.hash_ip_0, 3, 2] = \
                 pow(2, (-0.1 * ip_ts_interval_2)) * \
-                self.fc_ip[self.hash_ip_0][3][2] + pow(self.cur_pkt[0], 2)
-            self.fc_ip[self.hash_ip_0][4][2] = \
+                self.fc_ip[self.hash_ip_0, 3, 2] + pow(self.cur_pkt[0], 2)
+            self.fc_ip[self.hash_ip_0, 4, 2] = \
                 pow(2, (-(1/60) * ip_ts_interval_3)) * \
-                self.fc_ip[self.hash_ip_0][4][2] + pow(self.cur_pkt[0], 2)
-
-            self.ip_res_sum[self.hash_ip_xor][1] = \
-                pow(2, (-10 * ip_ts_interval_0)) * self.ip_res_sum[self.hash_ip_xor][1]
-            self.ip_res_sum[self.hash_ip_xor][2] = \
-                pow(2, (-1 * ip_ts_interval_1)) * self.ip_res_sum[self.hash_ip_xor][2]
-            self.ip_res_sum[self.hash_ip_xor][3] = \
-                pow(2, (-0.1 * ip_ts_interval_2)) * self.ip_res_sum[self.hash_ip_xor][3]
-            self.ip_res_sum[self.hash_ip_xor][4] = \
-                pow(2, (-(1/60) * ip_ts_interval_3)) * self.ip_res_sum[self.hash_ip_xor][4]
+                self.fc_ip[self.hash_ip_0, 4, 2] + pow(self.cur_pkt[0], 2)
+
+            self.ip_res_sum[self.hash_ip_xor, 1] = \
+                pow(2, (-10 * ip_ts_interval_0)) * self.ip_res_sum[self.hash_ip_xor, 1]
+            self.ip_res_sum[self.hash_ip_xor, 2] = \
+                pow(2, (-1 * ip_ts_interval_1)) * self.ip_res_sum[self.hash_ip_xor, 2]
+            self.ip_res_sum[self.hash_ip_xor, 3] = \
+                pow(2, (-0.1 * ip_ts_interval_2)) * self.ip_res_sum[self.hash_ip_xor, 3]
+            self.ip_res_sum[self.hash_ip_xor, 4] = \
+                pow(2, (-(1/60) * ip_ts_interval_3)) * self.ip_res_sum[self.hash_ip_xor, 4]
         else:
-            self.fc_ip[self.hash_ip_0] = ([[0, 0, 0, 0],
-                                              [0, 0, 0, 0, 0, 0],
-                                              [0, 0, 0, 0, 0, 0],
-                                              [0, 0, 0, 0, 0, 0],
-                                              [0, 0, 0, 0, 0, 0]])
-            self.fc_ip[self.hash_ip_0][0][0] = self.cur_pkt[1]
-            self.fc_ip[self.hash_ip_0][0][1] = self.cur_pkt[1]
-            self.fc_ip[self.hash_ip_0][0][2] = self.cur_pkt[1]
-            self.fc_ip[self.hash_ip_0][0][3] = self.cur_pkt[1]
-            self.fc_ip[self.hash_ip_0][1] = \
+            self.regs['fc_ip'].reset(self.hash_ip_0)
+            self.fc_ip[self.hash_ip_0, 0, 0] = self.cur_pkt[1]
+            self.fc_ip[self.hash_ip_0, 0, 1] = self.cur_pkt[1]
+            self.fc_ip[self.hash_ip_0, 0, 2] = self.cur_pkt[1]
+            self.fc_ip[self.hash_ip_0, 0, 3] = self.cur_pkt[1]
+            self.regs['fc_ip'].array[self.hash_ip_0, 1, :6] = \
                 [1, self.cur_pkt[0], pow(self.cur_pkt[0], 2), 0, 0, 0]
-            self.fc_ip[self.hash_ip_0][2] = \
+            self.regs['fc_ip'].array[self.hash_ip_0, 2, :6] = \
                 [1, self.cur_pkt[0], pow(self.cur_pkt[0], 2), 0, 0, 0]
-            self.fc_ip[self.hash_ip_0][3] = \
+            self.regs['fc_ip'].array[self.hash_ip_0, 3, :6] = \
                 [1, self.cur_pkt[0], pow(self.cur_pkt[0], 2), 0, 0, 0]
-            self.fc_ip[self.hash_ip_0][4] = \
+            self.regs['fc_ip'].array[self.hash_ip_0, 4, :6] = \
                 [1, self.cur_pkt[0], pow(self.cur_pkt[0], 2), 0, 0, 0]
 
         # Five tuple
 
-        if self.hash_five_t_0 not in self.five_t_res:
-            self.five_t_res[self.hash_five_t_0] = [0, 0, 0, 0]
-
-        if self.hash_five_t_xor not in self.five_t_res_sum:
-            self.five_t_res_sum[self.hash_five_t_xor] = ([[0, 0, 0, 0], 0, 0, 0, 0])
-
         # Check if the current flow ID has already been seen.
         # If it exists, calculate the decay.
         # Else, initialize all values and perform the update from the current pkt.
-        if self.hash_five_t_0 in self.fc_five_t:
+        if self.fc_five_t_valid[self.hash_five_t_0]:
             five_t_ts_interval_0 = \
-                self.cur_pkt[1] - self.fc_five_t[self.hash_five_t_0][0][0]
+                self.cur_pkt[1] - self.fc_five_t[self.hash_five_t_0, 0, 0]
             five_t_ts_interval_1 = \
-                self.cur_pkt[1] - self.fc_five_t[self.hash_five_t_0][0][1]
+                self.cur_pkt[1] - self.fc_five_t[self.hash_five_t_0, 0, 1]
             five_t_ts_interval_2 = \
-                self.cur_pkt[1] - self.fc_five_t[self.hash_five_t_0][0][2]
+                self.cur_pkt[1] - self.fc_five_t[self.hash_five_t_0, 0, 2]
             five_t_ts_interval_3 = \
-                self.cur_pkt[1] - self.fc_five_t[self.hash_five_t_0][0][3]
+                self.cur_pkt[1] - self.fc_five_t[self.hash_five_t_0, 0, 3]
 
             # Check if the current decay counter has been previously updated.
             # If so, perform the decay factor update.
             # Else, the current decay counter value becomes the current pkt timestamp.
 
-            self.fc_five_t[self.hash_five_t_0][0][0] = self.cur_pkt[1]
-            self.fc_five_t[self.hash_five_t_0][0][1] = self.cur_pkt[1]
-            self.fc_five_t[self.hash_five_t_0][0][2] = self.cur_pkt[1]
-            self.fc_five_t[self.hash_five_t_0][0][3] = self.cur_pkt[1]
+            self.fc_five_t[self.hash_five_t_0, 0, 0] = self.cur_pkt[1]
+            self.fc_five_t[self.hash_five_t_0, 0, 1] = self.cur_pkt[1]
+            self.fc_five_t[self.hash_five_t_0, 0, 2] = self.cur_pkt[1]
+            self.fc_five_t[self.hash_five_t_0, 0, 3] = self.cur_pkt[1]
 
-            self.five_t_res_sum[self.hash_five_t_xor][0][0] = self.cur_pkt[1]
-            self.five_t_res_sum[self.hash_five_t_xor][0][1] = self.cur_pkt[1]
-            self.five_t_res_sum[self.hash_five_t_xor][0][2] = self.cur_pkt[1]
-            self.five_t_res_sum[self.hash_five_t_xor][0][3] = self.cur_pkt[1]
+            self.five_t_res_sum_ts[self.hash_five_t_xor, 0] = self.cur_pkt[1]
+            self.five_t_res_sum_ts[self.hash_five_t_xor, 1] = self.cur_pkt[1]
+            self.five_t_res_sum_ts[self.hash_five_t_xor, 2] = self.cur_pkt[1]
+            self.five_t_res_sum_ts[self.hash_five_t_xor, 3] = self.cur_pkt[1]
 
             # Decay factor: pkt count.
-            self.fc_five_t[self.hash_five_t_0][1][0] = \
+            self.fc_five_t[self.hash_five_t_0, 1, 0] = \
                 pow(2, (-10 * five_t_ts_interval_0)) * \
-                self.fc_five_t[self.hash_five_t_0][1][0] + 1
-            self.fc_five_t[self.hash_five_t_0][2][0] = \
+                self.fc_five_t[self.hash_five_t_0, 1, 0] + 1
+            self.fc_five_t[self.hash_five_t_0, 2, 0] = \
                 pow(2, (-1 * five_t_ts_interval_0)) * \
-                self.fc_five_t[self.hash_five_t_0][2][0] + 1
-            self.fc_five_t[self.hash_five_t_0][3][0] = \
+                self.fc_five_t[self.hash_five_t_0, 2, 0] + 1
+            self.fc_five_t[self.hash_five_t_0, 3, 0] = \
                 pow(2, (-0.1 * five_t_ts_interval_0)) * \
-                self.fc_five_t[self.hash_five_t_0][3][0] + 1
-            self.fc_five_t[self.hash_five_t_0][4][0] = \
+                self.fc_five_t[self.hash_five_t_0, 3, 0] + 1
+            self.fc_five_t[self.hash_five_t_0, 4, 0] = \
                 pow(2, (-(1/60) * five_t_ts_interval_0)) * \
-                self.fc_five_t[self.hash_five_t_0][4][0] + 1
+                self.fc_five_t[self.hash_five_t_0, 4, 0] + 1
 
             # Decay factor: pkt length.
-            self.fc_five_t[self.hash_five_t_0][1][1] = \
+            self.fc_five_t[self.hash_five_t_0, 1, 1] = \
                 pow(2, (-10 * five_t_ts_interval_0)) * \
-                self.fc_five_t[self.hash_five_t_0][1][1] + self.cur_pkt[0]
-            self.fc_five_t[self.hash_five_t_0][2][1] = \
+                self.fc_five_t[self.hash_five_t_0, 1, 1] + self.cur_pkt[0]
+            self.fc_five_t[self.hash_five_t_0, 2, 1] = \
                 pow(2, (-1 * five_t_ts_interval_1)) * \
-                self.fc_five_t[self.hash_five_t_0][2][1] + self.cur_pkt[0]
-            self.fc_five_t[self.hash_five_t_0][3][1] = \
+                self.fc_five_t[self.hash_five_t_0, 2, 1] + self.cur_pkt[0]
+            self.fc_five_t[self.hash_five_t_0, 3, 1] = \
                 pow(2, (-0.1 * five_t_ts_interval_2)) * \
-                self.fc_five_t[self.hash_five_t_0][3][1] + self.cur_pkt[0]
-            self.fc_five_t[self.hash_five_t_0][4][1] = \
+                self.fc_five_t[self.hash_five_t_0, 3, 1] + self.cur_pkt[0]
+            self.fc_five_t[self.hash_five_t_0, 4, 1] = \
                 pow(2, (-(1/60) * five_t_ts_interval_3)) * \
-                self.fc_five_t[self.hash_five_t_0][4][1] + self.cur_pkt[0]
+                self.fc_five_t[self.hash_five_t_0, 4, 1] + self.cur_pkt[0]
 
             # Decay factor: pkt length squared.
-            self.fc_five_t[self.hash_five_t_0][1][2] = \
+            self.fc_five_t[self.hash_five_t_0, 1, 2] = \
                 pow(2, (-10 * five_t_ts_interval_0)) * \
-                self.fc_five_t[self.hash_five_t_0][1][2] + pow(self.cur_pkt[0], 2)
-            self.fc_five_t[self.hash_five_t_0][2][2] = \
+                self.fc_five_t[self.hash_five_t_0, 1, 2] + pow(self.cur_pkt[0], 2)
+            self.fc_five_t[self.hash_five_t_0, 2, 2] = \
                 pow(2, (-1 * five_t_ts_interval_1)) * \
-                self.fc_five_t[self.hash_five_t_0][2][2] + pow(self.cur_pkt[0], 2)
-            self.fc_five_t[self.hash_five_t_0][3][2] = \
+                self.fc_five_t[self.hash_five_t_0, 2, 2] + pow(self.cur_pkt[0], 2)
+            self.fc_five_t[self.hash_five_t_0, 3, 2] = \
                 pow(2, (-0.1 * five_t_ts_interval_2)) * \
-                self.fc_five_t[self.hash_five_t_0][3][2] + pow(self.cur_pkt[0], 2)
-            self.fc_five_t[self.hash_five_t_0][4][2] = \
+                self.fc_five_t[self.hash_five_t_0, 3, 2] + pow(self.cur_pkt[0], 2)
+            self.fc_five_t[self.hash_five_t_0, 4, 2] = \
                 pow(2, (-(1/60) * five_t_ts_interval_3)) * \
-                self.fc_five_t[self.hash_five_t_0][4][2] + pow(self.cur_pkt[0], 2)
-
-            self.five_t_res_sum[self.hash_five_t_xor][1] = \
-                pow(2, (-10 * five_t_ts_interval_0)) * self.five_t_res_sum[self.hash_five_t_xor][1]
-            self.five_t_res_sum[self.hash_five_t_xor][2] = \
-                pow(2, (-1 * five_t_ts_interval_1)) * self.five_t_res_sum[self.hash_five_t_xor][2]
-            self.five_t_res_sum[self.hash_five_t_xor][3] = \
-                pow(2, (-0.1 * five_t_ts_interval_2)) * self.five_t_res_sum[self.hash_five_t_xor][3]
-            self.five_t_res_sum[self.hash_five_t_xor][4] = \
-                pow(2, (-(1/60) * five_t_ts_interval_3)) * self.five_t_res_sum[self.hash_five_t_xor][4]
+                self.fc_five_t[self.hash_five_t_0, 4, 2] + pow(self.cur_pkt[0], 2)
+
+            self.five_t_res_sum[self.hash_five_t_xor, 1] = \
+                pow(2, (-10 * five_t_ts_interval_0)) * self.five_t_res_sum[self.hash_five_t_xor, 1]
+            self.five_t_res_sum[self.hash_five_t_xor, 2] = \
+                pow(2, (-1 * five_t_ts_interval_1)) * self.five_t_res_sum[self.hash_five_t_xor, 2]
+            self.five_t_res_sum[self.hash_five_t_xor, 3] = \
+                pow(2, (-0.1 * five_t_ts_interval_2)) * self.five_t_res_sum[self.hash_five_t_xor, 3]
+            self.five_t_res_sum[self.hash_five_t_xor, 4] = \
+                pow(2, (-(1/60) * five_t_ts_interval_3)) * self.five_t_res_sum[self.hash_five_t_xor, 4]
         else:
-            self.fc_five_t[self.hash_five_t_0] = ([[0, 0, 0, 0],
-                                                      [0, 0, 0, 0, 0, 0],
-                                                      [0, 0, 0, 0, 0, 0],
-                                                      [0, 0, 0, 0, 0, 0],
-                                                      [0, 0, 0, 0, 0, 0]])
-            self.fc_five_t[self.hash_five_t_0][0][0] = self.cur_pkt[1]
-            self.fc_five_t[self.hash_five_t_0][0][1] = self.cur_pkt[1]
-            self.fc_five_t[self.hash_five_t_0][0][2] = self.cur_pkt[1]
-            self.fc_five_t[self.hash_five_t_0][0][3] = self.cur_pkt[1]
-            self.fc_five_t[self.hash_five_t_0][1] = \
+            self.regs['fc_five_t'].reset(self.hash_five_t_0)
+            self.fc_five_t[self.hash_five_t_0, 0, 0] = self.cur_pkt[1]
+            self.fc_five_t[self.hash_five_t_0, 0, 1] = self.cur_pkt[1]
+            self.fc_five_t[self.hash_five_t_0, 0, 2] = self.cur_pkt[1]
+            self.fc_five_t[self.hash_five_t_0, 0, 3] = self.cur_pkt[1]
+            self.regs['fc_five_t'].array[self.hash_five_t_0, 1, :6] = \
                 [1, self.cur_pkt[0], pow(self.cur_pkt[0], 2), 0, 0, 0]
-            self.fc_five_t[self.hash_five_t_0][2] = \
+            self.regs['fc_five_t'].array[self.hash_five_t_0, 2, :6] = \
                 [1, self.cur_pkt[0], pow(self.cur_pkt[0], 2), 0, 0, 0]
-            self.fc_five_t[self.hash_five_t_0][3] = \
+            self.regs['fc_five_t'].array[self.hash_five_t_0, 3, :6] = \
                 [1, self.cur_pkt[0], pow(self.cur_pkt[0], 2), 0, 0, 0]
-            self.fc_five_t[self.hash_five_t_0][4] = \
+            self.regs['fc_five_t'].array[self.hash_five_t_0, 4, :6] = \
                 [1, self.cur_pkt[0], pow(self.cur_pkt[0], 2), 0, 0, 0]
 
     # Returns the nearest lower power of two.
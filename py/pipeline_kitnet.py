@@ -1,23 +1,68 @@
 import os
 import time
-import pickle
 import itertools
 import numpy as np
 import pandas as pd
 from pathlib import Path
-from fc_kitnet import FCKitNET
+from fc_kitnet import FCKitNET, BATCH_HDRS
+from register_file import register_arrays
+from threshold import StreamingThreshold
+from eval_buffer import EvalBuffer
+from stats_writer import StatsWriter
+from train_stats import save_train_stats, load_train_stats
 from plugins.KitNET.KitNET import KitNET
+from plugins.KitNET.ModelBundle import export_spatial
 
 LAMBDAS = 4
 LEARNING_RATE = 0.1
 HIDDEN_RATIO = 0.75
 
+# Packets per FC block, when computing the approximate stats (see FCKitNET.process_batch).
+# 1: packet by packet.
+FC_BATCH = 4096
+
+# Packets scored together by KitNET in the execution phase (1: packet by packet), unless set by
+# the exec_batch config. Batched scoring is faster, but its RMSEs may differ from the packet by
+# packet ones in the last bits (float rounding of the batched products).
+EXEC_BATCH = 1
+
+# Packets trained on together by KitNET while it learns the feature mapping (1: packet by packet,
+# opt-in). The FM updates are the same as packet by packet, up to float rounding, which may break
+# ties between equally correlated features differently when clustering them (and so change the
+# feature map and the model).
+FM_BATCH = 1
+
+# Packets trained on together by KitNET once the feature mapping is learned, as a single mini-batch
+# step (1: packet by packet, i.e., per-sample SGD). Mini-batches speed up the training but change
+# the trained model (and so the threshold): see bench_train_batch.py.
+TRAIN_BATCH = 1
+
+# Threads evaluating the KitNET ensemble layer for the batched packets (0: none), see
+# KitNET.set_workers. Only worth it with large batches (exec_batch, TRAIN_BATCH).
+ENSEMBLE_WORKERS = 0
+
+# KitNET inference mode in the execution phase: 'float64', 'float32', 'int16' or 'int8'
+# (fixed-point), overridden by the inference_mode config. The reduced precision modes mirror a
+# switch model's arithmetic, to measure its detection; they are not faster than float64 (see
+# Quantized.py).
+# With save_spatial, the quantized model is also saved (see ModelBundle.export_spatial).
+INFERENCE_MODE = 'float64'
+
+# Detection threshold: the highest training phase RMSE (None), or this quantile of the training
+# phase RMSEs (e.g., 0.99). Both are estimated in constant memory, see threshold.py.
+THRESHOLD_QUANTILE = None
+
+# Worker processes computing the FC blocks, one per flow key family (0: none, opt-in). The stats
+# are the same; up to 4 workers are used, worth it with at least as many cores.
+FC_WORKERS = 0
+
 
 class PipelineKitNET:
     def __init__(
             self, trace, labels, sampl, train_sampl, exec_sampl_offset, fm_grace, ad_grace,
             max_ae, fm_model, el_model, ol_model, train_stats, attack, train_exact_ratio,
-            exact_stats, save_stats_global, save_spatial, time_start):
+            exact_stats, save_stats_global, save_spatial, time_start, model=None,
+            exec_batch=EXEC_BATCH, inference_mode=INFERENCE_MODE):
 
         self.decay_to_pos = {
             0: 0, 1: 0, 2: 1, 3: 2, 4: 3,
@@ -40,7 +85,7 @@ class PipelineKitNET:
         self.train_exact_ratio = train_exact_ratio
         # Calculate exact stats in the exec phase.
         self.exact_stats = exact_stats
-        # Keep track of the global stats and save them to a csv.
+        # Keep track of the global stats and save them to a binary file (see stats_writer.py).
         self.save_stats_global = save_stats_global
         # Save the model for spatial.
         self.save_spatial = save_spatial
@@ -52,11 +97,19 @@ class PipelineKitNET:
         self.det_init_pkt_num = -1
         self.det_init_pkt_num_dp = -1
 
-        self.stats_global = []
-        self.rmse_list = []
-        self.peregrine_eval = []
+        self.stats_writer = None
+        if self.save_stats_global:
+            outdir = f'{Path(__file__).parents[0]}/eval/kitnet'
+            if not os.path.exists(outdir):
+                os.makedirs(outdir, exist_ok=True)
+            self.stats_writer = StatsWriter(f'{outdir}/{self.attack}-{self.sampl}-stats.f32')
+
+        # Number of packets processed by KitNET (trained on or executed).
+        self.rmse_cnt = 0
+        self.peregrine_eval = EvalBuffer()
 
         self.threshold = 0
+        self.threshold_est = StreamingThreshold(THRESHOLD_QUANTILE)
         self.pkt_cnt_global = 0
         self.train_skip_pkt = 0
         self.train_skip = False
@@ -64,14 +117,20 @@ class PipelineKitNET:
         # Read the csv containing the ground truth labels.
         self.trace_labels = pd.read_csv(labels, header=None)
 
-        if fm_model is not None \
-                and os.path.isfile(f'{Path(__file__).parents[0]}/{fm_model}') \
-                and el_model is not None \
-                and os.path.isfile(f'{Path(__file__).parents[0]}/{el_model}') \
-                and ol_model is not None \
-                and os.path.isfile(f'{Path(__file__).parents[0]}/{ol_model}') \
+        # Previously trained model: a model bundle, or else the (legacy) pickled FM, EL and OL.
+        if model is not None and os.path.isfile(f'{Path(__file__).parents[0]}/{model}'):
+            fm_model = el_model = ol_model = None
+        else:
+            model = None
+        if (model is not None
+                or fm_model is not None
+                and os.path.isfile(f'{Path(__file__).parents[0]}/{fm_model}')
+                and el_model is not None
+                and os.path.isfile(f'{Path(__file__).parents[0]}/{el_model}')
+                and ol_model is not None
+                and os.path.isfile(f'{Path(__file__).parents[0]}/{ol_model}')) \
                 and train_stats is not None \
-                and os.path.isfile(f'{Path(__file__).parents[0]}/{train_stats}'):
+                and os.path.exists(f'{Path(__file__).parents[0]}/{train_stats}'):
             self.train_skip = True
 
         self.stats_mac_ip_src = {}
@@ -81,23 +140,25 @@ class PipelineKitNET:
 
         # If train_skip is true, import the previously generated models.
         if self.train_skip:
-            with open(train_stats, 'rb') as f_stats:
-                stats = pickle.load(f_stats)
-                self.stats_mac_ip_src = stats[0]
-                self.stats_ip_src = stats[1]
-                self.stats_ip = stats[2]
-                self.stats_five_t = stats[3]
+            cp_stats = load_train_stats(train_stats)['cp_stats']
+            self.stats_mac_ip_src = cp_stats['stats_mac_ip_src']
+            self.stats_ip_src = cp_stats['stats_ip_src']
+            self.stats_ip = cp_stats['stats_ip']
+            self.stats_five_t = cp_stats['stats_five_t']
 
         # Initialize KitNET.
         if self.train_sampl:
             self.kitnet = KitNET(
                 80, max_ae, fm_grace // self.sampl, ad_grace // self.sampl,
                 LEARNING_RATE, HIDDEN_RATIO, fm_model, el_model, ol_model, attack,
-                train_exact_ratio)
+                train_exact_ratio, model)
         else:
             self.kitnet = KitNET(
                 80, max_ae, fm_grace, ad_grace, LEARNING_RATE, HIDDEN_RATIO, fm_model, el_model,
-                ol_model, attack, train_exact_ratio)
+                ol_model, attack, train_exact_ratio, model)
+        if ENSEMBLE_WORKERS > 1:
+            self.kitnet.set_workers(ENSEMBLE_WORKERS)
+        self.kitnet.set_inference_mode(inference_mode)
 
         # Initialize feature extraction/computation.
         self.fc = FCKitNET(trace, sampl, self.train_grace, exec_sampl_offset, self.train_skip,
@@ -106,6 +167,17 @@ class PipelineKitNET:
         self.trace_size = self.fc.trace_size()
         self.trace_initial_ts = self.fc.trace_initial_ts()
 
+        # Current FC block: rows, headers, stats and skipped packets; position of the next packet.
+        self.fc_block = [[], None, None, None]
+        self.fc_block_pos = 0
+
+        # Execution phase packets waiting to be scored: stats, KitNET input, label index and
+        # data plane attack pkt counter; scored exec_batch_size at a time.
+        self.exec_batch = []
+        self.exec_batch_size = exec_batch
+        # Training phase packets waiting to be trained on, as above.
+        self.train_batch = []
+
     def process(self):
         # Offset value, corresponds to 0 during the training phase and
         # to self.exec_sampl_offset during the exec phase.
@@ -117,20 +189,23 @@ class PipelineKitNET:
         time_old = 0
         time_new = 0
 
+        if FC_BATCH > 1 and FC_WORKERS:
+            self.fc.start_workers(FC_WORKERS)
+
         # Process the trace, packet by packet.
         while True:
             cur_stats = 0
 
             time_new = time.time()
             if not self.train_skip:
-                if (len(self.rmse_list) + self.train_skip_pkt) % 1000 == 0 and \
-                        (len(self.rmse_list) + self.train_skip_pkt) < self.train_grace:
-                    print(f'Processed pkts: {len(self.rmse_list) + self.train_skip_pkt}. '
+                if (self.rmse_cnt + self.train_skip_pkt) % 1000 == 0 and \
+                        (self.rmse_cnt + self.train_skip_pkt) < self.train_grace:
+                    print(f'Processed pkts: {self.rmse_cnt + self.train_skip_pkt}. '
                           f'Elapsed time: {time_new - time_old} '
                           f'({int(1000/(time_new - time_old))} pps)')
                     time_old = time_new
                 elif self.pkt_cnt_global % 1000 == 0 and \
-                        (len(self.rmse_list) + self.train_skip_pkt) >= self.train_grace:
+                        (self.rmse_cnt + self.train_skip_pkt) >= self.train_grace:
                     print(f'Processed pkts: {self.train_grace + self.pkt_cnt_global}. '
                           f'Elapsed time: {time_new - time_old} '
                           f'({int(1000/(time_new - time_old))} pps)')
@@ -142,45 +217,52 @@ class PipelineKitNET:
                           f'({int(1000/(time_new - time_old))} pps)')
                     time_old = time_new
 
-            if self.save_stats_global:
-                self.update_stats_global()
-
             # Training phase.
-            if (len(self.rmse_list) + self.train_skip_pkt) \
+            if (self.rmse_cnt + self.train_skip_pkt) \
                     < (self.train_exact_ratio * (self.train_grace)) \
                     and not self.train_skip:
                 self.fc.feature_extract()
                 if self.train_sampl \
-                        and (len(self.rmse_list) +1 + self.train_skip_pkt) % self.sampl != 0:
+                        and (self.rmse_cnt +1 + self.train_skip_pkt) % self.sampl != 0:
                     self.train_skip_pkt += 1
                     continue
                 cur_stats = self.fc.process_exact('training')
-            elif (len(self.rmse_list) + self.train_skip_pkt) \
+            elif (self.rmse_cnt + self.train_skip_pkt) \
                     < self.train_grace and not self.train_skip:
-                self.fc.feature_extract()
-                if self.train_sampl \
-                        and (len(self.rmse_list) +1 + self.train_skip_pkt) % self.sampl != 0:
-                    self.train_skip_pkt += 1
-                    continue
-                if self.exact_stats:
-                    cur_stats = self.fc.process_exact('training')
+                if not self.exact_stats and FC_BATCH > 1:
+                    cur_stats = self.fc_process(
+                        'training', self.train_grace - self.rmse_cnt - self.train_skip_pkt)
+                    if cur_stats is None:
+                        self.train_skip_pkt += 1
+                        continue
                 else:
-                    cur_stats = self.fc.process('training')
+                    self.fc.feature_extract()
+                    if self.train_sampl \
+                            and (self.rmse_cnt +1 + self.train_skip_pkt) % self.sampl != 0:
+                        self.train_skip_pkt += 1
+                        continue
+                    if self.exact_stats:
+                        cur_stats = self.fc.process_exact('training')
+                    else:
+                        cur_stats = self.fc.process('training')
 
             # Execution phase.
             else:
                 self.pkt_cnt_global += 1
                 if self.train_grace + self.pkt_cnt_global + self.exec_sampl_offset > self.trace_size:
-                    if self.save_stats_global:
-                        self.update_stats_global()
                     break
-                self.fc.feature_extract()
+                if not self.exact_stats and FC_BATCH > 1:
+                    cur_stats = self.fc_process(
+                        'execution', self.trace_size - self.train_grace - self.pkt_cnt_global
+                        - self.exec_sampl_offset + 1)
+                else:
+                    self.fc.feature_extract()
                 if self.attack_pkt_num_cntr_dp != -1 and int(self.trace_labels.iat[
                         self.train_grace + offset + self.pkt_cnt_global - 1, 0]) == 1:
                     self.attack_pkt_num_cntr_dp += 1
                 if self.exact_stats:
                     cur_stats = self.fc.process_exact('execution')
-                else:
+                elif FC_BATCH == 1:
                     cur_stats = self.fc.process('execution')
 
             # If any statistics were obtained, send them to the ML pipeline.
@@ -194,8 +276,6 @@ class PipelineKitNET:
                 # Break when we reach the end of the trace file.
                 if self.train_grace + self.pkt_cnt_global + self.exec_sampl_offset \
                         > self.trace_size:
-                    if self.save_stats_global:
-                        self.update_stats_global()
                     break
                 if self.pkt_cnt_global % self.sampl != 0:
                     continue
@@ -207,68 +287,166 @@ class PipelineKitNET:
                 input_stats = self.update_stats(cur_stats)
 
                 if self.save_stats_global:
-                    self.stats_global.append(input_stats)
+                    self.stats_writer.append(input_stats)
+
+                # Execution phase micro-batching: the packet is scored with the next ones.
+                if self.exec_batch_size > 1 and self.kitnet.is_executing() and (
+                        self.train_skip
+                        or self.rmse_cnt + self.train_skip_pkt >= self.train_grace):
+                    self.exec_batch.append([
+                        cur_stats, input_stats, self.train_grace + offset + self.pkt_cnt_global - 1,
+                        self.attack_pkt_num_cntr_dp])
+                    if len(self.exec_batch) == self.exec_batch_size:
+                        self.process_exec_batch()
+                    # Break when we reach the end of the trace file.
+                    if self.train_grace + self.pkt_cnt_global \
+                            + self.exec_sampl_offset >= self.trace_size:
+                        break
+                    continue
 
-                # Call function with the content of kitsune's main (before the eval/csv part).
-                rmse = self.kitnet.process(input_stats)
+                # Training phase batching: the packet is trained on with the next ones, FM_BATCH at
+                # a time while the FM learns the feature mapping, TRAIN_BATCH at a time afterwards.
+                if FM_BATCH > 1 and self.kitnet.is_mapping():
+                    train_batch_size = FM_BATCH
+                elif TRAIN_BATCH > 1 and not self.kitnet.is_executing():
+                    train_batch_size = TRAIN_BATCH
+                else:
+                    train_batch_size = 1
+                train_batched = train_batch_size > 1
+                if train_batched:
+                    self.train_batch.append([
+                        cur_stats, input_stats, self.train_grace + offset + self.pkt_cnt_global - 1,
+                        self.attack_pkt_num_cntr_dp])
+                    self.rmse_cnt += 1
+                    if len(self.train_batch) >= train_batch_size \
+                            or (self.kitnet.is_mapping() and self.kitnet.n_trained
+                                + len(self.train_batch) == self.kitnet.FM_grace_period) \
+                            or (self.rmse_cnt + self.train_skip_pkt) == self.train_grace:
+                        self.process_train_batch()
+                else:
+                    # Call function with the content of kitsune's main (before the eval/csv part).
+                    mapping = self.kitnet.is_mapping()
+                    rmse = self.kitnet.process(input_stats)
 
-                self.rmse_list.append(rmse)
+                    self.rmse_cnt += 1
+                    # Training phase rmse values (past the feature mapping) set the threshold.
+                    if not mapping and self.rmse_cnt + self.train_skip_pkt <= self.train_grace:
+                        self.threshold_est.update(rmse)
 
-                if len(self.rmse_list) < self.train_grace and int(self.trace_labels.iat[
-                        len(self.rmse_list) + self.train_skip_pkt - 1, 0]) == 1:
+                if self.rmse_cnt < self.train_grace and int(self.trace_labels.iat[
+                        self.rmse_cnt + self.train_skip_pkt - 1, 0]) == 1:
                     print('Error: attack traces appearing during the training phase')
                     break
 
-                if self.attack_init_ts == 0 and int(self.trace_labels.iat[
-                        self.train_grace + offset + self.pkt_cnt_global - 1, 0]) == 1:
-                    print('Trace attack: start')
-                    self.attack_init_ts = cur_stats[0]
-                    self.attack_pkt_num_cntr += 1
-
-                if int(rmse) > int(self.threshold) \
-                        and self.attack_pkt_num_cntr != -1 \
-                        and int(self.trace_labels.iat[
-                            self.train_grace + offset + self.pkt_cnt_global - 1, 0]) == 1:
-                    self.det_init_time = cur_stats[0] - self.attack_init_ts
-                    self.det_init_pkt_num = self.attack_pkt_num_cntr
-                    self.det_init_pkt_num_dp = self.attack_pkt_num_cntr_dp
-                    self.attack_pkt_num_cntr = -1
-                    self.attack_pkt_num_cntr_dp = -1
-
-                if self.attack_pkt_num_cntr != -1 and int(self.trace_labels.iat[
-                        self.train_grace + offset + self.pkt_cnt_global - 1, 0]) == 1:
-                    self.attack_pkt_num_cntr += 1
-
-                try:
-                    # 1-5: pkt headers
-                    # time_pkt_ml: processing time (ML classifier only)
-                    self.peregrine_eval.append([
-                        cur_stats[1], cur_stats[2], cur_stats[3], cur_stats[4], cur_stats[5],
-                        cur_stats[6], rmse, self.trace_labels.iat[
-                            self.train_grace + offset + self.pkt_cnt_global - 1, 0]])
-                except IndexError:
-                    print(self.trace_labels.shape[0])
-                    print(self.pkt_cnt_global)
-                    print(self.train_grace + offset + self.pkt_cnt_global - 1)
-
-                # At the end of the training phase, store the highest rmse value as the threshold.
+                if not train_batched:
+                    self.eval_packet(cur_stats, rmse,
+                                     self.train_grace + offset + self.pkt_cnt_global - 1,
+                                     self.attack_pkt_num_cntr_dp)
+
+                # At the end of the training phase, store the threshold (by default, the highest
+                # rmse value).
                 # Also, save the stored stat values.
                 if not self.train_skip \
-                        and (len(self.rmse_list) + self.train_skip_pkt) == self.train_grace:
+                        and (self.rmse_cnt + self.train_skip_pkt) == self.train_grace:
                     offset = self.exec_sampl_offset
-                    self.threshold = max(self.rmse_list, key=float)
+                    self.threshold = self.threshold_est.threshold()
                     self.save_train_stats()
                     print('Starting execution phase...')
                 # Break when we reach the end of the trace file.
                 elif self.train_grace + self.pkt_cnt_global \
                         + self.exec_sampl_offset >= self.trace_size:
-                    if self.save_stats_global:
-                        self.update_stats_global()
                     break
             else:
                 print('TIMEOUT.')
                 break
 
+        if self.train_batch:
+            self.process_train_batch()
+        if self.exec_batch:
+            self.process_exec_batch()
+
+        if self.stats_writer is not None:
+            self.stats_writer.close()
+        self.fc.stop_workers()
+        self.kitnet.set_workers(0)
+
+    # Detection and eval data of a packet, given its rmse.
+    # label_index: index of the packet in the trace labels;
+    # attack_pkt_num_cntr_dp: data plane attack pkt counter, when the packet was processed.
+    def eval_packet(self, cur_stats, rmse, label_index, attack_pkt_num_cntr_dp):
+        if self.attack_init_ts == 0 and int(self.trace_labels.iat[label_index, 0]) == 1:
+            print('Trace attack: start')
+            self.attack_init_ts = cur_stats[0]
+            self.attack_pkt_num_cntr += 1
+
+        if int(rmse) > int(self.threshold) \
+                and self.attack_pkt_num_cntr != -1 \
+                and int(self.trace_labels.iat[label_index, 0]) == 1:
+            self.det_init_time = cur_stats[0] - self.attack_init_ts
+            self.det_init_pkt_num = self.attack_pkt_num_cntr
+            self.det_init_pkt_num_dp = attack_pkt_num_cntr_dp
+            self.attack_pkt_num_cntr = -1
+            self.attack_pkt_num_cntr_dp = -1
+
+        if self.attack_pkt_num_cntr != -1 and int(self.trace_labels.iat[label_index, 0]) == 1:
+            self.attack_pkt_num_cntr += 1
+
+        try:
+            # 1-5: pkt headers
+            # time_pkt_ml: processing time (ML classifier only)
+            self.peregrine_eval.append(
+                cur_stats[1], cur_stats[2], cur_stats[3], cur_stats[4], cur_stats[5],
+                cur_stats[6], rmse, self.trace_labels.iat[label_index, 0])
+        except IndexError:
+            print(self.trace_labels.shape[0])
+            print(label_index)
+
+    # Score the buffered execution phase packets with a single KitNET call.
+    def process_exec_batch(self):
+        rmses = self.kitnet.execute_batch(np.stack([pkt[1] for pkt in self.exec_batch]))
+        for (cur_stats, _, label_index, attack_pkt_num_cntr_dp), rmse \
+                in zip(self.exec_batch, rmses.tolist()):
+            self.eval_packet(cur_stats, rmse, label_index, attack_pkt_num_cntr_dp)
+        self.rmse_cnt += len(self.exec_batch)
+        self.exec_batch = []
+
+    # Train KitNET on the buffered training phase packets, with a single call.
+    def process_train_batch(self):
+        mapping = self.kitnet.is_mapping()
+        rmses = self.kitnet.process_batch(np.stack([pkt[1] for pkt in self.train_batch]))
+        if not mapping:
+            self.threshold_est.update_batch(rmses)
+        for (cur_stats, _, label_index, attack_pkt_num_cntr_dp), rmse \
+                in zip(self.train_batch, rmses.tolist()):
+            self.eval_packet(cur_stats, rmse, label_index, attack_pkt_num_cntr_dp)
+        self.train_batch = []
+
+    # Stats of the next packet (as FCKitNET.process), None if skipped (training phase sampling).
+    # The packets are processed by the FC in blocks, up to the count packets left in the phase.
+    def fc_process(self, phase, count):
+        rows, hdrs, stats, skip = self.fc_block
+        if self.fc_block_pos == len(rows):
+            count = min(FC_BATCH, count)
+            skip = None
+            if phase == 'training' and self.train_sampl:
+                pkt_num = self.rmse_cnt + self.train_skip_pkt + 1
+                skip = (np.arange(pkt_num, pkt_num + count) % self.sampl != 0).tolist()
+            rows, hdrs, stats = self.fc.process_batch(
+                self.fc.global_pkt_index, count, phase, skip)
+            rows = rows.tolist()
+            hdrs = list(zip(*[hdrs[name].tolist() for name in BATCH_HDRS]))
+            stats = stats.tolist()
+            self.fc_block = [rows, hdrs, stats, skip]
+            self.fc_block_pos = 0
+
+        pos = self.fc_block_pos
+        self.fc_block_pos += 1
+        if skip is not None and skip[pos]:
+            return None
+        if rows[pos] == -1:
+            return -1
+        return [list(hdrs[rows[pos]]), stats[rows[pos]]]
+
     def update_stats(self, cur_stats):
         cur_decay_pos = self.decay_to_pos[cur_stats[7]]
 
@@ -312,86 +490,27 @@ class PipelineKitNET:
         return input_stats
 
     def save_train_stats(self):
-        train_stats = [
-            self.stats_mac_ip_src,
-            self.stats_ip_src,
-            self.stats_ip,
-            self.stats_five_t,
-            self.fc.fc_mac_ip_src,
-            self.fc.fc_ip_src,
-            self.fc.fc_ip,
-            self.fc.fc_five_t,
-            self.fc.ip_res,
-            self.fc.ip_res_sum,
-            self.fc.five_t_res,
-            self.fc.five_t_res_sum]
+        cp_stats = {
+            'stats_mac_ip_src': self.stats_mac_ip_src,
+            'stats_ip_src': self.stats_ip_src,
+            'stats_ip': self.stats_ip,
+            'stats_five_t': self.stats_five_t}
 
         outdir = str(Path(__file__).parents[0]) + '/plugins/KitNET/models'
         if not os.path.exists(str(Path(__file__).parents[0]) + '/plugins/KitNET/models'):
             os.mkdir(outdir)
 
-        with open(outdir + '/' + self.attack + '-m-' + str(self.m)
-                  + '-r-' + str(self.train_exact_ratio) + '-train-stats'
-                  + '.txt', 'wb') as f_stats:
-            pickle.dump(train_stats, f_stats)
+        save_train_stats(outdir + '/' + self.attack + '-m-' + str(self.m)
+                         + '-r-' + str(self.train_exact_ratio) + '-train-stats',
+                         cp_stats, register_arrays(self.fc.regs))
 
+        # The spatial model is derived from the trained model (see export_spatial.py).
         if self.save_spatial:
-            outdir_params = f'{Path(__file__).parents[0]}/plugins/KitNET/models/spatial/{self.attack}'\
-                            f'-m-{self.m}-r-{self.train_exact_ratio}/params'
-            if not os.path.exists(outdir_params):
-                os.makedirs(outdir_params)
-            outdir_norms = f'{Path(__file__).parents[0]}/plugins/KitNET/models/spatial/{self.attack}'\
-                        f'-m-{self.m}-r-{self.train_exact_ratio}/norms'
-            if not os.path.exists(outdir_norms):
-                os.makedirs(outdir_norms)
-            outdir_maps = f'{Path(__file__).parents[0]}/plugins/KitNET/models/spatial/{self.attack}'\
-                        f'-m-{self.m}-r-{self.train_exact_ratio}/maps'
-            if not os.path.exists(outdir_maps):
-                os.makedirs(outdir_maps)
-
-            for i in range(len(self.kitnet.ensembleLayer)):
-                pd.DataFrame(self.kitnet.ensembleLayer[i].W).to_csv(
-                    f'{outdir_params}/L{i}_W.csv', header=False, index=False)
-                pd.DataFrame(self.kitnet.ensembleLayer[i].hbias).to_csv(
-                    f'{outdir_params}/L{i}_B1.csv', header=False, index=False)
-                pd.DataFrame(self.kitnet.ensembleLayer[i].vbias).to_csv(
-                    f'{outdir_params}/L{i}_B2.csv', header=False, index=False)
-                pd.DataFrame(self.kitnet.ensembleLayer[i].norm_min).to_csv(
-                    f'{outdir_norms}/L{i}_NORM_MIN.csv', header=False, index=False)
-                pd.DataFrame(self.kitnet.ensembleLayer[i].norm_max).to_csv(
-                    f'{outdir_norms}/L{i}_NORM_MAX.csv', header=False, index=False)
-
-            pd.DataFrame(self.kitnet.outputLayer.W).to_csv(
-                f'{outdir_params}/OUTL_W.csv', header=False, index=False)
-            pd.DataFrame(self.kitnet.outputLayer.hbias).to_csv(
-                f'{outdir_params}/OUTL_B1.csv', header=False, index=False)
-            pd.DataFrame(self.kitnet.outputLayer.vbias).to_csv(
-                f'{outdir_params}/OUTL_B2.csv', header=False, index=False)
-            pd.DataFrame(self.kitnet.outputLayer.norm_min).to_csv(
-                f'{outdir_norms}/OUTL_NORM_MIN.csv', header=False, index=False)
-            pd.DataFrame(self.kitnet.outputLayer.norm_max).to_csv(
-                f'{outdir_norms}/OUTL_NORM_MAX.csv', header=False, index=False)
-
-            for i in range(len(self.kitnet.v)):
-                pd.DataFrame(self.kitnet.v[i]).T.to_csv(
-                    f'{outdir_maps}/L{i}_MAP.csv', header=False, index=False)
-                pd.DataFrame([len(self.kitnet.v[i]),
-                            int(np.ceil(len(self.kitnet.v[i])*0.75))]).T.to_csv(
-                                f'{outdir_maps}/L{i}_NEURONS.csv', header=False, index=False)
-
-            pd.DataFrame([len(self.kitnet.v)]).T.to_csv(
-                f'{outdir_maps}/N_LAYERS.csv', header=False, index=False)
-
-    def update_stats_global(self):
-        outdir = f'{Path(__file__).parents[0]}/eval/kitnet'
-        if not os.path.exists(f'{Path(__file__).parents[0]}/eval/kitnet'):
-            os.makedirs(outdir, exist_ok=True)
-        outpath_stats_global = os.path.join(
-            outdir, f'{self.attack}-{self.sampl}-stats.csv')
-        df_stats_global = pd.DataFrame(self.stats_global)
-        df_stats_global.to_csv(outpath_stats_global, mode='a', chunksize=10000,
-                               index=None, header=False)
-        self.stats_global = []
+            export_spatial(
+                f'{Path(__file__).parents[0]}/plugins/KitNET/models/spatial/{self.attack}'
+                f'-m-{self.m}-r-{self.train_exact_ratio}',
+                self.kitnet.v, self.kitnet.ensembleLayer, self.kitnet.outputLayer,
+                self.kitnet.inference_mode)
 
     def reset_stats(self):
         print('Reset stats')
@@ -0,0 +1,59 @@
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from .FusedEnsemble import FusedEnsemble
+
+# Smallest batch evaluated by the workers: smaller batches are not worth the scheduling overhead.
+MIN_BATCH = 64
+
+
+# A thread pool evaluating the autoencoders of the KitNET ensemble layer concurrently, for batches
+# of instances (NumPy releases the GIL in the BLAS calls, so the workers run in parallel).
+# The ensemble is partitioned between the workers by autoencoder size, so that they are balanced.
+# n_workers: the number of worker threads
+class EnsembleWorkers:
+    def __init__(self, n_workers):
+        self.n_workers = n_workers
+        self.pool = ThreadPoolExecutor(max_workers=n_workers)
+        self.parts = []  # compiled partitions: (autoencoder indices, FusedEnsemble)
+
+    # partitions the autoencoders in (at most) n_workers groups of similar cost (visible x hidden units),
+    # assigning each autoencoder, from the largest, to the least loaded group
+    def partition(self, ensemble_layer):
+        cost = [da.params.n_visible * da.params.n_hidden for da in ensemble_layer]
+        parts = [[] for _ in range(min(self.n_workers, len(ensemble_layer)))]
+        load = np.zeros(len(parts))
+        for a in sorted(range(len(ensemble_layer)), key=lambda a: -cost[a]):
+            i = int(np.argmin(load))
+            parts[i].append(a)
+            load[i] += cost[a]
+        return [sorted(part) for part in parts]
+
+    # compiles each partition of the (trained) ensemble layer, for execute_batch
+    def compile(self, v, ensemble_layer):
+        self.parts = []
+        for part in self.partition(ensemble_layer):
+            self.parts.append((part, FusedEnsemble([v[a] for a in part],
+                                                   [ensemble_layer[a] for a in part])))
+
+    # returns the RMSE of each autoencoder for each row of X (a (B, n) array), as a (B, n_ae) array
+    def execute_batch(self, X):
+        S = np.empty((X.shape[0], sum(len(part) for part, _ in self.parts)))
+        for part, S_part in zip([part for part, _ in self.parts],
+                                self.pool.map(lambda p: p[1].execute_batch(X), self.parts)):
+            S[:, part] = S_part
+        return S
+
+    # mini-batch training of each autoencoder on X (a (B, n) array), see DA.train_batch
+    # returns the training RMSE of each autoencoder for each row of X, as a (B, n_ae) array
+    def train_batch(self, v, ensemble_layer, X):
+        S = np.empty((X.shape[0], len(ensemble_layer)))
+
+        def train_part(part):
+            for a in part:
+                S[:, a] = ensemble_layer[a].train_batch(X[:, v[a]])
+
+        list(self.pool.map(train_part, self.partition(ensemble_layer)))
+        return S
+
+    def close(self):
+        self.pool.shutdown()
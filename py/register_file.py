@@ -0,0 +1,113 @@
+import numpy as np
+
+# Number of register slots per flow key (4 decay counters x 8192 hash values),
+# mirroring REG_SIZE in p4/tna/includes/constants.p4.
+REG_SIZE = 32768
+
+
+#
+# Preallocated register array, mirroring a data plane register, with a validity bitmap
+# marking the slots already initialized by a flow.
+#
+# Values are float64 by default. The per-packet path accesses single cells through
+# memoryviews (cells, valid_bits), which read/write python floats and bools in place,
+# without any allocation.
+# Registers whose values can grow past 2^53 (float64 would round them) are object arrays
+# of python ints instead; their cells are then the array itself.
+#
+class RegisterFile:
+    def __init__(self, shape, size=REG_SIZE, dtype=np.float64):
+        self.array = np.zeros((size,) + tuple(shape), dtype=dtype)
+        self.valid = np.zeros(size, dtype=np.bool_)
+        self.__bind__()
+
+    def __bind__(self):
+        if self.array.dtype == object:
+            self.cells = self.array
+        else:
+            self.cells = memoryview(self.array)
+        self.valid_bits = memoryview(self.valid)
+
+    # Register file backed by existing arrays (e.g., loaded from a snapshot).
+    @staticmethod
+    def wrap(array, valid):
+        reg = RegisterFile.__new__(RegisterFile)
+        reg.__setstate__({'array': array, 'valid': valid})
+        return reg
+
+    # (Re)initialize a slot, when a new flow ID is seen.
+    def reset(self, index):
+        self.array[index] = 0
+        self.valid[index] = True
+
+    # Memoryviews can not be pickled.
+    def __getstate__(self):
+        return {'array': self.array, 'valid': self.valid}
+
+    def __setstate__(self, state):
+        self.array = state['array']
+        self.valid = state['valid']
+        self.__bind__()
+
+
+# Register files of the FC flow keys.
+def flow_registers():
+    return {
+        # Timestamp row (one per decay counter), then one stats row per decay counter:
+        # pkt count, pkt length, pkt length squared.
+        'fc_mac_ip_src': RegisterFile((5, 4)),
+        'fc_ip_src': RegisterFile((5, 4)),
+        # As above, plus the counters shared with the reverse flow:
+        # pkt count, pkt length squared, mean.
+        'fc_ip': RegisterFile((5, 6)),
+        'fc_five_t': RegisterFile((5, 6)),
+        # Residues per decay counter.
+        'ip_res': RegisterFile((4,)),
+        'five_t_res': RegisterFile((4,)),
+        # Sum of residual products per decay counter (indexed 1-4), and their timestamps.
+        # The sums of the heavy bidirectional flows go past 2^53: they are python ints.
+        'ip_res_sum': RegisterFile((5,), dtype=object),
+        'ip_res_sum_ts': RegisterFile((4,)),
+        'five_t_res_sum': RegisterFile((5,), dtype=object),
+        'five_t_res_sum_ts': RegisterFile((4,))}
+
+
+# Flat named arrays of the register files, for the train stats snapshots.
+def register_arrays(regs):
+    arrays = {}
+    for name, reg in regs.items():
+        arrays[name] = reg.array
+        arrays[f'{name}.valid'] = reg.valid
+    return arrays
+
+
+def registers_from_arrays(arrays):
+    return {name: RegisterFile.wrap(array, arrays[f'{name}.valid'])
+            for name, array in arrays.items() if not name.endswith('.valid')}
+
+
+# Converts the dicts of nested lists used by older versions (legacy train stats) to registers.
+def legacy_flow_registers(fc_mac_ip_src, fc_ip_src, fc_ip, fc_five_t,
+                          ip_res, ip_res_sum, five_t_res, five_t_res_sum):
+    regs = flow_registers()
+
+    for name, slots in [('fc_mac_ip_src', fc_mac_ip_src), ('fc_ip_src', fc_ip_src),
+                        ('fc_ip', fc_ip), ('fc_five_t', fc_five_t)]:
+        for index, rows in slots.items():
+            regs[name].valid[index] = True
+            for row, values in enumerate(rows):
+                regs[name].array[index, row, :len(values)] = values
+
+    for name, slots in [('ip_res', ip_res), ('five_t_res', five_t_res)]:
+        for index, values in slots.items():
+            regs[name].valid[index] = True
+            regs[name].array[index] = values
+
+    for name, slots in [('ip_res_sum', ip_res_sum), ('five_t_res_sum', five_t_res_sum)]:
+        for index, values in slots.items():
+            regs[name].valid[index] = True
+            regs[f'{name}_ts'].valid[index] = True
+            regs[f'{name}_ts'].array[index] = values[0]
+            regs[name].array[index, 1:] = values[1:]
+
+    return regs
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+
+# Converts a global stats binary file (save_stats_global, see stats_writer.py) to a csv, one row
+# of stats per packet, as previously saved by the pipeline.
+#
+# Usage:
+#   python3 stats_to_csv.py -i eval/kitnet/<attack>-<sampl>-stats.f32
+
+import os
+import argparse
+import pandas as pd
+from stats_writer import STATS_COLS, load_stats
+
+# Rows converted at a time.
+CONVERT_ROWS = 1 << 16
+
+
+if __name__ == "__main__":
+    argparser = argparse.ArgumentParser(description='Global stats binary file to csv')
+    argparser.add_argument('-i', '--input', type=str, required=True, help='Global stats file')
+    argparser.add_argument('-o', '--output', type=str, default=None,
+                           help='Output csv (default: the input file, with a .csv extension)')
+    argparser.add_argument('-c', '--cols', type=int, default=STATS_COLS, help='Stats per row')
+    args = argparser.parse_args()
+
+    output = args.output if args.output is not None else os.path.splitext(args.input)[0] + '.csv'
+    stats = load_stats(args.input, args.cols)
+    if os.path.exists(output):
+        os.remove(output)
+    for start in range(0, stats.shape[0], CONVERT_ROWS):
+        pd.DataFrame(stats[start:start + CONVERT_ROWS]).to_csv(
+            output, mode='a', index=None, header=False)
+    print(f'{stats.shape[0]} rows converted to {output}')
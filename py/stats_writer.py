@@ -0,0 +1,80 @@
+import queue
+import threading
+import numpy as np
+import pandas as pd
+
+#
+# Background writer of the global stats (save_stats_global): one fixed-width row of STATS_COLS
+# float32 values per packet, appended to a binary file (<attack>-<sampl>-stats.f32).
+#
+# The rows are buffered in chunks of CHUNK_ROWS and each full chunk is written by a background
+# thread, so the pipeline neither formats nor writes the stats itself. The binary file is read
+# with load_stats, or converted to the csv format with stats_to_csv.py.
+#
+
+STATS_COLS = 80
+
+CHUNK_ROWS = 1 << 14
+
+# Full chunks waiting to be written before append blocks.
+MAX_PENDING = 4
+
+
+class StatsWriter:
+    def __init__(self, path, cols=STATS_COLS, chunk_rows=CHUNK_ROWS):
+        self.path = path
+        self.cols = cols
+        self.chunk_rows = chunk_rows
+        self.chunk = np.empty((chunk_rows, cols), dtype=np.float32)
+        self.n = 0  # rows in the current chunk
+        self.rows = 0  # rows handed to the writer thread
+        self.error = None
+
+        self.file = open(path, 'ab')
+        self.queue = queue.Queue(MAX_PENDING)
+        self.thread = threading.Thread(target=self.__write__, daemon=True)
+        self.thread.start()
+
+    def append(self, row):
+        self.chunk[self.n] = row
+        self.n += 1
+        if self.n == self.chunk_rows:
+            self.flush()
+
+    # Hand the current (possibly partial) chunk to the writer thread.
+    def flush(self):
+        if self.n == 0:
+            return
+        self.queue.put(self.chunk[:self.n])
+        self.rows += self.n
+        self.chunk = np.empty((self.chunk_rows, self.cols), dtype=np.float32)
+        self.n = 0
+
+    def close(self):
+        if self.file is None:
+            return
+        self.flush()
+        self.queue.put(None)
+        self.thread.join()
+        self.file.close()
+        self.file = None
+        if self.error is not None:
+            raise self.error
+
+    def __write__(self):
+        while True:
+            chunk = self.queue.get()
+            if chunk is None:
+                return
+            if self.error is None:
+                try:
+                    chunk.tofile(self.file)
+                except OSError as e:
+                    self.error = e
+
+
+# Global stats of a binary file (memory mapped, float32), or of a csv (float64).
+def load_stats(path, cols=STATS_COLS):
+    if path.endswith('.csv'):
+        return pd.read_csv(path, header=None).to_numpy(dtype=np.float64)
+    return np.memmap(path, dtype=np.float32, mode='r').reshape(-1, cols)
@@ -0,0 +1,100 @@
+import numpy as np
+
+#
+# Streaming estimation of the detection threshold from the training phase anomaly scores (RMSE),
+# in constant memory, instead of keeping every score.
+#
+# The threshold is the highest score (running maximum), as in Kitsune, or a quantile of the scores
+# (e.g., 0.99 for a threshold less sensitive to training outliers). The quantile is estimated with
+# the P-square algorithm (Jain and Chlamtac, 1985): 5 markers track the minimum, the quantile, the
+# maximum and two intermediate quantiles, and their heights are adjusted with a piecewise-parabolic
+# interpolation as the scores arrive.
+#
+
+
+class StreamingThreshold:
+    def __init__(self, quantile=None):
+        if quantile is not None and not 0 < quantile < 1:
+            raise ValueError(f'Invalid threshold quantile: {quantile}')
+        self.quantile = quantile
+        self.n = 0  # number of scores so far
+        self.max = 0.0
+
+        if quantile is not None:
+            p = quantile
+            self.heights = []  # marker heights (the first 5 scores, until there are 5)
+            self.pos = [1, 2, 3, 4, 5]  # marker positions
+            self.pos_desired = [1, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5]
+            self.pos_incr = [0, p / 2, p, (1 + p) / 2, 1]
+
+    def update(self, x):
+        x = float(x)
+        self.n += 1
+        if x > self.max:
+            self.max = x
+        if self.quantile is not None:
+            self.__update_quantile__(x)
+
+    def update_batch(self, X):
+        X = np.asarray(X, dtype=np.float64).ravel()
+        if X.size == 0:
+            return
+        if self.quantile is None:
+            self.n += X.size
+            self.max = max(self.max, float(X.max()))
+        else:
+            for x in X.tolist():
+                self.update(x)
+
+    def threshold(self):
+        if self.quantile is None:
+            return self.max
+        return self.estimate()
+
+    # Current estimate of the quantile.
+    def estimate(self):
+        if self.n == 0:
+            return 0.0
+        if self.n < 5:
+            heights = sorted(self.heights)
+            return heights[int(round(self.quantile * (len(heights) - 1)))]
+        return self.heights[2]
+
+    def __update_quantile__(self, x):
+        q = self.heights
+        if self.n <= 5:
+            q.append(x)
+            if self.n == 5:
+                q.sort()
+            return
+
+        # Find the cell k of x, extending the extreme markers if needed.
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= q[k + 1]:
+                k += 1
+
+        n = self.pos
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self.pos_desired[i] += self.pos_incr[i]
+
+        # Adjust the heights of the middle markers, if off their desired positions.
+        for i in range(1, 4):
+            d = self.pos_desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                h = q[i] + d / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1]))
+                if not q[i - 1] < h < q[i + 1]:
+                    h = q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+                q[i] = h
+                n[i] += d
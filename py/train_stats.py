@@ -0,0 +1,101 @@
+import os
+import json
+import pickle
+import shutil
+import numpy as np
+
+#
+# On-disk snapshot of the stats at the end of the training phase.
+#
+# A snapshot is a directory with a small json header and one .npy file per array:
+#   - the control plane stats dicts (flow key -> stats vector), as a keys and a values array;
+#   - any other named arrays (e.g., the FC registers).
+# Arrays are loaded as copy-on-write memmaps, so loading a snapshot reads almost nothing
+# from disk, and the execution phase can still update the loaded stats in place
+# (except the object arrays, which are loaded in memory).
+#
+# Snapshots saved by older versions (a pickled list) can still be loaded.
+#
+
+SNAPSHOT_FORMAT = 'peregrine-train-stats'
+SNAPSHOT_VERSION = 1
+
+# Control plane stats dicts, in the order of the legacy pickled list.
+CP_STATS = ['stats_mac_ip_src', 'stats_ip_src', 'stats_ip', 'stats_five_t']
+
+
+def save_train_stats(path, cp_stats, arrays=None):
+    arrays = {} if arrays is None else arrays
+    header = {
+        'format': SNAPSHOT_FORMAT,
+        'version': SNAPSHOT_VERSION,
+        'cp_stats': {},
+        'arrays': {}}
+
+    # Write to a temporary directory first, so an interrupted save is never loaded.
+    tmp_path = path + '.tmp'
+    if os.path.exists(tmp_path):
+        shutil.rmtree(tmp_path)
+    os.makedirs(tmp_path)
+
+    for name in CP_STATS:
+        stats = cp_stats[name]
+        keys = np.array(list(stats.keys()), dtype=str)
+        if stats:
+            values = np.stack(list(stats.values()))
+        else:
+            values = np.zeros((0, 0))
+        np.save(os.path.join(tmp_path, f'{name}.keys.npy'), keys)
+        np.save(os.path.join(tmp_path, f'{name}.values.npy'), values)
+        header['cp_stats'][name] = {'n_keys': len(keys), 'width': values.shape[1]}
+
+    for name, array in arrays.items():
+        np.save(os.path.join(tmp_path, f'{name}.npy'), array)
+        header['arrays'][name] = {'dtype': array.dtype.str, 'shape': list(array.shape)}
+
+    with open(os.path.join(tmp_path, 'header.json'), 'w') as f:
+        json.dump(header, f, indent=4)
+
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+    elif os.path.isfile(path):
+        os.remove(path)
+    os.rename(tmp_path, path)
+
+
+# Returns a dict with the control plane stats dicts ('cp_stats', only if cp_stats is set)
+# and the named arrays ('arrays').
+# For a legacy pickled snapshot, the items following the control plane stats are
+# returned as-is ('legacy').
+def load_train_stats(path, cp_stats=True):
+    if os.path.isfile(path):
+        with open(path, 'rb') as f_stats:
+            stats = pickle.load(f_stats)
+        snapshot = {'legacy': stats[len(CP_STATS):]}
+        if cp_stats:
+            snapshot['cp_stats'] = dict(zip(CP_STATS, stats[:len(CP_STATS)]))
+        return snapshot
+
+    with open(os.path.join(path, 'header.json'), 'r') as f:
+        header = json.load(f)
+    if header.get('format') != SNAPSHOT_FORMAT or header.get('version') != SNAPSHOT_VERSION:
+        raise ValueError(f'Unsupported train stats snapshot: {path}')
+
+    snapshot = {'arrays': {}}
+    for name, spec in header['arrays'].items():
+        file_path = os.path.join(path, f'{name}.npy')
+        # Object arrays (python ints) are pickled, and can not be memmapped.
+        if spec['dtype'] == '|O':
+            snapshot['arrays'][name] = np.load(file_path, allow_pickle=True)
+        else:
+            snapshot['arrays'][name] = np.load(file_path, mmap_mode='c')
+
+    if cp_stats:
+        snapshot['cp_stats'] = {}
+        for name in CP_STATS:
+            keys = np.load(os.path.join(path, f'{name}.keys.npy'))
+            values = np.asarray(np.load(os.path.join(path, f'{name}.values.npy'), mmap_mode='c'))
+            # Each stats vector is a view on the (copy-on-write) values array.
+            snapshot['cp_stats'][name] = dict(zip(keys.tolist(), values))
+
+    return snapshot
@@ -0,0 +1,131 @@
+import sys
+import struct
+import importlib.util
+from pathlib import Path
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).parents[1]
+
+
+# Loads a module of the repo from its path (e.g., py/hash_engine.py), under a name of its own: the
+# shared modules are duplicated in py/ and controller/, and both copies are tested. Its sibling
+# modules are imported from its own directory.
+def load_module(path):
+    path = ROOT / path
+    modules = set(sys.modules)
+    sys.path.insert(0, str(path.parent))
+    try:
+        spec = importlib.util.spec_from_file_location(
+            '_'.join(path.relative_to(ROOT).with_suffix('').parts), path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    finally:
+        sys.path.remove(str(path.parent))
+        for name in set(sys.modules) - modules:
+            if Path(getattr(sys.modules[name], '__file__', None) or '/').parent == path.parent:
+                del sys.modules[name]
+    return module
+
+
+# Loads a package of the repo from its directory (e.g., py/plugins/KitNET), under a name of its own,
+# with its submodules (relative imports).
+def load_package(path):
+    path = ROOT / path
+    name = '_'.join(path.relative_to(ROOT).parts)
+    spec = importlib.util.spec_from_file_location(name, path / '__init__.py',
+                                                  submodule_search_locations=[str(path)])
+    package = importlib.util.module_from_spec(spec)
+    sys.modules[name] = package
+    spec.loader.exec_module(package)
+    return package
+
+
+@pytest.fixture(params=['py', 'controller'])
+def copy_dir(request):
+    return request.param
+
+
+# Imports the modules of py/ by their own names, as the pipeline does (e.g., for the FC worker
+# processes, which are sent their functions by name). They are removed afterwards.
+@pytest.fixture
+def import_py(monkeypatch):
+    modules = set(sys.modules)
+    monkeypatch.syspath_prepend(str(ROOT / 'py'))
+    yield importlib.import_module
+    for name in set(sys.modules) - modules:
+        if Path(getattr(sys.modules[name], '__file__', None) or '/').parent == ROOT / 'py':
+            del sys.modules[name]
+
+
+# Writes an Ethernet pcap of the given packets, as (ts, ip_src, ip_dst, ip_proto, port_src,
+# port_dst, ip_len) tuples (IPs as ints, the MACs are derived from them), or None for a
+# non-IP (ARP) frame. Only the headers are captured, so any IP length can be set.
+def write_pcap(path, pkts):
+    with open(path, 'wb') as f:
+        f.write(struct.pack('<IHHiIII', 0xa1b2c3d4, 2, 4, 0, 0, 65535, 1))
+        ts = 0
+        for pkt in pkts:
+            if pkt is None:
+                frame = b'\xff' * 6 + b'\x02' * 6 + struct.pack('!H', 0x0806) + bytes(28)
+            else:
+                ts, ip_src, ip_dst, ip_proto, port_src, port_dst, ip_len = pkt
+                frame = struct.pack('!HI', 2, ip_dst) + struct.pack('!HI', 2, ip_src) \
+                    + struct.pack('!H', 0x0800) \
+                    + struct.pack('!BBHHHBBHII', 0x45, 0, ip_len, 0, 0, 64, ip_proto, 0,
+                                  ip_src, ip_dst)
+                if ip_proto == 6:
+                    frame += struct.pack('!HHIIBBHHH', port_src, port_dst, 0, 0, 0x50, 0x10,
+                                         0, 0, 0)
+                else:
+                    frame += struct.pack('!HHHH', port_src, port_dst, max(ip_len - 20, 8), 0)
+            sec, usec = divmod(round(ts * 1e6), 1000000)
+            f.write(struct.pack('<IIII', sec, usec, len(frame),
+                                len(frame) if pkt is None else ip_len + 14))
+            f.write(frame)
+
+
+# Synthetic trace of n packets: heavy bidirectional flows of large packets (their sums of
+# residual products go past 2^53), short flows, gaps long enough to decay the first decay
+# counters, and a few non-IP frames.
+# Bursts of tiny packets between hosts whose IP pair has the same IP xor hash as the heaviest
+# flow (it only depends on ip_src ^ ip_dst, as the CRC is linear) add residual products with
+# low bits set to its large sums. Each packet of a burst is sent 4 times in a row, once per
+# decay counter value.
+def synthetic_trace(path, n, seed=0):
+    rng = np.random.RandomState(seed)
+    hosts = [0x0a000001 + i for i in range(8)]
+    heavy = [(hosts[0], hosts[1], 17, 5000, 53), (hosts[2], hosts[3], 6, 40000, 443)]
+    colliders = [(0x0a000100 + 4 * i, 0x0a000103 + 4 * i) for i in range(4)]
+    bursts = [int(n * x) for x in [0.5, 0.6, 0.75, 0.9]]
+
+    pkts = []
+    ts = 1600000000.0
+    while len(pkts) < n:
+        ts += rng.choice([0.001, 0.02, 0.3, 1.5], p=[0.85, 0.12, 0.02, 0.01])
+        if bursts and len(pkts) >= bursts[0]:
+            bursts.pop(0)
+            ip_src, ip_dst = colliders.pop(0)
+            for src, dst, ip_len in [(ip_dst, ip_src, 1), (ip_dst, ip_src, 1),
+                                     (ip_src, ip_dst, 3), (ip_src, ip_dst, 2)]:
+                pkts += [(ts, src, dst, 17, 7, 7, ip_len)] * 4
+            continue
+
+        kind = rng.randint(10)
+        if kind == 0:
+            pkts.append(None)
+            continue
+        if kind < 7:
+            ip_src, ip_dst, ip_proto, port_src, port_dst = heavy[kind % 2]
+            ip_len = rng.randint(30000, 65536)
+        else:
+            ip_src, ip_dst = rng.choice(hosts, 2, replace=False).tolist()
+            ip_proto = [6, 17][rng.randint(2)]
+            port_src, port_dst = rng.randint(1024, 1040, 2).tolist()
+            ip_len = rng.randint(40, 1500)
+        if rng.randint(2):
+            ip_src, ip_dst, port_src, port_dst = ip_dst, ip_src, port_dst, port_src
+        pkts.append((ts, ip_src, ip_dst, ip_proto, port_src, port_dst, ip_len))
+
+    write_pcap(path, pkts[:n])
+    return path
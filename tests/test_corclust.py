@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+from conftest import load_module
+
+CORCLUST = {'py': 'py/plugins/KitNET/CorClust.py', 'controller': 'controller/KitNET/CorClust.py'}
+
+
+@pytest.fixture
+def corclust(copy_dir):
+    return load_module(CORCLUST[copy_dir])
+
+
+def random_stats(seed, rows=3000, n=40):
+    rng = np.random.default_rng(seed)
+    # correlated features of different scales, as the stats of a trace
+    X = rng.normal(size=(rows, n // 4)) @ rng.normal(size=(n // 4, n))
+    return X * rng.uniform(1, 1e4, size=n) + rng.uniform(0, 1e3, size=n)
+
+
+@pytest.mark.parametrize('seed', range(3))
+@pytest.mark.parametrize('batch', [1, 7, 256, 1024])
+def test_update_batch_matches_update(corclust, seed, batch):
+    X = random_stats(seed)
+    sequential = corclust.CorClust(X.shape[1])
+    for x in X:
+        sequential.update(x)
+    batched = corclust.CorClust(X.shape[1])
+    for start in range(0, len(X), batch):
+        batched.update_batch(X[start:start + batch])
+
+    assert batched.N == sequential.N
+    for name in ['c', 'c_r', 'c_rs', 'C']:
+        np.testing.assert_allclose(getattr(batched, name), getattr(sequential, name),
+                                   rtol=1e-9, atol=1e-9 * np.abs(getattr(sequential, name)).max())
+    np.testing.assert_allclose(batched.corr_dist(), sequential.corr_dist(), rtol=1e-9, atol=1e-12)
+    assert batched.cluster(10) == sequential.cluster(10)
@@ -0,0 +1,264 @@
+import numpy as np
+import pytest
+from math import log
+from conftest import load_module, synthetic_trace
+
+# Decay interval of each decay counter value.
+DECAY_INTERVALS = [0.1, 1, 10, 60]
+
+
+def pow_2(n):
+    if n > 1:
+        return int(log(n, 2))
+    else:
+        return 0
+
+
+#
+# Reference FC, as implemented before the register files: dicts of nested lists (flow slot
+# -> values), updated as by FCKitNET.process (approximate stats).
+#
+class DictFC:
+    def __init__(self, sqr, sqrt_mu):
+        self.sqr = sqr
+        self.sqrt_mu = sqrt_mu
+        self.fc = {'mac_ip_src': {}, 'ip_src': {}, 'ip': {}, 'five_t': {}}
+        self.res = {'ip': {}, 'five_t': {}}
+        self.res_sum = {'ip': {}, 'five_t': {}}
+
+    # Returns the decay factor (1 for a new flow).
+    def decay_check(self, fc, h, d, ts, pkt_len, width, res_sum_ts=None):
+        if h not in fc:
+            fc[h] = [[0, 0, 0, 0]] + [[0] * width for _ in range(4)]
+            fc[h][0][d-1] = ts
+            fc[h][d] = [1, pkt_len, self.sqr.compute(pkt_len)] + [0] * (width - 3)
+            return 1
+
+        ts_rows = [fc[h][0]] + ([res_sum_ts] if res_sum_ts is not None else [])
+        decay = 1
+        if fc[h][0][d-1] and ts - fc[h][0][d-1] > DECAY_INTERVALS[d-1]:
+            decay = 0.5
+            for row in ts_rows:
+                row[d-1] += DECAY_INTERVALS[d-1]
+        else:
+            for row in ts_rows:
+                row[d-1] = ts
+
+        fc[h][d][0] = int(decay * fc[h][d][0] + 1)
+        if decay == 1:
+            fc[h][d][1] = int(fc[h][d][1] + pkt_len)
+            fc[h][d][2] = int(fc[h][d][2] + self.sqr.compute(pkt_len))
+        else:
+            fc[h][d][1] = int(decay * fc[h][d][1])
+            fc[h][d][2] = int(decay * fc[h][d][2])
+        return decay
+
+    def stats_1d(self, pkt_cnt, pkt_len, pkt_len_sqr):
+        mean = pkt_len >> pow_2(pkt_cnt)
+        variance = abs((pkt_len_sqr >> pow_2(pkt_cnt)) - self.sqr.compute(mean))
+        return mean, int(self.sqrt_mu.compute(variance)), variance
+
+    # Stats of a packet, with its decay counter and hashes (decay counter offset included).
+    def process(self, d, hashes, ts, pkt_len, write, read):
+        stats = [d]
+
+        for name, h in zip(['mac_ip_src', 'ip_src'], hashes[:2]):
+            fc = self.fc[name]
+            self.decay_check(fc, h, d, ts, pkt_len, 3)
+            pkt_cnt, length, length_sqr = map(int, fc[h][d])
+            stats += [pkt_cnt] + list(self.stats_1d(pkt_cnt, length, length_sqr))[:2]
+
+        for name, (h_0, h_1, h_xor) in zip(['ip', 'five_t'], [hashes[2:5], hashes[5:8]]):
+            fc = self.fc[name]
+            res = self.res[name]
+            res_sum = self.res_sum[name]
+            res.setdefault(h_0, [0, 0, 0, 0])
+            res_sum.setdefault(h_xor, [[0, 0, 0, 0], 0, 0, 0, 0])
+
+            decay = self.decay_check(fc, h_0, d, ts, pkt_len, 6, res_sum[h_xor][0])
+            if decay != 1:
+                res_sum[h_xor][d] = int(decay * res_sum[h_xor][d])
+
+            pkt_cnt_0, length, length_sqr = map(int, fc[h_0][d][:3])
+            mean_0, std_dev_0, variance_0 = self.stats_1d(pkt_cnt_0, length, length_sqr)
+
+            res_0 = length - mean_0
+            res[h_0][d-1] = res_0
+            res_1 = res[h_1][d-1] if h_1 in fc else 0
+            if res_1 != 0 and decay == 1:
+                res_sum[h_xor][d] += res_0 << pow_2(res_1)
+
+            if write:
+                fc[h_0][d][3:] = [pkt_cnt_0, length_sqr, mean_0]
+            stats += [pkt_cnt_0, mean_0, std_dev_0]
+
+            if not read:
+                stats += [0, 0, 0, 0]
+                continue
+            pkt_cnt_1, length_sqr_1, mean_1 = fc[h_1][d][3:] if h_1 in fc else [0, 0, 0]
+            variance_1 = abs((length_sqr_1 >> pow_2(pkt_cnt_1)) - self.sqr.compute(mean_1))
+            std_dev_1 = self.sqrt_mu.compute(variance_1)
+            magnitude = self.sqrt_mu.compute(self.sqr.compute(mean_0) + self.sqr.compute(mean_1))
+            radius = self.sqrt_mu.compute(self.sqr.compute(variance_0) +
+                                          self.sqr.compute(variance_1))
+            cov = res_sum[h_xor][d] >> pow_2(pkt_cnt_0 + pkt_cnt_1)
+            shift = pow_2(std_dev_0 << pow_2(std_dev_1))
+            pcc = cov >> shift if pow_2(std_dev_1) != 0 and shift != 0 else 0
+            stats += [int(magnitude), int(radius), cov, pcc]
+
+        return stats
+
+    # Register files of the dicts (see register_file.legacy_flow_registers).
+    def registers(self, register_file):
+        return register_file.legacy_flow_registers(
+            self.fc['mac_ip_src'], self.fc['ip_src'], self.fc['ip'], self.fc['five_t'],
+            self.res['ip'], self.res_sum['ip'], self.res['five_t'], self.res_sum['five_t'])
+
+
+# Stats of all packets of the trace (None if not IPv4) through DictFC, with the decay counter
+# and sampling bookkeeping of FCKitNET.feature_extract/process.
+def reference_stats(ref, pkts, pkt_hashes, train_pkts, sampling_rate):
+    decay_cntr = 0
+    phase_pkt_index = 0
+    sampl_pkt_index = 0
+    stats = []
+    for i in range(len(pkts['ts'])):
+        if i == train_pkts:
+            decay_cntr = 1
+            phase_pkt_index = 0
+        phase_pkt_index += 1
+        if not pkts['ipv4'][i]:
+            stats.append(None)
+            continue
+
+        training = i < train_pkts or sampling_rate == 1
+        if training or sampl_pkt_index < sampling_rate:
+            decay_cntr = decay_cntr % 4 + 1
+            if not training:
+                sampl_pkt_index += 1
+        else:
+            sampl_pkt_index = 1
+        read = training or phase_pkt_index % sampling_rate == 0
+
+        hashes = [h + 8192 * (decay_cntr - 1) for h in pkt_hashes[i].tolist()]
+        stats.append(ref.process(decay_cntr, hashes, pkts['ts'].item(i),
+                                 pkts['pkt_len'].item(i), training or not read, read))
+    return stats
+
+
+def phase(i, train_pkts):
+    return 'training' if i < train_pkts else 'execution'
+
+
+def process_stats(fc, train_pkts):
+    stats = []
+    for i in range(fc.trace_size()):
+        fc.feature_extract()
+        out = fc.process(phase(i, train_pkts))
+        stats.append(None if out == -1 else out[1])
+    return stats
+
+
+# Blocks of block_size packets, in the phase of their first packet.
+def process_batch_stats(fc, train_pkts, block_size):
+    stats = []
+    start = 0
+    while start < fc.trace_size():
+        end = min(start + block_size, fc.trace_size())
+        rows, _, block = fc.process_batch(start, end - start, phase(start, train_pkts))
+        stats += [None if row < 0 else block[row].tolist() for row in rows]
+        start = end
+    return stats
+
+
+def assert_registers_equal(regs, ref_regs):
+    assert regs.keys() == ref_regs.keys()
+    for name, reg in regs.items():
+        # exact comparison, also for the python int registers
+        assert reg.array.dtype == ref_regs[name].array.dtype
+        assert (reg.array == ref_regs[name].array).all(), name
+        # only the flow registers track the validity of their slots
+        if name.startswith('fc_'):
+            np.testing.assert_array_equal(reg.valid, ref_regs[name].valid)
+
+
+N_PKTS = 12000
+TRAIN_PKTS = 7000
+
+
+@pytest.fixture(scope='module')
+def trace(tmp_path_factory):
+    return str(synthetic_trace(tmp_path_factory.mktemp('trace') / 'trace.pcap', N_PKTS))
+
+
+@pytest.mark.parametrize('sampling_rate', [1, 3])
+@pytest.mark.parametrize('batch', [False, True])
+def test_fc_matches_dict_registers(trace, sampling_rate, batch):
+    fc_kitnet = load_module('py/fc_kitnet.py')
+    register_file = load_module('py/register_file.py')
+    fc = fc_kitnet.FCKitNET(trace, sampling_rate, TRAIN_PKTS, 0, False, None)
+
+    ref = DictFC(fc_kitnet.sqr, fc_kitnet.sqrt_mu)
+    expected = reference_stats(ref, fc.pkts, fc.pkt_hashes, TRAIN_PKTS, sampling_rate)
+
+    if batch:
+        stats = process_batch_stats(fc, TRAIN_PKTS, 1024)
+    else:
+        stats = process_stats(fc, TRAIN_PKTS)
+
+    # the sums of residual products overflow the float64 mantissa
+    assert max(max(values[1:]) for values in ref.res_sum['ip'].values()) > 1 << 53
+
+    assert stats == expected
+    assert_registers_equal(fc.regs, ref.registers(register_file))
+
+
+@pytest.mark.parametrize('sampling_rate', [1, 3, 4])
+def test_process_batch_matches_process(trace, sampling_rate):
+    fc_kitnet = load_module('py/fc_kitnet.py')
+    fc = fc_kitnet.FCKitNET(trace, sampling_rate, TRAIN_PKTS, 0, False, None)
+    expected = process_stats(fc, TRAIN_PKTS)
+    expected_regs = fc.regs
+
+    # the end of the training phase falls at the start of a block (7), or inside one
+    for block_size in [7, 97, 1024, 4096]:
+        fc = fc_kitnet.FCKitNET(trace, sampling_rate, TRAIN_PKTS, 0, False, None)
+        assert process_batch_stats(fc, TRAIN_PKTS, block_size) == expected, block_size
+        assert_registers_equal(fc.regs, expected_regs)
+
+
+@pytest.mark.parametrize('sampling_rate', [1, 3])
+def test_process_batch_workers(import_py, trace, sampling_rate):
+    fc_kitnet = import_py('fc_kitnet')
+    fc = fc_kitnet.FCKitNET(trace, sampling_rate, TRAIN_PKTS, 0, False, None)
+    expected = process_batch_stats(fc, TRAIN_PKTS, 1024)
+    expected_regs = fc.regs
+
+    fc = fc_kitnet.FCKitNET(trace, sampling_rate, TRAIN_PKTS, 0, False, None)
+    fc.start_workers(2)
+    try:
+        stats = process_batch_stats(fc, TRAIN_PKTS, 1024)
+    finally:
+        fc.stop_workers()
+
+    assert stats == expected
+    assert_registers_equal(fc.regs, expected_regs)
+
+
+def test_register_snapshot(tmp_path):
+    register_file = load_module('py/register_file.py')
+    train_stats = load_module('py/train_stats.py')
+    regs = register_file.flow_registers()
+    regs['ip_res_sum'].reset(5)
+    regs['ip_res_sum'].array[5, 2] = (1 << 70) + 1
+    regs['fc_ip'].reset(5)
+    regs['fc_ip'].array[5, 1] = [3, 1500, 2250000, 2, 2250000, 1500]
+
+    path = str(tmp_path / 'stats')
+    train_stats.save_train_stats(path, {name: {} for name in train_stats.CP_STATS},
+                                 register_file.register_arrays(regs))
+    loaded = register_file.registers_from_arrays(
+        train_stats.load_train_stats(path, cp_stats=False)['arrays'])
+
+    assert_registers_equal(loaded, regs)
+    assert loaded['ip_res_sum'].cells[5, 2] == (1 << 70) + 1
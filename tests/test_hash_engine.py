@@ -0,0 +1,138 @@
+import socket
+import struct
+import crcmod
+import numpy as np
+import pytest
+from conftest import load_module
+
+# The CRC16 of the data plane, as computed with crcmod before the hash engine.
+crc16 = crcmod.mkCrcFun(0x18005, rev=True, initCrc=0x0000, xorOut=0x0000)
+
+MAX_MAC = (1 << 48) - 1
+MAX_IP = (1 << 32) - 1
+
+
+@pytest.fixture
+def hash_engine(copy_dir):
+    return load_module(f'{copy_dir}/hash_engine.py')
+
+
+@pytest.fixture
+def trace_cache(copy_dir):
+    return load_module(f'{copy_dir}/trace_cache.py')
+
+
+# Base hash indexes of a packet (FLOW_HASHES order), from its fields formatted as before.
+def crcmod_hashes(mac_src, ip_src, ip_dst, ip_proto, port_src, port_dst):
+    mac_src = mac_src.to_bytes(6, 'big')
+    ip_src = socket.inet_aton(socket.inet_ntoa(struct.pack('!I', ip_src)))
+    ip_dst = socket.inet_aton(socket.inet_ntoa(struct.pack('!I', ip_dst)))
+    ip_proto = struct.pack('!B', ip_proto)
+    port_src = struct.pack('!H', port_src)
+    port_dst = struct.pack('!H', port_dst)
+
+    def crc(*fields):
+        value = crc16(fields[0])
+        for field in fields[1:]:
+            value = crc16(field, value)
+        return value & 0x1fff
+
+    ip_0 = crc(ip_src, ip_dst)
+    ip_1 = crc(ip_dst, ip_src)
+    five_t_0 = crc(ip_src, ip_dst, ip_proto, port_src, port_dst)
+    five_t_1 = crc(ip_dst, ip_src, ip_proto, port_dst, port_src)
+    return [crc(mac_src, ip_src), crc(ip_src), ip_0, ip_1, ip_0 ^ ip_1,
+            five_t_0, five_t_1, five_t_0 ^ five_t_1]
+
+
+def random_keys(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return {
+        'mac_src': rng.integers(0, MAX_MAC, n, endpoint=True, dtype=np.uint64),
+        'ip_src': rng.integers(0, MAX_IP, n, endpoint=True, dtype=np.uint64),
+        'ip_dst': rng.integers(0, MAX_IP, n, endpoint=True, dtype=np.uint64),
+        'ip_proto': rng.choice([1, 6, 17], n).astype(np.uint64),
+        'port_src': rng.integers(0, 65535, n, endpoint=True, dtype=np.uint64),
+        'port_dst': rng.integers(0, 65535, n, endpoint=True, dtype=np.uint64)}
+
+
+# Edge cases: zero and max fields, ICMP (no ports) and both directions of the same flow.
+EDGE_KEYS = [
+    (0, 0, 0, 0, 0, 0),
+    (MAX_MAC, MAX_IP, MAX_IP, 255, 65535, 65535),
+    (0x0123456789ab, 0x0a000001, 0x0a000002, 17, 0, 65535),
+    (0x0123456789ab, 0x0a000002, 0x0a000001, 17, 65535, 0),
+    (0x0123456789ab, 0xc0a80001, 0x08080808, 6, 65535, 65535),
+    (0x0123456789ab, 0x08080808, 0xc0a80001, 6, 65535, 65535),
+    (0xffeeddccbbaa, 0xc0a80001, 0xc0a80002, 1, 0, 0),
+    (0xffeeddccbbaa, 0xc0a80002, 0xc0a80001, 1, 0, 0)]
+
+
+def test_crc16_matches_crcmod(hash_engine):
+    engine = hash_engine.HashEngine()
+    rng = np.random.default_rng(0)
+    for size in [0, 1, 2, 4, 6, 13, 64]:
+        for _ in range(20):
+            data = rng.integers(0, 255, size, endpoint=True, dtype=np.uint8).tobytes()
+            init = int(rng.integers(0, 0xffff, endpoint=True))
+            assert engine.crc16(data) == crc16(data)
+            assert engine.crc16(data, init) == crc16(data, init)
+
+
+@pytest.mark.parametrize('key', EDGE_KEYS)
+def test_scalar_edge_cases(hash_engine, key):
+    assert hash_engine.HashEngine().flow_hashes(*key) == crcmod_hashes(*key)
+
+
+def test_scalar_random(hash_engine):
+    engine = hash_engine.HashEngine()
+    keys = random_keys(2000)
+    for row in zip(*[keys[name].tolist() for name in keys]):
+        assert engine.flow_hashes(*row) == crcmod_hashes(*row)
+
+
+def test_vectorized_random_and_edge_cases(hash_engine):
+    keys = random_keys(5000, seed=1)
+    for name, values in zip(keys, zip(*EDGE_KEYS)):
+        keys[name] = np.concatenate([keys[name], np.array(values, dtype=np.uint64)])
+    hashes = np.stack(hash_engine.HashEngine().flow_hashes(**keys), axis=1)
+    expected = [crcmod_hashes(*row) for row in zip(*[keys[name].tolist() for name in keys])]
+    np.testing.assert_array_equal(hashes, np.array(expected))
+
+
+# The flow keys of non-IPv4 packets (and the ports of non TCP/UDP packets) are zeroed, as their
+# hashes were computed from zero fields.
+def test_flow_keys_of_non_ipv4_and_icmp_rows(hash_engine, trace_cache):
+    flags = np.array([trace_cache.FLAG_IPV4 | trace_cache.FLAG_UDP,
+                      trace_cache.FLAG_IPV4 | trace_cache.FLAG_TCP,
+                      trace_cache.FLAG_IPV4 | trace_cache.FLAG_ICMP,
+                      0, 0], dtype=np.uint8)
+    columns = {
+        'flags': flags,
+        'eth_src': np.array([1, 2, 3, 4, MAX_MAC], dtype=np.uint64),
+        'ip_src': np.array([0x0a000001, 0x0a000002, 0x0a000003, 0x0a000004, MAX_IP],
+                           dtype=np.uint32),
+        'ip_dst': np.array([0x0a0000ff, 0x0a0000fe, 0x0a0000fd, 0x0a0000fc, MAX_IP],
+                           dtype=np.uint32),
+        'ip_proto': np.array([17, 6, 1, 17, 6], dtype=np.uint8),
+        'port_src': np.array([53, 65535, 7, 9, 65535], dtype=np.uint16),
+        'port_dst': np.array([0, 80, 7, 9, 65535], dtype=np.uint16)}
+    keys = trace_cache.flow_keys(columns)
+    rows = list(zip(*[np.asarray(keys[name]).tolist() for name in keys]))
+    assert rows[2][3:] == (1, 0, 0)
+    assert [row[1:] for row in rows[3:]] == [(0, 0, 0, 0, 0)] * 2
+
+    engine = hash_engine.HashEngine()
+    vectorized = np.stack(engine.flow_hashes(**keys), axis=1)
+    for row, hashes in zip(rows, vectorized.tolist()):
+        assert engine.flow_hashes(*row) == crcmod_hashes(*row) == hashes
+
+
+# Whole traces are hashed in blocks into an (n_pkts, 8) array.
+def test_trace_hashes(hash_engine):
+    keys = random_keys(1000, seed=2)
+    expected = np.array([crcmod_hashes(*row) for row in zip(*[keys[name].tolist()
+                                                              for name in keys])])
+    hashes = hash_engine.HashEngine().trace_hashes(keys, block_size=64)
+    assert hashes.shape == (1000, 8) and hashes.dtype == np.int64
+    np.testing.assert_array_equal(hashes, expected)
@@ -0,0 +1,40 @@
+import importlib
+import numpy as np
+import pytest
+from conftest import load_package
+
+KITNET = {'py': 'py/plugins/KitNET', 'controller': 'controller/KitNET'}
+
+
+@pytest.fixture
+def kitnet(copy_dir):
+    package = load_package(KITNET[copy_dir])
+    return importlib.import_module(f'{package.__name__}.KitNET')
+
+
+# Trained KitNET, with a few autoencoders and stats of different scales.
+def trained_kitnet(kitnet, tmp_path, n=20, fm_grace=300, ad_grace=700):
+    rng = np.random.RandomState(1234)
+    X = rng.rand(fm_grace + ad_grace + 1000, n) * rng.rand(n) * 1000
+    K = kitnet.KitNET(n, max_autoencoder_size=5, fm_grace_period=fm_grace,
+                      ad_grace_period=ad_grace, model_dir=str(tmp_path))
+    for x in X[:fm_grace + ad_grace]:
+        K.process(x)
+    return K, X[fm_grace + ad_grace:]
+
+
+# Reference execution: each autoencoder of the ensemble layer executed on its own features.
+def execute_per_da(K, x):
+    S_l1 = np.array([da.execute(x[v]) for v, da in zip(K.v, K.ensembleLayer)])
+    return K.outputLayer.execute(S_l1)
+
+
+def test_execute_matches_per_da(kitnet, tmp_path):
+    K, X = trained_kitnet(kitnet, tmp_path)
+    assert len(K.ensembleLayer) > 1
+
+    rmses = [K.execute(x) for x in X]
+    assert rmses == [execute_per_da(K, x) for x in X]
+
+    # the batches go through the compiled ensemble layer, equal up to rounding
+    np.testing.assert_allclose(K.execute_batch(X), rmses, rtol=1e-12)
@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+from conftest import load_module
+
+# Custom sqrt lookup table, as in stats_calc.py and fc_kitnet.py.
+LOOKUP_SQRT = [240, 240, 222, 222, 202, 202, 182, 182, 175, 169, 163, 157, 150, 143, 136, 128]
+
+# MathUnit configurations of stats_calc.py and fc_kitnet.py: sqr and sqrt_mu.
+CONFIGS = {
+    'sqr': dict(shift=1, invert=False, scale=-6, lookup=[x*x for x in range(15, -1, -1)]),
+    'sqrt_mu': dict(shift=-1, invert=False, scale=-7, lookup=LOOKUP_SQRT)}
+
+
+# The scalar algorithm of MathUnit.compute, before the precomputed tables.
+def reference_compute(config, arg):
+    shift, invert, scale = config['shift'], config['invert'], config['scale']
+    lookup = list(reversed(config['lookup']))
+    sqrt_flag = False
+    arg = int(arg)
+    if arg == 0:
+        return 0
+    arg1 = arg << 3
+    exp1 = arg1.bit_length() - 1
+    if shift == -1 and exp1 % 2 != 0:
+        sqrt_flag = True
+        exp1 += 1
+    exp = exp1 - 3
+    if sqrt_flag:
+        mantissa = int(bin(arg)[2:2 + 4], base=2)
+    else:
+        mantissa = (arg1 >> exp) & 0xF
+    if shift == -1:
+        new_exp = exp >> 1
+    elif shift == 0:
+        new_exp = exp
+    else:
+        new_exp = exp << 1
+    if invert:
+        new_exp = -new_exp
+    new_exp += scale
+    new_mantissa = lookup[mantissa - 8] if sqrt_flag else lookup[mantissa]
+    if new_exp < 0:
+        result = new_mantissa >> -new_exp
+    else:
+        result = new_mantissa << new_exp
+    return result & 0xffffffff
+
+
+# Dense sample of the 32-bit range: all 17-bit values, the values around each power of two
+# (odd and even exponents, the mantissa boundaries) and random values of each bit length.
+def sample_args():
+    rng = np.random.default_rng(0)
+    args = [np.arange(1 << 17)]
+    for bits in range(17, 33):
+        low = 1 << (bits - 1)
+        args.append(low + np.arange(-64, 64))
+        args.append(low + (np.arange(16) << (bits - 5)))
+        args.append(rng.integers(low, 2 * low, 20000))
+    args.append(np.array([(1 << 32) - 1]))
+    return np.unique(np.concatenate(args)).astype(np.int64)
+
+
+ARGS = sample_args()
+
+
+@pytest.fixture(params=list(CONFIGS))
+def config_name(request):
+    return request.param
+
+
+@pytest.fixture
+def math_unit(copy_dir, config_name):
+    config = CONFIGS[config_name]
+    module = load_module(f'{copy_dir}/math_unit.py')
+    return module.MathUnit(**{**config, 'lookup': list(config['lookup'])})
+
+
+def test_compute_matches_reference(math_unit, config_name):
+    config = CONFIGS[config_name]
+    mismatches = [arg for arg in ARGS.tolist()
+                  if math_unit.compute(arg) != reference_compute(config, arg)]
+    assert mismatches == []
+
+
+def test_compute_array_matches_reference(math_unit, config_name):
+    config = CONFIGS[config_name]
+    expected = np.array([reference_compute(config, arg) for arg in ARGS.tolist()])
+    np.testing.assert_array_equal(math_unit.compute_array(ARGS), expected)
+    # any array shape, and float arguments (truncated as by compute)
+    np.testing.assert_array_equal(math_unit.compute_array(ARGS[:1000].reshape(10, 100)),
+                                  expected[:1000].reshape(10, 100))
+    np.testing.assert_array_equal(math_unit.compute_array(ARGS[:1000] + 0.5), expected[:1000])
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+from conftest import load_module
+
+
+@pytest.fixture
+def trace_cache(copy_dir):
+    return load_module(f'{copy_dir}/trace_cache.py')
+
+
+def test_decode_trace(trace_cache):
+    udp = trace_cache.FLAG_IPV4 | trace_cache.FLAG_UDP
+    columns = {
+        'flags': np.array([udp, 0, udp, trace_cache.FLAG_IPV4 | trace_cache.FLAG_ICMP],
+                          dtype=np.uint8),
+        'ts_sec': np.array([10, 10, 11, 12], dtype=np.int64),
+        'ts_nsec': np.array([500000000, 0, 250000000, 0], dtype=np.int64),
+        'eth_src': np.array([0x0123456789ab, 1, 0x0123456789ab, 0xffeeddccbbaa],
+                            dtype=np.uint64),
+        'eth_dst': np.array([0xffeeddccbbaa, 2, 0xffeeddccbbaa, 0x0123456789ab],
+                            dtype=np.uint64),
+        'ip_src': np.array([0x0a000001, 7, 0x0a000001, 0xc0a80001], dtype=np.uint32),
+        'ip_dst': np.array([0x0a000002, 7, 0x0a000002, 0x08080808], dtype=np.uint32),
+        'ip_len': np.array([60, 70, 1500, 84], dtype=np.uint16),
+        'ip_proto': np.array([17, 17, 17, 1], dtype=np.uint8),
+        'port_src': np.array([53, 1, 5353, 9], dtype=np.uint16),
+        'port_dst': np.array([1000, 1, 53, 9], dtype=np.uint16)}
+    pkts = trace_cache.decode_trace(columns)
+
+    np.testing.assert_array_equal(pkts['ipv4'], [True, False, True, True])
+    np.testing.assert_array_equal(pkts['pkt_len'], [60, 0, 1500, 84])
+    np.testing.assert_array_equal(pkts['ts'], [10.5, 10, 11.25, 12])
+    # the repeated MACs and IPs are formatted once
+    assert len(pkts['tables']['mac_src']) == 3 and len(pkts['tables']['ip_src']) == 3
+    assert all(pkts[name].dtype == np.int32 for name in trace_cache.STR_FIELDS)
+
+    assert [trace_cache.pkt_strs(pkts, i) for i in range(4)] == [
+        ['ff:ee:dd:cc:bb:aa', '01:23:45:67:89:ab', '10.0.0.1', '10.0.0.2', '17', '53', '1000'],
+        ['00:00:00:00:00:02', '00:00:00:00:00:01', '0.0.0.0', '0.0.0.0', '0', '0', '0'],
+        ['ff:ee:dd:cc:bb:aa', '01:23:45:67:89:ab', '10.0.0.1', '10.0.0.2', '17', '5353', '53'],
+        ['01:23:45:67:89:ab', 'ff:ee:dd:cc:bb:aa', '192.168.0.1', '8.8.8.8', '1', '0', '0']]